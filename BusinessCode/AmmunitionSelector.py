@@ -12,10 +12,15 @@ from PyQt6.QtWidgets import (
     QLineEdit, QLabel, QMessageBox, QHeaderView
 )
 from PyQt6.QtGui import QStandardItemModel, QStandardItem
-from PyQt6.QtCore import Qt
-from DBCode.DBHelper import DBHelper
+from PyQt6.QtCore import Qt, QTimer
+from BusinessCode.QueryRunner import QueryRunner
+from DBCode.SelectorIndex import SELECTOR_INDEX
 from loguru import logger
 
+_TABLE = "Ammunition_Info"
+# 停止输入多久后检索（ms）
+_SEARCH_DELAY_MS = 150
+
 
 class AmmunitionSelectorDialog(QDialog):
     """弹药选择对话框"""
@@ -26,6 +31,15 @@ class AmmunitionSelectorDialog(QDialog):
         self.resize(1000, 600)
 
         self.selected_ammunition = None  # 选中的弹药信息
+
+        # 边输入边检索：内存索引就绪时直接在界面线程检索，否则在后台查库
+        SELECTOR_INDEX.preload(_TABLE)
+        self._runner = QueryRunner(self)
+        self._runner.chunk.connect(self._show_rows)
+        self._runner.done.connect(self._on_fallback_done)
+        self._runner.failed.connect(lambda msg: QMessageBox.warning(self, "错误", f"加载弹药数据失败：{msg}"))
+        self.finished.connect(lambda _result: self._runner.shutdown())
+
         self._init_ui()
         self._load_data()
 
@@ -34,18 +48,22 @@ class AmmunitionSelectorDialog(QDialog):
         layout = QVBoxLayout(self)
 
         # 搜索区域
-        # search_layout = QHBoxLayout()
-        # search_layout.addWidget(QLabel("搜索弹药:"))
-        # self.ed_search = QLineEdit()
-        # self.ed_search.setPlaceholderText("输入弹药名称或型号...")
-        # search_layout.addWidget(self.ed_search)
-        #
-        # self.btn_search = QPushButton("搜索")
-        # self.btn_search.clicked.connect(self._on_search)
-        # search_layout.addWidget(self.btn_search)
-        #
-        # search_layout.addStretch()
-        # layout.addLayout(search_layout)
+        search_layout = QHBoxLayout()
+        search_layout.addWidget(QLabel("搜索弹药:"))
+        self.ed_search = QLineEdit()
+        self.ed_search.setPlaceholderText("输入弹药名称或型号...")
+        self.ed_search.setClearButtonEnabled(True)
+        search_layout.addWidget(self.ed_search)
+        search_layout.addStretch()
+        layout.addLayout(search_layout)
+
+        # 输入停顿后再检索，连续输入只检索最后一次
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(_SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self._on_search)
+        self.ed_search.textChanged.connect(lambda _text: self._search_timer.start())
+        self.ed_search.returnPressed.connect(self._on_search)
 
         # 表格区域
         self.table_view = QTableView()
@@ -70,65 +88,43 @@ class AmmunitionSelectorDialog(QDialog):
         layout.addLayout(btn_layout)
 
     def _load_data(self, keyword: str = ""):
-        """加载弹药数据"""
-        db = DBHelper()
+        """加载弹药数据（关键字为空时显示最新的记录）"""
         try:
-            if keyword:
-                sql = """
-                SELECT AMID, AMName, AMNameCN, AMType, AMModel, Country, 
-                       WarheadType, WarheadName, ChargeAmount
-                FROM Ammunition_Info 
-                AND (AMName LIKE %s OR AMNameCN LIKE %s OR AMModel LIKE %s)
-                ORDER BY AMID DESC
-                """
-                pattern = f'%{keyword}%'
-                result = db.execute_query(sql, (pattern, pattern, pattern))
-            else:
-                sql = """
-                SELECT AMID, AMName, AMNameCN, AMType, AMModel, Country, 
-                       WarheadType, WarheadName, ChargeAmount
-                FROM Ammunition_Info 
-                ORDER BY AMID DESC
-                LIMIT 100
-                """
-                result = db.execute_query(sql)
-
-            # 设置表格模型
-            headers = ["弹药ID", "官方名称", "中文名称", "弹药类型", "弹药型号",
-                      "国家", "战斗部类型", "战斗部名称", "装药量(kg)"]
-
-            model = QStandardItemModel(0, len(headers))
-            model.setHorizontalHeaderLabels(headers)
-
-            if result:
-                for row_data in result:
-                    row = []
-                    row.append(QStandardItem(str(row_data.get('AMID', ''))))
-                    row.append(QStandardItem(row_data.get('AMName', '')))
-                    row.append(QStandardItem(row_data.get('AMNameCN', '')))
-                    row.append(QStandardItem(row_data.get('AMType', '')))
-                    row.append(QStandardItem(row_data.get('AMModel', '')))
-                    row.append(QStandardItem(row_data.get('Country', '')))
-                    row.append(QStandardItem(row_data.get('WarheadType', '')))
-                    row.append(QStandardItem(row_data.get('WarheadName', '')))
-                    row.append(QStandardItem(str(row_data.get('ChargeAmount', ''))))
-                    model.appendRow(row)
-
-            self.table_view.setModel(model)
-
-            # 调整列宽
-            header = self.table_view.horizontalHeader()
-            for i in range(len(headers)):
-                header.setSectionResizeMode(i, QHeaderView.ResizeMode.ResizeToContents)
-
+            rows = SELECTOR_INDEX.search(_TABLE, keyword)
         except Exception as e:
             logger.exception(e)
-            QMessageBox.warning(self, "错误", f"加载弹药数据失败：{e}")
-        finally:
-            db.close()
+            rows = None
+        if rows is not None:
+            self._runner.cancel()  # 丢弃仍在执行的查库结果
+            self._show_rows(rows)
+            return
+        # 索引尚未载入（后台载入中）：本次查库
+        self._runner.submit(lambda: [SELECTOR_INDEX.fallback_search(_TABLE, keyword)])
+
+    def _show_rows(self, rows):
+        """rows 为按 SELECTOR_INDEX 中弹药表的列排列的元组"""
+        headers = ["弹药ID", "官方名称", "中文名称", "弹药类型", "弹药型号",
+                   "国家", "战斗部类型", "战斗部名称", "装药量(kg)"]
+
+        model = QStandardItemModel(0, len(headers))
+        model.setHorizontalHeaderLabels(headers)
+        for row_data in rows:
+            model.appendRow([QStandardItem("" if v is None else str(v)) for v in row_data])
+
+        self.table_view.setModel(model)
+
+        # 调整列宽
+        header = self.table_view.horizontalHeader()
+        for i in range(len(headers)):
+            header.setSectionResizeMode(i, QHeaderView.ResizeMode.ResizeToContents)
+
+    def _on_fallback_done(self, total: int, _elapsed_ms: float):
+        if total == 0:  # 空结果不会发出 chunk，这里清空表格
+            self._show_rows([])
 
     def _on_search(self):
-        """搜索按钮点击"""
+        """输入停顿 / 回车时检索"""
+        self._search_timer.stop()
         keyword = self.ed_search.text().strip()
         self._load_data(keyword)
 
@@ -148,14 +144,12 @@ class AmmunitionSelectorDialog(QDialog):
         model = self.table_view.model()
         amid = int(model.item(row, 0).text())
 
-        # 从数据库查询完整的弹药信息
-        db = DBHelper()
+        # 从数据库查询完整的弹药信息（按主键读取，未变化的记录由实体缓存返回）
         try:
             from am_models.sql_repository import SQLRepository as AmModelSQLRepository
             from am_models.db import session_scope as AmSessionScope
             with AmSessionScope() as session:
-                am_repo = AmModelSQLRepository(session)
-            result = am_repo.get(amid)
+                result = AmModelSQLRepository(session).get(amid)
 
             if result:
                 self.selected_ammunition = result
@@ -165,8 +159,6 @@ class AmmunitionSelectorDialog(QDialog):
         except Exception as e:
             logger.exception(e)
             QMessageBox.warning(self, "错误", f"查询弹药信息失败：{e}")
-        finally:
-            db.close()
 
     def get_selected_ammunition(self):
         """获取选中的弹药信息"""
@@ -0,0 +1,121 @@
+"""
+弹药数据服务（不依赖 Qt）
+
+弹药检索、列表、导出与语义索引构建。界面（Search_Ammunition、DM_Ammunition_Export）在后台线程中调用，
+命令行工具 cli.py 与基准脚本在子进程中直接调用。
+"""
+from __future__ import annotations
+
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from loguru import logger
+
+from am_models import Ammunition
+from am_models.db import session_scope
+from am_models.orm import AmmunitionORM
+from am_models.sql_repository import SQLRepository
+from BusinessCode.QuerySpec import Filter, QuerySpec
+from BusinessCode.TableExport import TABLE_SPECS, ProgressFn, write_table
+
+# 语义索引文件（不含扩展名），与检索窗口共用
+INDEX_PATH = "./models/ammo_index"
+PREFER_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
+
+# 弹药类型下拉框中的已知类型；选“其他”时排除这些类型
+KNOWN_AM_TYPES = ["钻地弹", "空地导弹", "子母弹", "巡航导弹", "布撒器"]
+
+# 组合检索条件声明，键与 Search_Ammunition.combination_search 中的 condition_data 对应
+AMMUNITION_QUERY = QuerySpec(
+    "ammunition",
+    # 只取列表需要的列（不含图片），结果行由 SQLRepository.row_mapper 直接映射为实体
+    columns=tuple(SQLRepository.entity_columns(include_blob=False)),
+    filters=(
+        Filter("am_type_other", ~AmmunitionORM.am_type.in_(KNOWN_AM_TYPES), op="clause", enabled="am_type_enabled"),
+        Filter("am_type", AmmunitionORM.am_type, enabled="am_type_enabled"),
+        Filter("country", AmmunitionORM.country, enabled="country_enabled"),
+        Filter("am_model", AmmunitionORM.model_name, enabled="am_model_enabled"),
+        Filter("am_length", AmmunitionORM.length_m, op="range", key="am_length_a", upper="am_length_b",
+               enabled="am_length_enabled"),
+        Filter("am_diameter", AmmunitionORM.diameter_m, op="range", key="am_diameter_a", upper="am_diameter_b",
+               enabled="am_diameter_enabled"),
+        Filter("max_speed", AmmunitionORM.max_speed_ma, op="range", key="max_speed_a", upper="max_speed_b",
+               enabled="max_speed_enabled"),
+        Filter("am_weight", AmmunitionORM.weight_kg, op="eq", enabled="am_weight_enabled"),
+    ),
+    session_factory=session_scope,
+)
+
+
+def list_ammunition(scope: Callable = session_scope) -> List[Ammunition]:
+    """全部弹药；scope 为会话工厂（默认 am_models.db.session_scope）"""
+    with scope() as s:
+        return SQLRepository(s).list_all()
+
+
+def get_ammunition(am_id: int) -> Optional[Ammunition]:
+    with session_scope() as s:
+        return SQLRepository(s).get(am_id)
+
+
+def _related_am_ids(repo_name: str, keyword: Any) -> set:
+    """评估结果 / 毁伤场景中与 keyword 匹配的记录所关联的弹药ID；查询失败时记录日志并返回空集"""
+    import damage_models
+    from DBCode.DBHelper import DBHelper
+
+    db = DBHelper()
+    try:
+        found = getattr(damage_models, repo_name)(db).search(keyword)
+        logger.debug(f"{repo_name} 检索：{len(found)} 条")
+        return {r.AMID for r in found}
+    except Exception as e:
+        logger.exception(f"{repo_name} 检索失败{e}")
+        return set()
+    finally:
+        db.close()
+
+
+def iter_ammunition_by_conditions(condition_data: Dict[str, Any]) -> Iterator[List[Ammunition]]:
+    """按块返回组合检索结果（实体不含图片）"""
+    cond = dict(condition_data)
+    if (cond.get("am_type") or "").strip() == "其他":
+        # 排除已知类型
+        cond["am_type_other"] = True
+        cond["am_type"] = ""
+
+    # 评估/场景交叉过滤：先取出关联的弹药ID，再逐块过滤主查询结果
+    level_enabled = condition_data.get("damage_parameter_damage_level_enabled", False)
+    scene_enabled = condition_data.get("damage_parameter_name_enabled", False)
+    keyword = condition_data.get("damage_parameter_damage_level")
+    ar_amids = _related_am_ids("AssessmentResultRepository", keyword) if level_enabled else set()
+    ds_amids = _related_am_ids("DamageSceneRepository", keyword) if scene_enabled else set()
+
+    to_entity = SQLRepository.row_mapper(include_blob=False)
+    for rows in AMMUNITION_QUERY.stream(cond):
+        result = [to_entity(r) for r in rows]
+        if level_enabled:
+            result = [obj for obj in result if obj.am_id in ar_amids]
+        if scene_enabled:
+            result = [obj for obj in result if obj.am_id in ds_amids]
+        yield result
+
+
+def query_ammunition_by_conditions(condition_data: Dict[str, Any]) -> List[Ammunition]:
+    return [am for chunk in iter_ammunition_by_conditions(condition_data) for am in chunk]
+
+
+def export_ammunition(items: Sequence[Ammunition], filename: str, fmt: str, progress: ProgressFn = None) -> int:
+    """导出为 xlsx / docx / csv / json（见 TableExport.write_table），返回记录数"""
+    return write_table(TABLE_SPECS["ammunition"], items, filename, fmt, progress=progress)
+
+
+def rebuild_semantic_index(path: str = INDEX_PATH, prefer_model: Optional[str] = PREFER_MODEL):
+    """从数据库重建弹药语义索引并保存到 path；没有数据时返回 None"""
+    from BusinessCode.am_semantic_search import build_semantic_index_from_db
+
+    with session_scope() as session:
+        idx = build_semantic_index_from_db(session, AmmunitionORM, id_attr="am_id", prefer_model=prefer_model)
+    if idx is not None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        idx.save_index(path)
+    return idx
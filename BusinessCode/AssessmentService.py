@@ -0,0 +1,153 @@
+"""
+毁伤评估结果 / 评估报告服务（不依赖 Qt）
+
+结果与报告的列表、保存、组合检索（REPORT_QUERY），以及报告的批量导出（PDF / Word，见 ReportExporter）。
+编辑窗口（PG_AssessmentResult_Add、PG_AssessmentReport_Add）校验表单后调用，cli.py 在子进程中调用。
+
+失败约定：要更新的记录不存在抛 LookupError，数据库错误原样抛出。
+"""
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, case, func
+from sqlalchemy.sql import Select
+
+from am_models.orm import AmmunitionORM
+from BusinessCode.QuerySpec import Filter, QuerySpec
+from damage_models import (
+    AssessmentReport, AssessmentReportRepository, AssessmentResult, AssessmentResultRepository,
+)
+from damage_models.db import get_session
+from damage_models.orm import AssessmentReportORM, DamageSceneORM
+from DBCode.DBHelper import DBHelper
+from target_model.orm import AircraftShelterORM, AirportRunwayORM, UndergroundCommandPostORM
+
+
+def list_results() -> List[AssessmentResult]:
+    db = DBHelper()
+    try:
+        return AssessmentResultRepository(db).get_all()
+    finally:
+        db.close()
+
+
+def list_reports() -> List[AssessmentReport]:
+    db = DBHelper()
+    try:
+        return AssessmentReportRepository(db).get_all()
+    finally:
+        db.close()
+
+
+def save_result(result: AssessmentResult, db: Optional[DBHelper] = None) -> int:
+    """result.DAID 为空时新增，否则更新；返回结果ID"""
+    own = db is None
+    db = db or DBHelper()
+    try:
+        repo = AssessmentResultRepository(db)
+        if result.DAID is None:
+            return repo.add(result)
+        if not repo.update(result):
+            raise LookupError("更新失败，评估结果不存在")
+        return result.DAID
+    finally:
+        if own:
+            db.close()
+
+
+def save_report(report: AssessmentReport, db: Optional[DBHelper] = None) -> int:
+    """report.ReportID 为空时新增，否则更新；返回报告ID"""
+    own = db is None
+    db = db or DBHelper()
+    try:
+        repo = AssessmentReportRepository(db)
+        if report.ReportID is None:
+            return repo.add(report)
+        if not repo.update(report):
+            raise LookupError("更新失败，报告不存在")
+        return report.ReportID
+    finally:
+        if own:
+            db.close()
+
+
+def report_file_name(report_id: int, fmt: str) -> str:
+    """与报告管理窗口“导出”的默认文件名一致"""
+    return f"评估报告_{report_id}{'.pdf' if fmt == 'pdf' else '.docx'}"
+
+
+def export_reports(report_ids: Sequence[int], fmt: str, out_dir: str) -> List[Tuple[int, bool, str]]:
+    """
+    依次导出一组报告到 out_dir，返回 [(报告ID, 成功, 文件路径或错误信息)]。
+    PDF 字体 / Word 模板在进程内只准备一次，批量导出时每个进程处理一组。
+    """
+    from BusinessCode.ReportExporter import export_report_to_file, preload_report_resources
+
+    preload_report_resources()
+    results = []
+    for report_id in report_ids:
+        path = os.path.join(out_dir, report_file_name(report_id, fmt))
+        ok, msg = export_report_to_file(report_id, path, fmt)
+        results.append((report_id, ok, path if ok else msg))
+    return results
+
+
+# ---------- 报告组合检索（检索窗口 Search_Report 与基准脚本共用） ----------
+
+TARGET_TYPE_LABELS = {
+    1: "机场跑道",
+    2: "单机掩蔽库",
+    3: "地下指挥所",
+}
+
+_AR = AssessmentReportORM
+_TARGET_NAME = func.coalesce(
+    AirportRunwayORM.runway_name, AircraftShelterORM.shelter_name, UndergroundCommandPostORM.ucc_name
+)
+
+
+def _report_joins(stmt: Select) -> Select:
+    return (
+        stmt.select_from(_AR)
+        .outerjoin(AmmunitionORM, AmmunitionORM.am_id == _AR.AMID)
+        .outerjoin(DamageSceneORM, DamageSceneORM.DSID == _AR.DSID)
+        .outerjoin(AirportRunwayORM, and_(_AR.TargetType == 1, _AR.TargetID == AirportRunwayORM.id))
+        .outerjoin(AircraftShelterORM, and_(_AR.TargetType == 2, _AR.TargetID == AircraftShelterORM.id))
+        .outerjoin(UndergroundCommandPostORM, and_(_AR.TargetType == 3, _AR.TargetID == UndergroundCommandPostORM.id))
+    )
+
+
+# 组合检索：条件键与检索窗口 _collect_conditions 返回的字典对应（只包含已勾选且填写了的条件）
+REPORT_QUERY = QuerySpec(
+    "report",
+    columns=(
+        _AR.ReportID, _AR.ReportCode, _AR.ReportName, _AR.DamageDegree, _AR.Comment,
+        _AR.CreatedTime, _AR.Reviewer,
+        AmmunitionORM.model_name.label("AMModel"),
+        AmmunitionORM.am_type.label("AMType"),
+        DamageSceneORM.DSName.label("SceneName"),
+        case(TARGET_TYPE_LABELS, value=_AR.TargetType, else_="未知").label("TargetTypeName"),
+        _TARGET_NAME.label("TargetName"),
+    ),
+    filters=(
+        Filter("report_code", _AR.ReportCode),
+        Filter("report_name", _AR.ReportName),
+        Filter("am_model", AmmunitionORM.model_name),
+        Filter("am_type", AmmunitionORM.am_type),
+        Filter("target_type", _AR.TargetType, op="eq"),
+        Filter("target_name", _TARGET_NAME),
+        Filter("scene_name", DamageSceneORM.DSName),
+        Filter("damage_degree", _AR.DamageDegree),
+        Filter("comment", _AR.Comment),
+    ),
+    session_factory=get_session,
+    select_from=_report_joins,
+    order_by=(_AR.ReportID.desc(),),
+)
+
+
+def query_reports(cond: Dict[str, Any]) -> List[Any]:
+    """按条件字典组合检索报告，返回投影后的结果行"""
+    return REPORT_QUERY.execute(cond).rows
@@ -0,0 +1,281 @@
+"""
+自动备份调度服务
+
+- 调度配置（是否启用、周期、保留策略）持久化在 Config 的配置文件中
+- 上一次自动备份时间取自 DataBackup_Records，程序重启后可以补做错过的备份
+- 备份（mysqldump 或内置逻辑备份，见 BackupService / LogicalBackup）与记录写入、过期清理都在后台线程执行，不阻塞界面
+- 恢复窗口使用的 RestoreJobWorker 同样在后台线程执行恢复并写入恢复记录
+"""
+from __future__ import annotations
+
+import datetime
+import os
+from typing import Dict, Optional
+
+from loguru import logger
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal
+
+from BusinessCode.BackupService import (  # noqa: F401  备份 / 恢复函数见 BackupService，此处保持原有导入路径
+    TARGET_TABLES, BACKUP_TYPE_AUTO, BACKUP_TYPE_MANUAL, BACKUP_BACKENDS,
+    dump_tables, load_sql_dump, backup_backend, run_backup, restore_backup, insert_backup_record,
+    last_auto_backup_time, select_expired, apply_retention, backup_now, restore_now, insert_restore_record,
+)
+from BusinessCode.ConfigStore import load_config, save_config
+from DBCode.DBHelper import DBHelper
+
+# 周期名称 -> 秒数
+BACKUP_CYCLES: Dict[str, int] = {
+    "每周": 60 * 60 * 24 * 7,
+    "每月": 60 * 60 * 24 * 30,
+    "每季度": 60 * 60 * 24 * 90,
+    "每年": 60 * 60 * 24 * 365,
+}
+
+# 调度检查间隔（毫秒）
+CHECK_INTERVAL_MS = 60 * 1000
+# 自动备份失败后的重试间隔（秒）
+RETRY_INTERVAL_SEC = 60 * 60
+
+
+class BackupJobWorker(QThread):
+    """在后台线程执行一次备份（备份文件 + 写记录 + 保留策略）"""
+    message = pyqtSignal(str)
+    error = pyqtSignal(str)
+    done = pyqtSignal(str)  # 完成，携带备份文件路径
+
+    def __init__(self, backup_type: int, backup_path: str, operator: str, cycle: str = "",
+                 keep_daily: int = 0, keep_weekly: int = 0, parent=None):
+        super().__init__(parent)
+        self.backup_type = backup_type
+        self.backup_path = backup_path
+        self.operator = operator
+        self.cycle = cycle
+        self.keep_daily = keep_daily
+        self.keep_weekly = keep_weekly
+
+    def run(self):
+        try:
+            self.message.emit("正在执行数据备份...")
+            full_path = backup_now(self.backup_type, self.backup_path, self.operator, self.cycle,
+                                   self.keep_daily, self.keep_weekly, progress=self.message.emit)
+            self.done.emit(full_path)
+        except Exception as e:
+            logger.exception(e)
+            self.error.emit(f"备份失败: {e}")
+
+
+class RestoreJobWorker(QThread):
+    """在后台线程执行一次恢复，并写入恢复记录（成功 1 / 失败 0）"""
+    message = pyqtSignal(str)
+    error = pyqtSignal(str)
+    done = pyqtSignal(str)  # 完成，携带备份文件路径
+
+    def __init__(self, backup_id, backup_path: str, backup_file: str, version: str, operator: str,
+                 tables=TARGET_TABLES, parent=None):
+        super().__init__(parent)
+        self.backup_id = backup_id
+        self.backup_path = backup_path
+        self.backup_file = backup_file
+        self.version = version
+        self.operator = operator
+        self.tables = tables
+
+    def _record(self, status: int, remark: str = "") -> None:
+        db = DBHelper()
+        try:
+            insert_restore_record(db, self.backup_id, self.backup_path, self.backup_file, self.version,
+                                  status, self.operator, remark)
+        except Exception as e:
+            logger.exception(e)
+        finally:
+            db.close()
+
+    def run(self):
+        full_path = os.path.join(self.backup_path, self.backup_file)
+        try:
+            self.message.emit("正在执行数据恢复...")
+            restore_now(full_path, self.tables, progress=self.message.emit)
+        except Exception as e:
+            logger.exception(e)
+            self._record(0, str(e))
+            self.error.emit(f"恢复失败: {e}")
+            return
+        self._record(1)
+        self.done.emit(full_path)
+
+
+class LastBackupLookup(QThread):
+    """在后台线程查询最近一次成功的自动备份时间（没有记录时为 None）"""
+    found = pyqtSignal(object)
+
+    def run(self):
+        db = DBHelper()
+        try:
+            last = last_auto_backup_time(db)
+        except Exception as e:
+            logger.exception(e)
+            last = None
+        finally:
+            db.close()
+        self.found.emit(last)
+
+
+class BackupScheduler(QObject):
+    """
+    随主程序启动的自动备份调度器。
+    - 每分钟检查一次是否到期，到期则启动 BackupJobWorker
+    - 启动时在后台线程查询 DataBackup_Records 的最近一次自动备份，错过备份窗口则立即补做一次；
+      之后由备份完成事件更新该时间，修改配置时只做计算，不再查库
+    """
+    scheduleChanged = pyqtSignal()
+    jobStarted = pyqtSignal(int)  # BackupType
+    jobFinished = pyqtSignal(int, str)  # BackupType, 文件路径
+    jobFailed = pyqtSignal(int, str)  # BackupType, 错误信息
+
+    def __init__(self, operator: str = "", parent=None):
+        super().__init__(parent)
+        self.operator = operator
+        self.next_backup_time: Optional[datetime.datetime] = None
+        self._worker: Optional[BackupJobWorker] = None
+        self._lookup: Optional[LastBackupLookup] = None
+        self._last_auto_backup: Optional[datetime.datetime] = None
+        self._last_loaded = False
+        self._timer = QTimer(self)
+        self._timer.setInterval(CHECK_INTERVAL_MS)
+        self._timer.timeout.connect(self._check_due)
+
+    # ---------- 配置 ----------
+
+    @staticmethod
+    def settings() -> Dict[str, str]:
+        return load_config()
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings().get("auto_backup_enabled") == "1"
+
+    @property
+    def cycle_name(self) -> str:
+        name = self.settings().get("auto_backup_cycle", "每周")
+        return name if name in BACKUP_CYCLES else "每周"
+
+    def configure(self, enabled: bool, cycle_name: Optional[str] = None) -> None:
+        """修改并持久化调度配置，随后重新计算下一次备份时间"""
+        values = {"auto_backup_enabled": "1" if enabled else "0"}
+        if cycle_name in BACKUP_CYCLES:
+            values["auto_backup_cycle"] = cycle_name
+        save_config(values)
+        self.reschedule()
+
+    # ---------- 调度 ----------
+
+    def start(self) -> None:
+        self._timer.start()
+        self._lookup = LastBackupLookup(self)
+        self._lookup.found.connect(self._on_last_backup_found)
+        self._lookup.finished.connect(self._lookup.deleteLater)
+        self._lookup.start()
+
+    def _on_last_backup_found(self, last: Optional[datetime.datetime]) -> None:
+        self._lookup = None
+        self._last_auto_backup = last
+        self._last_loaded = True
+        self.reschedule()
+        self._check_due()
+
+    def stop(self) -> None:
+        self._timer.stop()
+
+    def reschedule(self) -> None:
+        if not self.enabled or not self._last_loaded:
+            # 启动时的查询尚未返回：返回后会再次计算
+            self.next_backup_time = None
+            self.scheduleChanged.emit()
+            return
+        cycle = datetime.timedelta(seconds=BACKUP_CYCLES[self.cycle_name])
+        last = self._last_auto_backup
+        # 没有历史记录或已错过窗口：立即到期，由 _check_due 补做
+        now = datetime.datetime.now()
+        self.next_backup_time = now if last is None else max(last + cycle, now)
+        self.scheduleChanged.emit()
+
+    def remaining_seconds(self) -> Optional[int]:
+        if self.next_backup_time is None:
+            return None
+        return max(0, int((self.next_backup_time - datetime.datetime.now()).total_seconds()))
+
+    def is_busy(self) -> bool:
+        return self._worker is not None
+
+    def _check_due(self) -> None:
+        if self.next_backup_time is None or self.is_busy():
+            return
+        if datetime.datetime.now() < self.next_backup_time:
+            return
+        cfg = self.settings()
+        self._submit(
+            BACKUP_TYPE_AUTO,
+            cfg.get("auto_backup_path") or "./auto_backups",
+            cycle=self.cycle_name,
+            keep_daily=int(cfg.get("backup_keep_daily") or 0),
+            keep_weekly=int(cfg.get("backup_keep_weekly") or 0),
+        )
+
+    # ---------- 任务 ----------
+
+    def run_manual(self, backup_path: str, operator: Optional[str] = None) -> bool:
+        """提交一次手动备份；已有任务在执行时返回 False"""
+        if self.is_busy():
+            return False
+        self._submit(BACKUP_TYPE_MANUAL, backup_path, operator=operator)
+        return True
+
+    def _submit(self, backup_type: int, backup_path: str, operator: Optional[str] = None, cycle: str = "",
+                keep_daily: int = 0, keep_weekly: int = 0) -> None:
+        worker = BackupJobWorker(backup_type, backup_path, operator or self.operator, cycle,
+                                 keep_daily, keep_weekly, parent=self)
+        worker.done.connect(lambda path, t=backup_type: self._on_job_done(t, path))
+        worker.error.connect(lambda msg, t=backup_type: self._on_job_error(t, msg))
+        worker.finished.connect(self._on_job_finished)
+        self._worker = worker
+        self.jobStarted.emit(backup_type)
+        worker.start()
+
+    def _on_job_done(self, backup_type: int, path: str) -> None:
+        logger.info(f"备份完成: {path}")
+        if backup_type == BACKUP_TYPE_AUTO:
+            self._last_auto_backup = datetime.datetime.now()
+            self.next_backup_time = self._last_auto_backup + datetime.timedelta(
+                seconds=BACKUP_CYCLES[self.cycle_name])
+            self.scheduleChanged.emit()
+        self.jobFinished.emit(backup_type, path)
+
+    def _on_job_error(self, backup_type: int, msg: str) -> None:
+        if backup_type == BACKUP_TYPE_AUTO:
+            # 失败后按重试间隔再试，而不是等待一个完整周期
+            self.next_backup_time = datetime.datetime.now() + datetime.timedelta(seconds=RETRY_INTERVAL_SEC)
+            self.scheduleChanged.emit()
+        self.jobFailed.emit(backup_type, msg)
+
+    def _on_job_finished(self) -> None:
+        if self._worker is not None:
+            self._worker.deleteLater()
+        self._worker = None
+
+
+_scheduler: Optional[BackupScheduler] = None
+
+
+def start_backup_scheduler(operator: str, parent=None) -> BackupScheduler:
+    """创建（或复用）全局调度器并启动"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = BackupScheduler(operator, parent)
+        _scheduler.start()
+    else:
+        _scheduler.operator = operator
+    return _scheduler
+
+
+def get_backup_scheduler() -> Optional[BackupScheduler]:
+    return _scheduler
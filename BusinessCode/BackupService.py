@@ -0,0 +1,309 @@
+"""
+数据备份 / 恢复（不依赖 Qt）
+
+备份文件的生成与导入（mysqldump / mysql，或内置逻辑备份 LogicalBackup）、备份记录写入与保留策略清理。
+界面（XT_DataRestore）与自动备份调度（BackupScheduler）在后台线程中调用这里的函数，命令行工具 cli.py
+直接调用。
+"""
+from __future__ import annotations
+
+import datetime
+import os
+import subprocess
+import uuid
+from typing import Dict, List, Optional, Sequence
+
+from loguru import logger
+
+from BusinessCode import LogicalBackup
+from BusinessCode.ConfigStore import load_config
+from DBCode.DBHelper import DBHelper
+
+# 需要备份和恢复的业务表
+TARGET_TABLES: List[str] = [
+    "Ammunition_Info",
+    "Runway_Info",
+    "Shelter_Info",
+    "UCC_Info",
+    "DamageScene_Info",
+    "DamageParameter_Info",
+    "Assessment_Result",
+    "Assessment_Report",
+]
+
+# 备份类型：与 DataBackup_Records.BackupType 一致
+BACKUP_TYPE_AUTO = 1
+BACKUP_TYPE_MANUAL = 2
+
+# 备份方式（Config 中的 backup_backend）-> 备份文件扩展名
+BACKUP_BACKENDS: Dict[str, str] = {
+    "mysqldump": ".sql",
+    "native": LogicalBackup.NATIVE_EXT,
+}
+
+def dump_tables(cfg: Dict[str, str], backup_path: str, backup_file: str,
+                tables: Sequence[str] = TARGET_TABLES) -> str:
+    """
+    使用 mysqldump 备份指定的若干业务表到 SQL 文件。
+    - 避免 shell 拼接；使用 args 列表更安全
+    - 通过 env 传递密码，避免明文出现在命令行
+    - 指定 utf8mb4
+    """
+    os.makedirs(backup_path, exist_ok=True)
+    full_path = os.path.join(backup_path, backup_file)
+
+    args = [
+        cfg["mysqldump_path"],
+        f"--host={cfg['DB_HOST']}",
+        f"--port={cfg.get('DB_PORT', 3306)}",
+        f"--user={cfg['DB_USER']}",
+        "--default-character-set=utf8mb4",
+        "--skip-add-drop-table",
+        cfg["DB_NAME"],
+        *tables,
+    ]
+
+    # 避免密码出现在命令行：MYSQL_PWD 仅对子进程可见
+    env = os.environ.copy()
+    if cfg.get("DB_PASS"):
+        env["MYSQL_PWD"] = cfg["DB_PASS"]
+
+    # 直接把 stdout 写到文件，避免 shell 重定向
+    with open(full_path, "wb") as out:
+        proc = subprocess.run(args, stdout=out, stderr=subprocess.PIPE, env=env, check=True)
+        if proc.stderr:
+            # mysqldump 会打印 warning 到 stderr；这里留作日志
+            logger.warning(proc.stderr.decode(errors="ignore"))
+    return full_path
+
+
+def load_sql_dump(cfg: Dict[str, str], full_path: str) -> str:
+    """
+    使用 mysql 导入 SQL 文件：
+    - 不用 shell 重定向；以 stdin 传入
+    - 自动去除 UTF-8 BOM，避免 Unknown command
+    - 通过 env 传递密码，避免明文出现在命令行
+    - 指定 utf8mb4
+    """
+    args = [
+        cfg["mysql_path"],
+        f"--host={cfg['DB_HOST']}",
+        f"--port={cfg.get('DB_PORT', 3306)}",
+        f"--user={cfg['DB_USER']}",
+        "--default-character-set=utf8mb4",
+        cfg["DB_NAME"],
+    ]
+
+    env = os.environ.copy()
+    if cfg.get("DB_PASS"):
+        env["MYSQL_PWD"] = cfg["DB_PASS"]  # 仅对子进程生效
+
+    # 读取 SQL，若有 UTF-8 BOM 则跳过
+    with open(full_path, "rb") as f:
+        data = f.read()
+    if data.startswith(b"\xEF\xBB\xBF"):  # UTF-8 BOM
+        data = data[3:]
+
+    # 把 SQL 通过 stdin 输入给 mysql
+    proc = subprocess.run(args, input=data, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env, check=True)
+    if proc.stdout:
+        logger.info(proc.stdout.decode(errors="ignore"))
+    if proc.stderr:
+        # mysql 可能会有 warning
+        logger.warning(proc.stderr.decode(errors="ignore"))
+    return full_path
+
+
+def backup_backend(cfg: Dict[str, str]) -> str:
+    from DBCode.Backend import backend as db_backend
+
+    if db_backend() == "sqlite":  # 本进程实际连接的后端
+        return "native"  # 没有 MySQL 服务，只能用内置逻辑备份
+    backend = cfg.get("backup_backend") or "mysqldump"
+    return backend if backend in BACKUP_BACKENDS else "mysqldump"
+
+
+def run_backup(cfg: Dict[str, str], backup_path: str, prefix: str, tables: Sequence[str] = TARGET_TABLES,
+               progress: LogicalBackup.ProgressFn = None) -> str:
+    """按配置的备份方式执行一次备份，返回备份文件名"""
+    backend = backup_backend(cfg)
+    backup_file = f"{prefix}_{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}{BACKUP_BACKENDS[backend]}"
+    if backend == "native":
+        LogicalBackup.backup_tables(backup_path, backup_file, tables, progress=progress)
+    else:
+        dump_tables(cfg, backup_path, backup_file, tables)
+    return backup_file
+
+
+def restore_backup(cfg: Dict[str, str], full_path: str, progress: LogicalBackup.ProgressFn = None) -> str:
+    """按备份文件扩展名选择恢复方式；.sql 文件需调用方先清理业务表"""
+    if full_path.endswith(LogicalBackup.NATIVE_EXT):
+        return LogicalBackup.restore_archive(full_path, progress=progress)
+    return load_sql_dump(cfg, full_path)
+
+
+def insert_backup_record(db: DBHelper, backup_type, cycle, path, file, version, status, operator, remark=""):
+    """插入备份记录到DataBackup_Records"""
+    sqlstr = """
+             INSERT INTO DataBackup_Records
+             (BackupType, BackupCycle, BackupPath, BackupFile, VersionNo, BackupStatus, BackupTime, Operator,
+              Remark)
+             VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+             """
+    params = (backup_type, cycle, path, file, version, status,
+              datetime.datetime.now(), operator, remark)
+    if db.execute_query(sqlstr, params) is None:
+        raise Exception("备份记录插入失败")
+
+
+def insert_restore_record(db: DBHelper, backup_id, path, file, version, status, operator, remark=""):
+    """插入恢复记录到DataRestore_Records（status：1=成功，0=失败）"""
+    sqlstr = """
+             INSERT INTO DataRestore_Records
+             (BackupID, RestorePath, RestoreFile, VersionNo, RestoreStatus, RestoreTime, Operator, Remark)
+             VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+             """
+    params = (backup_id, path, file, version, status, datetime.datetime.now(), operator, remark)
+    if db.execute_query(sqlstr, params) is None:
+        raise Exception("恢复记录插入失败")
+
+
+def list_backup_records(db: DBHelper) -> List[Dict]:
+    """全部备份记录，最新的在前"""
+    return db.fetch_all("SELECT * FROM DataBackup_Records ORDER BY BackupTime DESC") or []
+
+
+def last_auto_backup_time(db: DBHelper) -> Optional[datetime.datetime]:
+    """最近一次成功的自动备份时间（无记录返回 None）"""
+    rows = db.fetch_all(
+        "SELECT BackupTime FROM DataBackup_Records WHERE BackupType=%s AND BackupStatus=%s "
+        "ORDER BY BackupTime DESC LIMIT 1",
+        (BACKUP_TYPE_AUTO, "成功"),
+    )
+    return rows[0]["BackupTime"] if rows else None
+
+
+def select_expired(records: Sequence[Dict], keep_daily: int, keep_weekly: int) -> List[Dict]:
+    """
+    按保留策略挑出需要清理的自动备份记录。
+    - 最近 keep_daily 个自然日，每天保留最新一份
+    - 最近 keep_weekly 个 ISO 周，每周保留最新一份
+    - 最新的一份始终保留
+    records 需包含 BackupID / BackupTime。
+    """
+    ordered = sorted(records, key=lambda r: r["BackupTime"], reverse=True)
+    keep = set()
+    days, weeks = set(), set()
+    for r in ordered:
+        t: datetime.datetime = r["BackupTime"]
+        day = t.date()
+        week = tuple(t.isocalendar()[:2])
+        if day not in days and len(days) < keep_daily:
+            days.add(day)
+            keep.add(r["BackupID"])
+        if week not in weeks and len(weeks) < keep_weekly:
+            weeks.add(week)
+            keep.add(r["BackupID"])
+    if ordered:
+        keep.add(ordered[0]["BackupID"])
+    return [r for r in ordered if r["BackupID"] not in keep]
+
+
+def expire_backup_records(db: DBHelper, keep_daily: int, keep_weekly: int) -> List[str]:
+    """
+    在当前事务中删除超出保留策略的自动备份记录，返回对应的备份文件路径。
+    文件由调用方在事务提交成功后用 remove_backup_files 删除：回滚时记录与文件都还在，
+    反过来删文件失败也只会留下没有记录的文件。
+    """
+    records = db.fetch_all(
+        "SELECT BackupID, BackupPath, BackupFile, BackupTime FROM DataBackup_Records "
+        "WHERE BackupType=%s AND BackupStatus=%s",
+        (BACKUP_TYPE_AUTO, "成功"),
+    )
+    expired = select_expired(records, keep_daily, keep_weekly)
+    # 记录删除排队后合并为一次 executemany
+    for r in expired:
+        db.queue("DELETE FROM DataBackup_Records WHERE BackupID=%s", (r["BackupID"],))
+    return [os.path.join(r.get("BackupPath") or "", r.get("BackupFile") or "") for r in expired]
+
+
+def remove_backup_files(paths: Sequence[str]) -> None:
+    for full_path in paths:
+        try:
+            if os.path.isfile(full_path):
+                os.remove(full_path)
+        except OSError as e:
+            logger.warning(f"删除过期备份文件失败 {full_path}: {e}")
+    if paths:
+        logger.info(f"按保留策略清理自动备份 {len(paths)} 份")
+
+
+def apply_retention(db: DBHelper, keep_daily: int, keep_weekly: int) -> int:
+    """删除超出保留策略的自动备份记录（一次提交）及其文件（提交成功后），返回清理数量"""
+    with db.transaction():
+        paths = expire_backup_records(db, keep_daily, keep_weekly)
+    remove_backup_files(paths)
+    return len(paths)
+
+
+def backup_now(backup_type: int, backup_path: str, operator: str, cycle: str = "",
+               keep_daily: int = 0, keep_weekly: int = 0, progress: LogicalBackup.ProgressFn = None) -> str:
+    """
+    执行一次备份并写入备份记录（自动备份同时按保留策略清理），返回备份文件完整路径。失败时抛出异常。
+    """
+    prefix = "auto" if backup_type == BACKUP_TYPE_AUTO else "manual"
+    version = f"V{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+    db = DBHelper()
+    try:
+        backup_file = run_backup(load_config(), backup_path, prefix, progress=progress)
+        # 备份记录与保留策略清理同一事务提交：清理失败时不会留下半截记录
+        expired: List[str] = []
+        with db.transaction():
+            insert_backup_record(db, backup_type, cycle, backup_path, backup_file, version, "成功", operator)
+            if backup_type == BACKUP_TYPE_AUTO and (keep_daily or keep_weekly):
+                expired = expire_backup_records(db, keep_daily, keep_weekly)
+        remove_backup_files(expired)
+        return os.path.join(backup_path, backup_file)
+    finally:
+        db.close()
+
+
+def restore_now(full_path: str, tables: Sequence[str] = TARGET_TABLES,
+                progress: LogicalBackup.ProgressFn = None) -> str:
+    """
+    恢复备份文件：
+    - .sql：先删除业务表，再用 mysql 导入（见 load_sql_dump）
+    - .hsbk：内置逻辑恢复，按表重建后批量插入（见 LogicalBackup.restore_archive）
+    mysql 非零退出时抛出带输出内容的异常。
+    """
+    if not os.path.exists(full_path):
+        raise FileNotFoundError(f"备份文件不存在：{full_path}")
+    cfg = load_config()
+    try:
+        if full_path.endswith(".sql"):
+            db = DBHelper()
+            try:
+                for table in tables:
+                    if progress:
+                        progress(f"正在删除原始数据表: {table} ...")
+                    try:
+                        db.execute_query(f"DROP TABLE IF EXISTS `{table}`;")
+                    except Exception as e:
+                        logger.warning(f"删除表 {table} 失败：{e}")
+            finally:
+                db.close()
+        result = restore_backup(cfg, full_path, progress=progress)
+    except subprocess.CalledProcessError as e:
+        out = (e.stdout or b"").decode(errors="ignore")
+        err = (e.stderr or b"").decode(errors="ignore")
+        logger.error(f"mysql 导入失败，stdout:\n{out}\nstderr:\n{err}")
+        raise Exception(f"恢复失败（mysql 非零退出）: {err or out or e}")
+
+    # 数据已整体替换，本进程的取值字典与选择器索引下次使用时重新载入
+    from DBCode.LookupCache import LOOKUPS
+    from DBCode.SelectorIndex import SELECTOR_INDEX
+
+    LOOKUPS.invalidate()
+    SELECTOR_INDEX.invalidate()
+    return result
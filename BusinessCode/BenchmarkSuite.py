@@ -0,0 +1,578 @@
+"""
+性能基准套件（不依赖 Qt）
+
+按固定随机种子生成合成数据（弹药、跑道、掩蔽库、地下指挥所、毁伤场景、毁伤参数、评估结果、评估报告，
+每张表 scale 行，可选附带图片），写入测试库后对核心操作计时：按列查询、列表、组合检索（弹药、目标、报告）、
+选择框检索、语义索引构建与检索（未安装 sklearn 时跳过）、表格导出、报告 PDF / Word 渲染、逻辑备份与恢复。
+结果输出为 JSON，用于版本间的回归对比。
+
+每个规模在独立子进程中运行（各模型包在导入时按 DATABASE_URL / 配置文件建立连接）：
+- mysql：使用当前配置的数据库，运行前清空 8 张业务表，须加 --yes 确认，请指向专用的测试库；
+- sqlite：每个规模一个本地 SQLite 文件（通过 DATABASE_URL 传给子进程，模型包与 DBHelper 共用，见 DBCode.Backend）。
+
+    python -m BusinessCode.BenchmarkSuite --backend sqlite --scales 10000 100000 --out bench.json
+    python -m BusinessCode.BenchmarkSuite --backend mysql --scales 10000 --images --yes
+    python -m BusinessCode.BenchmarkSuite --smoke    # 小规模冒烟检查：临时 SQLite 库，任一计时项出错则退出码非 0
+"""
+from __future__ import annotations
+
+import datetime
+import importlib.util
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from loguru import logger
+
+SCALES = (10_000, 100_000, 1_000_000)
+BACKENDS = ("mysql", "sqlite")
+# 可选的计时项；不在 --ops 中的跳过
+OPS = ("seed", "list_columns", "list_all", "search", "search_damage", "selector", "semantic_index",
+       "export", "report_pdf", "report_docx", "backup", "restore")
+SMOKE_SCALE = 300
+SEED_BATCH = 5000
+IMAGE_POOL = 16  # 合成图片轮流使用，避免为每行生成随机字节
+
+COUNTRIES = ["美国", "俄罗斯", "英国", "法国", "德国", "以色列", "印度", "日本"]
+AM_PREFIXES = ["AGM", "GBU", "JDAM", "BLU", "KH", "风暴", "鹰击", "长剑"]
+WARHEAD_TYPES = ["侵彻战斗部", "爆破战斗部", "聚能战斗部", "破片战斗部", "子母战斗部"]
+MECHANISMS = ["钻地后延时起爆，摧毁钢筋混凝土工事", "高爆破片杀伤跑道道面", "聚能射流击穿装甲与防护门",
+              "子弹药大面积覆盖机场停机坪", "冲击波与破片联合毁伤地面目标"]
+MATERIALS = ["钢筋混凝土", "素混凝土", "花岗岩", "石灰岩", "钢板", "土壤", "碎石"]
+DEGREES = ["轻度毁伤", "中度毁伤", "重度毁伤", "完全摧毁"]
+WORDS = ["东部", "西部", "北部", "南部", "中部", "沿海", "山地", "平原", "高原", "岛屿"]
+SEMANTIC_QUERIES = ["钻地 钢筋混凝土", "跑道 破片", "GBU-31", "聚能 装甲"]
+
+
+# ---------- 合成数据 ----------
+
+class SyntheticData:
+    """
+    确定性的合成数据：每张表使用独立的 Random(f"{seed}:{表名}")，同一种子和规模生成的数据完全相同。
+    行以 ORM 属性名为键，未显式给出的列按列类型填充；外键按“空库自增主键从 1 开始”取 1..scale。
+    """
+
+    def __init__(self, scale: int, seed: int = 2025, images: bool = False, image_kb: int = 64) -> None:
+        self.scale = scale
+        self.seed = seed
+        self._images: List[bytes] = []
+        if images:
+            rng = random.Random(f"{seed}:images")
+            self._images = [rng.randbytes(image_kb * 1024) for _ in range(IMAGE_POOL)]
+
+    def _rng(self, table: str) -> random.Random:
+        return random.Random(f"{self.seed}:{table}")
+
+    def _image(self, i: int) -> Optional[bytes]:
+        return self._images[i % len(self._images)] if self._images else None
+
+    def _fill(self, orm_cls, rng: random.Random, i: int, values: Dict[str, Any]) -> Dict[str, Any]:
+        """按列类型补齐其余列（主键除外）"""
+        from sqlalchemy import inspect
+        from sqlalchemy.types import DateTime, Float, Integer, LargeBinary, Numeric, String
+
+        base_time = datetime.datetime(2025, 1, 1)
+        row: Dict[str, Any] = {}
+        for attr in inspect(orm_cls).column_attrs:
+            col = attr.columns[0]
+            if col.primary_key or attr.key in values:
+                continue
+            t = col.type
+            if isinstance(t, DateTime):
+                row[attr.key] = base_time + datetime.timedelta(seconds=i)
+            elif isinstance(t, LargeBinary):
+                row[attr.key] = self._image(i)
+            elif isinstance(t, (Float, Numeric)):
+                row[attr.key] = round(rng.uniform(0.5, 500.0), 2)
+            elif isinstance(t, Integer):
+                row[attr.key] = rng.randint(0, 1)
+            elif isinstance(t, String):
+                text = f"{rng.choice(WORDS)}{rng.choice(MATERIALS)}{rng.randint(1, 99)}"
+                row[attr.key] = text[:t.length] if t.length else text
+            else:
+                row[attr.key] = None
+        row.update(values)
+        return row
+
+    def _batches(self, orm_cls, table: str, make: Callable[[random.Random, int], Dict[str, Any]],
+                 batch_size: int = SEED_BATCH) -> Iterator[List[Dict[str, Any]]]:
+        rng = self._rng(table)
+        batch = []
+        for i in range(1, self.scale + 1):
+            batch.append(self._fill(orm_cls, rng, i, make(rng, i)))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _ref(self, rng: random.Random) -> int:
+        return rng.randint(1, self.scale)
+
+    def ammunition(self) -> Iterator[List[Dict[str, Any]]]:
+        from am_models.orm import AmmunitionORM
+
+        def make(rng, i):
+            prefix = rng.choice(AM_PREFIXES)
+            return {
+                "am_name": f"{prefix} Missile {i}", "chinese_name": f"{prefix}导弹{i}",
+                "model_name": f"{prefix}-{rng.randint(1, 999)}", "country": rng.choice(COUNTRIES),
+                "am_type": rng.choice(("钻地弹", "空地导弹", "子母弹", "巡航导弹", "布撒器", "航空炸弹")),
+                "warhead_type": rng.choice(WARHEAD_TYPES), "destroying_mechanism": rng.choice(MECHANISMS),
+                "am_image_blob": self._image(i), "length_m": round(rng.uniform(1.0, 8.0), 3),
+                "diameter_m": round(rng.uniform(0.1, 1.0), 3), "max_speed_ma": round(rng.uniform(0.5, 5.0), 3),
+            }
+        return self._batches(AmmunitionORM, "Ammunition_Info", make)
+
+    def runways(self) -> Iterator[List[Dict[str, Any]]]:
+        from target_model.orm import AirportRunwayORM
+        return self._batches(AirportRunwayORM, "Runway_Info", lambda rng, i: {
+            "runway_code": f"RW-{i:07d}", "runway_name": f"跑道{i}", "country": rng.choice(COUNTRIES),
+            "base": f"{rng.choice(WORDS)}基地", "pccsc_cement": rng.choice(MATERIALS)})
+
+    def shelters(self) -> Iterator[List[Dict[str, Any]]]:
+        from target_model.orm import AircraftShelterORM
+        return self._batches(AircraftShelterORM, "Shelter_Info", lambda rng, i: {
+            "shelter_code": f"SH-{i:07d}", "shelter_name": f"掩蔽库{i}", "country": rng.choice(COUNTRIES),
+            "base": f"{rng.choice(WORDS)}基地", "structure_layer_material": "钢筋混凝土"})
+
+    def uccs(self) -> Iterator[List[Dict[str, Any]]]:
+        from target_model.orm import UndergroundCommandPostORM
+        return self._batches(UndergroundCommandPostORM, "UCC_Info", lambda rng, i: {
+            "ucc_code": f"UCC-{i:07d}", "ucc_name": f"指挥所{i}", "country": rng.choice(COUNTRIES),
+            "base": f"{rng.choice(WORDS)}基地", "rock_layer_materials": rng.choice(MATERIALS)})
+
+    def scenes(self) -> Iterator[List[Dict[str, Any]]]:
+        from damage_models.orm import DamageSceneORM
+
+        def make(rng, i):
+            target_type = rng.randint(1, 3)
+            return {
+                "DSCode": f"DS-{i:07d}", "DSName": f"场景{i}", "DSOffensive": "红方", "DSDefensive": "蓝方",
+                "DSBattle": f"{rng.choice(WORDS)}战场", "AMID": self._ref(rng), "AMCode": f"AM-{i}",
+                "TargetType": target_type, "TargetID": self._ref(rng), "TargetCode": f"T{target_type}-{i}",
+            }
+        return self._batches(DamageSceneORM, "DamageScene_Info", make)
+
+    def parameters(self) -> Iterator[List[Dict[str, Any]]]:
+        from damage_models.orm import DamageParameterORM
+        return self._batches(DamageParameterORM, "DamageParameter_Info", lambda rng, i: {
+            "DSID": i, "DSCode": f"DS-{i:07d}", "WarheadType": rng.choice(WARHEAD_TYPES)})
+
+    def results(self) -> Iterator[List[Dict[str, Any]]]:
+        from damage_models.orm import AssessmentResultORM
+        return self._batches(AssessmentResultORM, "Assessment_Result", lambda rng, i: {
+            "DSID": i, "DPID": i, "AMID": self._ref(rng), "TargetType": rng.randint(1, 3),
+            "TargetID": self._ref(rng), "DamageDegree": rng.choice(DEGREES)})
+
+    def reports(self) -> Iterator[List[Dict[str, Any]]]:
+        from damage_models.orm import AssessmentReportORM
+        return self._batches(AssessmentReportORM, "Assessment_Report", lambda rng, i: {
+            "ReportCode": f"RPT-{i:07d}", "ReportName": f"毁伤评估报告{i}", "DAID": i, "DSID": i, "DPID": i,
+            "AMID": self._ref(rng), "TargetType": rng.randint(1, 3), "TargetID": self._ref(rng),
+            "DamageDegree": rng.choice(DEGREES), "Comment": rng.choice(MECHANISMS), "Creator": 1,
+            "Reviewer": "审核员"})
+
+
+def _tables():
+    """(表名, 会话工厂, ORM 类, SyntheticData 方法名)，顺序即写入顺序"""
+    from am_models.db import session_scope as am_scope
+    from am_models.orm import AmmunitionORM
+    from damage_models.db import get_session
+    from damage_models.orm import AssessmentReportORM, AssessmentResultORM, DamageParameterORM, DamageSceneORM
+    from target_model.db import session_scope as target_scope
+    from target_model.orm import AircraftShelterORM, AirportRunwayORM, UndergroundCommandPostORM
+
+    return (
+        ("Ammunition_Info", am_scope, AmmunitionORM, "ammunition"),
+        ("Runway_Info", target_scope, AirportRunwayORM, "runways"),
+        ("Shelter_Info", target_scope, AircraftShelterORM, "shelters"),
+        ("UCC_Info", target_scope, UndergroundCommandPostORM, "uccs"),
+        ("DamageScene_Info", get_session, DamageSceneORM, "scenes"),
+        ("DamageParameter_Info", get_session, DamageParameterORM, "parameters"),
+        ("Assessment_Result", get_session, AssessmentResultORM, "results"),
+        ("Assessment_Report", get_session, AssessmentReportORM, "reports"),
+    )
+
+
+def reset_tables(backend: str) -> None:
+    """建表（已存在则跳过）并清空 8 张业务表，使自增主键从 1 开始"""
+    import am_models.orm  # noqa: F401 - 注册各包的 ORM 模型，create_all 才会建表
+    import damage_models.orm  # noqa: F401
+    import target_model.orm  # noqa: F401
+    from am_models.db import Base as AmBase, engine
+    from damage_models.db import Base as DamageBase, engine as damage_engine
+    from target_model.db import Base as TargetBase, engine as target_engine
+
+    AmBase.metadata.create_all(bind=engine)
+    TargetBase.metadata.create_all(bind=target_engine)
+    DamageBase.metadata.create_all(bind=damage_engine)
+    with engine.begin() as conn:
+        for table, *_ in _tables():
+            if backend == "mysql":
+                conn.exec_driver_sql(f"TRUNCATE TABLE `{table}`")
+            else:
+                conn.exec_driver_sql(f'DELETE FROM "{table}"')
+
+
+def seed(data: SyntheticData) -> Dict[str, Dict[str, Any]]:
+    """逐表分批写入合成数据，返回每张表的行数与耗时"""
+    from sqlalchemy import insert
+
+    out = {}
+    for table, scope, orm_cls, method in _tables():
+        t0 = time.perf_counter()
+        nrows = 0
+        for batch in getattr(data, method)():
+            with scope() as s:
+                s.execute(insert(orm_cls), batch)
+            nrows += len(batch)
+        out[table] = {"ms": (time.perf_counter() - t0) * 1000, "rows": nrows}
+        logger.info(f"合成数据 {table}: {nrows} 行")
+    return out
+
+
+# ---------- 计时项 ----------
+
+def _timed(fn: Callable[[], Any]) -> Dict[str, Any]:
+    """执行 fn 并计时；fn 返回行数（int）或附加信息（dict）"""
+    t0 = time.perf_counter()
+    value = fn()
+    entry: Dict[str, Any] = {"ms": (time.perf_counter() - t0) * 1000}
+    if isinstance(value, dict):
+        entry.update(value)
+    elif value is not None:
+        entry["rows"] = value
+    return entry
+
+
+def _op_list_columns() -> Dict[str, Any]:
+    from am_models.db import session_scope
+    from am_models.sql_repository import SQLRepository
+
+    cols = ["am_id", "am_name", "chinese_name", "country", "model_name"]
+    with session_scope() as s:
+        repo = SQLRepository(s)
+        return {
+            "page": _timed(lambda: len(repo.list_columns(cols, order_by=["-am_id"], limit=100))),
+            "filtered": _timed(lambda: len(repo.list_columns(cols, where=lambda T: T.country == COUNTRIES[0]))),
+            "full": _timed(lambda: len(repo.list_columns(cols))),
+        }
+
+
+def _op_list_all() -> Dict[str, Any]:
+    from BusinessCode.AmmunitionService import list_ammunition
+    from BusinessCode.TargetService import TARGET_KINDS, list_targets
+
+    out = {"ammunition": _timed(lambda: len(list_ammunition()))}
+    for kind in TARGET_KINDS:
+        out[kind] = _timed(lambda: len(list_targets(kind)))
+    return out
+
+
+def _op_search() -> Dict[str, Any]:
+    """组合检索（弹药、三种目标、评估报告各检索窗口所用的查询）"""
+    from BusinessCode.AmmunitionService import query_ammunition_by_conditions
+    from BusinessCode.AssessmentService import query_reports
+    from BusinessCode.TargetService import query_targets
+
+    country = {"country": COUNTRIES[0], "country_enabled": True}
+    ammunition = {
+        "country": country,
+        "type_other": {"am_type": "其他", "am_type_enabled": True},
+        "length_range": {"am_length_a": 3, "am_length_b": 5, "am_length_enabled": True},
+        "combined": {"country": COUNTRIES[1], "country_enabled": True, "am_model": "GBU",
+                     "am_model_enabled": True, "max_speed_a": 1, "max_speed_enabled": True},
+    }
+    targets = {
+        "runway": {
+            "country": country,
+            "length_range": {"length_min": 1000, "length_max": 3000, "length_enabled": True},
+            "keyword": {"pccsc_keyword": MATERIALS[0], "pccsc_enabled": True},
+            "combined": {**country, "base": WORDS[0], "base_enabled": True, "thickness_min": 10,
+                         "thickness_enabled": True},
+        },
+        "shelter": {
+            "country": country,
+            "combined": {**country, "height_min": 5, "height_enabled": True},
+        },
+        "ucc": {
+            "country": country,
+            "keyword": {"rock_keyword": MATERIALS[2], "rock_enabled": True},
+        },
+    }
+    reports = {
+        "degree": {"damage_degree": DEGREES[2]},
+        "combined": {"target_type": 1, "damage_degree": DEGREES[1], "comment": "跑道"},
+    }
+
+    out = {"ammunition": {name: _timed(lambda c=cond: len(query_ammunition_by_conditions(c)))
+                          for name, cond in ammunition.items()}}
+    for kind, conditions in targets.items():
+        out[kind] = {name: _timed(lambda k=kind, c=cond: len(query_targets(k, c)))
+                     for name, cond in conditions.items()}
+    out["report"] = {name: _timed(lambda c=cond: len(query_reports(c))) for name, cond in reports.items()}
+    return out
+
+
+def _op_search_damage() -> Dict[str, Any]:
+    from damage_models import AssessmentReportRepository, AssessmentResultRepository, DamageSceneRepository
+    from DBCode.DBHelper import DBHelper
+
+    db = DBHelper()
+    try:
+        return {
+            "scene": _timed(lambda: len(DamageSceneRepository(db).search("东部"))),
+            "result": _timed(lambda: len(AssessmentResultRepository(db).search(DEGREES[2]))),
+            "report": _timed(lambda: len(AssessmentReportRepository(db).search("钻地"))),
+        }
+    finally:
+        db.close()
+
+
+def _op_selector() -> Dict[str, Any]:
+    from DBCode.SelectorIndex import INDEX_SPECS, SELECTOR_INDEX
+
+    out = {}
+    for spec in INDEX_SPECS:
+        entry = _timed(lambda: SELECTOR_INDEX.preload(spec.table))
+        keystrokes = [_timed(lambda kw=kw: len(SELECTOR_INDEX.search(spec.table, kw) or []))
+                      for kw in ("1", "12", "123", "美", "美国")]
+        entry["max_keystroke_ms"] = max(k["ms"] for k in keystrokes)
+        out[spec.table] = entry
+    return out
+
+
+def _op_semantic_index(workdir: str) -> Dict[str, Any]:
+    # sklearn 为可选依赖（语义检索功能整体不可用），缺失时跳过而不计为出错
+    if importlib.util.find_spec("sklearn") is None:
+        return {"skipped": "sklearn not installed"}
+    from BusinessCode import AmmunitionService
+
+    holder = {}
+
+    def build():
+        holder["idx"] = AmmunitionService.rebuild_semantic_index(os.path.join(workdir, "ammo_index"))
+        return {"rows": len(holder["idx"].ids) if holder["idx"] else 0,
+                "vector_backend": holder["idx"].backend if holder["idx"] else None}
+
+    out = {"build": _timed(build)}
+    if holder["idx"] is not None:
+        out["search"] = {q: _timed(lambda q=q: len(holder["idx"].search(q))) for q in SEMANTIC_QUERIES}
+    return out
+
+
+def _op_export(workdir: str, formats: Sequence[str]) -> Dict[str, Any]:
+    from BusinessCode.AmmunitionService import export_ammunition, list_ammunition
+
+    items = list_ammunition()
+    out = {}
+    for fmt in formats:
+        path = os.path.join(workdir, f"ammunition.{fmt}")
+        out[fmt] = _timed(lambda f=fmt, p=path: export_ammunition(items, p, f))
+        out[fmt]["size_bytes"] = os.path.getsize(path)
+    return out
+
+
+def _op_report(fmt: str, workdir: str, count: int) -> Dict[str, Any]:
+    """渲染 count 份报告（不经报告文件缓存）；资源预加载不计入"""
+    from BusinessCode.ReportExporter import (
+        get_report_full_data, preload_report_resources, render_report_pdf, render_report_word,
+    )
+
+    render = render_report_pdf if fmt == "pdf" else render_report_word
+    preload_report_resources()
+    holder = {}
+    out = {"fetch": _timed(lambda: len(holder.setdefault(
+        "data", [d for d in (get_report_full_data(i) for i in range(1, count + 1)) if d])))}
+    path = os.path.join(workdir, f"report.{'pdf' if fmt == 'pdf' else 'docx'}")
+    times = []
+    for d in holder["data"]:
+        times.append(_timed(lambda d=d: render(d, path))["ms"])
+    if times:
+        out["render"] = {"count": len(times), "first_ms": times[0], "mean_ms": sum(times) / len(times),
+                         "max_ms": max(times)}
+    return out
+
+
+def _op_backup(workdir: str, holder: Dict[str, str]) -> Dict[str, Any]:
+    from BusinessCode.BackupService import TARGET_TABLES
+    from BusinessCode.LogicalBackup import NATIVE_EXT, backup_tables
+
+    def run():
+        holder["path"] = backup_tables(workdir, f"bench{NATIVE_EXT}", TARGET_TABLES)
+        return {"size_bytes": os.path.getsize(holder["path"])}
+    return _timed(run)
+
+
+def _op_restore(holder: Dict[str, str]) -> Dict[str, Any]:
+    from BusinessCode.LogicalBackup import restore_archive
+
+    if "path" not in holder:
+        return {"skipped": "需要先执行 backup"}
+
+    def run():
+        restore_archive(holder["path"])
+    return _timed(run)
+
+
+def run_scale(scale: int, backend: str, workdir: str, seed_value: int = 2025, images: bool = False,
+              ops: Sequence[str] = OPS, export_formats: Sequence[str] = ("csv", "xlsx"),
+              reports: int = 50) -> Dict[str, Any]:
+    """在当前进程的数据库连接上完成一个规模：重置、写入合成数据、依次执行各计时项"""
+    os.makedirs(workdir, exist_ok=True)
+    result: Dict[str, Any] = {"scale": scale, "backend": backend, "ops": {}}
+    backup_holder: Dict[str, str] = {}
+    runners: Dict[str, Callable[[], Any]] = {
+        "list_columns": _op_list_columns,
+        "list_all": _op_list_all,
+        "search": _op_search,
+        "search_damage": _op_search_damage,
+        "selector": _op_selector,
+        "semantic_index": lambda: _op_semantic_index(workdir),
+        "export": lambda: _op_export(workdir, export_formats),
+        "report_pdf": lambda: _op_report("pdf", workdir, min(reports, scale)),
+        "report_docx": lambda: _op_report("docx", workdir, min(reports, scale)),
+        "backup": lambda: _op_backup(workdir, backup_holder),
+        "restore": lambda: _op_restore(backup_holder),
+    }
+
+    reset_tables(backend)
+    data = SyntheticData(scale, seed_value, images)
+    result["ops"]["seed"] = seed(data)
+
+    for name in OPS:
+        if name == "seed" or name not in ops:
+            continue
+        logger.info(f"[bench {scale}] {name}")
+        try:
+            result["ops"][name] = runners[name]()
+        except Exception as e:
+            logger.exception(f"[bench {scale}] {name} 失败")
+            result["ops"][name] = {"error": f"{type(e).__name__}: {e}"}
+    return result
+
+
+# ---------- 多规模运行 ----------
+
+def _git_rev(root: str) -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def benchmark(scales: Sequence[int] = SCALES, backend: str = "sqlite", workdir: Optional[str] = None,
+              seed_value: int = 2025, images: bool = False, ops: Sequence[str] = OPS,
+              export_formats: Sequence[str] = ("csv", "xlsx"), reports: int = 50) -> Dict[str, Any]:
+    """
+    依次在子进程中运行各规模，汇总为 {"meta": ..., "results": [...]}。
+    sqlite 时每个规模使用 workdir 下单独的数据库文件。
+    """
+    import platform
+    import tempfile
+
+    if backend not in BACKENDS:
+        raise ValueError(f"未知的数据库类型: {backend}")
+    workdir = os.path.abspath(workdir or tempfile.mkdtemp(prefix="hsbench_"))
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    report: Dict[str, Any] = {
+        "meta": {
+            "started": datetime.datetime.now().isoformat(timespec="seconds"),
+            "git_rev": _git_rev(root), "python": platform.python_version(), "platform": platform.platform(),
+            "backend": backend, "seed": seed_value, "images": images, "scales": list(scales),
+            "ops": list(ops), "export_formats": list(export_formats), "reports": reports, "workdir": workdir,
+        },
+        "results": [],
+    }
+    for n in scales:
+        scale_dir = os.path.join(workdir, str(n))
+        os.makedirs(scale_dir, exist_ok=True)
+        env = dict(os.environ)
+        if backend == "sqlite":
+            db_path = os.path.join(scale_dir, "bench.sqlite")
+            if os.path.exists(db_path):
+                os.remove(db_path)
+            env["DATABASE_URL"] = "sqlite:///" + db_path.replace(os.sep, "/")
+        cmd = [sys.executable, "-m", "BusinessCode.BenchmarkSuite", "--child", str(n), "--backend", backend,
+               "--workdir", scale_dir, "--seed", str(seed_value), "--ops", *ops,
+               "--formats", *export_formats, "--reports", str(reports)]
+        if images:
+            cmd.append("--images")
+        logger.info(f"基准规模 {n}（{backend}）")
+        proc = subprocess.run(cmd, cwd=root, env=env, capture_output=True, text=True)
+        if proc.returncode != 0:
+            report["results"].append({"scale": n, "backend": backend,
+                                      "error": (proc.stderr or "").strip().splitlines()[-20:]})
+            continue
+        report["results"].append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    return report
+
+
+def smoke(workdir: Optional[str] = None) -> List[str]:
+    """在全新的临时 SQLite 库上跑一个小规模的全部计时项，返回出错项（空列表表示通过）"""
+    report = benchmark([SMOKE_SCALE], "sqlite", workdir, reports=2)
+    errors = []
+    for res in report["results"]:
+        if "error" in res:
+            errors.append(f"{res['scale']}: " + "\n".join(res["error"]))
+            continue
+        for name, entry in res["ops"].items():
+            if isinstance(entry, dict) and "error" in entry:
+                errors.append(f"{res['scale']} {name}: {entry['error']}")
+    return errors
+
+
+if __name__ == "__main__":
+    import argparse
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser = argparse.ArgumentParser(description="合成数据性能基准（结果输出为 JSON）")
+    parser.add_argument("--backend", choices=BACKENDS, default="sqlite",
+                        help="mysql：当前配置的数据库（会清空业务表）；sqlite：本地临时库")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(SCALES), help="每张表的行数")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--images", action="store_true", help="弹药与目标附带合成图片")
+    parser.add_argument("--ops", nargs="+", default=list(OPS), help=f"计时项，可选：{' '.join(OPS)}")
+    parser.add_argument("--formats", nargs="+", default=["csv", "xlsx"], help="导出格式")
+    parser.add_argument("--reports", type=int, default=50, help="每个规模渲染的报告份数")
+    parser.add_argument("--workdir", default=None, help="数据库文件、导出与备份文件目录（默认临时目录）")
+    parser.add_argument("--out", default=None, help="结果 JSON 文件（默认输出到标准输出）")
+    parser.add_argument("--yes", action="store_true", help="确认清空 MySQL 中的业务表")
+    parser.add_argument("--smoke", action="store_true", help=f"冒烟检查：临时 SQLite 库、{SMOKE_SCALE} 行、全部计时项")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    unknown = [op for op in args.ops if op not in OPS]
+    if unknown:
+        parser.error(f"未知的计时项: {' '.join(unknown)}")
+
+    if args.child:
+        logger.remove()
+        logger.add(sys.stderr, level="WARNING")
+        print(json.dumps(run_scale(args.child, args.backend, args.workdir, args.seed, args.images,
+                                   args.ops, args.formats, args.reports), ensure_ascii=False, default=str))
+        sys.exit(0)
+
+    if args.smoke:
+        failures = smoke(args.workdir)
+        for line in failures:
+            logger.error(line)
+        print("smoke: " + ("FAILED" if failures else "OK"))
+        sys.exit(1 if failures else 0)
+
+    if args.backend == "mysql" and not args.yes:
+        parser.error("mysql 基准会清空当前配置数据库中的 8 张业务表，请指向测试库并加 --yes 确认")
+    result = benchmark(args.scales, args.backend, args.workdir, args.seed, args.images, args.ops,
+                       args.formats, args.reports)
+    text = json.dumps(result, ensure_ascii=False, indent=2, default=str)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
@@ -0,0 +1,155 @@
+# bulk_import.py
+"""
+弹药 / 目标数据批量导入窗口
+
+选择文件后在后台线程中读取、校验并分批写入（逻辑见 BulkImportService），完成后列出校验未通过的行。
+"""
+from __future__ import annotations
+
+import os
+from typing import Callable, Optional
+
+from loguru import logger
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
+    QProgressBar, QMessageBox, QFileDialog, QPlainTextEdit
+)
+
+from BusinessCode.BulkImportService import (  # noqa: F401  ImportKind 供各管理窗口从此处导入
+    KIND_TITLES, MAX_REPORTED_ERRORS, ImportKind, map_records, read_records, write_batches,
+)
+
+
+# ---------------------- 后台线程：执行导入 ----------------------
+class ImportWorker(QThread):
+    progress = pyqtSignal(int)  # 0..100
+    message = pyqtSignal(str)  # 状态文本
+    error = pyqtSignal(str)  # 错误
+    done = pyqtSignal(object)  # 完成，携带汇总 dict
+
+    def __init__(self, kind: str, path: str, parent=None):
+        super().__init__(parent)
+        self.kind = kind
+        self.path = path
+
+    def run(self):
+        try:
+            self.message.emit("正在读取文件 ...")
+            records = read_records(self.path)
+            self.progress.emit(10)
+
+            self.message.emit(f"正在校验 {len(records)} 条记录 ...")
+            items, rows, errors = map_records(self.kind, records)
+            self.progress.emit(30)
+
+            total = max(len(items), 1)
+
+            def _on_batch(n: int):
+                self.message.emit(f"正在写入数据库 {n}/{len(items)} ...")
+                self.progress.emit(30 + int(70 * n / total))
+
+            inserted, updated, conflicts = write_batches(self.kind, items, rows, _on_batch)
+            errors = sorted(errors + conflicts)
+        except Exception as e:
+            logger.exception(e)
+            self.error.emit(f"导入失败：{e}")
+            return
+
+        self.progress.emit(100)
+        self.message.emit("导入完成")
+        self.done.emit({
+            "total": len(records),
+            "inserted": inserted,
+            "updated": updated,
+            "invalid": len(errors),
+            "errors": errors[:MAX_REPORTED_ERRORS],
+        })
+
+
+# ---------------------- 导入对话框 ----------------------
+class ImportDialog(QDialog):
+    imported = pyqtSignal()  # 有记录写入后通知父窗口刷新
+
+    def __init__(self, parent, kind: str):
+        super().__init__(parent)
+        self.kind = kind
+        self.setWindowTitle(f"批量导入{KIND_TITLES[kind]}")
+        self.setModal(True)
+        self.resize(560, 320)
+        self.worker: Optional[ImportWorker] = None
+
+        vbox = QVBoxLayout(self)
+
+        row1 = QHBoxLayout()
+        row1.addWidget(QLabel("导入文件："))
+        self.ed_file = QLineEdit()
+        self.btn_browse = QPushButton("浏览...")
+        self.btn_browse.clicked.connect(self._on_browse)
+        row1.addWidget(self.ed_file, 1)
+        row1.addWidget(self.btn_browse)
+        vbox.addLayout(row1)
+
+        row2 = QHBoxLayout()
+        self.btn_import = QPushButton("开始导入")
+        self.btn_import.clicked.connect(self._on_import)
+        row2.addStretch(1)
+        row2.addWidget(self.btn_import)
+        vbox.addLayout(row2)
+
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 100)
+        self.progress.setValue(0)
+        vbox.addWidget(self.progress)
+
+        self.lbl_status = QLabel("")
+        self.lbl_status.setStyleSheet("color: gray;")
+        vbox.addWidget(self.lbl_status)
+
+        # 校验未通过的行
+        self.txt_errors = QPlainTextEdit()
+        self.txt_errors.setReadOnly(True)
+        vbox.addWidget(self.txt_errors, 1)
+
+    def _on_browse(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "选择导入文件", os.path.expanduser("~"), "数据文件 (*.csv *.xlsx *.json)")
+        if path:
+            self.ed_file.setText(path)
+
+    def _on_import(self):
+        path = self.ed_file.text().strip()
+        if not path or not os.path.isfile(path):
+            QMessageBox.warning(self, "提示", "请先选择导入文件")
+            return
+        self.progress.setValue(0)
+        self.txt_errors.clear()
+        self.btn_import.setEnabled(False)
+
+        self.worker = ImportWorker(self.kind, path, parent=self)
+        self.worker.progress.connect(self.progress.setValue)
+        self.worker.message.connect(self.lbl_status.setText)
+        self.worker.error.connect(self._on_error)
+        self.worker.done.connect(self._on_done)
+        self.worker.finished.connect(lambda: self.btn_import.setEnabled(True))
+        self.worker.start()
+
+    def _on_error(self, msg: str):
+        self.lbl_status.setText(msg)
+        QMessageBox.critical(self, "导入失败", msg)
+
+    def _on_done(self, summary: dict):
+        self.lbl_status.setText(
+            f"共 {summary['total']} 条：新增 {summary['inserted']}，更新 {summary['updated']}，"
+            f"校验未通过 {summary['invalid']}")
+        if summary["errors"]:
+            self.txt_errors.setPlainText("\n".join(f"第 {i} 行：{msg}" for i, msg in summary["errors"]))
+        if summary["inserted"] or summary["updated"]:
+            self.imported.emit()
+
+
+def show_import_dialog(parent, kind: str, on_imported: Optional[Callable[[], None]] = None):
+    dlg = ImportDialog(parent, kind)
+    if on_imported is not None:
+        dlg.imported.connect(on_imported)
+    dlg.exec()
@@ -0,0 +1,384 @@
+"""
+弹药 / 目标数据批量导入（CSV / XLSX / JSON，不依赖 Qt）
+
+- 读取：CSV（utf-8，可带 BOM）、XLSX（首行表头）、JSON（对象数组）；每条记录带上用户在文件中看到的行号
+- 校验：与编辑窗口一致的必填项 / 数字项规则；目标另按 ORM 的 NOT NULL / 唯一列检查，文件内编码、名称重复的行只保留第一行
+- 映射：弹药走 am_models.gui_adapter.ui_json_to_ammunition；目标按实体字段转换
+- 入库：按批调用仓储的 upsert_many（弹药按 型号+官方名称，目标按编码），每批提交一次；
+  目标的名称已被库中另一编码占用的行不写入，与校验错误一起列出
+
+导入窗口与后台线程见 BulkImport。
+"""
+from __future__ import annotations
+
+import csv
+import functools
+import json
+import os
+import re
+from dataclasses import fields
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, get_type_hints
+
+from am_models import Ammunition
+from am_models.gui_adapter import ui_json_to_ammunition, ammunition_to_ui_json, to_decimal_or_none
+from target_model import AirportRunway, AircraftShelter, UndergroundCommandPost
+from target_model.orm import AirportRunwayORM, AircraftShelterORM, UndergroundCommandPostORM
+
+# 每批写入的记录数
+BATCH_SIZE = 1000
+# 汇总里最多列出的错误行数
+MAX_REPORTED_ERRORS = 200
+
+SUPPORTED_EXTS = (".csv", ".xlsx", ".json")
+
+
+# ---------------------- 读取 ----------------------
+# 一条导入记录：(行号, 字段字典)
+Record = Tuple[int, Dict[str, Any]]
+
+
+def read_records(path: str) -> List[Record]:
+    """
+    读取导入文件为 (行号, 字典) 列表；JSON 中的嵌套对象原样保留。
+    行号与用户打开文件时看到的一致：CSV / XLSX 为表格行号（表头为第 1 行，跳过的空行也计数），JSON 为数组中的第几个对象。
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.DictReader(f)
+            return [(reader.line_num, dict(r)) for r in reader]
+    if ext == ".xlsx":
+        from openpyxl import load_workbook  # type: ignore
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            header = next(rows, None)
+            if not header:
+                return []
+            keys = [str(h).strip() if h is not None else "" for h in header]
+            return [(i, dict(zip(keys, r))) for i, r in enumerate(rows, start=2)
+                    if any(v not in (None, "") for v in r)]
+        finally:
+            wb.close()
+    if ext == ".json":
+        with open(path, "r", encoding="utf-8-sig") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = [data]
+        return list(enumerate(data, start=1))
+    raise ValueError(f"不支持的文件类型：{ext}（支持 {' / '.join(SUPPORTED_EXTS)}）")
+
+
+def _blank(v: Any) -> bool:
+    return v is None or str(v).strip() == ""
+
+
+# ---------------------- 弹药 ----------------------
+def _leaf_paths(d: Dict[str, Any], prefix: Tuple[str, ...] = ()) -> Dict[Any, Tuple[str, ...]]:
+    out: Dict[Any, Tuple[str, ...]] = {}
+    for k, v in d.items():
+        if isinstance(v, dict):
+            out.update(_leaf_paths(v, prefix + (k,)))
+        else:
+            out[v] = prefix + (k,)
+    return out
+
+
+# 实体字段 -> UI JSON 路径：用字段名作为值跑一遍 ammunition_to_ui_json 反推，避免再维护一份对照表
+_AM_FIELD_PATHS: Dict[str, Tuple[str, ...]] = {
+    k: p for k, p in _leaf_paths(ammunition_to_ui_json(
+        Ammunition(**{f.name: f.name for f in fields(Ammunition)}))).items()
+    if isinstance(k, str) and k
+}
+
+# 与 DM_Ammunition_Add.validate_must_filled 一致
+AM_REQUIRED: List[Tuple[Tuple[str, ...], str]] = [
+    (("basic", "chinese_name"), "中文名称"),
+    (("basic", "official_name"), "官方名称"),
+    (("basic", "ammunition_type"), "弹药类型"),
+    (("basic", "model_name"), "弹药型号"),
+    (("warhead_fcs", "warhead_name"), "战斗部名称"),
+    (("struct", "weight_kg"), "弹药全重"),
+    (("struct", "launch_mass_kg"), "发射质量"),
+]
+
+# 与 DM_Ammunition_Add.validate_decimal 一致（非空时必须为数字）
+AM_DECIMAL: List[Tuple[Tuple[str, ...], str]] = [
+    (("warhead_fcs", "explosion_equivalent_TNT_T"), "爆炸当量"),
+    (("warhead_fcs", "precision_m"), "精度"),
+    (("warhead_fcs", "explosive_payload_kg"), "装药量"),
+    (("warhead_fcs", "range_km"), "射程"),
+    (("warhead_fcs", "drop_speed_kmh"), "投弹速度"),
+    (("struct", "weight_kg"), "弹药全重"),
+    (("struct", "length_m"), "弹体长度"),
+    (("struct", "diameter_m"), "弹体直径"),
+    (("struct", "wingspan_close_mm"), "翼展(闭合)"),
+    (("struct", "wingspan_open_mm"), "翼展(张开)"),
+    (("struct", "max_speed_ma"), "最大时速"),
+    (("struct", "launch_mass_kg"), "发射质量"),
+    (("warhead_params", "blast_warhead", "explosive_thermal_explosion"), "爆破-热爆"),
+    (("warhead_params", "blast_warhead", "actual_charge_mass"), "爆破-装药质量"),
+    (("warhead_params", "shaped_charge_warhead", "explosive_density"), "聚能-炸药密度"),
+    (("warhead_params", "shaped_charge_warhead", "charge_detonation_velocity"), "聚能-爆速"),
+    (("warhead_params", "shaped_charge_warhead", "detonation_pressure"), "聚能-爆轰压"),
+    (("warhead_params", "shaped_charge_warhead", "liner_cone_angle"), "聚能-锥角"),
+    (("warhead_params", "fragmentation_warhead", "explosive_thermal_explosion"), "破片-热爆"),
+    (("warhead_params", "fragmentation_warhead", "fragment_surface_area"), "破片-表面积"),
+    (("warhead_params", "fragmentation_warhead", "fragment_mass"), "破片-质量"),
+    (("warhead_params", "fragmentation_warhead", "charge_diameter"), "破片-装药直径"),
+    (("warhead_params", "fragmentation_warhead", "charge_length"), "破片-装药长度"),
+    (("warhead_params", "armor_piercing_warhead", "projectile_mass"), "穿甲-弹丸质量"),
+    (("warhead_params", "armor_piercing_warhead", "projectile_diameter"), "穿甲-弹丸直径"),
+    (("warhead_params", "armor_piercing_warhead", "projectile_nose_length"), "穿甲-头部长度"),
+    (("warhead_params", "cluster_warhead", "warhead_mass"), "子母-母弹质量"),
+    (("warhead_params", "cluster_warhead", "warhead_ref_area"), "子母-母弹横截面"),
+    (("warhead_params", "cluster_warhead", "submunition_count"), "子母-子弹数量"),
+    (("warhead_params", "cluster_warhead", "submunition_mass"), "子母-子弹质量"),
+]
+
+
+def _am_header_map() -> Dict[str, Tuple[str, ...]]:
+    """表头 -> UI JSON 路径：支持实体字段名、导出的中文表头"""
+    from BusinessCode.TableExport import AMMUNITION_FIELD_ORDER, AMMUNITION_HEADERS
+    out = dict(_AM_FIELD_PATHS)
+    for field_name, zh in zip(AMMUNITION_FIELD_ORDER, AMMUNITION_HEADERS):
+        if field_name in _AM_FIELD_PATHS:
+            out[zh] = _AM_FIELD_PATHS[field_name]
+    return out
+
+
+def _get_path(d: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+    for k in path:
+        if not isinstance(d, dict):
+            return None
+        d = d.get(k)
+    return d
+
+
+def flat_to_ui_json(record: Dict[str, Any], header_map: Dict[str, Tuple[str, ...]]) -> Dict[str, Any]:
+    """
+    扁平记录 -> UI 嵌套 JSON。
+    表头可以是实体字段名、导出的中文表头，或 "basic.official_name" 形式的路径。
+    """
+    if isinstance(record.get("basic"), dict):
+        return record  # 已是 UI JSON
+    data: Dict[str, Any] = {}
+    for key, value in record.items():
+        key = str(key).strip()
+        path = header_map.get(key) or (tuple(key.split(".")) if "." in key else None)
+        if not path:
+            continue
+        node = data
+        for k in path[:-1]:
+            node = node.setdefault(k, {})
+        node[path[-1]] = "" if value is None else str(value).strip()
+    return data
+
+
+def validate_ammunition(data: Dict[str, Any]) -> List[str]:
+    """返回错误描述列表；空列表表示通过"""
+    errors: List[str] = []
+    missing = [label for path, label in AM_REQUIRED if _blank(_get_path(data, path))]
+    if missing:
+        errors.append(f"必须填写：{'，'.join(missing)}")
+    need_decimal = [label for path, label in AM_DECIMAL
+                    if not _blank(v := _get_path(data, path)) and to_decimal_or_none(v) is None]
+    if need_decimal:
+        errors.append(f"以下项必须为数字：{'，'.join(need_decimal)}")
+    return errors
+
+
+def map_ammunition(records: Iterable[Record]
+                   ) -> Tuple[List[Ammunition], List[int], List[Tuple[int, str]]]:
+    """返回 (弹药列表, 各条对应的行号, [(行号, 错误)])"""
+    header_map = _am_header_map()
+    items: List[Ammunition] = []
+    rows: List[int] = []
+    errors: List[Tuple[int, str]] = []
+    for i, rec in records:
+        data = flat_to_ui_json(rec, header_map)
+        errs = validate_ammunition(data)
+        if errs:
+            errors.append((i, "；".join(errs)))
+            continue
+        items.append(ui_json_to_ammunition(data))
+        rows.append(i)
+    return items, rows, errors
+
+
+# ---------------------- 目标 ----------------------
+# 必填的实体字段 —— 与各 Target_*_Add._required_field_specs 一致
+_TARGET_REQUIRED_TEXT: Dict[type, List[str]] = {
+    AirportRunway: ["runway_name", "country"],
+    AircraftShelter: ["shelter_name", "shelter_code", "mask_layer_material", "soil_layer_material",
+                      "disper_layer_material", "structure_layer_material"],
+    UndergroundCommandPost: ["ucc_code", "ucc_name", "rock_layer_materials", "protective_layer_material",
+                             "lining_layer_material", "ucc_wall_materials"],
+}
+_TARGET_REQUIRED_POSITIVE: Dict[type, List[str]] = {
+    AirportRunway: ["r_length", "r_width", "pccsc_thick", "ctbc_thick", "gcss_thick", "cs_thick"],
+    AircraftShelter: ["shelter_width", "shelter_length", "shelter_height", "mask_layer_thick",
+                      "soil_layer_thick", "disper_layer_thick", "structure_layer_thick"],
+    UndergroundCommandPost: ["rock_layer_thick", "protective_layer_thick", "protective_layer_strength",
+                             "lining_layer_thick", "lining_layer_strength", "ucc_wall_thick",
+                             "ucc_wall_strength"],
+}
+_TARGET_ORM = {
+    AirportRunway: AirportRunwayORM,
+    AircraftShelter: AircraftShelterORM,
+    UndergroundCommandPost: UndergroundCommandPostORM,
+}
+# 导入时不接受的字段（主键、图片、审计字段由系统维护）
+_TARGET_SKIP = {"id", "created_time", "updated_time", "runway_picture", "shelter_picture"}
+
+
+@functools.lru_cache(maxsize=None)
+def _target_columns(entity_cls: type) -> Tuple[Dict[str, str], Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]:
+    """
+    由 ORM 列定义得到：表头 -> 实体字段（实体字段名与数据库列名，如 RunwayCode）、
+    NOT NULL 的文本字段、NOT NULL 的数字字段、唯一字段。
+    """
+    from sqlalchemy import inspect
+    names = {f.name for f in fields(entity_cls)} - _TARGET_SKIP
+    header_map = {n: n for n in names}
+    not_null_text: List[str] = []
+    not_null_number: List[str] = []
+    unique: List[str] = []
+    for attr in inspect(_TARGET_ORM[entity_cls]).column_attrs:
+        col = attr.columns[0]
+        if attr.key not in names:
+            continue
+        header_map[col.name] = attr.key
+        if col.unique:
+            unique.append(attr.key)
+        if not col.nullable:
+            (not_null_text if col.type.python_type is str else not_null_number).append(attr.key)
+    return header_map, tuple(not_null_text), tuple(not_null_number), tuple(unique)
+
+
+def _coerce(value: Any, tp: Any) -> Any:
+    if _blank(value):
+        return None
+    if tp in (float, Optional[float]):
+        return float(value)
+    if tp in (int, Optional[int]):
+        number = float(value)
+        if not number.is_integer():
+            raise ValueError(f"{value} 不是整数")
+        return int(number)
+    return str(value).strip()
+
+
+def map_targets(entity_cls: type, records: Iterable[Record]
+                ) -> Tuple[List[Any], List[int], List[Tuple[int, str]]]:
+    """返回 (实体列表, 各实体对应的行号, [(行号, 错误)])；文件内编码 / 名称重复的行只保留第一行"""
+    header_map, not_null_text, not_null_number, unique = _target_columns(entity_cls)
+    hints = get_type_hints(entity_cls)
+    required_text = list(dict.fromkeys(_TARGET_REQUIRED_TEXT[entity_cls] + list(not_null_text)))
+    required_positive = _TARGET_REQUIRED_POSITIVE[entity_cls]
+    seen: Dict[str, Dict[Any, int]] = {name: {} for name in unique}
+    items: List[Any] = []
+    rows: List[int] = []
+    errors: List[Tuple[int, str]] = []
+    for i, rec in records:
+        values: Dict[str, Any] = {}
+        bad_number: List[str] = []
+        for key, raw in rec.items():
+            name = header_map.get(str(key).strip())
+            if name is None:
+                continue
+            try:
+                values[name] = _coerce(raw, hints.get(name, str))
+            except (TypeError, ValueError):
+                bad_number.append(str(key))
+
+        if entity_cls is AirportRunway:
+            # 与 Target_Runway_Add 一致：未填编码时用名称，空白转 "-" 并大写
+            code = values.get("runway_code") or values.get("runway_name")
+            if code:
+                values["runway_code"] = re.sub(r"\s+", "-", str(code).strip()).upper()
+
+        # 编辑窗口中非必填的 NOT NULL 数字项是默认值为 0 的数值框，导入留空时同样取 0
+        for name in not_null_number:
+            if name not in required_positive and name not in bad_number and values.get(name) is None:
+                values[name] = 0.0
+
+        errs: List[str] = []
+        missing = [n for n in required_text if _blank(values.get(n))]
+        missing += [n for n in required_positive
+                    if n not in bad_number and not (values.get(n) or 0) > 0]
+        if missing:
+            errs.append(f"必须填写：{'，'.join(missing)}")
+        if bad_number:
+            errs.append(f"以下项必须为数字：{'，'.join(bad_number)}")
+        duplicated = [f"{n} {values[n]} 与第 {seen[n][values[n]]} 行重复"
+                      for n in unique if values.get(n) in seen[n]]
+        if duplicated:
+            errs.append("；".join(duplicated))
+        if errs:
+            errors.append((i, "；".join(errs)))
+            continue
+        for n in unique:
+            seen[n][values[n]] = i
+        items.append(entity_cls(**{k: v for k, v in values.items() if v is not None}))
+        rows.append(i)
+    return items, rows, errors
+
+
+# ---------------------- 导入目标定义 ----------------------
+class ImportKind:
+    AMMUNITION = "ammunition"
+    RUNWAY = "runway"
+    SHELTER = "shelter"
+    UCC = "ucc"
+
+
+KIND_TITLES = {
+    ImportKind.AMMUNITION: "弹药毁伤数据",
+    ImportKind.RUNWAY: "机场跑道数据模型",
+    ImportKind.SHELTER: "单机掩蔽库数据模型",
+    ImportKind.UCC: "地下指挥所数据模型",
+}
+_KIND_ENTITY = {
+    ImportKind.RUNWAY: AirportRunway,
+    ImportKind.SHELTER: AircraftShelter,
+    ImportKind.UCC: UndergroundCommandPost,
+}
+
+
+def map_records(kind: str, records: List[Record]) -> Tuple[List[Any], List[int], List[Tuple[int, str]]]:
+    if kind == ImportKind.AMMUNITION:
+        return map_ammunition(records)
+    return map_targets(_KIND_ENTITY[kind], records)
+
+
+def write_batches(kind: str, items: List[Any], rows: List[int], on_batch: Optional[Callable[[int], None]] = None,
+                  batch_size: int = BATCH_SIZE) -> Tuple[int, int, List[Tuple[int, str]]]:
+    """
+    分批写入，每批一个事务。返回 (新增数, 更新数, [(行号, 错误)])；目标表的 upsert 不区分两者，统一计入新增。
+    rows 为各条记录在文件中的行号；目标的名称等唯一列已被另一编码占用时该行不写入，作为错误返回。
+    on_batch(已处理条数) 用于汇报进度。
+    """
+    inserted = updated = 0
+    errors: List[Tuple[int, str]] = []
+    for start in range(0, len(items), batch_size):
+        batch = items[start:start + batch_size]
+        if kind == ImportKind.AMMUNITION:
+            from am_models import SQLRepository
+            from am_models.db import session_scope
+            with session_scope() as s:
+                ins, upd = SQLRepository(s).upsert_many(batch, batch_size)
+        else:
+            from target_model import SQLRepository
+            from target_model.db import session_scope
+            with session_scope() as s:
+                repo = SQLRepository(s)
+                conflicts = repo.unique_conflicts(batch)
+                errors.extend((rows[start + j], msg) for j, msg in conflicts)
+                rejected = {j for j, _ in conflicts}
+                ins, upd = repo.upsert_many([e for j, e in enumerate(batch) if j not in rejected], batch_size), 0
+        inserted += ins
+        updated += upd
+        if on_batch:
+            on_batch(start + len(batch))
+    return inserted, updated, errors
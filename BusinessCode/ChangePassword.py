@@ -10,7 +10,8 @@ if str(project_root) not in sys.path:
 from PyQt6.QtWidgets import QApplication, QMainWindow, QDialog, QMessageBox, QPushButton
 from UIs.Frm_ChangePassword import Ui_Frm_ChangePassword  # 导入自动生成的界面类
 from DBCode.DBHelper import DBHelper
-import bcrypt
+from DBCode.UserRepository import UserRepository
+from BusinessCode.PasswordPolicy import hash_password, verify_password
 
 
 class ChangePasswordWindow(QDialog, Ui_Frm_ChangePassword):
@@ -53,16 +54,17 @@ class ChangePasswordWindow(QDialog, Ui_Frm_ChangePassword):
             self.txt_NewPwd2.setFocus()
         else:
             # 3. 验证当前密码是否正确
-            result = self.dbhelper.execute_query("SELECT UPassword FROM user_info WHERE username=%s", (self.username,))
-            if not result:
+            users = UserRepository(self.dbhelper)
+            user = users.get_by_name(self.username)
+            if not user:
                 QMessageBox.warning(self, "错误", "用户不存在")
                 return
             else:
-                pwd_db =  result[0]['UPassword'].encode('utf-8')
-                if bcrypt.checkpw(oldpwd.encode('utf-8'), pwd_db):  # 用 sha256 生成哈希
+                pwd_db =  user['UPassword'].encode('utf-8')
+                if verify_password(oldpwd, pwd_db):
                     # 4. 更新新密码
-                    hashed_password = bcrypt.hashpw(newpwd1.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
-                    self.dbhelper.execute_query("UPDATE user_info SET UPassword=%s WHERE username=%s", (hashed_password, self.username))
+                    hashed_password = hash_password(newpwd1)
+                    users.set_password_by_name(self.username, hashed_password)
                     QMessageBox.information(self, "成功", "密码修改成功")
                     self.clear_input()
                 else:
@@ -13,6 +13,7 @@ from PyQt6.QtGui import QPixmap
 from loguru import logger
 
 from BusinessCode.ImgHelper import ImgHelper
+from DBCode.LookupCache import LOOKUPS
 from UIs.Frm_Ammunition_Add import Ui_AmmunitionEditorWindow
 from am_models import SQLRepository, Ammunition
 from am_models.db import Base, engine, session_scope
@@ -104,9 +105,9 @@ class AmmunitionEditor(QDialog):
     # ------- 初始化与信号 -------
     def _init_comboboxes(self):
         if self.ui.cmb_country.count() == 0:
-            self.ui.cmb_country.addItems(["中国", "美国", "俄罗斯", "法国", "英国", "德国", "印度", "中国台湾", "其他"])
+            self.ui.cmb_country.addItems(LOOKUPS.values("am_country"))
         if self.ui.cmb_user.count() == 0:
-            self.ui.cmb_user.addItems(["空军", "陆军", "海军", "联合"])
+            self.ui.cmb_user.addItems(LOOKUPS.values("am_base"))
         if self.ui.cmb_warhead.count() == 0:
             self.ui.cmb_warhead.addItems(
                 ["爆破战斗部", "聚能穿甲战斗部", "破片战斗部", "钻地侵彻战斗部", "子母弹战斗部（爆破子弹）",
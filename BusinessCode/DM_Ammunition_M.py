@@ -1,5 +1,5 @@
 import sys
-from typing import Dict, List, Any
+from typing import List, Any
 
 from PyQt6.QtCore import QModelIndex
 from PyQt6.QtGui import QStandardItem, QStandardItemModel
@@ -8,6 +8,8 @@ from PyQt6.QtWidgets import QApplication, QWidget, QMessageBox, QPushButton, QHB
 
 from BusinessCode.DM_Ammunition_Add import init_tables, AmmunitionEditor, AmmunitionEditorMode
 from BusinessCode.DM_Ammunition_Export import ExportDialog
+from BusinessCode.BulkImport import ImportKind, show_import_dialog
+from BusinessCode.LogSetup import brief
 from UIs.Frm_Ammunition_M import Ui_Frm_AmmunitionManagement
 from am_models import SQLRepository
 from am_models.db import session_scope
@@ -31,6 +33,12 @@ class DYListWindow(QDialog):
         # 按钮绑定
         self.ui.btn_add.clicked.connect(self._on_btn_add_clicked)
         self.ui.btn_export.clicked.connect(self._on_btn_export_clicked)
+        # 批量导入（CSV / XLSX / JSON）
+        self.btn_import = QPushButton("批量导入弹药毁伤数据", self)
+        self.btn_import.setMinimumSize(80, 40)
+        self.btn_import.setAutoDefault(False)
+        self.ui.gridLayout.addWidget(self.btn_import, 0, 3, 1, 1)
+        self.btn_import.clicked.connect(self._on_btn_import_clicked)
         # 绑定双击信号
         self.ui.tb_dan.doubleClicked.connect(self._on_row_double_clicked)
         self.setup_table()
@@ -40,6 +48,9 @@ class DYListWindow(QDialog):
         dlg = ExportDialog(self, session_scope)
         dlg.exec()
 
+    def _on_btn_import_clicked(self):
+        show_import_dialog(self, ImportKind.AMMUNITION, on_imported=self.setup_table)
+
     def _on_btn_add_clicked(self):
         try:
             self.edit_win = AmmunitionEditor(parent=self, mode=AmmunitionEditorMode.AmmunitionEditorMode_Add)
@@ -79,46 +90,46 @@ class DYListWindow(QDialog):
         tv.setEditTriggers(tv.EditTrigger.NoEditTriggers)
 
         # 从数据库读取数据
-        db_data: List[Dict[str, Any]] = []
+        db_data: List[Any] = []
         with session_scope() as db_session:
             repo = SQLRepository(db_session)
             db_session.flush()
             db_session.expire_all()
             try:
-                db_data = repo.list_columns(
+                # 只读记录（namedtuple），不构造完整实体
+                db_data = repo.list_records(
                     ['am_id', 'am_type', "country", "chinese_name", "model_name", "weight_kg", "length_m", "diameter_m",
-                     "max_speed_ma", "warhead_type", "explosion_equivalent_tnt_t"])
+                     "max_speed_ma", "warhead_type", "explosion_equivalent_TNT_T"])
             except Exception as e:
                 print(e)
                 QMessageBox.warning(self, "错误", f"读取数据库失败:{e}")
                 self.close()
                 return
 
-        logger.debug(db_data)
+        logger.opt(lazy=True).debug("弹药列表 {}", lambda: brief(db_data))
 
         try:
             for row_id, am in enumerate(db_data):
-                logger.debug(f"row_id: {row_id},am={am}")
                 # ["弹药类型", "国家/地区", "中文名称", "弹药型号", "弹药全重", "弹药长度", "弹体直径", "最大时速","战斗部", "爆炸当量", "操作"]
                 table.insertRow(row_id)
-                table.setItem(row_id, 0, QStandardItem(am["am_type"]))
-                table.setItem(row_id, 1, QStandardItem(am.get("country", "") or ""))
-                table.setItem(row_id, 2, QStandardItem(am.get("chinese_name", "") or ""))
-                table.setItem(row_id, 3, QStandardItem(am.get("model_name", "") or ""))
+                table.setItem(row_id, 0, QStandardItem(am.am_type))
+                table.setItem(row_id, 1, QStandardItem(am.country or ""))
+                table.setItem(row_id, 2, QStandardItem(am.chinese_name or ""))
+                table.setItem(row_id, 3, QStandardItem(am.model_name or ""))
 
-                table.setItem(row_id, 4, QStandardItem(str(am.get("weight_kg", "") or "")))
-                table.setItem(row_id, 5, QStandardItem(str(am.get("length_m", "") or "")))
-                table.setItem(row_id, 6, QStandardItem(str(am.get("diameter_m", "") or "")))
-                table.setItem(row_id, 7, QStandardItem(str(am.get("max_speed_ma", "") or "")))
+                table.setItem(row_id, 4, QStandardItem(str(am.weight_kg or "")))
+                table.setItem(row_id, 5, QStandardItem(str(am.length_m or "")))
+                table.setItem(row_id, 6, QStandardItem(str(am.diameter_m or "")))
+                table.setItem(row_id, 7, QStandardItem(str(am.max_speed_ma or "")))
 
-                table.setItem(row_id, 8, QStandardItem(am.get("warhead_type", "") or ""))
-                table.setItem(row_id, 9, QStandardItem(str(am.get("explosion_equivalent_tnt_t", "") or "")))
+                table.setItem(row_id, 8, QStandardItem(am.warhead_type or ""))
+                table.setItem(row_id, 9, QStandardItem(str(am.explosion_equivalent_TNT_T or "")))
 
                 # 操作列：为本行插入按钮
-                self._add_action_buttons(tv, table, row_id, len(headers) - 2, am_id=am["am_id"])
+                self._add_action_buttons(tv, table, row_id, len(headers) - 2, am_id=am.am_id)
 
                 # 隐藏的主键列
-                table.setItem(row_id, len(headers) - 1, QStandardItem(str(am["am_id"])))
+                table.setItem(row_id, len(headers) - 1, QStandardItem(str(am.am_id)))
 
         except Exception as e:
             logger.exception(e)
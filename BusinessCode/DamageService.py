@@ -0,0 +1,106 @@
+"""
+毁伤场景 / 毁伤参数服务（不依赖 Qt）
+
+场景与参数的列表和保存。保存时场景与其全部参数在同一事务内提交，任一步失败整体回滚。
+编辑窗口（PG_DamageScene_Add、PG_DamageParameter_Add）校验表单后调用，cli.py 与基准脚本直接调用。
+
+失败约定：重复的编号抛 ValueError，要更新的记录不存在抛 LookupError，数据库错误原样抛出。
+"""
+from __future__ import annotations
+
+from typing import Iterable, List, Optional, Sequence
+
+from damage_models import DamageParameter, DamageParameterRepository, DamageScene, DamageSceneRepository
+from DBCode.DBHelper import DBHelper
+
+
+def list_scenes() -> List[DamageScene]:
+    db = DBHelper()
+    try:
+        return DamageSceneRepository(db).get_all()
+    finally:
+        db.close()
+
+
+def list_parameters() -> List[DamageParameter]:
+    db = DBHelper()
+    try:
+        return DamageParameterRepository(db).get_all()
+    finally:
+        db.close()
+
+
+def get_scene(dsid: int) -> Optional[DamageScene]:
+    db = DBHelper()
+    try:
+        return DamageSceneRepository(db).get_by_id(dsid)
+    finally:
+        db.close()
+
+
+def get_parameter(dpid: int) -> Optional[DamageParameter]:
+    db = DBHelper()
+    try:
+        return DamageParameterRepository(db).get_by_id(dpid)
+    finally:
+        db.close()
+
+
+def scene_parameters(dsid: int) -> List[DamageParameter]:
+    """场景关联的全部参数"""
+    db = DBHelper()
+    try:
+        return DamageParameterRepository(db).get_by_scene_id(dsid)
+    finally:
+        db.close()
+
+
+def save_scene(scene: DamageScene, parameters: Sequence[DamageParameter] = (),
+               deleted_param_ids: Iterable[int] = (), db: Optional[DBHelper] = None) -> int:
+    """
+    scene.DSID 为空时新增，否则更新；parameters 中无 DPID 的新增（挂到该场景），其余更新；
+    deleted_param_ids 删除。返回场景ID。
+    """
+    own = db is None
+    db = db or DBHelper()
+    try:
+        repo = DamageSceneRepository(db)
+        param_repo = DamageParameterRepository(db)
+        with db.transaction():
+            # 事务内插入 / 更新撞上唯一索引会直接抛数据库异常，先检查以给出可读的提示
+            if repo.is_duplicate(scene):
+                raise ValueError("场景编号或名称重复")
+            if scene.DSID is None:
+                dsid = repo.add(scene)["DSID"]
+            else:
+                if not repo.update(scene):
+                    raise LookupError("更新失败，场景不存在")
+                dsid = scene.DSID
+
+            new_params = [p for p in parameters if not p.DPID]
+            for param in new_params:
+                param.DSID = dsid
+                param.DSCode = scene.DSCode
+            param_repo.add_many(new_params)
+            param_repo.update_many([p for p in parameters if p.DPID])
+            param_repo.delete_many(deleted_param_ids)
+        return dsid
+    finally:
+        if own:
+            db.close()
+
+
+def save_parameter(param: DamageParameter, db: Optional[DBHelper] = None) -> int:
+    """param.DPID 为空时新增，否则更新；返回参数ID"""
+    own = db is None
+    db = db or DBHelper()
+    try:
+        repo = DamageParameterRepository(db)
+        if param.DPID is None:
+            return repo.add(param)
+        if not repo.update(param):
+            raise LookupError("更新失败，参数不存在")
+        return param.DPID
+    finally:
+        if own:
+            db.close()
@@ -0,0 +1,227 @@
+"""
+Word 报告模板
+
+报告导出不再每次新建空白文档再逐个修补样式字体、逐个单元格设置文字和字体：
+- 模板（字体已设好的 Normal / Title / Heading 1..9 及表格样式）只生成或读取一次，以字节缓存在内存中，
+  每份报告从缓存字节打开一个新文档
+- 正文（标题、段落、表格）由 DocxBody 拼成 XML 字符串，最后一次解析插入文档，代替 python-docx 的
+  逐段落、逐单元格调用（后者每次按样式名查找样式、逐个创建元素）
+
+    body = REPORT_TEMPLATE.body()
+    body.heading("报告名称", 0, center=True)
+    body.table([["字段", "值"], ["报告编号", "R-001"]])
+    body.save(path)                # 直接写出 .docx（模板各部件原样复制，只替换 document.xml）
+    doc = body.to_document()       # 或得到 python-docx 文档继续编辑
+
+自定义模板：把 .docx 放到 UIstyles/templates/report_template.docx（需包含 Title、Heading 1..9 和
+TABLE_STYLE 样式，正文为空）即优先使用；可由默认模板导出后修改：
+    python -m BusinessCode.DocxTemplate --write UIstyles/templates/report_template.docx
+"""
+from __future__ import annotations
+
+import io
+import re
+import threading
+import zipfile
+from pathlib import Path
+from typing import List, Optional, Sequence
+from xml.sax.saxutils import escape
+
+from loguru import logger
+
+project_root = Path(__file__).resolve().parent.parent
+
+TEMPLATE_PATH = project_root / "UIstyles" / "templates" / "report_template.docx"
+FONT_NAME = "宋体"
+TABLE_STYLE = "Light Grid Accent 1"
+
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_RE_XML_INVALID = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_THEME_ATTRS = ("asciiTheme", "hAnsiTheme", "eastAsiaTheme", "cstheme")
+_FONT_ATTRS = ("ascii", "hAnsi", "eastAsia", "cs")
+
+
+def build_default_template(font_name: str = FONT_NAME) -> bytes:
+    """python-docx 默认文档，正文、标题及表格样式的字体统一设为 font_name（去掉主题字体引用）"""
+    from docx import Document
+    from docx.oxml.ns import qn
+
+    doc = Document()
+    names = ["Normal", "Title"] + [f"Heading {level}" for level in range(1, 10)]
+    for name in names:
+        rpr = doc.styles[name].element.get_or_add_rPr()
+        rpr.get_or_add_rFonts()
+    names.append(TABLE_STYLE)
+    for name in names:
+        # 主题字体优先于具体字体名，需一并去掉；表格样式的首行 / 首列条件格式中也有
+        for rfonts in doc.styles[name].element.iter(qn("w:rFonts")):
+            for attr in _THEME_ATTRS:
+                rfonts.attrib.pop(qn(f"w:{attr}"), None)
+            for attr in _FONT_ATTRS:
+                rfonts.set(qn(f"w:{attr}"), font_name)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+class DocxTemplate:
+    def __init__(self, path: Optional[Path] = TEMPLATE_PATH, font_name: str = FONT_NAME,
+                 table_style: str = TABLE_STYLE) -> None:
+        self.path = path
+        self.font_name = font_name
+        self.table_style = table_style
+        self.loads = 0
+        self._lock = threading.Lock()
+        self._blob: Optional[bytes] = None
+        self._table_style_id = ""
+        self._heading_style_ids: List[str] = []  # 0 为 Title，1..9 为 Heading n
+        self._block_width = 0  # EMU，正文宽度；表格各列按其均分（与 doc.add_table 一致）
+        self._run_props = ""
+        # 模板包的各部件；document.xml 在正文末尾的 <w:sectPr> 处切开，正文插在两段之间
+        self._package_parts: List[tuple] = []
+        self._doc_head = ""
+        self._doc_tail = ""
+
+    def _ensure_loaded(self) -> bytes:
+        with self._lock:
+            if self._blob is None:
+                if self.path is not None and Path(self.path).is_file():
+                    blob = Path(self.path).read_bytes()
+                    logger.info(f"载入 Word 报告模板: {self.path}")
+                else:
+                    blob = build_default_template(self.font_name)
+                self._prepare(blob)
+                self._blob = blob
+                self.loads += 1
+            return self._blob
+
+    def _prepare(self, blob: bytes) -> None:
+        from docx import Document
+
+        doc = Document(io.BytesIO(blob))
+        self._table_style_id = doc.styles[self.table_style].style_id
+        self._heading_style_ids = [doc.styles["Title"].style_id] + [
+            doc.styles[f"Heading {level}"].style_id for level in range(1, 10)]
+        section = doc.sections[-1]
+        self._block_width = section.page_width - section.left_margin - section.right_margin
+        with zipfile.ZipFile(io.BytesIO(blob)) as zf:
+            self._package_parts = [(info, zf.read(info)) for info in zf.infolist()]
+        xml = dict((info.filename, data) for info, data in self._package_parts)["word/document.xml"].decode("utf-8")
+        cut = xml.rfind("<w:sectPr")
+        if cut < 0:
+            cut = xml.rfind("</w:body>")
+        self._doc_head, self._doc_tail = xml[:cut], xml[cut:]
+        font = escape(self.font_name, {'"': "&quot;"})
+        self._run_props = f'<w:rPr><w:rFonts w:ascii="{font}" w:hAnsi="{font}" w:eastAsia="{font}"/></w:rPr>'
+
+    def reset(self) -> None:
+        """丢弃缓存的模板（更换模板文件后调用）"""
+        with self._lock:
+            self._blob = None
+
+    def new_document(self):
+        """从缓存模板打开一份新文档"""
+        from docx import Document
+        return Document(io.BytesIO(self._ensure_loaded()))
+
+    def body(self) -> "DocxBody":
+        self._ensure_loaded()
+        return DocxBody(self)
+
+    def table_xml(self, rows: Sequence[Sequence[str]], cols: int, width: int) -> str:
+        cell_open = f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/></w:tcPr><w:p><w:r>{self._run_props}'
+        parts: List[str] = [
+            f'<w:tbl><w:tblPr><w:tblStyle w:val="{self._table_style_id}"/>'
+            '<w:tblW w:type="auto" w:w="0"/>'
+            '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" '
+            'w:noHBand="0" w:noVBand="1" w:val="04A0"/></w:tblPr><w:tblGrid>',
+            f'<w:gridCol w:w="{width}"/>' * cols,
+            "</w:tblGrid>",
+        ]
+        for row in rows:
+            parts.append("<w:tr>")
+            for i in range(cols):
+                text = row[i] if i < len(row) else ""
+                parts.append(cell_open)
+                parts.append(_run_text(text))
+                parts.append("</w:r></w:p></w:tc>")
+            parts.append("</w:tr>")
+        parts.append("</w:tbl>")
+        return "".join(parts)
+
+
+class DocxBody:
+    """报告正文的 XML 片段，按调用顺序拼接；to_document() 时一次解析并插入模板文档"""
+
+    def __init__(self, template: DocxTemplate) -> None:
+        self.template = template
+        self._parts: List[str] = []
+
+    def heading(self, text: str, level: int = 1, center: bool = False) -> None:
+        style_id = self.template._heading_style_ids[level]
+        jc = '<w:jc w:val="center"/>' if center else ""
+        self._parts.append(f'<w:p><w:pPr><w:pStyle w:val="{style_id}"/>{jc}</w:pPr>'
+                           f'<w:r>{_run_text(text)}</w:r></w:p>')
+
+    def paragraph(self, text: str = "") -> None:
+        self._parts.append(f"<w:p><w:r>{_run_text(text)}</w:r></w:p>" if text else "<w:p/>")
+
+    def table(self, rows: Sequence[Sequence[str]]) -> None:
+        """rows 为各行单元格文字；列宽按正文宽度均分"""
+        cols = max((len(r) for r in rows), default=0)
+        if cols:
+            width = int(self.template._block_width / cols / 635)  # EMU -> twips
+            self._parts.append(self.template.table_xml(rows, cols, width))
+
+    def save(self, path) -> None:
+        """写出 .docx：复制模板包的其余部件，document.xml 为模板正文 + 本次生成的内容"""
+        t = self.template
+        document_xml = (t._doc_head + "".join(self._parts) + t._doc_tail).encode("utf-8")
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for info, data in t._package_parts:
+                zf.writestr(info, document_xml if info.filename == "word/document.xml" else data)
+
+    def to_document(self):
+        from docx.oxml import parse_xml
+
+        doc = self.template.new_document()
+        fragment = parse_xml(f'<w:body xmlns:w="{_W_NS}">{"".join(self._parts)}</w:body>')
+        sect_pr = doc.element.body.sectPr
+        for child in list(fragment):
+            if sect_pr is not None:
+                sect_pr.addprevious(child)
+            else:
+                doc.element.body.append(child)
+        return doc
+
+
+def _run_text(text) -> str:
+    """单元格文字 -> <w:t>，换行 / 制表符与 python-docx 的 run.text 一样转为 <w:br/> / <w:tab/>"""
+    text = _RE_XML_INVALID.sub("", "" if text is None else str(text))
+    out: List[str] = []
+    for li, line in enumerate(text.split("\n")):
+        if li:
+            out.append("<w:br/>")
+        for ti, piece in enumerate(line.split("\t")):
+            if ti:
+                out.append("<w:tab/>")
+            out.append(f'<w:t xml:space="preserve">{escape(piece)}</w:t>')
+    return "".join(out)
+
+
+# 进程内共享的报告模板
+REPORT_TEMPLATE = DocxTemplate()
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    sys.path.insert(0, str(project_root))
+
+    parser = argparse.ArgumentParser(description="导出默认 Word 报告模板")
+    parser.add_argument("--write", required=True, help="输出 .docx 路径")
+    args = parser.parse_args()
+    Path(args.write).parent.mkdir(parents=True, exist_ok=True)
+    Path(args.write).write_bytes(build_default_template())
+    print(f"已写入 {args.write}")
@@ -0,0 +1,169 @@
+"""
+日志配置（loguru）
+
+- 文件 sink 使用 enqueue=True：日志记录先入队，由后台线程批量写入 logs/app.log，调用方不等待磁盘 IO；
+  文件按大小轮转并保留若干个
+- 级别取自配置：log_level 为默认级别，log_levels 按模块覆盖，例如
+      log_levels = BusinessCode.semantic_search=DEBUG, DBCode=WARNING
+  模块名前缀匹配（loguru 的 filter 字典）。默认 INFO 时，DEBUG 调用在 loguru 入口即返回，
+  参数不会被格式化
+- 单条消息超过 MAX_MESSAGE_CHARS 时截断，防止整份数据写入日志
+- 大对象请用惰性格式化并只输出概要：
+      logger.opt(lazy=True).debug("语料 {}", lambda: brief(blobs))
+
+开销对比（同步 DEBUG 文件 sink + f-string / 当前配置）：
+    python -m BusinessCode.LogSetup --rows 20000
+"""
+from __future__ import annotations
+
+import os
+import sys
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+LOG_FILE = os.path.join("logs", "app.log")
+DEFAULT_LEVEL = "INFO"
+MAX_MESSAGE_CHARS = 4000
+ROTATION = "10 MB"
+RETENTION = 5
+
+_LEVELS = ("TRACE", "DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR", "CRITICAL")
+
+
+def brief(value: Any, max_items: int = 5, max_chars: int = 200) -> str:
+    """大对象的日志概要：序列只给长度和前几项，文本截断到 max_chars"""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = list(value)[:max_items]
+        head = ", ".join(_clip(repr(x), max_chars // max(1, max_items)) for x in items)
+        more = f", ...(共 {len(value)} 项)" if len(value) > max_items else ""
+        return f"{type(value).__name__}[{len(value)}]: [{head}{more}]"
+    if isinstance(value, dict):
+        return brief(list(value.items()), max_items, max_chars).replace("list[", "dict[", 1)
+    return _clip(value if isinstance(value, str) else repr(value), max_chars)
+
+
+def _clip(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}...(省略 {len(text) - limit} 字符)"
+
+
+def _cap_message(record: Dict[str, Any]) -> None:
+    message = record["message"]
+    if len(message) > MAX_MESSAGE_CHARS:
+        record["message"] = _clip(message, MAX_MESSAGE_CHARS)
+
+
+def _parse_levels(spec: str) -> Dict[str, str]:
+    """'a.b=DEBUG, c=WARNING' -> {'a.b': 'DEBUG', 'c': 'WARNING'}；无法识别的项忽略"""
+    levels: Dict[str, str] = {}
+    for part in (spec or "").replace(";", ",").split(","):
+        name, sep, level = part.partition("=")
+        name, level = name.strip(), level.strip().upper()
+        if sep and name and level in _LEVELS:
+            levels[name] = level
+    return levels
+
+
+def configure_logging(cfg: Optional[Dict[str, str]] = None, log_file: str = LOG_FILE,
+                      console: bool = True) -> Dict[str, str]:
+    """
+    替换 loguru 默认的同步 stderr 输出；cfg 缺省时读取配置。返回生效的模块级别字典（"" 为默认级别）。
+    程序退出时 loguru 会停止后台线程并写完队列中的日志。
+    """
+    if cfg is None:
+        from BusinessCode.ConfigStore import load_config
+        cfg = load_config()
+    default = (cfg.get("log_level") or DEFAULT_LEVEL).strip().upper()
+    if default not in _LEVELS:
+        default = DEFAULT_LEVEL
+    levels = {"": default}
+    levels.update(_parse_levels(cfg.get("log_levels", "")))
+    # 处理器按级别下限过滤；模块级别由 filter 字典再筛一遍
+    min_level = min(levels.values(), key=_LEVELS.index)
+
+    logger.remove()
+    logger.configure(patcher=_cap_message)
+    if console:
+        logger.add(sys.stderr, level=min_level, filter=levels, enqueue=True)
+    os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+    logger.add(log_file, level=min_level, filter=levels, enqueue=True,
+               rotation=ROTATION, retention=RETENTION, encoding="utf-8")
+    return levels
+
+
+# ---------- 开销基准 ----------
+
+def benchmark(rows: int = 20000, log_dir: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    """
+    模拟两条热点路径上的日志调用，比较调整前后的配置：
+    - index_build：构建语义索引时逐行记录 blob，并一次性记录整个语料（build_semantic_index_from_db / SemanticIndex.build）
+    - table_fill：填充弹药表格时记录整份数据并逐行记录（DM_Ammunition_M.setup_table）
+    before = 同步 DEBUG 文件 sink + f-string；after = configure_logging 默认配置（INFO、enqueue、惰性格式化）；
+    after_debug = 同样写法但打开 DEBUG（enqueue + 截断）。时间为调用方线程耗时，不含后台写盘。
+    """
+    import tempfile
+    import time
+    from collections import namedtuple
+
+    Record = namedtuple("Record", "am_id am_type country chinese_name model_name weight_kg warhead_type")
+    data = [Record(i, "航空炸弹", "国家A", f"弹药{i}", f"MK-{i}", 250.0 + i, "侵彻战斗部") for i in range(rows)]
+    blobs = [" ".join(str(v) for v in r) for r in data]
+    out_dir = log_dir or tempfile.mkdtemp(prefix="logbench_")
+
+    def index_build_old():
+        for b in blobs:
+            logger.debug(f"_row_to_blob={b}")
+        logger.debug(f"safe_blobs={blobs}")
+
+    def index_build_new():
+        logger.opt(lazy=True).debug("语料 {}", lambda: brief(blobs))
+
+    def table_fill_old():
+        logger.debug(data)
+        for row_id, am in enumerate(data):
+            logger.debug(f"row_id: {row_id},am={am}")
+
+    def table_fill_new():
+        logger.opt(lazy=True).debug("弹药列表 {}", lambda: brief(data))
+
+    def timed(fn) -> float:
+        t0 = time.perf_counter()
+        fn()
+        return (time.perf_counter() - t0) * 1000
+
+    results: Dict[str, Dict[str, float]] = {}
+
+    logger.remove()
+    logger.add(os.path.join(out_dir, "before.log"), level="DEBUG")
+    results["before"] = {"index_build_ms": timed(index_build_old), "table_fill_ms": timed(table_fill_old)}
+
+    configure_logging({"log_level": "INFO"}, os.path.join(out_dir, "after.log"), console=False)
+    results["after"] = {"index_build_ms": timed(index_build_new), "table_fill_ms": timed(table_fill_new)}
+
+    configure_logging({"log_level": "DEBUG"}, os.path.join(out_dir, "after_debug.log"), console=False)
+    results["after_debug"] = {"index_build_ms": timed(index_build_new), "table_fill_ms": timed(table_fill_new)}
+    logger.complete()
+    logger.remove()
+
+    for name, r in results.items():
+        size = os.path.getsize(os.path.join(out_dir, f"{name}.log"))
+        r["log_bytes"] = float(size)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+    parser = argparse.ArgumentParser(description="日志开销基准")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--dir", default=None, help="日志输出目录（默认临时目录）")
+    args = parser.parse_args()
+
+    for name, r in benchmark(args.rows, args.dir).items():
+        print(f"{name:12s} 索引构建 {r['index_build_ms']:9.1f} ms   表格填充 {r['table_fill_ms']:9.1f} ms   "
+              f"日志 {r['log_bytes'] / 1024:9.1f} KB")
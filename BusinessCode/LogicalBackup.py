@@ -0,0 +1,301 @@
+"""
+内置逻辑备份 / 恢复（不依赖 mysqldump / mysql 可执行文件）
+
+- 通过 SQLAlchemy 连接池取连接，使用服务端游标（stream_results）分块读取，不把整表读进内存；
+  各表在同一个一致性读快照内读取
+- 备份文件为 zip 归档（.hsbk）：
+    manifest.json             格式版本、来源数据库类型（dialect）、各表列名 / 行数 / 分块数
+    <表名>/schema.sql         建表语句（MySQL 为 SHOW CREATE TABLE，SQLite 取自 sqlite_master）
+    <表名>/00000.json ...     按列存放的数据块（每块 CHUNK_ROWS 行，DEFLATE 压缩）
+- 恢复时重建表结构，再按块 executemany 批量插入；来源与当前数据库类型不同（如 MySQL 的备份恢复到
+  单机 SQLite）时不执行归档中的建表语句，而是清空 initialize_database 建好的同名表后插入
+
+说明：requirements 中没有 pyarrow / msgpack，这里用标准库的 zip + JSON 实现按列分块的压缩格式，
+datetime / Decimal / bytes 等类型在块内按列打类型标记后再还原。
+"""
+from __future__ import annotations
+
+import base64
+import datetime
+import json
+import os
+import zipfile
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from loguru import logger
+from sqlalchemy.engine import Engine
+
+from DBCode.Backend import translate
+
+# 备份文件扩展名，恢复时据此区分 mysqldump 的 .sql 文件
+NATIVE_EXT = ".hsbk"
+FORMAT_NAME = "hsbk"
+FORMAT_VERSION = 1
+# 每个数据块的行数；同时也是恢复时每次 executemany 的批量大小
+CHUNK_ROWS = 5000
+
+ProgressFn = Optional[Callable[[str], None]]
+
+
+def _default_engine() -> Engine:
+    # 复用 am_models 的连接池（各模型包连接同一个库）
+    from am_models.db import engine
+    return engine
+
+
+# ---------- 列编码 ----------
+
+def _type_tag(value: Any) -> str:
+    if isinstance(value, datetime.datetime):
+        return "dt"
+    if isinstance(value, datetime.date):
+        return "d"
+    if isinstance(value, datetime.timedelta):
+        return "td"
+    if isinstance(value, Decimal):
+        return "dec"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "b"
+    return ""
+
+
+_ENCODERS: Dict[str, Callable[[Any], Any]] = {
+    "dt": lambda v: v.isoformat(),
+    "d": lambda v: v.isoformat(),
+    "td": lambda v: v.total_seconds(),
+    "dec": str,
+    "b": lambda v: base64.b64encode(bytes(v)).decode("ascii"),
+}
+
+_DECODERS: Dict[str, Callable[[Any], Any]] = {
+    "dt": datetime.datetime.fromisoformat,
+    "d": datetime.date.fromisoformat,
+    "td": lambda v: datetime.timedelta(seconds=v),
+    "dec": Decimal,
+    "b": base64.b64decode,
+}
+
+
+def encode_chunk(rows: Sequence[Sequence[Any]], ncols: int) -> bytes:
+    """把一批行转成按列存放的 JSON 块"""
+    cols: List[List[Any]] = [[row[i] for row in rows] for i in range(ncols)]
+    types: List[str] = []
+    for i, col in enumerate(cols):
+        tag = next((_type_tag(v) for v in col if v is not None), "")
+        types.append(tag)
+        enc = _ENCODERS.get(tag)
+        if enc is not None:
+            cols[i] = [None if v is None else enc(v) for v in col]
+    return json.dumps({"types": types, "cols": cols}, ensure_ascii=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def decode_chunk(data: bytes) -> List[tuple]:
+    """按列 JSON 块 -> 行元组列表（可直接用于 executemany）"""
+    obj = json.loads(data)
+    cols = obj["cols"]
+    for i, tag in enumerate(obj["types"]):
+        dec = _DECODERS.get(tag)
+        if dec is not None:
+            cols[i] = [None if v is None else dec(v) for v in cols[i]]
+    return list(zip(*cols))
+
+
+# ---------- 备份 ----------
+
+def _begin_snapshot(conn) -> None:
+    """
+    所有表在同一个读快照内读取，备份期间的写入不会让各表停在不同时刻（如报告有而对应的评估结果没有），
+    与 mysqldump --single-transaction 一致。
+    """
+    if conn.dialect.name == "sqlite":
+        # pysqlite 不会为 SELECT 自动开启事务；WAL 下读事务看到的是 BEGIN 之后第一次读取时的快照
+        conn.exec_driver_sql("BEGIN")
+    else:
+        conn.exec_driver_sql("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+        conn.exec_driver_sql("START TRANSACTION WITH CONSISTENT SNAPSHOT")
+
+
+def backup_tables(backup_path: str, backup_file: str, tables: Iterable[str],
+                  engine: Optional[Engine] = None, progress: ProgressFn = None) -> str:
+    """把指定表逻辑备份到 .hsbk 归档，返回文件完整路径"""
+    engine = engine or _default_engine()
+    os.makedirs(backup_path, exist_ok=True)
+    full_path = os.path.join(backup_path, backup_file)
+    tmp_path = full_path + ".part"
+
+    manifest: Dict[str, Any] = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "dialect": engine.dialect.name,
+        "created": datetime.datetime.now().isoformat(),
+        "tables": {},
+    }
+    try:
+        with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6) as zf, \
+                engine.connect() as conn:
+            _begin_snapshot(conn)
+            for table in tables:
+                if progress:
+                    progress(f"正在备份数据表: {table} ...")
+                zf.writestr(f"{table}/schema.sql", _create_table_sql(conn, table))
+
+                # 服务端游标：pymysql 下对应 SSCursor，逐块拉取
+                result = conn.execution_options(stream_results=True).exec_driver_sql(
+                    f"SELECT * FROM `{table}`")
+                columns = list(result.keys())
+                nrows = nchunks = 0
+                for part in result.partitions(CHUNK_ROWS):
+                    zf.writestr(f"{table}/{nchunks:05d}.json", encode_chunk(part, len(columns)))
+                    nrows += len(part)
+                    nchunks += 1
+                manifest["tables"][table] = {"columns": columns, "rows": nrows, "chunks": nchunks}
+                logger.info(f"逻辑备份 {table}: {nrows} 行, {nchunks} 块")
+            zf.writestr("manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2))
+            conn.rollback()  # 只读事务，结束快照
+        os.replace(tmp_path, full_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return full_path
+
+
+def _create_table_sql(conn, table: str) -> str:
+    if conn.dialect.name == "sqlite":
+        return conn.exec_driver_sql("SELECT sql FROM sqlite_master WHERE type='table' AND name=?",
+                                    (table,)).fetchone()[0]
+    return conn.exec_driver_sql(f"SHOW CREATE TABLE `{table}`").fetchone()[1]
+
+
+# ---------- 恢复 ----------
+
+def read_manifest(full_path: str) -> Dict[str, Any]:
+    with zipfile.ZipFile(full_path, "r") as zf:
+        manifest = json.loads(zf.read("manifest.json"))
+    if manifest.get("format") != FORMAT_NAME or manifest.get("version", 0) > FORMAT_VERSION:
+        raise ValueError(f"不支持的备份文件格式：{full_path}")
+    return manifest
+
+
+def restore_archive(full_path: str, engine: Optional[Engine] = None, progress: ProgressFn = None) -> str:
+    """
+    从 .hsbk 归档恢复：按表 DROP + 重建，再按块 executemany 批量插入。
+    每张表的数据在一个事务内提交。
+    """
+    if not os.path.exists(full_path):
+        raise FileNotFoundError(f"备份文件不存在：{full_path}")
+    engine = engine or _default_engine()
+    manifest = read_manifest(full_path)
+    dialect = engine.dialect.name
+    # 早期归档没有 dialect 字段，都来自 MySQL
+    same_dialect = manifest.get("dialect", "mysql") == dialect
+
+    with zipfile.ZipFile(full_path, "r") as zf, engine.connect() as conn:
+        if dialect == "mysql":
+            conn.exec_driver_sql("SET FOREIGN_KEY_CHECKS=0")
+        try:
+            for table, meta in manifest["tables"].items():
+                if progress:
+                    progress(f"正在恢复数据表: {table} ...")
+                if same_dialect:
+                    conn.exec_driver_sql(f"DROP TABLE IF EXISTS `{table}`")
+                    conn.exec_driver_sql(zf.read(f"{table}/schema.sql").decode("utf-8"))
+                else:
+                    conn.exec_driver_sql(f"DELETE FROM `{table}`")
+                conn.commit()
+
+                columns = meta["columns"]
+                insert_sql = translate("INSERT INTO `{}` ({}) VALUES ({})".format(
+                    table,
+                    ", ".join(f"`{c}`" for c in columns),
+                    ", ".join(["%s"] * len(columns)),
+                ), dialect)
+                for i in range(meta["chunks"]):
+                    rows = decode_chunk(zf.read(f"{table}/{i:05d}.json"))
+                    if rows:
+                        # pymysql 会把 INSERT ... VALUES 的 executemany 合并成多值插入
+                        conn.exec_driver_sql(insert_sql, rows)
+                conn.commit()
+                logger.info(f"逻辑恢复 {table}: {meta['rows']} 行")
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if dialect == "mysql":
+                conn.exec_driver_sql("SET FOREIGN_KEY_CHECKS=1")
+    return full_path
+
+
+# ---------- 与 mysqldump 对比 ----------
+
+def _recreate_database(engine, name: str) -> None:
+    with engine.connect() as conn:
+        conn.exec_driver_sql(f"DROP DATABASE IF EXISTS `{name}`")
+        conn.exec_driver_sql(f"CREATE DATABASE `{name}` DEFAULT CHARSET utf8mb4")
+
+
+def benchmark(workdir: str, tables: Sequence[str], scratch_db: Optional[str] = None) -> Dict[str, Any]:
+    """
+    对比 mysqldump 与内置逻辑备份的备份耗时、文件大小和恢复耗时。
+    恢复写入临时库 scratch_db（默认 <DB_NAME>_bench），不影响业务数据；
+    每次恢复前删除并重建该库（不计入耗时），两种方式都是向空库恢复，重复运行结果可比。
+    """
+    import time
+    from sqlalchemy import create_engine
+    from BusinessCode.BackupService import dump_tables, load_sql_dump
+    from BusinessCode.ConfigStore import load_config, get_sqlalchemy_url
+
+    cfg = load_config()
+    scratch_db = scratch_db or f"{cfg['DB_NAME']}_bench"
+    if scratch_db == cfg["DB_NAME"]:
+        raise ValueError("临时库不能与业务库同名")
+    engine = _default_engine()
+    if engine.dialect.name != "mysql":
+        raise RuntimeError("与 mysqldump 的对比测试需要 MySQL 后端")
+    scratch_engine = create_engine(get_sqlalchemy_url({**cfg, "DB_NAME": scratch_db}), future=True)
+
+    def fresh_scratch() -> None:
+        scratch_engine.dispose()  # 池中的连接指向将被删除的库
+        _recreate_database(engine, scratch_db)
+
+    report: Dict[str, Any] = {"tables": list(tables), "scratch_db": scratch_db}
+    try:
+        if cfg.get("mysqldump_path") and cfg.get("mysql_path"):
+            t0 = time.perf_counter()
+            sql_path = dump_tables(cfg, workdir, "bench_mysqldump.sql", tables)
+            backup_sec = time.perf_counter() - t0
+            fresh_scratch()
+            t0 = time.perf_counter()
+            load_sql_dump({**cfg, "DB_NAME": scratch_db}, sql_path)
+            report["mysqldump"] = {"backup_sec": backup_sec, "restore_sec": time.perf_counter() - t0,
+                                   "size_bytes": os.path.getsize(sql_path)}
+        else:
+            report["mysqldump"] = None
+
+        t0 = time.perf_counter()
+        native_path = backup_tables(workdir, f"bench_native{NATIVE_EXT}", tables, engine)
+        backup_sec = time.perf_counter() - t0
+        fresh_scratch()
+        t0 = time.perf_counter()
+        restore_archive(native_path, scratch_engine)
+        report["native"] = {"backup_sec": backup_sec, "restore_sec": time.perf_counter() - t0,
+                            "size_bytes": os.path.getsize(native_path)}
+    finally:
+        scratch_engine.dispose()
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    import tempfile
+    from BusinessCode.BackupService import TARGET_TABLES
+
+    parser = argparse.ArgumentParser(description="内置逻辑备份与 mysqldump 的对比测试")
+    parser.add_argument("--workdir", default=None, help="备份文件输出目录（默认临时目录）")
+    parser.add_argument("--scratch-db", default=None, help="恢复测试使用的临时库名")
+    args = parser.parse_args()
+
+    print(json.dumps(benchmark(args.workdir or tempfile.mkdtemp(prefix="hsbk_bench_"),
+                               TARGET_TABLES, args.scratch_db), ensure_ascii=False, indent=2))
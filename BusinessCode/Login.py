@@ -1,4 +1,7 @@
-﻿import sys
+﻿import importlib
+import sys
+import threading
+import time
 from pathlib import Path
 from typing import Optional
 
@@ -11,13 +14,90 @@ if str(project_root) not in sys.path:
 
 from PyQt6.QtWidgets import QApplication, QMainWindow, QDialog, QMessageBox, QPushButton
 from PyQt6.QtGui import QPixmap
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
 # from qt_material import apply_stylesheet   #皮肤控件
 from UIs.Frm_Login import Ui_Frm_Login  # 导入自动生成的界面类
-from BusinessCode.MainWindow import MainWindow  # 导入自动生成的界面类
+from BusinessCode.PasswordPolicy import hash_password, needs_rehash, verify_password
 from BusinessCode.XT_UserManagement import UserManagement
 from DBCode.DBHelper import DBHelper
-import bcrypt
+from DBCode.UserRepository import UserRepository
+from DBCode.Metrics import METRICS
+
+# 登录成功后才用到的模块：登录窗口显示后即在后台线程导入，与用户输入、密码校验并行；
+# 主窗口模块会连带导入各管理 / 检索窗口，其余为报告导出、数据导入时才导入的库
+_PRELOAD_MODULES = (
+    "BusinessCode.MainWindow",
+    "numpy",
+    "pandas",
+    "openpyxl",
+    "docx",
+    "reportlab.platypus",
+    "reportlab.pdfbase.ttfonts",
+)
+
+
+def _preload_modules() -> None:
+    t0 = time.perf_counter()
+    loaded = 0
+    for name in _PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+            loaded += 1
+        except Exception as e:
+            # 可选依赖未安装等情况，用到时再按原方式报错
+            logger.debug(f"预加载模块 {name} 失败: {e}")
+    try:
+        # 报告导出的字体、样式与 Word 模板
+        from BusinessCode.ReportExporter import preload_report_resources
+        preload_report_resources()
+    except Exception as e:
+        logger.debug(f"预加载报告资源失败: {e}")
+    METRICS.observe("login.preload", (time.perf_counter() - t0) * 1000, loaded)
+
+
+class LoginWorker(QThread):
+    """
+    登录校验线程：查询用户并执行 bcrypt 校验（有意设计得慢），不占用界面线程。
+    校验通过后按 PasswordPolicy 判断是否需要以本机代价重新生成哈希。
+    """
+    succeeded = pyqtSignal(str, str)  # 姓名, 用户身份
+    failed = pyqtSignal(str, str)  # 提示信息, 需要获得焦点的输入框（user / pwd）
+
+    def __init__(self, username: str, password: str, parent=None):
+        super().__init__(parent)
+        self.username = username
+        self.password = password
+
+    def run(self):
+        db = DBHelper()
+        try:
+            with METRICS.timer("login.verify"):
+                row = UserRepository(db).get_by_name(self.username)
+                if not row:
+                    self.failed.emit("用户名不存在，请重新输入！", "user")
+                    return
+                if not verify_password(self.password, row['UPassword']):
+                    self.failed.emit("对不起，密码不正确，请重新输入！", "pwd")
+                    return
+                if row['UStatus'] != 1:  # 状态1表示启用
+                    self.failed.emit("对不起，该用户名处于禁用状态，请联系系统管理员！", "")
+                    return
+            urole = "系统管理员" if str(row['URole']) == "1" else "系统用户"
+            self.succeeded.emit(row['TrueName'], urole)
+            self._rehash_if_needed(db, row['UPassword'])
+        except Exception as e:
+            logger.exception(e)
+            self.failed.emit(f"登录失败：{e}", "")
+        finally:
+            db.close()
+
+    def _rehash_if_needed(self, db: DBHelper, stored: str) -> None:
+        try:
+            if needs_rehash(stored):
+                UserRepository(db).set_password_by_name(self.username, hash_password(self.password))
+                logger.info(f"用户 {self.username} 的密码哈希已按本机代价重新生成")
+        except Exception as e:
+            logger.warning(f"重新生成密码哈希失败: {e}")
 
 
 class LoginWindow(QMainWindow):
@@ -27,7 +107,8 @@ class LoginWindow(QMainWindow):
         self.ui = Ui_Frm_Login()
         self.ui.setupUi(self)
 
-        self.dbhelper = DBHelper()
+        self._login_worker: Optional[LoginWorker] = None
+        threading.Thread(target=_preload_modules, name="login-preload", daemon=True).start()
 
         # 绑定信号
         self.ui.btn_Login.clicked.connect(self.check_login)
@@ -92,28 +173,45 @@ class LoginWindow(QMainWindow):
         elif not password:
             QMessageBox.warning(self, "输入错误", "请输入密码")
             self.ui.txt_Pwd.setFocus()
+        elif self._login_worker is None:
+            # 校验在后台线程进行，期间禁用登录按钮防止重复提交
+            self._set_busy(True)
+            self._login_worker = LoginWorker(username, password)
+            self._login_worker.succeeded.connect(self._on_login_succeeded)
+            self._login_worker.failed.connect(self._on_login_failed)
+            self._login_worker.finished.connect(self._on_login_finished)
+            self._login_worker.start()
+
+    def _set_busy(self, busy: bool) -> None:
+        self.ui.btn_Login.setEnabled(not busy)
+        self.ui.btn_Clear.setEnabled(not busy)
+        if busy:
+            QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
         else:
-            # 查询用户信息（使用参数化查询防止SQL注入）
-            query = 'SELECT TrueName,URole, UPassword, UStatus FROM User_Info  WHERE UserName = %s'
-            result = self.dbhelper.execute_query(query, (username,))
-            # 简单验证
-            if result:
-                pwd_db = result[0]['UPassword'].encode('utf-8')
-                if bcrypt.checkpw(password.encode('utf-8'), pwd_db):  # 用 sha256 生成哈希
-                    if result[0]['UStatus'] == 1:  # 状态1表示启用
-                        truename = result[0]['TrueName']
-                        urole = "系统管理员" if str(result[0]['URole']) == "1" else "系统用户"
-                        self.mainwindow = MainWindow(username, truename, urole)  # 尝试创建并显示主窗口
-                        self.mainwindow.showMaximized()  # 打开主窗体并最大化
-                        self.close()  # 关闭登录窗口
-                    else:
-                        QMessageBox.warning(self, "错误", "对不起，该用户名处于禁用状态，请联系系统管理员！")
-                else:
-                    QMessageBox.warning(self, "错误", "对不起，密码不正确，请重新输入！")
-                    self.ui.txt_Pwd.setFocus()
-            else:
-                QMessageBox.warning(self, "错误", "用户名不存在，请重新输入！")
-                self.ui.txt_UserName.setFocus()
+            QApplication.restoreOverrideCursor()
+
+    def _on_login_succeeded(self, truename: str, urole: str) -> None:
+        self._set_busy(False)
+        username = self.ui.txt_UserName.text().strip()
+        # 模块通常已由预加载线程导入完毕；未完成时在此等待其导入结束
+        from BusinessCode.MainWindow import MainWindow
+        self.mainwindow = MainWindow(username, truename, urole)  # 尝试创建并显示主窗口
+        self.mainwindow.showMaximized()  # 打开主窗体并最大化
+        self.close()  # 关闭登录窗口
+
+    def _on_login_failed(self, msg: str, field: str) -> None:
+        self._set_busy(False)
+        QMessageBox.warning(self, "错误", msg)
+        if field == "user":
+            self.ui.txt_UserName.setFocus()
+        elif field == "pwd":
+            self.ui.txt_Pwd.setFocus()
+
+    def _on_login_finished(self) -> None:
+        # 校验通过后线程可能仍在重新生成哈希，结束后才释放
+        worker, self._login_worker = self._login_worker, None
+        if worker is not None:
+            worker.deleteLater()
 
     # 清空控件信息
     def clear_input(self):
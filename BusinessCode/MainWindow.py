@@ -3,11 +3,14 @@ from pathlib import Path
 from venv import logger
 
 from PyQt6.QtWidgets import QApplication, QMainWindow, QLabel, QPushButton
-from PyQt6.QtGui import QIcon
+from PyQt6.QtGui import QAction, QIcon
 from PyQt6.QtCore import QSize
 
+from BusinessCode.BackupScheduler import start_backup_scheduler
 from BusinessCode.Config import ConfigEditorDialog
+from BusinessCode.PerformanceDialog import PerformanceDialog, UiStallMonitor
 from DBCode.DBHelper import DBHelper
+from DBCode.UserRepository import UserRepository
 from UIs.Frm_MainWindow import Ui_Frm_MainWindow  # 导入自动生成的界面类
 from BusinessCode.XT_UserManagement import UserManagement
 from BusinessCode.XT_DataRestore import DataRestore
@@ -43,6 +46,11 @@ class MainWindow(QMainWindow):
         self.ui.setupUi(self)  # 关键：将 MainWindow 作为参数传给 setupUi
         # 设置工具栏
         self.init_toolbar()
+        # 性能监控（系统综合管理菜单）及界面线程卡顿检测
+        self.menu_Performance = QAction("性能监控", self)
+        self.ui.menu_5.addAction(self.menu_Performance)
+        self.stall_monitor = UiStallMonitor(self)
+        self.stall_monitor.start()
         # 设置状态栏
         self.username = username
         self.truename = truename
@@ -51,12 +59,15 @@ class MainWindow(QMainWindow):
         self.ui.statusbar.addPermanentWidget(self.user_label, 1)
         self.setRoleAccess()  # 设置用户访问权限
 
-        sql = """SELECT UID, UserName FROM User_Info WHERE UserName LIKE %s"""
         db = DBHelper()
+        try:
+            user = UserRepository(db).get_by_name(username)
+        finally:
+            db.close()
+        set_user(user['UID'], user['UserName'])
 
-        user_res = db.execute_query(sql, (username,))
-        set_user(user_res[0]['UID'], user_res[0]['UserName'])
-
+        # 自动备份调度随主窗口启动，备份在后台线程执行
+        self.backup_scheduler = start_backup_scheduler(username, self)
 
         # 添加主窗口的菜单事件
         self.ui.menu_AmmunitionManagement.triggered.connect(self.menu_AmmunitionManagement_click)
@@ -75,6 +86,7 @@ class MainWindow(QMainWindow):
         self.ui.menu_ChangePwd.triggered.connect(self.menu_changepwd_click)
         self.ui.menu_DataRestore.triggered.connect(self.menu_datarestore_click)
         self.ui.menu_Config.triggered.connect(self.menu_config_click)
+        self.menu_Performance.triggered.connect(self.menu_performance_click)
 
     def init_toolbar(self):
         # ====== 2. 设置工具栏高度 ======
@@ -131,6 +143,7 @@ class MainWindow(QMainWindow):
             self.ui.menu_DataRestore.setVisible(False)
             self.ui.menu_UserMag.setVisible(False)
             self.ui.menu_Config.setVisible(False)
+            self.menu_Performance.setVisible(False)
 
     # 单击机场跑道数据管理
     def menu_AmmunitionManagement_click(self):
@@ -197,13 +210,18 @@ class MainWindow(QMainWindow):
 
     # 数据备份和恢复
     def menu_datarestore_click(self):
-        self.frm_datarestore = DataRestore(self.username)
+        self.frm_datarestore = DataRestore(self.username, self.backup_scheduler)
         self.frm_datarestore.exec()
 
     def menu_config_click(self):
         self.frm_config = ConfigEditorDialog()
         self.frm_config.show()
 
+    # 性能监控
+    def menu_performance_click(self):
+        self.frm_performance = PerformanceDialog(self)
+        self.frm_performance.show()
+
 
 if __name__ == "__main__":
     # 运行应用
@@ -15,7 +15,10 @@ from UIs.Frm_PG_AssessmentReport_Add import Ui_Frm_PG_AssessmentReport_Add
 from damage_models import AssessmentReport
 from damage_models.sql_repository_dbhelper import AssessmentReportRepository, AssessmentResultRepository
 from BusinessCode.AssessmentSelectorDialog import AssessmentSelectorDialog
+from BusinessCode.AssessmentService import save_report
 from DBCode.DBHelper import DBHelper
+from DBCode.LookupCache import LOOKUPS
+from DBCode.UserRepository import UserRepository
 from loguru import logger
 from BusinessCode.UserContext import get_user
 
@@ -73,7 +76,7 @@ class AssessmentReportEditor(QDialog):
         # 毁伤等级
         if self.ui.cmb_damage_degree.count() == 0:
             self.ui.cmb_damage_degree.clear()
-            self.ui.cmb_damage_degree.addItems(["未达到轻度毁伤", "轻度毁伤", "中度毁伤", "重度毁伤", "完全摧毁"])
+            self.ui.cmb_damage_degree.addItems(LOOKUPS.values("damage_degree"))
 
     def _set_default_values(self):
         """设置默认值（仅在添加模式下）"""
@@ -269,29 +272,24 @@ class AssessmentReportEditor(QDialog):
             if self.ui.ed_reviewer.text().strip():
                 report.Reviewer = self.ui.ed_reviewer.text().strip()
 
-            # 保存到数据库
-            db = DBHelper()
+            # 保存到数据库（见 AssessmentService.save_report）
+            if self.mode != AssessmentReportEditorMode.Add:
+                report.ReportID = self.edit_report_id
             try:
-                repo = AssessmentReportRepository(db)
-
+                new_id = save_report(report)
                 if self.mode == AssessmentReportEditorMode.Add:
-                    new_id = repo.add(report)
                     QMessageBox.information(self, "成功", f"添加成功，报告ID: {new_id}")
                 else:
-                    report.ReportID = self.edit_report_id
-                    if repo.update(report):
-                        QMessageBox.information(self, "成功", "更新成功")
-                    else:
-                        QMessageBox.warning(self, "失败", "更新失败")
-
-                self.finished_with_result.emit(True)
-                self.close()
-
+                    QMessageBox.information(self, "成功", "更新成功")
+            except LookupError:
+                QMessageBox.warning(self, "失败", "更新失败")
             except Exception as e:
                 logger.exception(e)
                 QMessageBox.warning(self, "错误", f"保存失败：{e}")
-            finally:
-                db.close()
+                return
+
+            self.finished_with_result.emit(True)
+            self.close()
 
         except ValueError as ve:
             QMessageBox.warning(self, "输入错误", f"数值格式不正确：{ve}")
@@ -307,10 +305,7 @@ class AssessmentReportEditor(QDialog):
     def get_user_byID(self, user_id):
         db = DBHelper()
         try:
-            query = "select UID, UserName FROM User_Info WHERE UID = %s"
-            result = db.execute_query(query, (user_id,))
-            if result:
-                return result[0]
+            return UserRepository(db).get_by_id(user_id)
         finally:
             db.close()
 
@@ -14,7 +14,9 @@ from PyQt6.QtWidgets import QApplication, QMessageBox, QDialog
 from UIs.Frm_PG_AssessmentResult_Add import Ui_Frm_PG_AssessmentResult_Add
 from damage_models import AssessmentResult
 from damage_models.sql_repository_dbhelper import AssessmentResultRepository, DamageSceneRepository
+from BusinessCode.AssessmentService import save_result
 from DBCode.DBHelper import DBHelper
+from DBCode.LookupCache import LOOKUPS
 from loguru import logger
 
 
@@ -77,7 +79,7 @@ class AssessmentResultEditor(QDialog):
         # 毁伤等级
         if self.ui.cmb_damage_degree.count() == 0:
             self.ui.cmb_damage_degree.clear()
-            self.ui.cmb_damage_degree.addItems(["未达到轻度毁伤", "轻度毁伤", "中度毁伤", "重度毁伤", "完全摧毁"])
+            self.ui.cmb_damage_degree.addItems(LOOKUPS.values("damage_degree"))
 
     def _set_default_values(self):
         """设置默认值（仅在添加模式下）"""
@@ -326,29 +328,24 @@ class AssessmentResultEditor(QDialog):
                 result.Discturction = float(self.ui.ed_discturction.text().strip())
             result.DamageDegree = self.ui.cmb_damage_degree.currentText()
 
-            # 保存到数据库
-            db = DBHelper()
+            # 保存到数据库（见 AssessmentService.save_result）
+            if self.mode != AssessmentResultEditorMode.Add:
+                result.DAID = self.edit_result_id
             try:
-                repo = AssessmentResultRepository(db)
-
+                new_id = save_result(result)
                 if self.mode == AssessmentResultEditorMode.Add:
-                    new_id = repo.add(result)
                     QMessageBox.information(self, "成功", f"添加成功，ID: {new_id}")
                 else:
-                    result.DAID = self.edit_result_id
-                    if repo.update(result):
-                        QMessageBox.information(self, "成功", "更新成功")
-                    else:
-                        QMessageBox.warning(self, "失败", "更新失败")
-
-                self.finished_with_result.emit(True)
-                self.close()
-
+                    QMessageBox.information(self, "成功", "更新成功")
+            except LookupError:
+                QMessageBox.warning(self, "失败", "更新失败")
             except Exception as e:
                 logger.exception(e)
                 QMessageBox.warning(self, "错误", f"保存失败：{e}")
-            finally:
-                db.close()
+                return
+
+            self.finished_with_result.emit(True)
+            self.close()
 
         except ValueError as ve:
             QMessageBox.warning(self, "输入错误", f"数值格式不正确：{ve}")
@@ -363,48 +360,39 @@ class AssessmentResultEditor(QDialog):
 
     def load_target_from_db_by_TarID(self, target_type, target_id):
         try:
-            db = DBHelper()
-            try:
-                from target_model.sql_repository import SQLRepository as TargetModelSQLRepository
-                from target_model.db import session_scope as target_session_scope
-                from target_model.entities import AirportRunway, AircraftShelter, UndergroundCommandPost
+            from target_model.sql_repository import SQLRepository as TargetModelSQLRepository
+            from target_model.db import session_scope as target_session_scope
+            from target_model.entities import AirportRunway, AircraftShelter, UndergroundCommandPost
+            entity_cls, name_attr = {
+                1: (AirportRunway, "runway_name"),
+                2: (AircraftShelter, "shelter_name"),
+                3: (UndergroundCommandPost, "ucc_name"),
+            }.get(target_type, (None, None))
+            if entity_cls is not None:
+                # 按主键读取，未变化的记录由实体缓存返回
                 with target_session_scope() as session:
-                    target_repo = TargetModelSQLRepository(session)
-                if target_type == 1:
-                    self.target = target_repo.get(target_id, AirportRunway)
-                    self.target_name = self.target.runway_name
-                elif target_type == 2:
-                    self.target = target_repo.get(target_id, AircraftShelter)
-                    self.target_name = self.target.shelter_name
-                elif target_type == 3:
-                    self.target = target_repo.get(target_id, UndergroundCommandPost)
-                    self.target_name = self.target.ucc_name
-                if self.target:
-                    logger.info(f"成功加载弹目标信息: AMID={target_id}")
-                else:
-                    QMessageBox.warning(self, "警告", f"未找到ID为 {target_id} 的目标结果")
-            finally:
-                db.close()
+                    self.target = TargetModelSQLRepository(session).get(target_id, entity_cls)
+                self.target_name = getattr(self.target, name_attr, None)
+            if self.target:
+                logger.info(f"成功加载弹目标信息: AMID={target_id}")
+            else:
+                QMessageBox.warning(self, "警告", f"未找到ID为 {target_id} 的目标结果")
         except Exception as e:
             logger.exception(e)
             QMessageBox.warning(self, "错误", f"加载关联信息失败：{e}")
 
     def load_am_from_db_by_AMID(self, am_id: int):
         try:
-            db = DBHelper()
-            try:
-                from am_models.sql_repository import SQLRepository as AmModelSQLRepository
-                from am_models.db import session_scope as am_session_scope
-                with am_session_scope() as session:
-                    am_repo = AmModelSQLRepository(session)
-                am = am_repo.get(am_id)
-                if am:
-                    self.am = am
-                    logger.info(f"成功加载弹药信息: AMID={am_id}")
-                else:
-                    QMessageBox.warning(self, "警告", f"未找到ID为 {am_id} 的弹药结果")
-            finally:
-                db.close()
+            from am_models.sql_repository import SQLRepository as AmModelSQLRepository
+            from am_models.db import session_scope as am_session_scope
+            # 按主键读取，未变化的记录由实体缓存返回
+            with am_session_scope() as session:
+                am = AmModelSQLRepository(session).get(am_id)
+            if am:
+                self.am = am
+                logger.info(f"成功加载弹药信息: AMID={am_id}")
+            else:
+                QMessageBox.warning(self, "警告", f"未找到ID为 {am_id} 的弹药结果")
         except Exception as e:
             logger.exception(e)
             QMessageBox.warning(self, "错误", f"加载关联信息失败：{e}")
@@ -3,8 +3,8 @@
 """
 import os
 import sys
+import threading
 from datetime import datetime
-from typing import List
 
 # 添加项目根目录到路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -15,74 +15,95 @@ from PyQt6.QtWidgets import (
     QComboBox, QProgressBar, QMessageBox, QFileDialog, QApplication
 )
 
-from damage_models import AssessmentResult, CSVExporter, JSONExporter
+from damage_models import CSVExporter, JSONExporter
 from damage_models.sql_repository_dbhelper import AssessmentResultRepository
 from DBCode.DBHelper import DBHelper
+from DBCode.Metrics import METRICS
 from loguru import logger
 
 
 class ExportWorker(QThread):
-    """导出工作线程"""
+    """
+    导出工作线程
+    按块从数据库流式读取（DBHelper.iter_query）并直接写入文件，内存占用与总记录数无关；
+    进度按 COUNT(*) 得到的总数计算，cancel() 后在下一块处停止并删除未完成的文件。
+    """
     progress = pyqtSignal(int)
     message = pyqtSignal(str)
     error = pyqtSignal(str)
     done = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    CHUNK_SIZE = 1000
 
     def __init__(self, out_dir: str, fmt: str, parent=None):
         super().__init__(parent)
         self.out_dir = out_dir
         self.fmt = fmt.lower().strip()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
 
     def run(self):
-        """执行导出"""
+        # 耗时与导出记录数计入 export.* 指标（见 DBCode.Metrics）
+        with METRICS.timer(f"export.assessment_result.{self.fmt}") as t:
+            t.rows = self._export()
+
+    def _export(self):
+        """执行导出，成功时返回导出的记录数"""
+        if self.fmt == "csv":
+            exporter, ext = CSVExporter(), "CSV"
+        elif self.fmt == "json":
+            exporter, ext = JSONExporter(), "JSON"
+        else:
+            self.error.emit(f"不支持的导出格式：{self.fmt}")
+            return
+
         db = DBHelper()
+        filename = None
+        chunks = None
         try:
-            self.message.emit("正在读取数据...")
+            self.message.emit("正在统计记录数...")
             repo = AssessmentResultRepository(db)
-            items: List[AssessmentResult] = repo.get_all()
-
-            self.progress.emit(30)
-
-            if not items:
+            total = repo.count_all()
+            if total == 0:
                 self.error.emit("没有数据可导出")
                 return
 
             # 生成文件名
             ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = os.path.join(self.out_dir, f"AssessmentResult_{ts}.{self.fmt}")
+            self.message.emit(f"正在生成{ext}文件...")
+            self.progress.emit(1)
+
+            written = 0
+            chunks = repo.iter_all(self.CHUNK_SIZE)
+            with open(filename, 'wb') as f:
+                for written in exporter.export_stream(chunks, f):
+                    if self._cancel.is_set():
+                        break
+                    # 总数为导出开始前的统计值，期间新增的记录可能使写入数超出
+                    self.progress.emit(min(99, 1 + written * 98 // total))
+                    self.message.emit(f"正在生成{ext}文件... {written}/{total}")
+
+            if self._cancel.is_set():
+                os.remove(filename)
+                self.cancelled.emit()
+                return
 
-            if self.fmt == "csv":
-                filename = os.path.join(self.out_dir, f"AssessmentResult_{ts}.csv")
-                self.message.emit("正在生成CSV文件...")
-
-                exporter = CSVExporter()
-                data = exporter.export(items)
-
-                with open(filename, 'wb') as f:
-                    f.write(data)
-
-                self.progress.emit(100)
-                self.done.emit(filename)
-
-            elif self.fmt == "json":
-                filename = os.path.join(self.out_dir, f"AssessmentResult_{ts}.json")
-                self.message.emit("正在生成JSON文件...")
-
-                exporter = JSONExporter()
-                data = exporter.export(items)
-
-                with open(filename, 'wb') as f:
-                    f.write(data)
-
-                self.progress.emit(100)
-                self.done.emit(filename)
-
-            else:
-                self.error.emit(f"不支持的导出格式：{self.fmt}")
+            self.progress.emit(100)
+            self.done.emit(filename)
+            return written
 
         except Exception as e:
             logger.exception(e)
+            if filename and os.path.exists(filename):
+                os.remove(filename)
             self.error.emit(f"导出失败：{e}")
         finally:
+            if chunks is not None:
+                chunks.close()
             db.close()
 
 
@@ -141,6 +162,11 @@ class AssessmentResultExportDialog(QDialog):
         self.btn_export.clicked.connect(self._on_export)
         btn_layout.addWidget(self.btn_export)
 
+        self.btn_cancel = QPushButton("取消导出")
+        self.btn_cancel.setEnabled(False)
+        self.btn_cancel.clicked.connect(self._on_cancel)
+        btn_layout.addWidget(self.btn_cancel)
+
         btn_close = QPushButton("关闭")
         btn_close.clicked.connect(self.close)
         btn_layout.addWidget(btn_close)
@@ -170,6 +196,8 @@ class AssessmentResultExportDialog(QDialog):
 
         # 禁用导出按钮
         self.btn_export.setEnabled(False)
+        self.btn_cancel.setEnabled(True)
+        self.progress_bar.setValue(0)
 
         # 创建工作线程
         self.worker = ExportWorker(out_dir, self.cmb_format.currentText())
@@ -177,20 +205,44 @@ class AssessmentResultExportDialog(QDialog):
         self.worker.message.connect(self.lbl_status.setText)
         self.worker.error.connect(self._on_export_error)
         self.worker.done.connect(self._on_export_done)
+        self.worker.cancelled.connect(self._on_export_cancelled)
         self.worker.start()
 
+    def _on_cancel(self):
+        """取消导出（在当前块写完后停止）"""
+        if self.worker is not None and self.worker.isRunning():
+            self.btn_cancel.setEnabled(False)
+            self.lbl_status.setText("正在取消...")
+            self.worker.cancel()
+
+    def _on_export_cancelled(self):
+        """导出已取消"""
+        self.btn_export.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
+        self.progress_bar.setValue(0)
+        self.lbl_status.setText("导出已取消")
+
     def _on_export_error(self, msg: str):
         """导出出错"""
         self.btn_export.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
         self.lbl_status.setText(f"错误：{msg}")
         QMessageBox.critical(self, "导出失败", msg)
 
     def _on_export_done(self, filename: str):
         """导出完成"""
         self.btn_export.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
         self.lbl_status.setText(f"导出成功：{filename}")
         QMessageBox.information(self, "成功", f"文件已导出到：\n{filename}")
 
+    def closeEvent(self, event):
+        """关闭时取消仍在进行的导出并等待线程结束"""
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait(5000)
+        super().closeEvent(event)
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
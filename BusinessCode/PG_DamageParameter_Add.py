@@ -13,8 +13,7 @@ from PyQt6.QtWidgets import QApplication, QMessageBox, QDialog
 
 from UIs.Frm_PG_DamageParameter_Add import Ui_Frm_PG_DamageParameter_Add
 from damage_models import DamageParameter
-from damage_models.sql_repository_dbhelper import DamageParameterRepository
-from DBCode.DBHelper import DBHelper
+from BusinessCode.DamageService import get_parameter, save_parameter
 from BusinessCode.SceneSelector import SceneSelectorDialog
 from loguru import logger
 
@@ -136,49 +135,44 @@ class DamageParameterEditor(QDialog):
             QMessageBox.warning(self, "错误", f"选择场景失败：{e}")
 
     def load_data_from_db(self, param_id: int):
-        db = DBHelper()
-        try:
-            repo = DamageParameterRepository(db)
-            param = repo.get_by_id(param_id)
+        param = get_parameter(param_id)
 
-            if not param:
-                raise ValueError(f"找不到ID为{param_id}的参数")
+        if not param:
+            raise ValueError(f"找不到ID为{param_id}的参数")
 
-            # 填充表单
-            self.ui.ed_scene_code.setText(param.DSCode)
-            self.ui.ed_scene_id.setText(str(param.DSID))
+        # 填充表单
+        self.ui.ed_scene_code.setText(param.DSCode)
+        self.ui.ed_scene_id.setText(str(param.DSID))
 
-            self.ui.ed_carrier.setText(param.Carrier or "")
-            self.ui.ed_guidance_mode.setText(param.GuidanceMode or "")
+        self.ui.ed_carrier.setText(param.Carrier or "")
+        self.ui.ed_guidance_mode.setText(param.GuidanceMode or "")
 
-            # 设置战斗部类型（下拉框）
-            if param.WarheadType:
-                idx = self.ui.cmb_warhead_type.findText(param.WarheadType)
-                if idx >= 0:
-                    self.ui.cmb_warhead_type.setCurrentIndex(idx)
+        # 设置战斗部类型（下拉框）
+        if param.WarheadType:
+            idx = self.ui.cmb_warhead_type.findText(param.WarheadType)
+            if idx >= 0:
+                self.ui.cmb_warhead_type.setCurrentIndex(idx)
 
-            self.ui.ed_charge_amount.setText(str(param.ChargeAmount) if param.ChargeAmount else "")
+        self.ui.ed_charge_amount.setText(str(param.ChargeAmount) if param.ChargeAmount else "")
 
-            self.ui.ed_drop_height.setText(str(param.DropHeight) if param.DropHeight else "")
-            self.ui.ed_drop_speed.setText(str(param.DropSpeed) if param.DropSpeed else "")
-            self.ui.ed_drop_mode.setText(param.DropMode or "")
-            self.ui.ed_flight_range.setText(str(param.FlightRange) if param.FlightRange else "")
+        self.ui.ed_drop_height.setText(str(param.DropHeight) if param.DropHeight else "")
+        self.ui.ed_drop_speed.setText(str(param.DropSpeed) if param.DropSpeed else "")
+        self.ui.ed_drop_mode.setText(param.DropMode or "")
+        self.ui.ed_flight_range.setText(str(param.FlightRange) if param.FlightRange else "")
 
-            # 电磁干扰
-            if param.ElectroInterference:
-                idx = self.ui.cmb_electro_interference.findText(param.ElectroInterference)
-                if idx >= 0:
-                    self.ui.cmb_electro_interference.setCurrentIndex(idx)
+        # 电磁干扰
+        if param.ElectroInterference:
+            idx = self.ui.cmb_electro_interference.findText(param.ElectroInterference)
+            if idx >= 0:
+                self.ui.cmb_electro_interference.setCurrentIndex(idx)
 
-            # 天气
-            if param.WeatherConditions:
-                idx = self.ui.cmb_weather_conditions.findText(param.WeatherConditions)
-                if idx >= 0:
-                    self.ui.cmb_weather_conditions.setCurrentIndex(idx)
+        # 天气
+        if param.WeatherConditions:
+            idx = self.ui.cmb_weather_conditions.findText(param.WeatherConditions)
+            if idx >= 0:
+                self.ui.cmb_weather_conditions.setCurrentIndex(idx)
 
-            self.ui.ed_wind_speed.setText(str(param.WindSpeed) if param.WindSpeed else "")
-        finally:
-            db.close()
+        self.ui.ed_wind_speed.setText(str(param.WindSpeed) if param.WindSpeed else "")
 
     def collect_form_data(self) -> dict:
         """收集表单数据"""
@@ -235,23 +229,16 @@ class DamageParameterEditor(QDialog):
                 #DPStatus=data['DPStatus']
             )
 
-            # 保存到数据库
-            db = DBHelper()
+            # 保存到数据库（见 DamageService.save_parameter）
             try:
-                repo = DamageParameterRepository(db)
-
-                if self.mode == DamageParameterEditorMode.Add:
-                    param_id = repo.add(param)
-                    QMessageBox.information(self, "保存成功", f"参数已添加，ID={param_id}")
-                else:
-                    success = repo.update(param)
-                    if success:
-                        QMessageBox.information(self, "保存成功", "参数已更新")
-                    else:
-                        QMessageBox.warning(self, "保存失败", "更新失败，参数不存在")
-                        return
-            finally:
-                db.close()
+                param_id = save_parameter(param)
+            except LookupError as e:
+                QMessageBox.warning(self, "保存失败", str(e))
+                return
+            if self.mode == DamageParameterEditorMode.Add:
+                QMessageBox.information(self, "保存成功", f"参数已添加，ID={param_id}")
+            else:
+                QMessageBox.information(self, "保存成功", "参数已更新")
 
             # 通知父窗口
             self.finished_with_result.emit(True)
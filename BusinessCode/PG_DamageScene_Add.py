@@ -16,8 +16,9 @@ from PyQt6.QtWidgets import (
 
 from UIs.Frm_PG_DamageScene_Add import Ui_Frm_PG_DamageScene_Add
 from damage_models import DamageScene, DamageParameter
-from damage_models.sql_repository_dbhelper import DamageSceneRepository, DamageParameterRepository
-from DBCode.DBHelper import DBHelper
+from BusinessCode.AmmunitionService import get_ammunition
+from BusinessCode.DamageService import get_scene, save_scene, scene_parameters
+from BusinessCode.TargetService import TARGET_TYPES, get_target
 from BusinessCode.AmmunitionSelector import AmmunitionSelectorDialog
 from BusinessCode.TargetSelector import TargetSelectorDialog
 from loguru import logger
@@ -46,6 +47,7 @@ class DamageSceneEditor(QDialog):
         self.mode = mode
         self.edit_scene_id = edit_scene_id
         self.parameters = []  # 存储场景关联的参数列表
+        self._deleted_param_ids: List[int] = []  # 待删除的已入库参数，保存时与场景同一事务提交
 
         self.ammunition_id = 0
         self.target_id = 0
@@ -238,15 +240,8 @@ class DamageSceneEditor(QDialog):
 
             if dialog.exec() == QDialog.DialogCode.Accepted:
                 updated_param = dialog.get_parameter()
+                # 只加入内存列表，点击保存时与场景一起批量入库
                 self.parameters.append(updated_param)
-                db = DBHelper()
-                try:
-                    repo = DamageParameterRepository(db)
-                    #self.parameters = repo.add(updated_param)
-                except Exception as e:
-                    logger.exception(e)
-                finally:
-                    db.close()
                 self._setup_table()
                 logger.info(f"参数添加成功，当前参数数量: {len(self.parameters)}")
         except Exception as e:
@@ -287,23 +282,9 @@ class DamageSceneEditor(QDialog):
             )
 
             if reply == QMessageBox.StandardButton.Yes:
-                # 如果参数已经存在于数据库中（有DPID），需要从数据库删除
+                # 如果参数已经存在于数据库中（有DPID），记录下来在保存时删除
                 if param.DPID:
-                    db = DBHelper()
-                    try:
-                        from damage_models.sql_repository_dbhelper import DamageParameterRepository
-                        repo = DamageParameterRepository(db)
-                        success = repo.delete(param.DPID)
-                        if success:
-                            logger.info(f"已从数据库删除参数 ID={param.DPID}")
-                        else:
-                            logger.warning(f"从数据库删除参数 ID={param.DPID} 失败")
-                    except Exception as e:
-                        logger.exception(e)
-                        QMessageBox.warning(self, "错误", f"从数据库删除参数失败：{e}")
-                        return
-                    finally:
-                        db.close()
+                    self._deleted_param_ids.append(param.DPID)
 
                 # 从内存列表中删除
                 self.parameters.pop(index)
@@ -313,66 +294,36 @@ class DamageSceneEditor(QDialog):
 
     def _load_scene_parameters(self, scene_id: int):
         """加载场景关联的参数"""
-        db = DBHelper()
         try:
-            repo = DamageParameterRepository(db)
-            self.parameters = repo.get_by_scene_id(scene_id)
-            # self._setup_table(self.edit_scene_id)
+            self.parameters = scene_parameters(scene_id)
         except Exception as e:
             logger.exception(e)
-        finally:
-            db.close()
 
     def load_data_from_db(self, scene_id: int):
-        db = DBHelper()
-        try:
-            repo = DamageSceneRepository(db)
-            scene = repo.get_by_id(scene_id)
-
-            if not scene:
-                raise ValueError(f"找不到ID为{scene_id}的场景")
-
-            # 填充表单
-            self.ui.ed_scene_code.setText(scene.DSCode)
-            self.ui.ed_scene_name.setText(scene.DSName)
-            self.ui.ed_offensive.setText(scene.DSOffensive or "")
-            self.ui.ed_defensive.setText(scene.DSDefensive or "")
-            self.ui.ed_battle.setText(scene.DSBattle or "")
-
-            #self.ui.ed_ammunition_code.setText(scene.AMCode)
-            #self.ui.ed_ammunition_id.setText(str(scene.AMID))
-            self.ammunition_id = scene.AMID
-            from am_models.sql_repository import SQLRepository as AmModelSQLRepository
-            from am_models.db import session_scope as AmSessionScope
-            with AmSessionScope() as session:
-                am_repo = AmModelSQLRepository(session)
-            self.ammunition = am_repo.get(self.ammunition_id)
-
-            # 目标类型：1=跑道, 2=掩体, 3=地下目标
-            if scene.TargetType in [1, 2, 3]:
-                self.ui.cmb_target_type.setCurrentIndex(scene.TargetType - 1)
-            #self.ui.ed_target_id.setText(str(scene.TargetID))
-            self.target_type = scene.TargetType
-            self.target_id = scene.TargetID
-            #self.ui.ed_target_code.setText(scene.TargetCode)
-            from target_model.sql_repository import SQLRepository as TargetModelSQLRepository
-            from target_model.db import session_scope as TargetModelSessionScope
-            with TargetModelSessionScope() as session:
-                target_repo = TargetModelSQLRepository(session)
-            from target_model.entities import AirportRunway, AircraftShelter, UndergroundCommandPost
-            if scene.TargetType == 1:
-                entity_cls = AirportRunway
-            elif scene.TargetType == 2:
-                entity_cls = AircraftShelter
-            else:
-                entity_cls = UndergroundCommandPost
-            self.target = target_repo.get(self.target_id, entity_cls)
-
-            # 加载关联的参数
-            self._load_scene_parameters(scene_id)
-            self._setup_table()
-        finally:
-            db.close()
+        scene = get_scene(scene_id)
+        if not scene:
+            raise ValueError(f"找不到ID为{scene_id}的场景")
+
+        # 填充表单
+        self.ui.ed_scene_code.setText(scene.DSCode)
+        self.ui.ed_scene_name.setText(scene.DSName)
+        self.ui.ed_offensive.setText(scene.DSOffensive or "")
+        self.ui.ed_defensive.setText(scene.DSDefensive or "")
+        self.ui.ed_battle.setText(scene.DSBattle or "")
+
+        self.ammunition_id = scene.AMID
+        self.ammunition = get_ammunition(self.ammunition_id)
+
+        # 目标类型：1=跑道, 2=掩体, 3=地下目标
+        if scene.TargetType in [1, 2, 3]:
+            self.ui.cmb_target_type.setCurrentIndex(scene.TargetType - 1)
+        self.target_type = scene.TargetType
+        self.target_id = scene.TargetID
+        self.target = get_target(TARGET_TYPES.get(scene.TargetType, "ucc"), self.target_id)
+
+        # 加载关联的参数
+        self._load_scene_parameters(scene_id)
+        self._setup_table()
 
     def collect_form_data(self) -> dict:
         """收集表单数据"""
@@ -445,55 +396,26 @@ class DamageSceneEditor(QDialog):
                 DSStatus=data['DSStatus']
             )
 
-            # 保存到数据库
-            db = DBHelper()
+            # 场景与全部参数在同一事务内保存（见 DamageService.save_scene）
             try:
-                repo = DamageSceneRepository(db)
-                param_repo = DamageParameterRepository(db)
-
-                if self.mode == DamageSceneEditorMode.Add:
-                    scene_id = repo.add(scene)
-                    if scene_id == 0:
-                        QMessageBox.warning(self, "错误", f"弹药代码或名称重复")
-                        return
-
-                    # 保存关联的参数
-                    saved_count = 0
-                    for param in self.parameters:
-                        param.DSID = scene_id['DSID']
-                        param.DSCode = data['DSCode']
-                        param_repo.add(param)
-                        saved_count += 1
-
-                    msg = f"毁伤场景已添加"
-                    if saved_count > 0:
-                        msg += f"\n同时添加了 {saved_count} 个关联参数"
-                    QMessageBox.information(self, "保存成功", msg)
-                    logger.info("添加毁伤场景: {}", scene_id)
-                else:
-                    success = repo.update(scene)
-                    if success:
-                        # 更新关联的参数
-                        saved_count = 0
-                        for param in self.parameters:
-                            if param.DPID:
-                                param_repo.update(param)
-                            else:
-                                param.DSID = self.edit_scene_id
-                                param.DSCode = data['DSCode']
-                                param_repo.add(param)
-                            saved_count += 1
-
-                        msg = "场景已更新"
-                        if saved_count > 0:
-                            msg += f"\n同时保存了 {saved_count} 个关联参数"
-                        QMessageBox.information(self, "保存成功", msg)
-                    else:
-                        QMessageBox.warning(self, "保存失败", "更新失败，场景不存在")
-                        return
-                    logger.info("更新毁伤场景: ", {scene.DSID})
-            finally:
-                db.close()
+                dsid = save_scene(scene, self.parameters, self._deleted_param_ids)
+            except (ValueError, LookupError) as e:
+                QMessageBox.warning(self, "保存失败", str(e))
+                return
+
+            saved_count = len(self.parameters)
+            self._deleted_param_ids.clear()
+            if self.mode == DamageSceneEditorMode.Add:
+                msg = f"毁伤场景已添加"
+                if saved_count > 0:
+                    msg += f"\n同时添加了 {saved_count} 个关联参数"
+                logger.info("添加毁伤场景: {}", dsid)
+            else:
+                msg = "场景已更新"
+                if saved_count > 0:
+                    msg += f"\n同时保存了 {saved_count} 个关联参数"
+                logger.info("更新毁伤场景: {}", dsid)
+            QMessageBox.information(self, "保存成功", msg)
 
             # 通知父窗口
             self.finished_with_result.emit(True)
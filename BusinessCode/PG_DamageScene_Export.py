@@ -18,6 +18,7 @@ from PyQt6.QtWidgets import (
 from damage_models import DamageScene, CSVExporter, JSONExporter
 from damage_models.sql_repository_dbhelper import DamageSceneRepository
 from DBCode.DBHelper import DBHelper
+from DBCode.Metrics import METRICS
 from loguru import logger
 
 
@@ -34,7 +35,12 @@ class ExportWorker(QThread):
         self.fmt = fmt.lower().strip()
 
     def run(self):
-        """执行导出"""
+        # 耗时与导出记录数计入 export.* 指标（见 DBCode.Metrics）
+        with METRICS.timer(f"export.damage_scene.{self.fmt}") as t:
+            t.rows = self._export()
+
+    def _export(self):
+        """执行导出，成功时返回导出的记录数"""
         db = DBHelper()
         try:
             self.message.emit("正在读取数据...")
@@ -62,6 +68,7 @@ class ExportWorker(QThread):
 
                 self.progress.emit(100)
                 self.done.emit(filename)
+                return len(items)
 
             elif self.fmt == "json":
                 filename = os.path.join(self.out_dir, f"DamageScene_{ts}.json")
@@ -75,6 +82,7 @@ class ExportWorker(QThread):
 
                 self.progress.emit(100)
                 self.done.emit(filename)
+                return len(items)
 
             else:
                 self.error.emit(f"不支持的导出格式：{self.fmt}")
@@ -0,0 +1,111 @@
+"""
+密码哈希策略（bcrypt）
+
+bcrypt 的代价因子（rounds）每加 1 耗时翻倍。固定的 gensalt() 默认值在慢的客户端上可能使登录校验
+耗时数秒，这里按本机实测速度确定代价：
+- calibrate() 实测 MIN_ROUNDS 的哈希耗时，取估计耗时不超过 bcrypt_target_ms 的最大代价
+  （夹在 MIN_ROUNDS..MAX_ROUNDS 之间），结果与校准日期写入配置，超过 RECALIBRATE_DAYS 天重新校准
+- 新密码（注册、修改、重置）统一用 hash_password() 按该代价生成
+- 登录成功后 needs_rehash() 为真（库中哈希代价高于本机目标，或低于下限）时用明文重新生成哈希，
+  使之后的校验耗时可预期；不会因本机更快而把已有哈希升级，避免多台客户端来回改写
+
+本模块不创建界面对象，可在登录线程中调用。
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from datetime import date, datetime
+from typing import Optional, Union
+
+import bcrypt
+from loguru import logger
+
+from BusinessCode.ConfigStore import load_config, save_config
+
+MIN_ROUNDS = 10
+MAX_ROUNDS = 14
+DEFAULT_TARGET_MS = 250.0
+RECALIBRATE_DAYS = 30
+
+_RE_COST = re.compile(r"^\$2[abxy]?\$(\d{2})\$")
+_lock = threading.Lock()
+_rounds: Optional[int] = None
+
+
+def _as_bytes(value: Union[str, bytes]) -> bytes:
+    return value.encode("utf-8") if isinstance(value, str) else value
+
+
+def hash_rounds(hashed: Union[str, bytes]) -> Optional[int]:
+    """从 $2b$12$... 形式的哈希中取出代价因子；格式不符时返回 None"""
+    m = _RE_COST.match(_as_bytes(hashed).decode("ascii", "replace"))
+    return int(m.group(1)) if m else None
+
+
+def calibrate(target_ms: float = DEFAULT_TARGET_MS) -> int:
+    """按本机速度估算耗时不超过 target_ms 的最大代价因子"""
+    salt = bcrypt.gensalt(rounds=MIN_ROUNDS)
+    base_ms = min(_time_hash(salt) for _ in range(2))
+    rounds = MIN_ROUNDS
+    while rounds < MAX_ROUNDS and base_ms * (2 ** (rounds + 1 - MIN_ROUNDS)) <= target_ms:
+        rounds += 1
+    logger.info(f"bcrypt 校准：代价 {MIN_ROUNDS} 耗时 {base_ms:.0f} ms，目标 {target_ms:.0f} ms -> 代价 {rounds}")
+    return rounds
+
+
+def _time_hash(salt: bytes) -> float:
+    t0 = time.perf_counter()
+    bcrypt.hashpw(b"calibration", salt)
+    return (time.perf_counter() - t0) * 1000
+
+
+def target_rounds() -> int:
+    """本机使用的代价因子：取配置中的校准结果，缺失或过期时重新校准并保存"""
+    global _rounds
+    with _lock:
+        if _rounds is not None:
+            return _rounds
+        cfg = load_config()
+        try:
+            target_ms = float(cfg.get("bcrypt_target_ms") or DEFAULT_TARGET_MS)
+        except ValueError:
+            target_ms = DEFAULT_TARGET_MS
+        rounds = _configured_rounds(cfg)
+        if rounds is None:
+            rounds = calibrate(target_ms)
+            save_config({"bcrypt_rounds": str(rounds), "bcrypt_calibrated": date.today().isoformat()})
+        _rounds = rounds
+        return rounds
+
+
+def _configured_rounds(cfg) -> Optional[int]:
+    try:
+        rounds = int(cfg.get("bcrypt_rounds") or 0)
+        calibrated = datetime.strptime(cfg.get("bcrypt_calibrated") or "", "%Y-%m-%d").date()
+    except ValueError:
+        return None
+    if not MIN_ROUNDS <= rounds <= MAX_ROUNDS or (date.today() - calibrated).days > RECALIBRATE_DAYS:
+        return None
+    return rounds
+
+
+def hash_password(password: str) -> str:
+    """按本机代价因子生成哈希（存入 User_Info.UPassword）"""
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=target_rounds())).decode("utf-8")
+
+
+def verify_password(password: str, hashed: Union[str, bytes]) -> bool:
+    try:
+        return bcrypt.checkpw(password.encode("utf-8"), _as_bytes(hashed))
+    except ValueError:
+        # 库中不是合法的 bcrypt 哈希
+        return False
+
+
+def needs_rehash(hashed: Union[str, bytes]) -> bool:
+    rounds = hash_rounds(hashed)
+    if rounds is None:
+        return False
+    return rounds < MIN_ROUNDS or rounds > target_rounds()
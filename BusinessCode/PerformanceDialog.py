@@ -0,0 +1,207 @@
+"""
+性能监控窗口（系统综合管理 → 性能监控）
+
+显示 DBCode.Metrics 中各指标的滚动直方图：SQL 耗时与行数、索引构建/检索、导出吞吐、界面卡顿，
+以及实体缓存 / 检索规格的统计；可导出为 JSON。
+界面卡顿由 UiStallMonitor 采集：界面线程上的定时器按固定间隔触发，实际间隔超出阈值的部分
+即界面线程被占用（无法处理事件）的时长，记为 ui.stall。
+"""
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from loguru import logger
+from PyQt6.QtCore import QObject, Qt, QTimer
+from PyQt6.QtWidgets import (
+    QAbstractItemView, QCheckBox, QDialog, QFileDialog, QHBoxLayout, QHeaderView, QLabel,
+    QMessageBox, QPushButton, QSplitter, QTableWidget, QTableWidgetItem, QVBoxLayout, QWidget
+)
+
+from BusinessCode.QuerySpec import QUERY_STATS
+from DBCode.EntityCache import ENTITY_CACHE
+from DBCode.LookupCache import LOOKUPS
+from DBCode.Metrics import METRICS
+from DBCode.SelectorIndex import SELECTOR_INDEX
+
+
+class UiStallMonitor(QObject):
+    """界面线程卡顿检测：定时器实际触发间隔比预期晚 threshold_ms 以上时记录一次 ui.stall"""
+
+    def __init__(self, parent: Optional[QObject] = None, interval_ms: int = 50,
+                 threshold_ms: float = 100.0) -> None:
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self.threshold_ms = threshold_ms
+        self._last = 0.0
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._tick)
+
+    def start(self) -> None:
+        self._last = time.perf_counter()
+        self._timer.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+
+    def _tick(self) -> None:
+        now = time.perf_counter()
+        late_ms = (now - self._last) * 1000 - self.interval_ms
+        self._last = now
+        if late_ms >= self.threshold_ms:
+            METRICS.observe("ui.stall", late_ms)
+
+
+def _fmt(value: Any, digits: int = 1) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.{digits}f}"
+    return str(value)
+
+
+def collect_extra() -> Dict[str, Any]:
+    """直方图之外的统计：实体缓存、检索规格、取值字典 / 检索索引载入次数"""
+    return {
+        "entity_cache": ENTITY_CACHE.stats(),
+        "query_specs": {
+            name: {"count": st.count, "avg_ms": st.avg_ms, "max_ms": st.max_ms,
+                   "last_ms": st.last_ms, "last_rows": st.last_rows}
+            for name, st in sorted(QUERY_STATS.items())
+        },
+        "lookup_loads": LOOKUPS.loads,
+        "selector_index_loads": SELECTOR_INDEX.loads,
+    }
+
+
+class PerformanceDialog(QDialog):
+    COLUMNS = ["指标", "样本数", "累计次数", "平均(ms)", "P50(ms)", "P90(ms)", "P99(ms)", "最大(ms)",
+               "行数", "行/秒"]
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("性能监控")
+        self.resize(1000, 640)
+
+        self.lb_summary = QLabel()
+        self.lb_summary.setWordWrap(True)
+
+        self.tbl_metrics = QTableWidget(0, len(self.COLUMNS))
+        self.tbl_metrics.setHorizontalHeaderLabels(self.COLUMNS)
+        self.tbl_metrics.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.tbl_metrics.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.tbl_metrics.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.tbl_metrics.verticalHeader().setVisible(False)
+        self.tbl_metrics.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.tbl_metrics.itemSelectionChanged.connect(self._show_buckets)
+
+        self.tbl_buckets = QTableWidget(0, 2)
+        self.tbl_buckets.setHorizontalHeaderLabels(["耗时区间(ms)", "次数"])
+        self.tbl_buckets.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.tbl_buckets.verticalHeader().setVisible(False)
+        self.tbl_buckets.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        splitter.addWidget(self.tbl_metrics)
+        splitter.addWidget(self.tbl_buckets)
+        splitter.setStretchFactor(0, 4)
+        splitter.setStretchFactor(1, 1)
+
+        self.chk_auto = QCheckBox("自动刷新")
+        self.chk_auto.setChecked(True)
+        self.btn_refresh = QPushButton("刷新")
+        self.btn_export = QPushButton("导出 JSON")
+        self.btn_reset = QPushButton("清空")
+        self.btn_close = QPushButton("关闭")
+
+        bar = QHBoxLayout()
+        bar.addWidget(self.chk_auto)
+        bar.addStretch()
+        for btn in (self.btn_refresh, self.btn_export, self.btn_reset, self.btn_close):
+            bar.addWidget(btn)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.lb_summary)
+        layout.addWidget(splitter, 1)
+        layout.addLayout(bar)
+
+        self.btn_refresh.clicked.connect(self.refresh)
+        self.btn_export.clicked.connect(self._export_json)
+        self.btn_reset.clicked.connect(self._reset)
+        self.btn_close.clicked.connect(self.close)
+        self.chk_auto.toggled.connect(lambda on: self._timer.start() if on else self._timer.stop())
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(1000)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start()
+
+        self._snapshot: Dict[str, Any] = {}
+        self.refresh()
+
+    def refresh(self) -> None:
+        selected = self._selected_name()
+        self._snapshot = METRICS.snapshot()
+        metrics = self._snapshot["metrics"]
+
+        self.tbl_metrics.setRowCount(len(metrics))
+        for row, (name, s) in enumerate(metrics.items()):
+            values = [name, s["count"], s["lifetime_count"], s["mean_ms"], s["p50_ms"], s["p90_ms"],
+                      s["p99_ms"], s["max_ms"], s["rows"], s["rows_per_sec"]]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(_fmt(value))
+                if col > 0:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.tbl_metrics.setItem(row, col, item)
+            if name == selected:
+                self.tbl_metrics.selectRow(row)
+
+        extra = collect_extra()
+        cache = extra["entity_cache"]
+        uptime = time.time() - self._snapshot["started"]
+        self.lb_summary.setText(
+            f"统计时长 {uptime / 60:.1f} 分钟（每项保留最近 {self._snapshot['window']} 个样本）；"
+            f"实体缓存 {cache['size']}/{cache['max_size']} 条，命中率 {cache['hit_rate']:.1%}；"
+            f"检索规格 {len(extra['query_specs'])} 个；"
+            f"取值字典载入 {extra['lookup_loads']} 次，检索索引载入 {extra['selector_index_loads']} 次"
+        )
+        self._show_buckets()
+
+    def _selected_name(self) -> Optional[str]:
+        items = self.tbl_metrics.selectedItems()
+        if not items:
+            return None
+        item = self.tbl_metrics.item(items[0].row(), 0)
+        return item.text() if item is not None else None
+
+    def _show_buckets(self) -> None:
+        name = self._selected_name()
+        summary = self._snapshot.get("metrics", {}).get(name) if name else None
+        buckets = summary["buckets"] if summary else {}
+        self.tbl_buckets.setRowCount(len(buckets))
+        for row, (label, count) in enumerate(buckets.items()):
+            self.tbl_buckets.setItem(row, 0, QTableWidgetItem(label))
+            self.tbl_buckets.setItem(row, 1, QTableWidgetItem(str(count)))
+
+    def _export_json(self) -> None:
+        default = f"performance_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        path, _ = QFileDialog.getSaveFileName(self, "导出性能数据", default, "JSON 文件 (*.json)")
+        if not path:
+            return
+        try:
+            METRICS.export_json(path, collect_extra())
+        except Exception as e:
+            logger.exception(e)
+            QMessageBox.warning(self, "错误", f"导出失败：{e}")
+            return
+        QMessageBox.information(self, "提示", f"已导出：{path}")
+
+    def _reset(self) -> None:
+        METRICS.reset()
+        self.refresh()
+
+    def closeEvent(self, event) -> None:
+        self._timer.stop()
+        super().closeEvent(event)
@@ -0,0 +1,160 @@
+"""
+检索窗口的后台查询
+
+检索在 QueryWorker 线程中执行，结果按块通过信号发回界面线程，表格边查边填充；
+数据库慢时界面仍可操作。每个窗口持有一个 QueryRunner：
+- submit() 提交新查询时取消仍在执行的上一次查询，旧查询之后发回的结果一律丢弃
+- cancel_on_edit() 关联检索条件控件，用户修改条件即取消当前查询
+- 窗口关闭时 shutdown() 取消并等待线程结束
+
+取消只停止向界面发送结果并结束迭代（关闭会话）；已发到数据库的单条语句会执行完毕。
+
+    self._runner = QueryRunner(self)
+    self._runner.chunk.connect(self._append_rows)
+    self._runner.done.connect(lambda n, ms: self._set_status(f"共找到 {n} 条记录"))
+    self._runner.failed.connect(lambda msg: QMessageBox.warning(self, "提示", msg))
+    self._runner.submit(lambda: QUERY.stream(cond))
+"""
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import closing, nullcontext
+from typing import Callable, Iterable, List, Optional, Set
+
+from loguru import logger
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+from PyQt6.QtWidgets import QAbstractButton, QAbstractSpinBox, QComboBox, QLineEdit
+
+# 返回“结果块迭代器”的函数，在后台线程中调用
+ChunkSource = Callable[[], Iterable[List[object]]]
+
+
+class QueryWorker(QThread):
+    chunk = pyqtSignal(int, object)  # (查询序号, 一块结果)
+    done = pyqtSignal(int, int, float)  # (查询序号, 总行数, 耗时 ms)
+    error = pyqtSignal(int, str)
+
+    def __init__(self, ticket: int, source: ChunkSource, parent=None) -> None:
+        super().__init__(parent)
+        self.ticket = ticket
+        self.source = source
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def run(self) -> None:
+        t0 = time.perf_counter()
+        total = 0
+        try:
+            chunks = iter(self.source())
+            # 生成器在取消时被 close，结束查询并释放会话
+            with closing(chunks) if hasattr(chunks, "close") else nullcontext():
+                for rows in chunks:
+                    if self.cancelled:
+                        return
+                    if rows:
+                        total += len(rows)
+                        self.chunk.emit(self.ticket, rows)
+            if not self.cancelled:
+                self.done.emit(self.ticket, total, (time.perf_counter() - t0) * 1000)
+        except Exception as exc:
+            logger.exception(exc)
+            if not self.cancelled:
+                self.error.emit(self.ticket, f"查询失败：{exc}")
+
+
+class QueryRunner(QObject):
+    """单个窗口的查询调度：同一时刻只有最近一次提交的查询会把结果交给窗口"""
+    started = pyqtSignal()
+    chunk = pyqtSignal(object)  # 当前查询的一块结果（list）
+    done = pyqtSignal(int, float)  # 总行数, 耗时 ms
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()  # 正在执行的查询被取消（修改条件 / 窗口关闭）
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._ticket = 0
+        self._current: Optional[QueryWorker] = None
+        self._workers: Set[QueryWorker] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._current is not None
+
+    def submit(self, source: ChunkSource) -> int:
+        """取消上一次查询并在后台执行 source()；返回本次查询序号"""
+        self._cancel_current(notify=False)
+        self._ticket += 1
+        worker = QueryWorker(self._ticket, source)
+        worker.chunk.connect(self._on_chunk)
+        worker.done.connect(self._on_done)
+        worker.error.connect(self._on_error)
+        worker.finished.connect(lambda w=worker: self._on_finished(w))
+        self._workers.add(worker)
+        self._current = worker
+        self.started.emit()
+        worker.start()
+        return self._ticket
+
+    def cancel(self) -> None:
+        self._cancel_current(notify=True)
+
+    def cancel_on_edit(self, *widgets) -> None:
+        """用户修改这些检索条件控件时取消正在执行的查询"""
+        for w in widgets:
+            if w is None:
+                continue
+            if isinstance(w, QLineEdit):
+                w.textEdited.connect(self.cancel)
+            elif isinstance(w, QComboBox):
+                w.currentTextChanged.connect(self.cancel)
+            elif isinstance(w, QAbstractButton):
+                w.toggled.connect(self.cancel)
+            elif isinstance(w, QAbstractSpinBox) and hasattr(w, "valueChanged"):
+                w.valueChanged.connect(self.cancel)
+
+    def shutdown(self, timeout_ms: int = 3000) -> None:
+        """窗口关闭时调用：取消全部查询并等待线程退出"""
+        self._cancel_current(notify=False)
+        for worker in list(self._workers):
+            worker.cancel()
+            if not worker.wait(timeout_ms):
+                logger.warning("检索线程未在超时内结束")
+
+    # ---------- 内部 ----------
+
+    def _cancel_current(self, notify: bool) -> None:
+        worker = self._current
+        if worker is None:
+            return
+        worker.cancel()
+        self._current = None
+        self._ticket += 1  # 之后到达的旧结果按序号丢弃
+        if notify:
+            self.cancelled.emit()
+
+    def _on_chunk(self, ticket: int, rows) -> None:
+        if ticket == self._ticket:
+            self.chunk.emit(rows)
+
+    def _on_done(self, ticket: int, total: int, elapsed_ms: float) -> None:
+        if ticket == self._ticket:
+            self._current = None
+            self.done.emit(total, elapsed_ms)
+
+    def _on_error(self, ticket: int, msg: str) -> None:
+        if ticket == self._ticket:
+            self._current = None
+            self.failed.emit(msg)
+
+    def _on_finished(self, worker: QueryWorker) -> None:
+        self._workers.discard(worker)
+        if self._current is worker:
+            self._current = None
+        worker.deleteLater()
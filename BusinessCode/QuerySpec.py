@@ -0,0 +1,319 @@
+"""
+声明式检索条件 -> SQLAlchemy 语句
+
+各检索窗口把“勾选框 + 输入框”收集成条件字典，这里按声明好的 Filter 列表把条件字典编译成
+一条 SELECT：
+- 条件值全部走绑定参数，语句“形状”只取决于启用了哪些条件，按形状缓存已构建的 Select，
+  相同形状的查询复用同一语句（SQLAlchemy 的编译缓存也随之命中）
+- 支持分页（LIMIT/OFFSET），分页时用 COUNT(*) OVER() 在同一条查询里带回总数（页码超出末尾时另查 COUNT(*)）
+- 每次执行记录耗时，汇总在 QUERY_STATS 中；语句以检索名称标注，慢查询日志据此区分来源
+- stream() 按块逐批返回结果，供后台检索线程边查边填充表格（见 BusinessCode.QueryRunner）
+
+用法：
+    spec = QuerySpec(
+        "runway",
+        columns=(AirportRunwayORM.id, AirportRunwayORM.runway_name),
+        filters=(
+            Filter("name", AirportRunwayORM.runway_name, enabled="name_enabled"),
+            Filter("length", AirportRunwayORM.r_length, op="range", key="length_min", upper="length_max"),
+        ),
+        session_factory=session_scope,
+    )
+    page = spec.execute(cond, page=0, page_size=200)
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from loguru import logger
+from sqlalchemy import Integer, String, bindparam, func, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.functions import FunctionElement
+
+from DBCode.SlowQueryLog import query_label
+
+# LIKE 转义字符（与 SQLAlchemy autoescape 一致）
+LIKE_ESCAPE = "/"
+
+# op 取值：
+#   contains  列 LIKE %值%
+#   keyword   多列以空格拼接（跳过 NULL）后不区分大小写的包含匹配
+#   eq / ge / le
+#   range     key 为下限、upper 为上限，两端都有时 BETWEEN，否则 >= 或 <=
+#   clause    条件值为真时加入固定的 column 表达式（如 NOT IN 排除列表）
+OPS = ("contains", "keyword", "eq", "ge", "le", "range", "clause")
+
+
+class keyword_text(FunctionElement):
+    """多列以空格拼接并跳过 NULL：MySQL 为 CONCAT_WS；SQLite 3.44 之前没有 concat_ws，按方言另行编译"""
+    type = String()
+    name = "keyword_text"
+    inherit_cache = True
+
+
+@compiles(keyword_text)
+def _keyword_text_default(element, compiler, **kw):
+    return "concat_ws(' ', %s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(keyword_text, "sqlite")
+def _keyword_text_sqlite(element, compiler, **kw):
+    # ' ' || NULL 为 NULL，coalesce 后即跳过该列；去掉开头多出的一个空格
+    parts = [f"coalesce(' ' || {compiler.process(c, **kw)}, '')" for c in element.clauses]
+    return "substr(%s, 2)" % " || ".join(parts)
+
+
+def like_pattern(value: str) -> str:
+    """包含匹配的 LIKE 参数：转义 % 和 _ 后两端加 %"""
+    escaped = (value.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+               .replace("%", LIKE_ESCAPE + "%")
+               .replace("_", LIKE_ESCAPE + "_"))
+    return f"%{escaped}%"
+
+
+def has_value(value: Any) -> bool:
+    if value is None or value is False:
+        return False
+    if isinstance(value, str):
+        return value.strip() != ""
+    return True
+
+
+@dataclass(frozen=True)
+class Filter:
+    """一个检索条件。name 同时作为绑定参数名前缀，需在同一 QuerySpec 内唯一。"""
+    name: str
+    column: Any
+    op: str = "contains"
+    key: Optional[str] = None  # 条件字典中的取值键，默认同 name
+    upper: Optional[str] = None  # range 的上限键
+    enabled: Optional[str] = None  # 勾选框对应的键；为 None 时只看值是否存在
+
+    def __post_init__(self):
+        if self.op not in OPS:
+            raise ValueError(f"未知的条件类型: {self.op}")
+
+    @property
+    def value_key(self) -> str:
+        return self.key or self.name
+
+    def variant(self, cond: Dict[str, Any]) -> Optional[str]:
+        """该条件在本次查询中的形态；None 表示不参与"""
+        if self.enabled is not None and not cond.get(self.enabled):
+            return None
+        low = cond.get(self.value_key)
+        if self.op == "range":
+            high = cond.get(self.upper) if self.upper else None
+            if has_value(low) and has_value(high):
+                return "between"
+            if has_value(low):
+                return "ge"
+            if has_value(high):
+                return "le"
+            return None
+        if self.op == "clause":
+            return "clause" if low else None
+        return self.op if has_value(low) else None
+
+    def clause(self, variant: str) -> Any:
+        p = f"p_{self.name}"
+        col = self.column
+        if variant == "contains":
+            return col.like(bindparam(p), escape=LIKE_ESCAPE)
+        if variant == "keyword":
+            cols = list(col) if isinstance(col, (tuple, list)) else [col]
+            text = cols[0] if len(cols) == 1 else keyword_text(*cols)
+            return func.lower(text).like(bindparam(p), escape=LIKE_ESCAPE)
+        if variant == "eq":
+            return col == bindparam(p)
+        if variant == "ge":
+            return col >= bindparam(p)
+        if variant == "le":
+            return col <= bindparam(p)
+        if variant == "between":
+            return col.between(bindparam(p), bindparam(f"{p}_hi"))
+        if variant == "clause":
+            return col
+        raise ValueError(variant)
+
+    def params(self, variant: str, cond: Dict[str, Any]) -> Dict[str, Any]:
+        p = f"p_{self.name}"
+        low = cond.get(self.value_key)
+        if variant == "contains":
+            return {p: like_pattern(str(low).strip())}
+        if variant == "keyword":
+            return {p: like_pattern(str(low).strip().lower())}
+        if variant in ("eq", "ge"):
+            return {p: low}
+        if variant == "le":
+            # range 只有上限时取 upper 键，普通 le 条件取 key
+            return {p: cond.get(self.upper) if self.op == "range" else low}
+        if variant == "between":
+            return {p: low, f"{p}_hi": cond.get(self.upper)}
+        return {}
+
+
+@dataclass
+class QueryResult:
+    rows: List[Any]
+    total: int  # 满足条件的总行数（分页时来自 COUNT(*) OVER()）
+    elapsed_ms: float
+    page: Optional[int] = None
+    page_size: Optional[int] = None
+
+
+@dataclass
+class QueryStat:
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_ms: float = 0.0
+    last_rows: int = 0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+# 各 QuerySpec 的执行耗时汇总（按 spec 名称）
+QUERY_STATS: Dict[str, QueryStat] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(name: str, elapsed_ms: float, nrows: int) -> None:
+    with _stats_lock:
+        st = QUERY_STATS.setdefault(name, QueryStat())
+        st.count += 1
+        st.total_ms += elapsed_ms
+        st.max_ms = max(st.max_ms, elapsed_ms)
+        st.last_ms = elapsed_ms
+        st.last_rows = nrows
+
+
+@dataclass
+class QuerySpec:
+    """
+    name             统计与日志中使用的名称
+    columns          投影列；只有一个 ORM 实体时结果为实体列表，否则为 Row 列表
+    filters          Filter 列表，全部以 AND 组合
+    session_factory  返回会话上下文管理器的函数（各模型包的 session_scope / get_session）
+    select_from      可选，接收 Select 返回加上 JOIN 后的 Select
+    order_by         排序列
+    """
+    name: str
+    columns: Sequence[Any]
+    filters: Sequence[Filter]
+    session_factory: Callable[[], Any]
+    select_from: Optional[Callable[[Select], Select]] = None
+    order_by: Sequence[Any] = ()
+    _cache: Dict[Tuple, Select] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self):
+        names = [f.name for f in self.filters]
+        if len(names) != len(set(names)):
+            raise ValueError(f"{self.name}: Filter 名称重复")
+
+    @property
+    def _scalar(self) -> bool:
+        return len(self.columns) == 1 and hasattr(self.columns[0], "__mapper__")
+
+    def shape(self, cond: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+        """本次条件对应的语句形状：参与的 (条件名, 形态) 序列"""
+        out = []
+        for f in self.filters:
+            variant = f.variant(cond)
+            if variant is not None:
+                out.append((f.name, variant))
+        return tuple(out)
+
+    def has_conditions(self, cond: Dict[str, Any]) -> bool:
+        return bool(self.shape(cond))
+
+    def statement(self, cond: Dict[str, Any], paged: bool = False,
+                  count: bool = False) -> Tuple[Select, Dict[str, Any]]:
+        """编译条件字典，返回（缓存的 Select，绑定参数）；count=True 时为满足条件的总行数查询"""
+        shape = self.shape(cond)
+        key = (shape, "count" if count else paged)
+        by_name = {f.name: f for f in self.filters}
+        with self._lock:
+            stmt = self._cache.get(key)
+            if stmt is None:
+                if count:
+                    inner = self._build(shape, False, by_name).order_by(None)
+                    stmt = select(func.count()).select_from(inner.subquery())
+                else:
+                    stmt = self._build(shape, paged, by_name)
+                self._cache[key] = stmt
+        params: Dict[str, Any] = {}
+        for name, variant in shape:
+            params.update(by_name[name].params(variant, cond))
+        return stmt, params
+
+    def _build(self, shape, paged: bool, by_name: Dict[str, Filter]) -> Select:
+        columns = list(self.columns)
+        if paged:
+            columns.append(func.count().over().label("_total"))
+        stmt = select(*columns)
+        if self.select_from is not None:
+            stmt = self.select_from(stmt)
+        clauses = [by_name[name].clause(variant) for name, variant in shape]
+        if clauses:
+            stmt = stmt.where(*clauses)
+        if self.order_by:
+            stmt = stmt.order_by(*self.order_by)
+        if paged:
+            stmt = stmt.limit(bindparam("_limit", type_=Integer, literal_execute=True)).offset(
+                bindparam("_offset", type_=Integer, literal_execute=True))
+        return stmt
+
+    def execute(self, cond: Dict[str, Any], page: Optional[int] = None,
+                page_size: Optional[int] = None) -> QueryResult:
+        paged = page is not None and page_size is not None
+        stmt, params = self.statement(cond, paged)
+        if paged:
+            params["_limit"] = int(page_size)
+            params["_offset"] = int(page) * int(page_size)
+
+        t0 = time.perf_counter()
+        with self.session_factory() as session, query_label(self.name):
+            raw = session.execute(stmt, params).all()
+            if paged and not raw and params["_offset"] > 0:
+                # 页码超出末尾时窗口函数没有行可带回总数，单独 COUNT(*)
+                count_stmt, count_params = self.statement(cond, count=True)
+                total = session.execute(count_stmt, count_params).scalar_one()
+            elif paged:
+                total = raw[0]._total if raw else 0
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+
+        if not paged:
+            total = len(raw)
+        rows = [r[0] for r in raw] if self._scalar else raw
+        _record(self.name, elapsed_ms, len(rows))
+        logger.debug(f"[query:{self.name}] {len(rows)}/{total} 行, {elapsed_ms:.1f} ms")
+        return QueryResult(rows=rows, total=total, elapsed_ms=elapsed_ms,
+                           page=page if paged else None, page_size=page_size if paged else None)
+
+    def stream(self, cond: Dict[str, Any], chunk_size: int = 500) -> Iterator[List[Any]]:
+        """
+        逐块返回结果（每块至多 chunk_size 行），不分页、不计总数。
+        驱动支持服务端游标时按块从数据库读取；调用方中途停止迭代（close）即结束查询并释放会话。
+        """
+        stmt, params = self.statement(cond)
+        stmt = stmt.execution_options(yield_per=chunk_size)
+        t0 = time.perf_counter()
+        nrows = 0
+        with self.session_factory() as session:
+            with query_label(self.name):
+                result = session.execute(stmt, params)
+            for part in result.partitions():
+                rows = [r[0] for r in part] if self._scalar else list(part)
+                nrows += len(rows)
+                yield rows
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        _record(self.name, elapsed_ms, nrows)
+        logger.debug(f"[query:{self.name}] stream {nrows} 行, {elapsed_ms:.1f} ms")
@@ -0,0 +1,168 @@
+"""
+已生成报告文件的磁盘缓存
+
+同一份评估报告常被反复导出为 PDF / Word。导出时仍读取报告及关联记录（报告、计算结果、场景、参数、
+弹药、目标），但以这些记录全部字段的哈希作为内容摘要：
+- 缓存键 = (报告ID, 格式, 内容摘要)；摘要相同说明数据未变，直接复制上次生成的文件
+- 任何一条关联记录被修改，摘要随之改变，旧文件不再命中，并在写入新文件时删除
+- 缓存目录 ~/.hs_2025/report_cache，总大小超过 report_cache_mb 时按最近使用时间（文件 mtime，
+  命中时更新）淘汰最久未用的文件；report_cache_mb = 0 关闭缓存
+
+文件先写入临时名再原子替换，多个进程（如批量导出）共用目录也不会读到半个文件。
+统计：REPORT_CACHE.stats()
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+CACHE_DIR = Path.home() / ".hs_2025" / "report_cache"
+DEFAULT_MAX_MB = 200
+
+_EXTENSIONS = {"pdf": ".pdf", "word": ".docx"}
+
+
+def content_digest(data: Dict[str, Any], *extra: Any) -> str:
+    """get_report_full_data 结果的内容摘要：各记录按字段名排序逐项哈希；extra 为版式版本等附加因素"""
+    h = hashlib.sha256()
+    for item in extra:
+        h.update(repr(item).encode("utf-8"))
+    for name in sorted(data):
+        h.update(f"\x00{name}\x00".encode("utf-8"))
+        _update(h, data[name])
+    return h.hexdigest()
+
+
+def _update(h, obj: Any) -> None:
+    fields = getattr(obj, "__dict__", None)
+    if fields is None:
+        h.update(repr(obj).encode("utf-8"))
+        return
+    for key in sorted(fields):
+        value = fields[key]
+        h.update(f"\x01{key}=".encode("utf-8"))
+        # 图片等大字段直接按字节计入
+        h.update(value if isinstance(value, (bytes, bytearray)) else repr(value).encode("utf-8"))
+
+
+class ReportCache:
+    def __init__(self, root: Path = CACHE_DIR, max_bytes: Optional[int] = None) -> None:
+        self.root = Path(root)
+        self._max_bytes = max_bytes  # None 表示首次使用时从配置读取
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes is None:
+            try:
+                from BusinessCode.ConfigStore import load_config
+                mb = float(load_config().get("report_cache_mb") or DEFAULT_MAX_MB)
+            except Exception as e:
+                logger.debug(f"读取 report_cache_mb 失败，使用默认值: {e}")
+                mb = DEFAULT_MAX_MB
+            self._max_bytes = max(0, int(mb * 1024 * 1024))
+        return self._max_bytes
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _path(self, report_id: int, fmt: str, digest: str) -> Path:
+        return self.root / f"{report_id}_{fmt}_{digest[:32]}{_EXTENSIONS.get(fmt, '.' + fmt)}"
+
+    def fetch(self, report_id: int, fmt: str, digest: str, dest: str) -> bool:
+        """命中时把缓存文件复制到 dest 并返回 True"""
+        if not self.enabled:
+            return False
+        path = self._path(report_id, fmt, digest)
+        try:
+            shutil.copyfile(path, dest)
+            os.utime(path)  # 记为最近使用
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return False
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def store(self, report_id: int, fmt: str, digest: str, src: str) -> None:
+        """保存刚生成的 src；同一报告同一格式的旧版本一并删除。失败只记录日志，不影响导出"""
+        if not self.enabled:
+            return
+        path = self._path(report_id, fmt, digest)
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+            os.close(fd)
+            try:
+                shutil.copyfile(src, tmp)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+            prefix = f"{report_id}_{fmt}_"
+            for old in self.root.glob(prefix + "*"):
+                if old != path and not old.name.endswith(".tmp"):
+                    _unlink(old)
+            with self._lock:
+                self.stores += 1
+                self._evict()
+        except OSError as e:
+            logger.warning(f"写入报告缓存失败: {e}")
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for p in self.root.iterdir():
+            if p.name.endswith(".tmp"):
+                continue
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+            total += st.st_size
+        entries.sort()
+        for _, size, p in entries:
+            if total <= self.max_bytes:
+                break
+            if _unlink(p):
+                self.evictions += 1
+            total -= size
+
+    def clear(self) -> None:
+        if self.root.is_dir():
+            for p in self.root.iterdir():
+                _unlink(p)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "stores": self.stores,
+                    "evictions": self.evictions, "max_bytes": self.max_bytes}
+
+
+def _unlink(path: Path) -> bool:
+    try:
+        path.unlink()
+        return True
+    except FileNotFoundError:
+        return False
+    except OSError as e:
+        logger.debug(f"删除缓存文件失败 {path}: {e}")
+        return False
+
+
+# 进程内共享的报告缓存
+REPORT_CACHE = ReportCache()
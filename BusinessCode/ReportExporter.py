@@ -4,13 +4,18 @@
 """
 import os
 import sys
-from typing import Tuple, Optional, Dict, Any
+import threading
+from typing import Tuple, Optional, Dict, Any, List
 
 # 添加项目根目录到路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from loguru import logger
 from DBCode.DBHelper import DBHelper
+from DBCode.EntityCache import cached_get
+from DBCode.Metrics import METRICS
+from BusinessCode.DocxTemplate import REPORT_TEMPLATE
+from BusinessCode.ReportCache import REPORT_CACHE, content_digest
 from damage_models.sql_repository_dbhelper import (
     AssessmentReportRepository,
     AssessmentResultRepository,
@@ -19,6 +24,18 @@ from damage_models.sql_repository_dbhelper import (
 )
 
 
+# 报告版式版本：修改 PDF / Word 版式后加 1，使缓存的旧文件失效
+REPORT_LAYOUT_VERSION = 1
+
+
+class _RowObject:
+    """简单对象：以列名为属性存放一行数据（弹药、目标）"""
+
+    def __init__(self, row_dict):
+        for key, value in row_dict.items():
+            setattr(self, key, value)
+
+
 def get_report_full_data(report_id: int) -> Optional[Dict[str, Any]]:
     """
     根据报告ID获取完整的报告数据,包括所有关联表的详细信息
@@ -72,18 +89,8 @@ def get_report_full_data(report_id: int) -> Optional[Dict[str, Any]]:
 
         # 5. 获取弹药信息
         if report.AMID:
-            sql = "SELECT * FROM Ammunition_Info WHERE AMID = %s"
-            ammo_rows = db.execute_query(sql, [report.AMID])
-            if ammo_rows:
-                # 创建一个简单对象来存储弹药数据
-                class Ammunition:
-                    def __init__(self, row_dict):
-                        for key, value in row_dict.items():
-                            setattr(self, key, value)
-                ammunition = Ammunition(ammo_rows[0])
-                data['ammunition'] = ammunition
-            else:
-                data['ammunition'] = None
+            data['ammunition'] = cached_get(db, "Ammunition_Info", "Ammunition_Info", "AMID",
+                                            report.AMID, _RowObject)
         else:
             data['ammunition'] = None
 
@@ -96,30 +103,16 @@ def get_report_full_data(report_id: int) -> Optional[Dict[str, Any]]:
 
         data['target_type_name'] = target_type_map.get(report.TargetType, '未知')
 
-        if report.TargetID and report.TargetType:
-            target = None
-
-            class Target:
-                def __init__(self, row_dict):
-                    for key, value in row_dict.items():
-                        setattr(self, key, value)
-
-            if report.TargetType == 1:  # 机场跑道
-                sql = "SELECT * FROM Runway_Info WHERE RunwayID = %s"
-                target_rows = db.execute_query(sql, [report.TargetID])
-                if target_rows:
-                    target = Target(target_rows[0])
-            elif report.TargetType == 2:  # 单机掩蔽库
-                sql = "SELECT * FROM Shelter_Info WHERE ShelterID = %s"
-                target_rows = db.execute_query(sql, [report.TargetID])
-                if target_rows:
-                    target = Target(target_rows[0])
-            elif report.TargetType == 3:  # 地下指挥所
-                sql = "SELECT * FROM UCC_Info WHERE UCCID = %s"
-                target_rows = db.execute_query(sql, [report.TargetID])
-                if target_rows:
-                    target = Target(target_rows[0])
-            data['target'] = target
+        # 目标类型 -> (表名, 主键列)
+        target_tables = {
+            1: ("Runway_Info", "RunwayID"),  # 机场跑道
+            2: ("Shelter_Info", "ShelterID"),  # 单机掩蔽库
+            3: ("UCC_Info", "UCCID"),  # 地下指挥所
+        }
+
+        if report.TargetID and report.TargetType in target_tables:
+            table, pk = target_tables[report.TargetType]
+            data['target'] = cached_get(db, table, table, pk, report.TargetID, _RowObject)
         else:
             data['target'] = None
 
@@ -132,508 +125,383 @@ def get_report_full_data(report_id: int) -> Optional[Dict[str, Any]]:
         db.close()
 
 
-def export_report_to_pdf(report_id: int, output_path: str) -> Tuple[bool, str]:
-    """
-    导出报告为PDF格式
+def _ammunition_rows(ammunition) -> List[List[str]]:
+    """弹药表：基本信息及各类战斗部特有参数"""
+    def text(attr):
+        return getattr(ammunition, attr, '') or ''
+
+    def num(attr):
+        return str(getattr(ammunition, attr, '') or '')
+
+    return [
+        ['字段', '值'],
+        ['弹药名称', text('AMName')],
+        ['中文名称', text('AMNameCN')],
+        ['弹药类型', text('AMType')],
+        ['弹药型号', text('AMModel')],
+        ['国家/地区', text('Country')],
+        ['弹体全重(kg)', num('AMWeight')],
+        ['战斗部类型', text('WarheadType')],
+        ['战斗部名称', text('WarheadName')],
+        ['装药量(kg)', num('ChargeAmount')],
+        ['TNT当量(吨)', num('TNTEquivalent')],
+        ['载机(投放平台)', text('Carrier')],
+        ['制导方式', text('GuidanceMode')],
+        ['投弹高度范围(m)', text('DropHeight')],
+        ['投弹速度(km/h)', num('DropSpeed')],
+        ['射程(km)', num('FlightRange')],
+        # 战斗部特有参数 - 显示所有类型
+        ['--- 爆破战斗部参数 ---', ''],
+        ['炸药成分', text('EXBComponent')],
+        ['炸药热爆(kJ/kg)', num('EXBExplosion')],
+        ['装药质量(kg)', num('EXBWeight')],
+        ['--- 聚能战斗部参数 ---', ''],
+        ['炸药密度(g/cm³)', num('EBDensity')],
+        ['装药爆速(m/s)', num('EBVelocity')],
+        ['爆轰压(GPa)', num('EBPressure')],
+        ['药型罩材料', text('EBCoverMaterial')],
+        ['药型罩锥角(度)', num('EBConeAngle')],
+        ['--- 破片战斗部参数 ---', ''],
+        ['炸弹热爆(kJ/kg)', num('FBBombExplosion')],
+        ['破片形状', text('FBFragmentShape')],
+        ['破片表面积(mm²)', num('FBSurfaceArea')],
+        ['破片质量(g)', num('FBFragmentWeight')],
+        ['装药直径(mm)', num('FBDiameter')],
+        ['壳体质量(kg)', num('FBShellWeight')],
+        ['--- 穿甲战斗部参数 ---', ''],
+        ['弹丸质量(kg)', num('ABBulletWeight')],
+        ['弹丸直径(mm)', num('ABDiameter')],
+        ['弹丸头部长度(mm)', num('ABHeadLength')],
+        ['--- 子母弹战斗部参数 ---', ''],
+        ['母弹质量(kg)', num('CBMBulletWeight')],
+        ['母弹最大横截面(m²)', num('CBMBulletSection')],
+        ['母弹阻力系数', num('CBMProjectile')],
+        ['子弹数量', num('CBSBulletCount')],
+        ['子弹型号', text('CBSBulletModel')],
+        ['子弹质量(kg)', num('CBSBulletWeight')],
+        ['最大直径(mm)', num('CBDiameter')],
+        ['子弹参考长度(mm)', num('CBSBulletLength')],
+    ]
+
+
+# 目标类型 -> [(字段名, 属性, 是否数值)]
+_TARGET_FIELDS = {
+    1: [('跑道代码', 'RunwayCode', False), ('跑道名称', 'RunwayName', False),
+        ('国家/地区', 'Country', False), ('基地/部队', 'Base', False),
+        ('跑道长度(m)', 'RLength', True), ('跑道宽度(m)', 'RWidth', True),
+        ('混凝土面层厚度(cm)', 'PCCSCThick', True), ('水泥稳定碎石基层厚度(cm)', 'CTBCThick', True),
+        ('级配砂砾石垫层厚度(cm)', 'GCSSThick', True), ('土基压实层厚度(cm)', 'CSThick', True)],
+    2: [('掩蔽库代码', 'ShelterCode', False), ('掩蔽库名称', 'ShelterName', False),
+        ('国家/地区', 'Country', False), ('基地/部队', 'Base', False),
+        ('库容净宽(m)', 'ShelterWidth', True), ('库容净高(m)', 'ShelterHeight', True),
+        ('库容净长(m)', 'ShelterLength', True), ('结构形式', 'StructuralForm', False),
+        ('结构层材料', 'StructureLayerMaterial', False), ('结构层厚度(cm)', 'StructureLayerThick', True),
+        ('防护层材料', 'MaskLayerMaterial', False)],
+    3: [('指挥所代码', 'UCCCode', False), ('指挥所名称', 'UCCName', False),
+        ('国家/地区', 'Country', False), ('基地/部队', 'Base', False),
+        ('所在位置', 'Location', False), ('岩层材料', 'RockLayerMaterials', False),
+        ('岩层厚度(m)', 'RockLayerThick', True), ('防护层材料', 'ProtectiveLayerMaterial', False),
+        ('防护层厚度(m)', 'ProtectiveLayerThick', True), ('指挥中心墙壁材料', 'UCCWallMaterials', False),
+        ('指挥中心墙壁厚度(m)', 'UCCWallThick', True)],
+}
+
+
+def _target_rows(target, target_type: int, target_type_name: str) -> Optional[List[List[str]]]:
+    fields = _TARGET_FIELDS.get(target_type)
+    if fields is None:
+        return None
+    rows = [['字段', '值'], ['目标类型', target_type_name]]
+    for label, attr, numeric in fields:
+        value = getattr(target, attr, '') or ''
+        rows.append([label, str(value) if numeric else value])
+    return rows
+
+
+# CJK 字体候选：reportlab 内置的 CID 字体（无需本地字体文件），均失败时再尝试系统字体
+_CJK_FONTS = (
+    'STSong-Light',      # 简体中文宋体
+    'MSung-Light',       # 繁体中文明体
+    'HeiseiMin-W3',      # 日文明朝体（也支持中文）
+    'HeiseiKakuGo-W5',   # 日文黑体（也支持中文）
+)
+_SYSTEM_FONT_PATHS = (
+    r"C:\Windows\Fonts\simsun.ttc",
+    r"C:\Windows\Fonts\simsun.ttf",
+    "/usr/share/fonts/truetype/arphic/simsun.ttf",  # Linux
+    "/System/Library/Fonts/STHeiti Light.ttc",  # macOS
+)
 
-    Args:
-        report_id: 报告ID
-        output_path: 输出文件路径
 
-    Returns:
-        (成功标志, 消息)
-    """
-    try:
-        # 检查reportlab库
+def _register_pdf_font() -> str:
+    """注册中文字体，返回可用的字体名；全部失败时返回 Helvetica"""
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    for cjk_font in _CJK_FONTS:
         try:
-            from reportlab.lib.pagesizes import A4
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import cm
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-            from reportlab.lib import colors
-            from reportlab.lib.enums import TA_CENTER
-            from reportlab.pdfbase import pdfmetrics
-            from reportlab.pdfbase.ttfonts import TTFont
-        except ImportError:
-            return False, "需要安装reportlab库: pip install reportlab"
+            pdfmetrics.registerFont(UnicodeCIDFont(cjk_font))
+            logger.info(f"成功注册CJK字体: {cjk_font}（无需本地字体文件）")
+            return cjk_font
+        except Exception as e:
+            logger.debug(f"CJK字体 {cjk_font} 注册失败: {e}")
 
-        # 获取完整报告数据
-        data = get_report_full_data(report_id)
-        if not data:
-            return False, "无法获取报告数据"
+    logger.warning("CJK字体注册失败，尝试使用系统字体")
+    for font_path in _SYSTEM_FONT_PATHS:
+        if os.path.exists(font_path):
+            try:
+                pdfmetrics.registerFont(TTFont('SimSun', font_path))
+                logger.info(f"成功注册系统字体: {font_path}")
+                return 'SimSun'
+            except Exception as e:
+                logger.debug(f"系统字体 {font_path} 注册失败: {e}")
 
-        report = data['report']
-        result = data.get('result')
-        scene = data.get('scene')
-        parameter = data.get('parameter')
-        ammunition = data.get('ammunition')
-        target = data.get('target')
-        target_type_name = data.get('target_type_name', '未知')
+    logger.warning("未找到任何中文字体，PDF中的中文可能显示异常")
+    return 'Helvetica'
 
-        # 注册中文字体 - 使用reportlab内置的CJK字体支持（不依赖本机字体）
-        font_name = 'Helvetica'  # 默认字体
 
-        try:
-            # 使用reportlab内置的CJK字体（无需本地字体文件）
-            # STSong-Light 是 Adobe 的简体中文宋体，reportlab 原生支持
-            from reportlab.pdfbase.cidfonts import UnicodeCIDFont
-
-            # 尝试多个CJK字体选项
-            cjk_fonts = [
-                'STSong-Light',      # 简体中文宋体
-                'MSung-Light',       # 繁体中文明体
-                'HeiseiMin-W3',      # 日文明朝体（也支持中文）
-                'HeiseiKakuGo-W5',   # 日文黑体（也支持中文）
-            ]
+class _PdfContext:
+    """PDF 报告的字体、段落样式和表格样式；构建一次后各报告共用（样式对象只读）"""
 
-            for cjk_font in cjk_fonts:
-                try:
-                    pdfmetrics.registerFont(UnicodeCIDFont(cjk_font))
-                    font_name = cjk_font
-                    logger.info(f"成功注册CJK字体: {cjk_font}（无需本地字体文件）")
-                    break
-                except Exception as e:
-                    logger.debug(f"CJK字体 {cjk_font} 注册失败: {e}")
-                    continue
-
-            # 如果CJK字体都失败，尝试系统字体作为备选
-            if font_name == 'Helvetica':
-                logger.warning("CJK字体注册失败，尝试使用系统字体")
-                font_paths = [
-                    r"C:\Windows\Fonts\simsun.ttc",
-                    r"C:\Windows\Fonts\simsun.ttf",
-                    "/usr/share/fonts/truetype/arphic/simsun.ttf",  # Linux
-                    "/System/Library/Fonts/STHeiti Light.ttc",  # macOS
-                ]
-
-                for font_path in font_paths:
-                    if os.path.exists(font_path):
-                        try:
-                            pdfmetrics.registerFont(TTFont('SimSun', font_path))
-                            font_name = 'SimSun'
-                            logger.info(f"成功注册系统字体: {font_path}")
-                            break
-                        except Exception as e:
-                            logger.debug(f"系统字体 {font_path} 注册失败: {e}")
-                            continue
-
-            if font_name == 'Helvetica':
-                logger.warning("未找到任何中文字体，PDF中的中文可能显示异常")
+    def __init__(self) -> None:
+        from reportlab.lib import colors
+        from reportlab.lib.enums import TA_CENTER
+        from reportlab.lib.styles import ParagraphStyle
+        from reportlab.platypus import TableStyle
 
+        try:
+            font_name = _register_pdf_font()
         except Exception as e:
             logger.error(f"字体注册失败: {e}, 使用默认字体")
             font_name = 'Helvetica'
-
-        # 创建PDF文档
-        doc = SimpleDocTemplate(output_path, pagesize=A4)
-        story = []
-
-        # 设置样式
-        styles = getSampleStyleSheet()
-
-        # 主标题样式 - 不使用parent以确保字体设置生效
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            fontName=font_name,
-            fontSize=18,
-            leading=22,
-            alignment=TA_CENTER,
-            spaceAfter=30,
-            textColor=colors.black
-        )
-
-        # 一级标题样式 - 不使用parent以确保字体设置生效
-        h1_style = ParagraphStyle(
-            'CustomH1',
-            fontName=font_name,
-            fontSize=14,
-            leading=17,
-            spaceAfter=12,
-            spaceBefore=12,
-            leftIndent=0,
-            textColor=colors.black
-        )
-
-        # 正文样式 - 不使用parent以确保字体设置生效
-        normal_style = ParagraphStyle(
-            'CustomNormal',
-            fontName=font_name,
-            fontSize=10,
-            leading=16,
-            leftIndent=0,
-            textColor=colors.black
-        )
-
-        # 添加标题
-        story.append(Paragraph(f"{report.ReportName}", title_style))
-        story.append(Spacer(1, 0.5*cm))
-
-        # 一、评估报告概述
-        story.append(Paragraph("一、评估报告概述", h1_style))
-        story.append(Spacer(1, 0.3*cm))
-
-        overview_data = [
-            ['报告编号', report.ReportCode or ''],
-            ['报告名称', report.ReportName or ''],
-            ['报告生成日期', report.CreatedTime.strftime('%Y-%m-%d %H:%M:%S') if report.CreatedTime else '']
-        ]
-
-        overview_table = Table(overview_data, colWidths=[4*cm, 12*cm])
-        overview_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), font_name),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('LEFTPADDING', (0, 0), (-1, -1), 6),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ]))
-        story.append(overview_table)
-        story.append(Spacer(1, 0.5*cm))
-
-        # 二、弹药毁伤数据模型
-        story.append(Paragraph("二、弹药毁伤数据模型", h1_style))
-        story.append(Spacer(1, 0.3*cm))
-
-        if ammunition:
-            ammo_data = [
-                ['字段', '值'],
-                ['弹药名称', getattr(ammunition, 'AMName', '') or ''],
-                ['中文名称', getattr(ammunition, 'AMNameCN', '') or ''],
-                ['弹药类型', getattr(ammunition, 'AMType', '') or ''],
-                ['弹药型号', getattr(ammunition, 'AMModel', '') or ''],
-                ['国家/地区', getattr(ammunition, 'Country', '') or ''],
-                ['弹体全重(kg)', str(getattr(ammunition, 'AMWeight', '') or '')],
-                ['战斗部类型', getattr(ammunition, 'WarheadType', '') or ''],
-                ['战斗部名称', getattr(ammunition, 'WarheadName', '') or ''],
-                ['装药量(kg)', str(getattr(ammunition, 'ChargeAmount', '') or '')],
-                ['TNT当量(吨)', str(getattr(ammunition, 'TNTEquivalent', '') or '')],
-                ['载机(投放平台)', getattr(ammunition, 'Carrier', '') or ''],
-                ['制导方式', getattr(ammunition, 'GuidanceMode', '') or ''],
-                ['投弹高度范围(m)', getattr(ammunition, 'DropHeight', '') or ''],
-                ['投弹速度(km/h)', str(getattr(ammunition, 'DropSpeed', '') or '')],
-                ['射程(km)', str(getattr(ammunition, 'FlightRange', '') or '')],
-            ]
-
-            # 战斗部特有参数 - 显示所有类型
-            # 爆破战斗部参数
-            ammo_data.append(['--- 爆破战斗部参数 ---', ''])
-            ammo_data.append(['炸药成分', getattr(ammunition, 'EXBComponent', '') or ''])
-            ammo_data.append(['炸药热爆(kJ/kg)', str(getattr(ammunition, 'EXBExplosion', '') or '')])
-            ammo_data.append(['装药质量(kg)', str(getattr(ammunition, 'EXBWeight', '') or '')])
-
-            # 聚能战斗部参数
-            ammo_data.append(['--- 聚能战斗部参数 ---', ''])
-            ammo_data.append(['炸药密度(g/cm³)', str(getattr(ammunition, 'EBDensity', '') or '')])
-            ammo_data.append(['装药爆速(m/s)', str(getattr(ammunition, 'EBVelocity', '') or '')])
-            ammo_data.append(['爆轰压(GPa)', str(getattr(ammunition, 'EBPressure', '') or '')])
-            ammo_data.append(['药型罩材料', getattr(ammunition, 'EBCoverMaterial', '') or ''])
-            ammo_data.append(['药型罩锥角(度)', str(getattr(ammunition, 'EBConeAngle', '') or '')])
-
-            # 破片战斗部参数
-            ammo_data.append(['--- 破片战斗部参数 ---', ''])
-            ammo_data.append(['炸弹热爆(kJ/kg)', str(getattr(ammunition, 'FBBombExplosion', '') or '')])
-            ammo_data.append(['破片形状', getattr(ammunition, 'FBFragmentShape', '') or ''])
-            ammo_data.append(['破片表面积(mm²)', str(getattr(ammunition, 'FBSurfaceArea', '') or '')])
-            ammo_data.append(['破片质量(g)', str(getattr(ammunition, 'FBFragmentWeight', '') or '')])
-            ammo_data.append(['装药直径(mm)', str(getattr(ammunition, 'FBDiameter', '') or '')])
-            ammo_data.append(['壳体质量(kg)', str(getattr(ammunition, 'FBShellWeight', '') or '')])
-
-            # 穿甲战斗部参数
-            ammo_data.append(['--- 穿甲战斗部参数 ---', ''])
-            ammo_data.append(['弹丸质量(kg)', str(getattr(ammunition, 'ABBulletWeight', '') or '')])
-            ammo_data.append(['弹丸直径(mm)', str(getattr(ammunition, 'ABDiameter', '') or '')])
-            ammo_data.append(['弹丸头部长度(mm)', str(getattr(ammunition, 'ABHeadLength', '') or '')])
-
-            # 子母弹战斗部参数
-            ammo_data.append(['--- 子母弹战斗部参数 ---', ''])
-            ammo_data.append(['母弹质量(kg)', str(getattr(ammunition, 'CBMBulletWeight', '') or '')])
-            ammo_data.append(['母弹最大横截面(m²)', str(getattr(ammunition, 'CBMBulletSection', '') or '')])
-            ammo_data.append(['母弹阻力系数', str(getattr(ammunition, 'CBMProjectile', '') or '')])
-            ammo_data.append(['子弹数量', str(getattr(ammunition, 'CBSBulletCount', '') or '')])
-            ammo_data.append(['子弹型号', getattr(ammunition, 'CBSBulletModel', '') or ''])
-            ammo_data.append(['子弹质量(kg)', str(getattr(ammunition, 'CBSBulletWeight', '') or '')])
-            ammo_data.append(['最大直径(mm)', str(getattr(ammunition, 'CBDiameter', '') or '')])
-            ammo_data.append(['子弹参考长度(mm)', str(getattr(ammunition, 'CBSBulletLength', '') or '')])
-
-
-            ammo_table = Table(ammo_data, colWidths=[5*cm, 11*cm])
-            ammo_table.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (-1, -1), font_name),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        self.font_name = font_name
+
+        # 段落样式 - 不使用parent以确保字体设置生效
+        self.title_style = ParagraphStyle(
+            'CustomTitle', fontName=font_name, fontSize=18, leading=22,
+            alignment=TA_CENTER, spaceAfter=30, textColor=colors.black)
+        self.h1_style = ParagraphStyle(
+            'CustomH1', fontName=font_name, fontSize=14, leading=17,
+            spaceAfter=12, spaceBefore=12, leftIndent=0, textColor=colors.black)
+        self.normal_style = ParagraphStyle(
+            'CustomNormal', fontName=font_name, fontSize=10, leading=16,
+            leftIndent=0, textColor=colors.black)
+        self.comment_title_style = ParagraphStyle(
+            'CommentTitle', parent=self.normal_style, fontName=font_name, fontSize=10,
+            textColor=colors.black, spaceAfter=6)
+        self.comment_style = ParagraphStyle(
+            'CommentContent', parent=self.normal_style, fontName=font_name, fontSize=10,
+            leading=16, leftIndent=20, spaceAfter=10)
+
+        def table_style(font_size: int, padding: int, header_row: bool) -> TableStyle:
+            commands = [('FONTNAME', (0, 0), (-1, -1), font_name),
+                        ('FONTSIZE', (0, 0), (-1, -1), font_size)]
+            if header_row:
+                # 首行为“字段 / 值”表头
+                commands += [('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke)]
+            else:
+                # 首列为字段名
+                commands.append(('BACKGROUND', (0, 0), (0, -1), colors.lightgrey))
+            commands += [
                 ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
                 ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
                 ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
                 ('LEFTPADDING', (0, 0), (-1, -1), 6),
                 ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-                ('TOPPADDING', (0, 0), (-1, -1), 4),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-            ]))
-            story.append(ammo_table)
-        else:
-            story.append(Paragraph("无弹药数据", normal_style))
+                ('TOPPADDING', (0, 0), (-1, -1), padding),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), padding),
+            ]
+            return TableStyle(commands)
 
-        story.append(Spacer(1, 0.5*cm))
+        self.kv_table_style = table_style(10, 6, header_row=False)       # 概述、毁伤等级、人员
+        self.grid_table_style = table_style(10, 6, header_row=True)      # 场景、参数、计算结果
+        self.dense_table_style = table_style(9, 4, header_row=True)      # 弹药、目标（行数多）
 
-        # 三、打击目标数据模型
-        story.append(Paragraph("三、打击目标数据模型", h1_style))
-        story.append(Spacer(1, 0.3*cm))
 
-        if target:
-            target_data = [['字段', '值']]
-
-            if report.TargetType == 1:  # 机场跑道
-                target_data.extend([
-                    ['目标类型', target_type_name],
-                    ['跑道代码', getattr(target, 'RunwayCode', '') or ''],
-                    ['跑道名称', getattr(target, 'RunwayName', '') or ''],
-                    ['国家/地区', getattr(target, 'Country', '') or ''],
-                    ['基地/部队', getattr(target, 'Base', '') or ''],
-                    ['跑道长度(m)', str(getattr(target, 'RLength', '') or '')],
-                    ['跑道宽度(m)', str(getattr(target, 'RWidth', '') or '')],
-                    ['混凝土面层厚度(cm)', str(getattr(target, 'PCCSCThick', '') or '')],
-                    ['水泥稳定碎石基层厚度(cm)', str(getattr(target, 'CTBCThick', '') or '')],
-                    ['级配砂砾石垫层厚度(cm)', str(getattr(target, 'GCSSThick', '') or '')],
-                    ['土基压实层厚度(cm)', str(getattr(target, 'CSThick', '') or '')],
-                ])
-            elif report.TargetType == 2:  # 单机掩蔽库
-                target_data.extend([
-                    ['目标类型', target_type_name],
-                    ['掩蔽库代码', getattr(target, 'ShelterCode', '') or ''],
-                    ['掩蔽库名称', getattr(target, 'ShelterName', '') or ''],
-                    ['国家/地区', getattr(target, 'Country', '') or ''],
-                    ['基地/部队', getattr(target, 'Base', '') or ''],
-                    ['库容净宽(m)', str(getattr(target, 'ShelterWidth', '') or '')],
-                    ['库容净高(m)', str(getattr(target, 'ShelterHeight', '') or '')],
-                    ['库容净长(m)', str(getattr(target, 'ShelterLength', '') or '')],
-                    ['结构形式', getattr(target, 'StructuralForm', '') or ''],
-                    ['结构层材料', getattr(target, 'StructureLayerMaterial', '') or ''],
-                    ['结构层厚度(cm)', str(getattr(target, 'StructureLayerThick', '') or '')],
-                    ['防护层材料', getattr(target, 'MaskLayerMaterial', '') or ''],
-                ])
-            elif report.TargetType == 3:  # 地下指挥所
-                target_data.extend([
-                    ['目标类型', target_type_name],
-                    ['指挥所代码', getattr(target, 'UCCCode', '') or ''],
-                    ['指挥所名称', getattr(target, 'UCCName', '') or ''],
-                    ['国家/地区', getattr(target, 'Country', '') or ''],
-                    ['基地/部队', getattr(target, 'Base', '') or ''],
-                    ['所在位置', getattr(target, 'Location', '') or ''],
-                    ['岩层材料', getattr(target, 'RockLayerMaterials', '') or ''],
-                    ['岩层厚度(m)', str(getattr(target, 'RockLayerThick', '') or '')],
-                    ['防护层材料', getattr(target, 'ProtectiveLayerMaterial', '') or ''],
-                    ['防护层厚度(m)', str(getattr(target, 'ProtectiveLayerThick', '') or '')],
-                    ['指挥中心墙壁材料', getattr(target, 'UCCWallMaterials', '') or ''],
-                    ['指挥中心墙壁厚度(m)', str(getattr(target, 'UCCWallThick', '') or '')],
-                ])
-
-            target_table = Table(target_data, colWidths=[5*cm, 11*cm])
-            target_table.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (-1, -1), font_name),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('LEFTPADDING', (0, 0), (-1, -1), 6),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-                ('TOPPADDING', (0, 0), (-1, -1), 4),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-            ]))
-            story.append(target_table)
-        else:
-            story.append(Paragraph("无目标数据", normal_style))
+_pdf_context: Optional[_PdfContext] = None
+_pdf_context_lock = threading.Lock()
 
-        story.append(Spacer(1, 0.5*cm))
 
-        # 四、毁伤场景
-        story.append(Paragraph("四、毁伤场景", h1_style))
-        story.append(Spacer(1, 0.3*cm))
+def _get_pdf_context() -> _PdfContext:
+    """进程内只注册一次字体、构建一次样式"""
+    global _pdf_context
+    with _pdf_context_lock:
+        if _pdf_context is None:
+            _pdf_context = _PdfContext()
+        return _pdf_context
 
-        if scene:
-            scene_data = [
-                ['字段', '值'],
-                ['场景编号', scene.DSCode or ''],
-                ['场景名称', scene.DSName or ''],
-                ['进攻方', scene.DSOffensive or ''],
-                ['假想敌', scene.DSDefensive or ''],
-                ['所在战场', scene.DSBattle or ''],
-            ]
 
-            scene_table = Table(scene_data, colWidths=[4*cm, 12*cm])
-            scene_table.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (-1, -1), font_name),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('LEFTPADDING', (0, 0), (-1, -1), 6),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-                ('TOPPADDING', (0, 0), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ]))
-            story.append(scene_table)
-        else:
-            story.append(Paragraph("无场景数据", normal_style))
-
-        story.append(Spacer(1, 0.5*cm))
+def render_report_pdf(data: Dict[str, Any], output_path: str, ctx: Optional[_PdfContext] = None) -> None:
+    """按 get_report_full_data 的结果生成 PDF 报告；ctx 缺省时使用进程内缓存的字体与样式"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
 
-        # 五、毁伤参数
-        story.append(Paragraph("五、毁伤参数", h1_style))
-        story.append(Spacer(1, 0.3*cm))
+    ctx = ctx or _get_pdf_context()
+    report = data['report']
+    result = data.get('result')
+    scene = data.get('scene')
+    parameter = data.get('parameter')
+    ammunition = data.get('ammunition')
+    target = data.get('target')
+    target_type_name = data.get('target_type_name', '未知')
 
-        if parameter:
-            param_data = [
-                ['字段', '值'],
-                ['投放平台', parameter.Carrier or ''],
-                ['制导方式', parameter.GuidanceMode or ''],
-                ['战斗部类型', parameter.WarheadType or ''],
-                ['装药量(kg)', str(parameter.ChargeAmount or '')],
-                ['投弹高度', parameter.DropHeight or ''],
-                ['投弹速度(m/s)', str(parameter.DropSpeed or '')],
-                ['投弹方式', parameter.DropMode or ''],
-                ['射程(km)', str(parameter.FlightRange or '')],
-                ['电磁干扰等级', parameter.ElectroInterference or ''],
-                ['天气状况', parameter.WeatherConditions or ''],
-                ['环境风速(m/s)', str(parameter.WindSpeed or '')],
-            ]
+    story = []
+    narrow = [4*cm, 12*cm]
+    wide = [5*cm, 11*cm]
 
-            param_table = Table(param_data, colWidths=[4*cm, 12*cm])
-            param_table.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (-1, -1), font_name),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('LEFTPADDING', (0, 0), (-1, -1), 6),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-                ('TOPPADDING', (0, 0), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ]))
-            story.append(param_table)
-        else:
-            story.append(Paragraph("无参数数据", normal_style))
+    def table(rows, col_widths, style) -> None:
+        t = Table(rows, colWidths=col_widths)
+        t.setStyle(style)
+        story.append(t)
 
-        story.append(Spacer(1, 0.5*cm))
-
-        # 六、毁伤能力计算
-        story.append(Paragraph("六、毁伤能力计算", h1_style))
+    def section(heading: str, rows, col_widths, style, empty_text: str) -> None:
+        story.append(Paragraph(heading, ctx.h1_style))
         story.append(Spacer(1, 0.3*cm))
-
-        if result:
-            result_data = [
-                ['字段', '值'],
-                ['弹坑深度(m)', str(result.DADepth or '')],
-                ['弹坑直径(m)', str(result.DADiameter or '')],
-                ['弹坑容积(m³)', str(result.DAVolume or '')],
-                ['弹坑面积(m²)', str(result.DAArea or '')],
-                ['弹坑长度(m)', str(result.DALength or '')],
-                ['弹坑宽度(m)', str(result.DAWidth or '')],
-                ['结构破坏程度', str(result.Discturction or '')],
-            ]
-
-            result_table = Table(result_data, colWidths=[4*cm, 12*cm])
-            result_table.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (-1, -1), font_name),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('LEFTPADDING', (0, 0), (-1, -1), 6),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-                ('TOPPADDING', (0, 0), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ]))
-            story.append(result_table)
+        if rows:
+            table(rows, col_widths, style)
         else:
-            story.append(Paragraph("无毁伤计算结果", normal_style))
-
+            story.append(Paragraph(empty_text, ctx.normal_style))
         story.append(Spacer(1, 0.5*cm))
 
-        # 七、毁伤评估
-        story.append(Paragraph("七、毁伤评估", h1_style))
-        story.append(Spacer(1, 0.3*cm))
+    # 添加标题
+    story.append(Paragraph(f"{report.ReportName}", ctx.title_style))
+    story.append(Spacer(1, 0.5*cm))
+
+    # 一、评估报告概述
+    section("一、评估报告概述", [
+        ['报告编号', report.ReportCode or ''],
+        ['报告名称', report.ReportName or ''],
+        ['报告生成日期', report.CreatedTime.strftime('%Y-%m-%d %H:%M:%S') if report.CreatedTime else ''],
+    ], narrow, ctx.kv_table_style, '')
+
+    # 二、弹药毁伤数据模型
+    section("二、弹药毁伤数据模型", _ammunition_rows(ammunition) if ammunition else None,
+            wide, ctx.dense_table_style, "无弹药数据")
+
+    # 三、打击目标数据模型（未知目标类型时只有表头）
+    target_rows = (_target_rows(target, report.TargetType, target_type_name) or [['字段', '值']]) if target else None
+    section("三、打击目标数据模型", target_rows, wide, ctx.dense_table_style, "无目标数据")
+
+    # 四、毁伤场景
+    section("四、毁伤场景", [
+        ['字段', '值'],
+        ['场景编号', scene.DSCode or ''],
+        ['场景名称', scene.DSName or ''],
+        ['进攻方', scene.DSOffensive or ''],
+        ['假想敌', scene.DSDefensive or ''],
+        ['所在战场', scene.DSBattle or ''],
+    ] if scene else None, narrow, ctx.grid_table_style, "无场景数据")
+
+    # 五、毁伤参数
+    section("五、毁伤参数", [
+        ['字段', '值'],
+        ['投放平台', parameter.Carrier or ''],
+        ['制导方式', parameter.GuidanceMode or ''],
+        ['战斗部类型', parameter.WarheadType or ''],
+        ['装药量(kg)', str(parameter.ChargeAmount or '')],
+        ['投弹高度', parameter.DropHeight or ''],
+        ['投弹速度(m/s)', str(parameter.DropSpeed or '')],
+        ['投弹方式', parameter.DropMode or ''],
+        ['射程(km)', str(parameter.FlightRange or '')],
+        ['电磁干扰等级', parameter.ElectroInterference or ''],
+        ['天气状况', parameter.WeatherConditions or ''],
+        ['环境风速(m/s)', str(parameter.WindSpeed or '')],
+    ] if parameter else None, narrow, ctx.grid_table_style, "无参数数据")
+
+    # 六、毁伤能力计算
+    section("六、毁伤能力计算", [
+        ['字段', '值'],
+        ['弹坑深度(m)', str(result.DADepth or '')],
+        ['弹坑直径(m)', str(result.DADiameter or '')],
+        ['弹坑容积(m³)', str(result.DAVolume or '')],
+        ['弹坑面积(m²)', str(result.DAArea or '')],
+        ['弹坑长度(m)', str(result.DALength or '')],
+        ['弹坑宽度(m)', str(result.DAWidth or '')],
+        ['结构破坏程度', str(result.Discturction or '')],
+    ] if result else None, narrow, ctx.grid_table_style, "无毁伤计算结果")
+
+    # 七、毁伤评估
+    story.append(Paragraph("七、毁伤评估", ctx.h1_style))
+    story.append(Spacer(1, 0.3*cm))
+    table([['毁伤等级', report.DamageDegree or '']], narrow, ctx.kv_table_style)
+    story.append(Spacer(1, 0.2*cm))
+
+    # 评估结论 - 支持换行
+    story.append(Paragraph("评估结论:", ctx.comment_title_style))
+    comment_text = (report.Comment or '无').replace('\n', '<br/>')
+    story.append(Paragraph(comment_text, ctx.comment_style))
+    story.append(Spacer(1, 0.5*cm))
+
+    # 八、报告人员信息
+    story.append(Paragraph("八、报告人员信息", ctx.h1_style))
+    story.append(Spacer(1, 0.3*cm))
+    table([
+        ['报告操作人员ID', str(report.Creator or '')],
+        ['报告审核人', report.Reviewer or ''],
+    ], narrow, ctx.kv_table_style)
+
+    # 生成PDF
+    SimpleDocTemplate(output_path, pagesize=A4).build(story)
+
+
+def preload_report_resources() -> None:
+    """预先注册 PDF 字体、构建样式并载入 Word 模板（可在后台线程调用），使首份报告不承担初始化开销"""
+    try:
+        _get_pdf_context()
+    except ImportError:
+        pass  # 未安装 reportlab，导出时再提示
+    try:
+        REPORT_TEMPLATE.body()
+    except ImportError:
+        pass  # 未安装 python-docx
+
+
+def _render_cached(report_id: int, fmt: str, data: Dict[str, Any], output_path: str, render) -> bool:
+    """数据未变时从报告缓存复制上次生成的文件，否则调用 render 生成并存入缓存；返回是否命中缓存"""
+    if not REPORT_CACHE.enabled:
+        render(data, output_path)
+        return False
+    template = REPORT_TEMPLATE.path if fmt == "word" else None
+    template_stamp = os.path.getmtime(template) if template and os.path.isfile(template) else None
+    digest = content_digest(data, REPORT_LAYOUT_VERSION, fmt, template_stamp)
+    if REPORT_CACHE.fetch(report_id, fmt, digest, output_path):
+        return True
+    render(data, output_path)
+    REPORT_CACHE.store(report_id, fmt, digest, output_path)
+    return False
+
+
+def export_report_to_pdf(report_id: int, output_path: str, use_cache: bool = True) -> Tuple[bool, str]:
+    """
+    导出报告为PDF格式
 
-        # 毁伤等级
-        degree_data = [['毁伤等级', report.DamageDegree or '']]
-        degree_table = Table(degree_data, colWidths=[4*cm, 12*cm])
-        degree_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), font_name),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('LEFTPADDING', (0, 0), (-1, -1), 6),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ]))
-        story.append(degree_table)
-        story.append(Spacer(1, 0.2*cm))
-
-        # 评估结论 - 支持换行
-        story.append(Paragraph("评估结论:", ParagraphStyle(
-            'CommentTitle',
-            parent=normal_style,
-            fontName=font_name,
-            fontSize=10,
-            textColor=colors.black,
-            spaceAfter=6
-        )))
-
-        comment_text = report.Comment or '无'
-        comment_text = comment_text.replace('\n', '<br/>')
-        comment_para = Paragraph(comment_text, ParagraphStyle(
-            'CommentContent',
-            parent=normal_style,
-            fontName=font_name,
-            fontSize=10,
-            leading=16,
-            leftIndent=20,
-            spaceAfter=10
-        ))
-        story.append(comment_para)
-        story.append(Spacer(1, 0.5*cm))
+    Args:
+        report_id: 报告ID
+        output_path: 输出文件路径
+        use_cache: 数据未变时直接复制上次生成的文件
 
-        # 八、报告人员信息
-        story.append(Paragraph("八、报告人员信息", h1_style))
-        story.append(Spacer(1, 0.3*cm))
+    Returns:
+        (成功标志, 消息)
+    """
+    try:
+        # 检查reportlab库
+        try:
+            import reportlab  # noqa: F401
+        except ImportError:
+            return False, "需要安装reportlab库: pip install reportlab"
 
-        staff_data = [
-            ['报告操作人员ID', str(report.Creator or '')],
-            ['报告审核人', report.Reviewer or ''],
-        ]
-
-        staff_table = Table(staff_data, colWidths=[4*cm, 12*cm])
-        staff_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), font_name),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('LEFTPADDING', (0, 0), (-1, -1), 6),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ]))
-        story.append(staff_table)
-
-        # 生成PDF
-        doc.build(story)
+        # 获取完整报告数据
+        data = get_report_full_data(report_id)
+        if not data:
+            return False, "无法获取报告数据"
+
+        if not use_cache:
+            render_report_pdf(data, output_path)
+        elif _render_cached(report_id, "pdf", data, output_path, render_report_pdf):
+            logger.info(f"报告未变更，已从缓存导出为PDF: {output_path}")
+            return True, "导出成功"
 
         logger.info(f"报告已成功导出为PDF: {output_path}")
         return True, "导出成功"
@@ -643,34 +511,121 @@ def export_report_to_pdf(report_id: int, output_path: str) -> Tuple[bool, str]:
         return False, str(e)
 
 
-def set_paragraph_font(paragraph, font_name='宋体'):
-    """完整设置段落字体为宋体（包括所有字体属性）"""
-    from docx.oxml.ns import qn
-    for run in paragraph.runs:
-        run.font.name = font_name
-        # 设置所有字体属性确保生效
-        run._element.rPr.rFonts.set(qn('w:eastAsia'), font_name)  # 东亚文字
-        run._element.rPr.rFonts.set(qn('w:ascii'), font_name)      # ASCII字符
-        run._element.rPr.rFonts.set(qn('w:hAnsi'), font_name)      # 高位ANSI
-        run._element.rPr.rFonts.set(qn('w:cs'), font_name)         # 复杂脚本
-
-
-def set_cell_font(cell, font_name='宋体'):
-    """设置表格单元格字体为宋体"""
-    from docx.oxml.ns import qn
-    for paragraph in cell.paragraphs:
-        for run in paragraph.runs:
-            run.font.name = font_name
-            run._element.rPr.rFonts.set(qn('w:eastAsia'), font_name)
-
-
-def export_report_to_word(report_id: int, output_path: str) -> Tuple[bool, str]:
+def render_report_word(data: Dict[str, Any], output_path: str) -> None:
+    """
+    按 get_report_full_data 的结果生成 Word 报告。
+    文档从缓存的预设样式模板打开，正文整体生成 XML 后一次插入（见 BusinessCode.DocxTemplate）。
+    """
+    report = data['report']
+    result = data.get('result')
+    scene = data.get('scene')
+    parameter = data.get('parameter')
+    ammunition = data.get('ammunition')
+    target = data.get('target')
+    target_type_name = data.get('target_type_name', '未知')
+
+    body = REPORT_TEMPLATE.body()
+
+    def section(heading: str, rows: Optional[List[List[str]]], empty_text: str) -> None:
+        body.heading(heading, 1)
+        body.paragraph()
+        if rows:
+            body.table(rows)
+        else:
+            body.paragraph(empty_text)
+        body.paragraph()
+
+    # 标题（字体由模板样式提供）
+    body.heading(report.ReportName, 0, center=True)
+
+    # 一、评估报告概述
+    section('一、评估报告概述', [
+        ['报告编号', report.ReportCode or ''],
+        ['报告名称', report.ReportName or ''],
+        ['报告生成日期', report.CreatedTime.strftime('%Y-%m-%d %H:%M:%S') if report.CreatedTime else ''],
+    ], '')
+
+    # 二、弹药毁伤数据模型
+    section('二、弹药毁伤数据模型', _ammunition_rows(ammunition) if ammunition else None, '无弹药数据')
+
+    # 三、打击目标数据模型
+    target_rows = _target_rows(target, report.TargetType, target_type_name) if target else None
+    if target and target_rows is None:
+        # 未知目标类型：与原实现一致，不输出表格也不输出提示
+        body.heading('三、打击目标数据模型', 1)
+        body.paragraph()
+        body.paragraph()
+    else:
+        section('三、打击目标数据模型', target_rows, '无目标数据')
+
+    # 四、毁伤场景
+    section('四、毁伤场景', [
+        ['字段', '值'],
+        ['场景编号', scene.DSCode or ''],
+        ['场景名称', scene.DSName or ''],
+        ['进攻方', scene.DSOffensive or ''],
+        ['假想敌', scene.DSDefensive or ''],
+        ['所在战场', scene.DSBattle or ''],
+    ] if scene else None, '无场景数据')
+
+    # 五、毁伤参数
+    section('五、毁伤参数', [
+        ['字段', '值'],
+        ['投放平台', parameter.Carrier or ''],
+        ['制导方式', parameter.GuidanceMode or ''],
+        ['战斗部类型', parameter.WarheadType or ''],
+        ['装药量(kg)', str(parameter.ChargeAmount or '')],
+        ['投弹高度', str(parameter.DropHeight or '')],
+        ['投弹速度(m/s)', str(parameter.DropSpeed or '')],
+        ['投弹方式', parameter.DropMode or ''],
+        ['射程(km)', str(parameter.FlightRange or '')],
+        ['电磁干扰等级', parameter.ElectroInterference or ''],
+        ['天气状况', parameter.WeatherConditions or ''],
+        ['环境风速(m/s)', str(parameter.WindSpeed or '')],
+    ] if parameter else None, '无参数数据')
+
+    # 六、毁伤能力计算
+    section('六、毁伤能力计算', [
+        ['字段', '值'],
+        ['弹坑深度(m)', str(result.DADepth or '')],
+        ['弹坑直径(m)', str(result.DADiameter or '')],
+        ['弹坑容积(m³)', str(result.DAVolume or '')],
+        ['弹坑面积(m²)', str(result.DAArea or '')],
+        ['弹坑长度(m)', str(result.DALength or '')],
+        ['弹坑宽度(m)', str(result.DAWidth or '')],
+        ['结构破坏程度', str(result.Discturction or '')],
+    ] if result else None, '无毁伤计算结果')
+
+    # 七、毁伤评估
+    body.heading('七、毁伤评估', 1)
+    body.paragraph()
+    body.table([['毁伤等级', report.DamageDegree or '']])
+    body.paragraph()
+    # 评估结论 - 支持换行
+    body.heading('评估结论:', 3)
+    body.paragraph(report.Comment or '无')
+    body.paragraph()
+
+    # 八、报告人员信息
+    body.heading('八、报告人员信息', 1)
+    body.paragraph()
+    body.table([
+        ['报告操作人员ID', str(report.Creator or '')],
+        ['报告审核人', report.Reviewer or ''],
+    ])
+
+    # 保存文档
+    body.save(output_path)
+
+
+def export_report_to_word(report_id: int, output_path: str, use_cache: bool = True) -> Tuple[bool, str]:
     """
     导出报告为Word格式
 
     Args:
         report_id: 报告ID
         output_path: 输出文件路径
+        use_cache: 数据未变时直接复制上次生成的文件
 
     Returns:
         (成功标志, 消息)
@@ -678,9 +633,7 @@ def export_report_to_word(report_id: int, output_path: str) -> Tuple[bool, str]:
     try:
         # 检查python-docx库
         try:
-            from docx import Document
-            from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-            from docx.oxml.ns import qn
+            import docx  # noqa: F401
         except ImportError:
             return False, "需要安装python-docx库: pip install python-docx"
 
@@ -689,425 +642,11 @@ def export_report_to_word(report_id: int, output_path: str) -> Tuple[bool, str]:
         if not data:
             return False, "无法获取报告数据"
 
-        report = data['report']
-        result = data.get('result')
-        scene = data.get('scene')
-        parameter = data.get('parameter')
-        ammunition = data.get('ammunition')
-        target = data.get('target')
-        target_type_name = data.get('target_type_name', '未知')
-
-        # 创建Word文档
-        doc = Document()
-
-        # 设置中文字体 - 宋体
-        doc.styles['Normal'].font.name = '宋体'
-        doc.styles['Normal']._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-
-        # 设置标题字体为宋体（包括Title和各级Heading）
-        # Title样式（level 0）
-        try:
-            title_style = doc.styles['Title']
-            title_style.font.name = '宋体'
-            title_style._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-        except:
-            pass
-
-        # Heading 1-9 样式
-        for level in range(1, 10):
-            try:
-                heading_style = doc.styles[f'Heading {level}']
-                heading_style.font.name = '宋体'
-                heading_style._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-            except:
-                pass
-
-        # 标题
-        title = doc.add_heading(report.ReportName, 0)
-        title.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-        # 使用辅助函数完整设置字体
-        set_paragraph_font(title, '宋体')
-
-        # 一、评估报告概述
-        h1_para = doc.add_heading('一、评估报告概述', 1)
-        set_paragraph_font(h1_para, '宋体')
-        doc.add_paragraph()
-
-        table = doc.add_table(rows=3, cols=2)
-        table.style = 'Light Grid Accent 1'
-        table.rows[0].cells[0].text = '报告编号'
-        table.rows[0].cells[1].text = report.ReportCode or ''
-        table.rows[1].cells[0].text = '报告名称'
-        table.rows[1].cells[1].text = report.ReportName or ''
-        table.rows[2].cells[0].text = '报告生成日期'
-        table.rows[2].cells[1].text = report.CreatedTime.strftime('%Y-%m-%d %H:%M:%S') if report.CreatedTime else ''
-
-        # 设置表格字体为宋体
-        for row in table.rows:
-            for cell in row.cells:
-                set_cell_font(cell)
-
-        doc.add_paragraph()
-
-        # 二、弹药毁伤数据模型
-        h1_para = doc.add_heading('二、弹药毁伤数据模型', 1)
-        set_paragraph_font(h1_para, '宋体')
-        doc.add_paragraph()
-
-        if ammunition:
-            # 基本弹药信息
-            basic_rows = [
-                ['字段', '值'],
-                ['弹药名称', getattr(ammunition, 'AMName', '') or ''],
-                ['中文名称', getattr(ammunition, 'AMNameCN', '') or ''],
-                ['弹药类型', getattr(ammunition, 'AMType', '') or ''],
-                ['弹药型号', getattr(ammunition, 'AMModel', '') or ''],
-                ['国家/地区', getattr(ammunition, 'Country', '') or ''],
-                ['弹体全重(kg)', str(getattr(ammunition, 'AMWeight', '') or '')],
-                ['战斗部类型', getattr(ammunition, 'WarheadType', '') or ''],
-                ['战斗部名称', getattr(ammunition, 'WarheadName', '') or ''],
-                ['装药量(kg)', str(getattr(ammunition, 'ChargeAmount', '') or '')],
-                ['TNT当量(吨)', str(getattr(ammunition, 'TNTEquivalent', '') or '')],
-                ['载机(投放平台)', getattr(ammunition, 'Carrier', '') or ''],
-                ['制导方式', getattr(ammunition, 'GuidanceMode', '') or ''],
-                ['投弹高度范围(m)', getattr(ammunition, 'DropHeight', '') or ''],
-                ['投弹速度(km/h)', str(getattr(ammunition, 'DropSpeed', '') or '')],
-                ['射程(km)', str(getattr(ammunition, 'FlightRange', '') or '')],
-            ]
-
-            # 战斗部特有参数 - 显示所有类型
-            special_rows = []
-
-            # 爆破战斗部参数
-            special_rows.extend([
-                ['--- 爆破战斗部参数 ---', ''],
-                ['炸药成分', getattr(ammunition, 'EXBComponent', '') or ''],
-                ['炸药热爆(kJ/kg)', str(getattr(ammunition, 'EXBExplosion', '') or '')],
-                ['装药质量(kg)', str(getattr(ammunition, 'EXBWeight', '') or '')],
-            ])
-
-            # 聚能战斗部参数
-            special_rows.extend([
-                ['--- 聚能战斗部参数 ---', ''],
-                ['炸药密度(g/cm³)', str(getattr(ammunition, 'EBDensity', '') or '')],
-                ['装药爆速(m/s)', str(getattr(ammunition, 'EBVelocity', '') or '')],
-                ['爆轰压(GPa)', str(getattr(ammunition, 'EBPressure', '') or '')],
-                ['药型罩材料', getattr(ammunition, 'EBCoverMaterial', '') or ''],
-                ['药型罩锥角(度)', str(getattr(ammunition, 'EBConeAngle', '') or '')],
-            ])
-
-            # 破片战斗部参数
-            special_rows.extend([
-                ['--- 破片战斗部参数 ---', ''],
-                ['炸弹热爆(kJ/kg)', str(getattr(ammunition, 'FBBombExplosion', '') or '')],
-                ['破片形状', getattr(ammunition, 'FBFragmentShape', '') or ''],
-                ['破片表面积(mm²)', str(getattr(ammunition, 'FBSurfaceArea', '') or '')],
-                ['破片质量(g)', str(getattr(ammunition, 'FBFragmentWeight', '') or '')],
-                ['装药直径(mm)', str(getattr(ammunition, 'FBDiameter', '') or '')],
-                ['壳体质量(kg)', str(getattr(ammunition, 'FBShellWeight', '') or '')],
-            ])
-
-            # 穿甲战斗部参数
-            special_rows.extend([
-                ['--- 穿甲战斗部参数 ---', ''],
-                ['弹丸质量(kg)', str(getattr(ammunition, 'ABBulletWeight', '') or '')],
-                ['弹丸直径(mm)', str(getattr(ammunition, 'ABDiameter', '') or '')],
-                ['弹丸头部长度(mm)', str(getattr(ammunition, 'ABHeadLength', '') or '')],
-            ])
-
-            # 子母弹战斗部参数
-            special_rows.extend([
-                ['--- 子母弹战斗部参数 ---', ''],
-                ['母弹质量(kg)', str(getattr(ammunition, 'CBMBulletWeight', '') or '')],
-                ['母弹最大横截面(m²)', str(getattr(ammunition, 'CBMBulletSection', '') or '')],
-                ['母弹阻力系数', str(getattr(ammunition, 'CBMProjectile', '') or '')],
-                ['子弹数量', str(getattr(ammunition, 'CBSBulletCount', '') or '')],
-                ['子弹型号', getattr(ammunition, 'CBSBulletModel', '') or ''],
-                ['子弹质量(kg)', str(getattr(ammunition, 'CBSBulletWeight', '') or '')],
-                ['最大直径(mm)', str(getattr(ammunition, 'CBDiameter', '') or '')],
-                ['子弹参考长度(mm)', str(getattr(ammunition, 'CBSBulletLength', '') or '')],
-            ])
-
-            # 合并所有行并创建表格
-            all_rows = basic_rows + special_rows
-            table = doc.add_table(rows=len(all_rows), cols=2)
-            table.style = 'Light Grid Accent 1'
-
-            for idx, (field, value) in enumerate(all_rows):
-                cell0 = table.rows[idx].cells[0]
-                cell1 = table.rows[idx].cells[1]
-                cell0.text = field
-                cell1.text = value
-                set_cell_font(cell0)
-                set_cell_font(cell1)
-        else:
-            doc.add_paragraph('无弹药数据')
-
-        doc.add_paragraph()
-
-        # 三、打击目标数据模型
-        h1_para = doc.add_heading('三、打击目标数据模型', 1)
-        set_paragraph_font(h1_para, '宋体')
-        doc.add_paragraph()
-
-        if target:
-            if report.TargetType == 1:  # 机场跑道
-                table = doc.add_table(rows=12, cols=2)
-                table.style = 'Light Grid Accent 1'
-                table.rows[0].cells[0].text = '字段'
-                table.rows[0].cells[1].text = '值'
-                table.rows[1].cells[0].text = '目标类型'
-                table.rows[1].cells[1].text = target_type_name
-                table.rows[2].cells[0].text = '跑道代码'
-                table.rows[2].cells[1].text = getattr(target, 'RunwayCode', '') or ''
-                table.rows[3].cells[0].text = '跑道名称'
-                table.rows[3].cells[1].text = getattr(target, 'RunwayName', '') or ''
-                table.rows[4].cells[0].text = '国家/地区'
-                table.rows[4].cells[1].text = getattr(target, 'Country', '') or ''
-                table.rows[5].cells[0].text = '基地/部队'
-                table.rows[5].cells[1].text = getattr(target, 'Base', '') or ''
-                table.rows[6].cells[0].text = '跑道长度(m)'
-                table.rows[6].cells[1].text = str(getattr(target, 'RLength', '') or '')
-                table.rows[7].cells[0].text = '跑道宽度(m)'
-                table.rows[7].cells[1].text = str(getattr(target, 'RWidth', '') or '')
-                table.rows[8].cells[0].text = '混凝土面层厚度(cm)'
-                table.rows[8].cells[1].text = str(getattr(target, 'PCCSCThick', '') or '')
-                table.rows[9].cells[0].text = '水泥稳定碎石基层厚度(cm)'
-                table.rows[9].cells[1].text = str(getattr(target, 'CTBCThick', '') or '')
-                table.rows[10].cells[0].text = '级配砂砾石垫层厚度(cm)'
-                table.rows[10].cells[1].text = str(getattr(target, 'GCSSThick', '') or '')
-                table.rows[11].cells[0].text = '土基压实层厚度(cm)'
-                table.rows[11].cells[1].text = str(getattr(target, 'CSThick', '') or '')
-
-                # 设置表格字体为宋体
-                for row in table.rows:
-                    for cell in row.cells:
-                        set_cell_font(cell)
-            elif report.TargetType == 2:  # 单机掩蔽库
-                table = doc.add_table(rows=13, cols=2)
-                table.style = 'Light Grid Accent 1'
-                table.rows[0].cells[0].text = '字段'
-                table.rows[0].cells[1].text = '值'
-                table.rows[1].cells[0].text = '目标类型'
-                table.rows[1].cells[1].text = target_type_name
-                table.rows[2].cells[0].text = '掩蔽库代码'
-                table.rows[2].cells[1].text = getattr(target, 'ShelterCode', '') or ''
-                table.rows[3].cells[0].text = '掩蔽库名称'
-                table.rows[3].cells[1].text = getattr(target, 'ShelterName', '') or ''
-                table.rows[4].cells[0].text = '国家/地区'
-                table.rows[4].cells[1].text = getattr(target, 'Country', '') or ''
-                table.rows[5].cells[0].text = '基地/部队'
-                table.rows[5].cells[1].text = getattr(target, 'Base', '') or ''
-                table.rows[6].cells[0].text = '库容净宽(m)'
-                table.rows[6].cells[1].text = str(getattr(target, 'ShelterWidth', '') or '')
-                table.rows[7].cells[0].text = '库容净高(m)'
-                table.rows[7].cells[1].text = str(getattr(target, 'ShelterHeight', '') or '')
-                table.rows[8].cells[0].text = '库容净长(m)'
-                table.rows[8].cells[1].text = str(getattr(target, 'ShelterLength', '') or '')
-                table.rows[9].cells[0].text = '结构形式'
-                table.rows[9].cells[1].text = getattr(target, 'StructuralForm', '') or ''
-                table.rows[10].cells[0].text = '结构层材料'
-                table.rows[10].cells[1].text = getattr(target, 'StructureLayerMaterial', '') or ''
-                table.rows[11].cells[0].text = '结构层厚度(cm)'
-                table.rows[11].cells[1].text = str(getattr(target, 'StructureLayerThick', '') or '')
-                table.rows[12].cells[0].text = '防护层材料'
-                table.rows[12].cells[1].text = getattr(target, 'MaskLayerMaterial', '') or ''
-
-                # 设置表格字体为宋体
-                for row in table.rows:
-                    for cell in row.cells:
-                        set_cell_font(cell)
-            elif report.TargetType == 3:  # 地下指挥所
-                table = doc.add_table(rows=13, cols=2)
-                table.style = 'Light Grid Accent 1'
-                table.rows[0].cells[0].text = '字段'
-                table.rows[0].cells[1].text = '值'
-                table.rows[1].cells[0].text = '目标类型'
-                table.rows[1].cells[1].text = target_type_name
-                table.rows[2].cells[0].text = '指挥所代码'
-                table.rows[2].cells[1].text = getattr(target, 'UCCCode', '') or ''
-                table.rows[3].cells[0].text = '指挥所名称'
-                table.rows[3].cells[1].text = getattr(target, 'UCCName', '') or ''
-                table.rows[4].cells[0].text = '国家/地区'
-                table.rows[4].cells[1].text = getattr(target, 'Country', '') or ''
-                table.rows[5].cells[0].text = '基地/部队'
-                table.rows[5].cells[1].text = getattr(target, 'Base', '') or ''
-                table.rows[6].cells[0].text = '所在位置'
-                table.rows[6].cells[1].text = getattr(target, 'Location', '') or ''
-                table.rows[7].cells[0].text = '岩层材料'
-                table.rows[7].cells[1].text = getattr(target, 'RockLayerMaterials', '') or ''
-                table.rows[8].cells[0].text = '岩层厚度(m)'
-                table.rows[8].cells[1].text = str(getattr(target, 'RockLayerThick', '') or '')
-                table.rows[9].cells[0].text = '防护层材料'
-                table.rows[9].cells[1].text = getattr(target, 'ProtectiveLayerMaterial', '') or ''
-                table.rows[10].cells[0].text = '防护层厚度(m)'
-                table.rows[10].cells[1].text = str(getattr(target, 'ProtectiveLayerThick', '') or '')
-                table.rows[11].cells[0].text = '指挥中心墙壁材料'
-                table.rows[11].cells[1].text = getattr(target, 'UCCWallMaterials', '') or ''
-                table.rows[12].cells[0].text = '指挥中心墙壁厚度(m)'
-                table.rows[12].cells[1].text = str(getattr(target, 'UCCWallThick', '') or '')
-
-                # 设置表格字体为宋体
-                for row in table.rows:
-                    for cell in row.cells:
-                        set_cell_font(cell)
-        else:
-            doc.add_paragraph('无目标数据')
-
-        doc.add_paragraph()
-
-        # 四、毁伤场景
-        h1_para = doc.add_heading('四、毁伤场景', 1)
-        set_paragraph_font(h1_para, '宋体')
-        doc.add_paragraph()
-
-        if scene:
-            table = doc.add_table(rows=6, cols=2)
-            table.style = 'Light Grid Accent 1'
-            table.rows[0].cells[0].text = '字段'
-            table.rows[0].cells[1].text = '值'
-            table.rows[1].cells[0].text = '场景编号'
-            table.rows[1].cells[1].text = scene.DSCode or ''
-            table.rows[2].cells[0].text = '场景名称'
-            table.rows[2].cells[1].text = scene.DSName or ''
-            table.rows[3].cells[0].text = '进攻方'
-            table.rows[3].cells[1].text = scene.DSOffensive or ''
-            table.rows[4].cells[0].text = '假想敌'
-            table.rows[4].cells[1].text = scene.DSDefensive or ''
-            table.rows[5].cells[0].text = '所在战场'
-            table.rows[5].cells[1].text = scene.DSBattle or ''
-
-            # 设置表格字体为宋体
-            for row in table.rows:
-                for cell in row.cells:
-                    set_cell_font(cell)
-        else:
-            doc.add_paragraph('无场景数据')
-
-        doc.add_paragraph()
-
-        # 五、毁伤参数
-        h1_para = doc.add_heading('五、毁伤参数', 1)
-        set_paragraph_font(h1_para, '宋体')
-        doc.add_paragraph()
-
-        if parameter:
-            table = doc.add_table(rows=13, cols=2)
-            table.style = 'Light Grid Accent 1'
-            table.rows[0].cells[0].text = '字段'
-            table.rows[0].cells[1].text = '值'
-            table.rows[1].cells[0].text = '投放平台'
-            table.rows[1].cells[1].text = parameter.Carrier or ''
-            table.rows[2].cells[0].text = '制导方式'
-            table.rows[2].cells[1].text = parameter.GuidanceMode or ''
-            table.rows[3].cells[0].text = '战斗部类型'
-            table.rows[3].cells[1].text = parameter.WarheadType or ''
-            table.rows[4].cells[0].text = '装药量(kg)'
-            table.rows[4].cells[1].text = str(parameter.ChargeAmount or '')
-            table.rows[5].cells[0].text = '投弹高度'
-            table.rows[5].cells[1].text = str(parameter.DropHeight or '')
-            table.rows[6].cells[0].text = '投弹速度(m/s)'
-            table.rows[6].cells[1].text = str(parameter.DropSpeed or '')
-            table.rows[7].cells[0].text = '投弹方式'
-            table.rows[7].cells[1].text = parameter.DropMode or ''
-            table.rows[8].cells[0].text = '射程(km)'
-            table.rows[8].cells[1].text = str(parameter.FlightRange or '')
-            table.rows[9].cells[0].text = '电磁干扰等级'
-            table.rows[9].cells[1].text = parameter.ElectroInterference or ''
-            table.rows[10].cells[0].text = '天气状况'
-            table.rows[10].cells[1].text = parameter.WeatherConditions or ''
-            table.rows[11].cells[0].text = '环境风速(m/s)'
-            table.rows[11].cells[1].text = str(parameter.WindSpeed or '')
-
-            # 设置表格字体为宋体
-            for row in table.rows:
-                for cell in row.cells:
-                    set_cell_font(cell)
-        else:
-            doc.add_paragraph('无参数数据')
-
-        doc.add_paragraph()
-
-        # 六、毁伤能力计算
-        h1_para = doc.add_heading('六、毁伤能力计算', 1)
-        set_paragraph_font(h1_para, '宋体')
-        doc.add_paragraph()
-
-        if result:
-            table = doc.add_table(rows=8, cols=2)
-            table.style = 'Light Grid Accent 1'
-            table.rows[0].cells[0].text = '字段'
-            table.rows[0].cells[1].text = '值'
-            table.rows[1].cells[0].text = '弹坑深度(m)'
-            table.rows[1].cells[1].text = str(result.DADepth or '')
-            table.rows[2].cells[0].text = '弹坑直径(m)'
-            table.rows[2].cells[1].text = str(result.DADiameter or '')
-            table.rows[3].cells[0].text = '弹坑容积(m³)'
-            table.rows[3].cells[1].text = str(result.DAVolume or '')
-            table.rows[4].cells[0].text = '弹坑面积(m²)'
-            table.rows[4].cells[1].text = str(result.DAArea or '')
-            table.rows[5].cells[0].text = '弹坑长度(m)'
-            table.rows[5].cells[1].text = str(result.DALength or '')
-            table.rows[6].cells[0].text = '弹坑宽度(m)'
-            table.rows[6].cells[1].text = str(result.DAWidth or '')
-            table.rows[7].cells[0].text = '结构破坏程度'
-            table.rows[7].cells[1].text = str(result.Discturction or '')
-
-            # 设置表格字体为宋体
-            for row in table.rows:
-                for cell in row.cells:
-                    set_cell_font(cell)
-        else:
-            doc.add_paragraph('无毁伤计算结果')
-
-        doc.add_paragraph()
-
-        # 七、毁伤评估
-        h1_para = doc.add_heading('七、毁伤评估', 1)
-        set_paragraph_font(h1_para, '宋体')
-        doc.add_paragraph()
-
-        # 毁伤等级
-        table = doc.add_table(rows=1, cols=2)
-        table.style = 'Light Grid Accent 1'
-        table.rows[0].cells[0].text = '毁伤等级'
-        table.rows[0].cells[1].text = report.DamageDegree or ''
-
-        # 设置表格字体为宋体
-        for row in table.rows:
-            for cell in row.cells:
-                set_cell_font(cell)
-
-        doc.add_paragraph()
-
-        # 评估结论 - 支持换行（使用add_heading确保字体生效）
-        h3_para = doc.add_heading('评估结论:', level=3)
-        # 使用辅助函数完整设置字体
-        set_paragraph_font(h3_para, '宋体')
-        comment_text = report.Comment or '无'
-        doc.add_paragraph(comment_text)
-
-        doc.add_paragraph()
-
-        # 八、报告人员信息
-        h1_para = doc.add_heading('八、报告人员信息', 1)
-        set_paragraph_font(h1_para, '宋体')
-        doc.add_paragraph()
-
-        table = doc.add_table(rows=2, cols=2)
-        table.style = 'Light Grid Accent 1'
-        table.rows[0].cells[0].text = '报告操作人员ID'
-        table.rows[0].cells[1].text = str(report.Creator or '')
-        table.rows[1].cells[0].text = '报告审核人'
-        table.rows[1].cells[1].text = report.Reviewer or ''
-
-        # 设置表格字体为宋体
-        for row in table.rows:
-            for cell in row.cells:
-                set_cell_font(cell)
-
-        # 保存文档
-        doc.save(output_path)
+        if not use_cache:
+            render_report_word(data, output_path)
+        elif _render_cached(report_id, "word", data, output_path, render_report_word):
+            logger.info(f"报告未变更，已从缓存导出为Word: {output_path}")
+            return True, "导出成功"
 
         logger.info(f"报告已成功导出为Word: {output_path}")
         return True, "导出成功"
@@ -1132,9 +671,106 @@ def export_report_to_file(report_id: int, output_path: str, format: str = "pdf")
     format = format.lower().strip()
 
     if format == "pdf":
-        return export_report_to_pdf(report_id, output_path)
+        with METRICS.timer("export.report.pdf") as t:
+            ok, msg = export_report_to_pdf(report_id, output_path)
+            t.rows = 1 if ok else None
+        return ok, msg
     elif format in ["word", "docx"]:
-        return export_report_to_word(report_id, output_path)
+        with METRICS.timer("export.report.word") as t:
+            ok, msg = export_report_to_word(report_id, output_path)
+            t.rows = 1 if ok else None
+        return ok, msg
     else:
         return False, f"不支持的导出格式: {format}"
 
+
+
+# ---------- PDF 渲染基准 ----------
+
+def _sample_report_data(i: int) -> Dict[str, Any]:
+    """基准用的合成报告数据（字段与 get_report_full_data 一致，不访问数据库）"""
+    from datetime import datetime
+
+    row = _RowObject
+    return {
+        'report': row({'ReportName': f"毁伤评估报告-{i}", 'ReportCode': f"RPT-{i:06d}",
+                       'CreatedTime': datetime(2025, 1, 1, 8, 0, 0), 'TargetType': 1 + i % 3,
+                       'DamageDegree': "重度毁伤", 'Comment': "跑道中段形成弹坑\n短期内无法起降",
+                       'Creator': 1, 'Reviewer': "审核员"}),
+        'result': row({'DADepth': 3.2, 'DADiameter': 8.5, 'DAVolume': 96.0, 'DAArea': 56.7,
+                       'DALength': 9.1, 'DAWidth': 7.8, 'Discturction': "严重破坏"}),
+        'scene': row({'DSCode': f"DS-{i}", 'DSName': "机场封锁", 'DSOffensive': "红方",
+                      'DSDefensive': "蓝方", 'DSBattle': "东部战场"}),
+        'parameter': row({'Carrier': "歼击机", 'GuidanceMode': "卫星制导", 'WarheadType': "侵彻战斗部",
+                          'ChargeAmount': 120.0, 'DropHeight': "8000", 'DropSpeed': 250.0, 'DropMode': "俯冲",
+                          'FlightRange': 60.0, 'ElectroInterference': "中", 'WeatherConditions': "晴",
+                          'WindSpeed': 3.5}),
+        'ammunition': row({'AMName': "GBU-31", 'AMNameCN': "联合直接攻击弹药", 'AMType': "航空炸弹",
+                           'AMModel': "MK-84", 'Country': "国家A", 'AMWeight': 925.0,
+                           'WarheadType': "侵彻战斗部", 'ChargeAmount': 429.0, 'EXBComponent': "H-6"}),
+        'target': row({'RunwayCode': f"RW-{i}", 'RunwayName': "主跑道", 'ShelterCode': f"SH-{i}",
+                       'UCCCode': f"UCC-{i}", 'Country': "国家B", 'Base': "某基地", 'RLength': 3200,
+                       'RWidth': 60, 'ShelterWidth': 24, 'RockLayerThick': 30}),
+        'target_type_name': ("机场跑道", "单机掩蔽库", "地下指挥所")[i % 3],
+    }
+
+
+def _benchmark_run(mode: str, count: int, out_dir: str) -> Dict[str, float]:
+    """在当前进程中渲染 count 份报告；mode=before 时每份报告重新构建字体与样式"""
+    import time
+
+    path = os.path.join(out_dir, f"report_{mode}.pdf")
+    data = [_sample_report_data(i) for i in range(count)]
+    if mode == "after":
+        preload_report_resources()  # 对应程序启动时的预加载，不计入报告耗时
+    times = []
+    for d in data:
+        t0 = time.perf_counter()
+        render_report_pdf(d, path, _PdfContext() if mode == "before" else None)
+        times.append((time.perf_counter() - t0) * 1000)
+    return {"first_ms": times[0], "mean_ms": sum(times) / count}
+
+
+def benchmark(counts=(1, 100, 1000), out_dir: Optional[str] = None) -> Dict[int, Dict[str, Dict[str, float]]]:
+    """
+    单份 PDF 报告的渲染耗时（ms）。每组在新的子进程中运行，首份报告包含字体首次注册的冷启动开销：
+    before = 每份报告重新注册字体、构建段落与表格样式（缓存前的做法）；
+    after = 进程内缓存的上下文，已在启动时预加载
+    """
+    import json
+    import subprocess
+    import tempfile
+
+    out_dir = out_dir or tempfile.mkdtemp(prefix="reportbench_")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results: Dict[int, Dict[str, Dict[str, float]]] = {}
+    for n in counts:
+        results[n] = {}
+        for mode in ("before", "after"):
+            out = subprocess.run(
+                [sys.executable, "-m", "BusinessCode.ReportExporter", "--child", mode,
+                 "--counts", str(n), "--dir", out_dir],
+                cwd=root, capture_output=True, text=True, check=True).stdout
+            results[n][mode] = json.loads(out.strip().splitlines()[-1])
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="PDF 报告渲染基准")
+    parser.add_argument("--counts", default="1,100,1000", help="报告份数，逗号分隔")
+    parser.add_argument("--dir", default=None, help="输出目录（默认临时目录）")
+    parser.add_argument("--child", choices=("before", "after"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        logger.remove()
+        print(json.dumps(_benchmark_run(args.child, int(args.counts), args.dir)))
+        sys.exit(0)
+
+    for n, r in benchmark(tuple(int(c) for c in args.counts.split(",")), args.dir).items():
+        b, a = r["before"], r["after"]
+        print(f"{n:6d} 份   缓存前 首份 {b['first_ms']:7.1f} ms 平均 {b['mean_ms']:6.2f} ms/份   "
+              f"缓存后 首份 {a['first_ms']:7.1f} ms 平均 {a['mean_ms']:6.2f} ms/份")
@@ -2,30 +2,29 @@ import os
 import sys
 from copy import copy
 from decimal import Decimal, InvalidOperation
-from typing import Any, Optional, Dict, List
+from typing import Any, Optional, Dict, Iterator, List
 
 from PyQt6.QtGui import QStandardItemModel, QStandardItem
 
 from BusinessCode.DM_Ammunition_Add import AmmunitionEditor, AmmunitionEditorMode
+from BusinessCode.AmmunitionService import INDEX_PATH, iter_ammunition_by_conditions, rebuild_semantic_index
 from BusinessCode.DM_Ammunition_Export import show_export_dialog
-from BusinessCode.am_semantic_search import build_semantic_index_from_db, smart_query, SemanticIndex
-from DBCode.DBHelper import DBHelper
+from BusinessCode.QueryRunner import QueryRunner
+from BusinessCode.am_semantic_search import smart_query, SemanticIndex
+from DBCode.LookupCache import LOOKUPS
 from am_models import Ammunition
-from am_models.db import session_scope as am_session, session_scope
+from am_models.db import session_scope as am_session
 from am_models.gui_adapter import to_decimal_or_none
-from am_models.sql_repository import SQLRepository as am_repository
 from PyQt6.QtCore import pyqtSignal, QThread, QModelIndex
 from PyQt6.QtWidgets import (
     QApplication, QFileDialog, QMessageBox, QDialog, QHeaderView
 )
 from loguru import logger
-from sqlalchemy import select
 
 from UIs.Frm_Search_Ammunition import Ui_Frm_Q_Ammunition
 from am_models.orm import AmmunitionORM
-from damage_models import AssessmentResultRepository, DamageSceneRepository
 
-local_model_dir = r"./models/ammo_index"  # 你的实际路径
+local_model_dir = INDEX_PATH
 
 
 class SemanticIndexWorker(QThread):
@@ -58,15 +57,11 @@ class SemanticIndexWorker(QThread):
                 else:
                     logger.debug(f"不存在{local_model_dir}")
                     self.message.emit("正在构建语义索引 ...")
-                sem_idx = build_semantic_index_from_db(
-                    self.session_or_scope, self.orm_cls,
-                    id_attr="am_id", prefer_model=self.prefer_model
-                )
-                if sem_idx == None:
+                sem_idx = rebuild_semantic_index(local_model_dir, prefer_model=self.prefer_model)
+                if sem_idx is None:
                     self.message.emit("索引未构建，可能因为数据条目为0")
                 else:
                     self.message.emit("索引构建完成")
-                    sem_idx.save_index(local_model_dir)
                     self.done.emit(sem_idx)
         except Exception as e:
             logger.exception(e)
@@ -94,6 +89,15 @@ class AmmunitionSearch(QDialog):
 
         self.am_results: List[Ammunition] = []
 
+        # 组合检索在后台线程执行，结果分块填充表格；修改条件即取消正在执行的检索
+        self._runner = QueryRunner(self)
+        self._runner.chunk.connect(self._on_search_chunk)
+        self._runner.done.connect(self._on_search_done)
+        self._runner.failed.connect(lambda msg: QMessageBox.warning(self, "错误", f"数据库查询发生错误{msg}"))
+        self._runner.cancelled.connect(lambda: self.ui.lb_noti.setText("检索条件已修改，已取消上一次检索"))
+        self._runner.cancel_on_edit(*self._condition_widgets())
+        self.finished.connect(lambda _result: self._runner.shutdown())
+
         if self.ui.cmb_topk.count() == 0:
             self.ui.cmb_topk.addItems(["前3个", "前5个", "前10个"])
         self.topK_choice = [3, 5, 10]
@@ -219,7 +223,7 @@ class AmmunitionSearch(QDialog):
 
     def _init_comboboxes(self):
         if self.ui.comboBox.count() == 0:
-            self.ui.comboBox.addItems(["钻地弹", "空地导弹", "子母弹", "巡航导弹", "布撒器", "其他"])
+            self.ui.comboBox.addItems(LOOKUPS.values("am_type"))
 
     def combination_search(self):
         # 判断是否完成必填
@@ -262,154 +266,57 @@ class AmmunitionSearch(QDialog):
 
         logger.debug(f"condition_data={condition_data}")
 
-        try:
-            res_ams = self._query_ammunition_by_conditions(condition_data)
-            for _, res_am in enumerate(res_ams):
-                logger.debug(f"查询到={res_am.am_name}")
-        except Exception as e:
-            logger.exception(e)
-            QMessageBox.warning(self, "错误", f"数据库查询发生错误{e}")
-            return
-
-        self.ui.lb_noti.setText(f"检索到{len(res_ams)}条结果")
+        self.am_results = []
+        self._reset_table()
+        self.ui.lb_noti.setText("正在检索 ...")
+        self._runner.submit(lambda: self._iter_ammunition_by_conditions(condition_data))
 
+    def _on_search_chunk(self, ams: List[Ammunition]) -> None:
         try:
-            self.am_results = copy(res_ams)
-            self.setup_table(res_ams)
+            self.am_results.extend(ams)
+            self._append_rows(ams)
         except Exception as e:
             logger.exception(e)
             QMessageBox.warning(self, "错误", f"更新表格发生错误{e}")
             return
+        self.ui.lb_noti.setText(f"正在检索，已找到{len(self.am_results)}条结果 ...")
+
+    def _on_search_done(self, total: int, elapsed_ms: float) -> None:
+        logger.debug(f"检索结果：{total} 条, {elapsed_ms:.1f} ms")
+        self.ui.lb_noti.setText(f"检索到{total}条结果")
+
+    def _condition_widgets(self) -> list:
+        return [
+            self.ui.checkBox, self.ui.comboBox,
+            self.ui.checkBox_2, self.ui.txt_country,
+            self.ui.checkBox_3, self.ui.txt_am_no,
+            self.ui.checkBox_4, self.ui.txt_len_a, self.ui.txt_len_b,
+            self.ui.checkBox_5, self.ui.txt_d_a, self.ui.txt_d_b,
+            self.ui.checkBox_6, self.ui.txt_maxspeed_a, self.ui.txt_maxspeed_b,
+            self.ui.checkBox_7, self.ui.txt_hs_level,
+            self.ui.checkBox_8, self.ui.txt_hs_scene,
+            self.ui.checkBox_9, self.ui.txt_weight,
+        ]
 
     def _query_ammunition_by_conditions(self, condition_data: Dict[str, Any]) -> list[Ammunition]:
-        def _has_value(v: Any) -> bool:
-            if v is None:
-                return False
-            if isinstance(v, str):
-                return v.strip() != ""
-            return True
-
-        am_stmt = select(AmmunitionORM)
-        ar_amids = []
-        ds_amids = []
-        logger.debug(f"am_stmt={am_stmt}")
-        filters: List[Any] = []
-
-        # 1) 弹药类型
-        if condition_data.get("am_type_enabled", False):
-            val = (condition_data.get("am_type") or "").strip()
-            if val == "其他":
-                # 排除已知类型
-                exclude = ["钻地弹", "空地导弹", "子母弹", "巡航导弹", "布撒器"]
-                filters.append(~AmmunitionORM.am_type.in_(exclude))
-            elif _has_value(val):
-                filters.append(AmmunitionORM.am_type.like(f"%{val}%"))
-
-        # 2) 国家
-        if condition_data.get("country_enabled", False):
-            val = condition_data.get("country")
-            if _has_value(val):
-                filters.append(AmmunitionORM.country.like(f"%{val.strip()}%"))
-
-        # 3) 型号
-        if condition_data.get("am_model_enabled", False):
-            val = condition_data.get("am_model")
-            if _has_value(val):
-                filters.append(AmmunitionORM.model_name.like(f"%{val.strip()}%"))
-
-        # 4) 长度区间
-        if condition_data.get("am_length_enabled", False):
-            a_ = condition_data.get("am_length_a")
-            b_ = condition_data.get("am_length_b")
-            col = AmmunitionORM.length_m
-            if a_ is not None and b_ is not None:
-                filters.append(col.between(a_, b_))
-            elif a_ is not None:
-                filters.append(col >= a_)
-            elif b_ is not None:
-                filters.append(col <= b_)
-
-        # 5) 直径区间
-        if condition_data.get("am_diameter_enabled", False):
-            a_ = condition_data.get("am_diameter_a")
-            b_ = condition_data.get("am_diameter_b")
-            col = AmmunitionORM.diameter_m
-            if a_ is not None and b_ is not None:
-                filters.append(col.between(a_, b_))
-            elif a_ is not None:
-                filters.append(col >= a_)
-            elif b_ is not None:
-                filters.append(col <= b_)
-
-        # 6) 最大速度区间
-        if condition_data.get("max_speed_enabled", False):
-            a_ = condition_data.get("max_speed_a")
-            b_ = condition_data.get("max_speed_b")
-            col = AmmunitionORM.max_speed_ma
-            if a_ is not None and b_ is not None:
-                filters.append(col.between(a_, b_))
-            elif a_ is not None:
-                filters.append(col >= a_)
-            elif b_ is not None:
-                filters.append(col <= b_)
-
-        # 7) 重量
-        if condition_data.get("am_weight_enabled", False):
-            w = condition_data.get("am_weight")
-            if w is not None:
-                filters.append(AmmunitionORM.weight_kg == w)
-
-        if filters:
-            am_stmt = am_stmt.where(*filters)
+        return [am for chunk in self._iter_ammunition_by_conditions(condition_data) for am in chunk]
 
-        with am_session() as session:
-            res_orm = session.execute(am_stmt).scalars().all()
-
-        logger.debug(f"检索结果：: {len(res_orm)}")
-
-        # 评估/场景交叉过滤
-        if condition_data.get("damage_parameter_damage_level_enabled", False):
-            try:
-                ar_repo = AssessmentResultRepository(DBHelper())
-                ar_am = ar_repo.search(condition_data.get("damage_parameter_damage_level"))
-                logger.debug(f"检索毁伤结果表：ar_am={ar_am}")
-                for am in ar_am:
-                    ar_amids.append(am.AMID)
-            except Exception as e:
-                logger.exception(f"检索毁伤结果表失败{e}")
-
-        if condition_data.get("damage_parameter_name_enabled", False):
-            try:
-                ds_repo = DamageSceneRepository(DBHelper())
-                ds_am = ds_repo.search(condition_data.get("damage_parameter_damage_level"))
-                logger.debug(f"检索毁伤场景表：ds_am={ds_am}")
-                for am in ds_am:
-                    ds_amids.append(am.AMID)
-            except Exception as e:
-                logger.exception(f"检索毁伤参数表失败{e}")
-
-        result: List[Ammunition] = [am_repository.to_entity(r, False) for r in res_orm]
-        if not result:
-            return []
-
-        set_b = set(ar_amids)
-        set_c = set(ds_amids)
-
-        if condition_data.get("damage_parameter_damage_level_enabled", False) and condition_data.get(
-                "damage_parameter_name_enabled", False):
-            return [obj for obj in result if obj.am_id in set_b and obj.am_id in set_c]
-        elif condition_data.get("damage_parameter_damage_level_enabled", False):
-            return [obj for obj in result if obj.am_id in set_b]
-        elif condition_data.get("damage_parameter_name_enabled", False):
-            return [obj for obj in result if obj.am_id in set_c]
-
-        return result
+    def _iter_ammunition_by_conditions(self, condition_data: Dict[str, Any]) -> Iterator[List[Ammunition]]:
+        """按块返回检索结果（见 AmmunitionService，可在后台线程中执行）"""
+        return iter_ammunition_by_conditions(condition_data)
+
+    _HEADERS = ["弹药类型", "国家/地区", "中文名称", "弹药型号", "弹药全重", "弹药长度", "弹体直径", "最大时速",
+                "战斗部", "爆炸当量", "_id"]
 
     def setup_table(self, data: List[Ammunition]) -> None:
+        self._reset_table()
+        self._append_rows(data)
+        logger.debug("表格更新完毕")
+
+    def _reset_table(self) -> None:
         tv = self.ui.tv_result
 
-        headers = ["弹药类型", "国家/地区", "中文名称", "弹药型号", "弹药全重", "弹药长度", "弹体直径", "最大时速",
-                   "战斗部", "爆炸当量", "_id"]
+        headers = self._HEADERS
         table = QStandardItemModel(0, len(headers), tv)
         table.setHorizontalHeaderLabels(headers)
         tv.setModel(table)
@@ -423,26 +330,26 @@ class AmmunitionSearch(QDialog):
         tv.setSelectionBehavior(tv.SelectionBehavior.SelectRows)
         tv.setEditTriggers(tv.EditTrigger.NoEditTriggers)
 
-        for row_id, am in enumerate(data):
-            table.insertRow(row_id)
-            table.setItem(row_id, 0, QStandardItem(am.am_type))
-            table.setItem(row_id, 1, QStandardItem(am.country))
-            table.setItem(row_id, 2, QStandardItem(am.am_name))
-            table.setItem(row_id, 3, QStandardItem(am.model_name))
-            table.setItem(row_id, 4, QStandardItem(str(am.weight_kg)))
-            table.setItem(row_id, 5, QStandardItem(str(am.length_m)))
-            table.setItem(row_id, 6, QStandardItem(str(am.diameter_m)))
-            table.setItem(row_id, 7, QStandardItem(str(am.max_speed_ma)))
-            table.setItem(row_id, 8, QStandardItem(am.warhead_type))
-            table.setItem(row_id, 9, QStandardItem(str(am.explosion_equivalent_TNT_T)))
-
-            # 隐藏的主键列
-            table.setItem(row_id, len(headers) - 1, QStandardItem(str(am.am_id)))
-
         # 隐藏 _id 列
         tv.setColumnHidden(len(headers) - 1, True)
 
-        logger.debug("表格更新完毕")
+    def _append_rows(self, data: List[Ammunition]) -> None:
+        table = self.ui.tv_result.model()
+        for am in data:
+            table.appendRow([
+                QStandardItem(am.am_type),
+                QStandardItem(am.country),
+                QStandardItem(am.am_name),
+                QStandardItem(am.model_name),
+                QStandardItem(str(am.weight_kg)),
+                QStandardItem(str(am.length_m)),
+                QStandardItem(str(am.diameter_m)),
+                QStandardItem(str(am.max_speed_ma)),
+                QStandardItem(am.warhead_type),
+                QStandardItem(str(am.explosion_equivalent_TNT_T)),
+                # 隐藏的主键列
+                QStandardItem(str(am.am_id)),
+            ])
 
     def nlp_search(self):
         text = self.ui.txt_nlp.text().strip()
@@ -4,9 +4,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Sequence
+from typing import Dict, Iterator, List, Sequence
 
-from loguru import logger
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QStandardItem, QStandardItemModel
 from PyQt6.QtWidgets import (
@@ -18,17 +17,14 @@ from PyQt6.QtWidgets import (
     QDialog,
 )
 
+from BusinessCode.AssessmentService import REPORT_QUERY, TARGET_TYPE_LABELS
+from BusinessCode.QueryRunner import QueryRunner
 from BusinessCode.ReportDetailDialog import ReportDetailDialog
 from BusinessCode.ReportExporter import export_report_to_file
 from DBCode.DBHelper import DBHelper
+from DBCode.LookupCache import LOOKUPS
 from UIs.Frm_Search_Report import Ui_Frm_Search_Report
 
-TARGET_TYPE_LABELS = {
-    1: "机场跑道",
-    2: "单机掩蔽库",
-    3: "地下指挥所",
-}
-
 
 @dataclass
 class ReportRow:
@@ -68,6 +64,9 @@ class AssessmentReportSearchDialog(QDialog):
             "Comment": ("Comment_2",),
         }
 
+        # 检索在后台线程执行，结果分块追加到表格（见 BusinessCode.QueryRunner）
+        self._runner = QueryRunner(self)
+
         self._setup_dropdowns()
         self._setup_checkbox_dependencies()
         self._setup_table()
@@ -80,15 +79,9 @@ class AssessmentReportSearchDialog(QDialog):
     def _setup_dropdowns(self) -> None:
         self._init_combo(self.ui.Targets_2, ["", *TARGET_TYPE_LABELS.values()])
 
-        damage_degrees = self._fetch_distinct(
-            "SELECT DISTINCT DamageDegree FROM Assessment_Report WHERE DamageDegree IS NOT NULL AND DamageDegree <> ''"
-        )
-        self._init_combo(self.ui.DamageDegree_2, ["", *damage_degrees])
-
-        am_types = self._fetch_distinct(
-            "SELECT DISTINCT AMType FROM Ammunition_Info WHERE AMType IS NOT NULL AND AMType <> ''"
-        )
-        self._init_combo(self.ui.AMType_2, ["", *am_types])
+        # 取值字典在进程内共享，只包含库中已出现的取值（见 DBCode.LookupCache）
+        self._init_combo(self.ui.DamageDegree_2, ["", *LOOKUPS.values("damage_degree", with_defaults=False)])
+        self._init_combo(self.ui.AMType_2, ["", *LOOKUPS.values("am_type", with_defaults=False)])
 
     def _init_combo(self, widget: QComboBox, items: Sequence[str]) -> None:
         widget.clear()
@@ -150,22 +143,35 @@ class AssessmentReportSearchDialog(QDialog):
         self.ui.btn_export.clicked.connect(self._export_selected)
         self.ui.tv_result.doubleClicked.connect(lambda _: self._view_selected())
 
+        self._runner.chunk.connect(self._on_search_chunk)
+        self._runner.done.connect(lambda total, _ms: self.ui.lb_noti.setText(f"共找到 {total} 条记录"))
+        self._runner.failed.connect(lambda msg: QMessageBox.warning(self, "错误", msg))
+        self._runner.cancelled.connect(lambda: self.ui.lb_noti.setText("检索条件已修改，已取消上一次检索"))
+        condition_widgets = []
+        for chk_name, widget_names in self._checkbox_map.items():
+            condition_widgets.append(getattr(self.ui, chk_name, None))
+            condition_widgets.extend(getattr(self.ui, name, None) for name in widget_names)
+        self._runner.cancel_on_edit(*condition_widgets)
+        self.finished.connect(lambda _result: self._runner.shutdown())
+
     # ------------------------------------------------------------------ events
     def combination_search(self) -> None:
         condition = self._collect_conditions()
         if not condition:
             QMessageBox.information(self, "提示", "请先勾选并填写至少一个检索条件")
             return
-        try:
-            rows = self._query_reports(condition)
-        except Exception as exc:
-            logger.exception(exc)
-            QMessageBox.warning(self, "错误", f"查询失败：{exc}")
-            return
-        self._populate_table(rows)
-        self.ui.lb_noti.setText(f"共找到 {len(rows)} 条记录")
+        self._results = []
+        self._setup_table()
+        self.ui.lb_noti.setText("正在检索 ...")
+        self._runner.submit(lambda: self._stream_reports(condition))
+
+    def _on_search_chunk(self, rows: List[ReportRow]) -> None:
+        self._results.extend(rows)
+        self._append_rows(rows)
+        self.ui.lb_noti.setText(f"正在检索，已找到 {len(self._results)} 条记录 ...")
 
     def reset(self) -> None:
+        self._runner.cancel()
         for chk_name, widgets in self._checkbox_map.items():
             checkbox = getattr(self.ui, chk_name, None)
             if checkbox:
@@ -269,103 +275,32 @@ class AssessmentReportSearchDialog(QDialog):
                 cond["comment"] = value
         return cond
 
-    def _query_reports(self, cond: Dict[str, str | int]) -> List[ReportRow]:
-        sql = [
-            "SELECT ar.ReportID, ar.ReportCode, ar.ReportName, ar.DamageDegree, ar.Comment,",
-            "       ar.CreatedTime, ar.Reviewer,",
-            "       ai.AMModel, ai.AMType,",
-            "       ds.DSName AS SceneName,",
-            "       CASE ar.TargetType WHEN 1 THEN '机场跑道' WHEN 2 THEN '单机掩蔽库' WHEN 3 THEN '地下指挥所' ELSE '未知' END AS TargetTypeName,",
-            "       COALESCE(r.RunwayName, sh.ShelterName, u.UCCName) AS TargetName",
-            "FROM Assessment_Report ar",
-            "LEFT JOIN Ammunition_Info ai ON ai.AMID = ar.AMID",
-            "LEFT JOIN DamageScene_Info ds ON ds.DSID = ar.DSID",
-            "LEFT JOIN Runway_Info r ON ar.TargetType = 1 AND ar.TargetID = r.RunwayID",
-            "LEFT JOIN Shelter_Info sh ON ar.TargetType = 2 AND ar.TargetID = sh.ShelterID",
-            "LEFT JOIN UCC_Info u ON ar.TargetType = 3 AND ar.TargetID = u.UCCID",
-        ]
-        where: List[str] = []
-        params: List[str | int] = []
-        like = lambda val: f"%{val}%"
-
-        if value := cond.get("report_code"):
-            where.append("ar.ReportCode LIKE %s")
-            params.append(like(value))
-        if value := cond.get("report_name"):
-            where.append("ar.ReportName LIKE %s")
-            params.append(like(value))
-        if value := cond.get("am_model"):
-            where.append("ai.AMModel LIKE %s")
-            params.append(like(value))
-        if value := cond.get("am_type"):
-            where.append("ai.AMType LIKE %s")
-            params.append(like(value))
-        if value := cond.get("target_type"):
-            where.append("ar.TargetType = %s")
-            params.append(value)
-        if value := cond.get("target_name"):
-            where.append("COALESCE(r.RunwayName, sh.ShelterName, u.UCCName) LIKE %s")
-            params.append(like(value))
-        if value := cond.get("scene_name"):
-            where.append("ds.DSName LIKE %s")
-            params.append(like(value))
-        if value := cond.get("damage_degree"):
-            where.append("ar.DamageDegree LIKE %s")
-            params.append(like(value))
-        if value := cond.get("comment"):
-            where.append("ar.Comment LIKE %s")
-            params.append(like(value))
-
-        if where:
-            sql.append("WHERE " + " AND ".join(where))
-        sql.append("ORDER BY ar.ReportID DESC")
-
-        db = DBHelper()
-        try:
-            rows = db.execute_query("\n".join(sql), params)
-        finally:
-            db.close()
+    def _stream_reports(self, cond: Dict[str, str | int]) -> Iterator[List[ReportRow]]:
+        """按块返回检索结果（不访问界面控件，可在后台线程中执行）"""
+        for rows in REPORT_QUERY.stream(cond):
+            yield [self._to_report_row(row) for row in rows]
+
+    @staticmethod
+    def _to_report_row(row) -> ReportRow:
+        created = row.CreatedTime
+        created_str = created.strftime("%Y-%m-%d %H:%M") if created else ""
+        return ReportRow(
+            report_id=row.ReportID,
+            report_code=row.ReportCode or "",
+            report_name=row.ReportName or "",
+            ammunition_model=row.AMModel,
+            ammunition_type=row.AMType,
+            target_type=row.TargetTypeName or "未知",
+            target_name=row.TargetName,
+            damage_degree=row.DamageDegree,
+            comment=row.Comment,
+            created_time=created_str,
+            reviewer=row.Reviewer,
+        )
 
-        results: List[ReportRow] = []
-        for row in rows or []:
-            created = row.get("CreatedTime")
-            created_str = created.strftime("%Y-%m-%d %H:%M") if created else ""
-            results.append(
-                ReportRow(
-                    report_id=row.get("ReportID"),
-                    report_code=row.get("ReportCode", ""),
-                    report_name=row.get("ReportName", ""),
-                    ammunition_model=row.get("AMModel"),
-                    ammunition_type=row.get("AMType"),
-                    target_type=row.get("TargetTypeName", "未知"),
-                    target_name=row.get("TargetName"),
-                    damage_degree=row.get("DamageDegree"),
-                    comment=row.get("Comment"),
-                    created_time=created_str,
-                    reviewer=row.get("Reviewer"),
-                )
-            )
-        return results
-
-    def _populate_table(self, rows: List[ReportRow]) -> None:
-        self._results = rows
-        headers = [
-            "报告编号",
-            "报告名称",
-            "弹药型号",
-            "弹药类型",
-            "目标类型",
-            "目标名称",
-            "毁伤等级",
-            "评估结论",
-            "创建时间",
-            "审核人",
-        ]
-        tv = self.ui.tv_result
-        model = QStandardItemModel(0, len(headers), tv)
-        model.setHorizontalHeaderLabels(headers)
-        for row_idx, report in enumerate(rows):
-            model.insertRow(row_idx)
+    def _append_rows(self, rows: List[ReportRow]) -> None:
+        model = self.ui.tv_result.model()
+        for report in rows:
             values = [
                 report.report_code,
                 report.report_name,
@@ -378,28 +313,13 @@ class AssessmentReportSearchDialog(QDialog):
                 report.created_time or "",
                 report.reviewer or "",
             ]
-            for col, value in enumerate(values):
+            items = []
+            for value in values:
                 item = QStandardItem(str(value))
                 item.setEditable(False)
-                model.setItem(row_idx, col, item)
-        tv.setModel(model)
-        header = tv.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        header.setStretchLastSection(True)
-        tv.resizeRowsToContents()
-
-    def _fetch_distinct(self, sql: str) -> List[str]:
-        db = DBHelper()
-        try:
-            rows = db.execute_query(sql)
-        finally:
-            db.close()
-        values: List[str] = []
-        for row in rows or []:
-            value = next(iter(row.values()))
-            if isinstance(value, str):
-                values.append(value)
-        return values
+                items.append(item)
+            model.appendRow(items)
+        self.ui.tv_result.resizeRowsToContents()
 
 
 if __name__ == "__main__":
@@ -2,10 +2,10 @@ from __future__ import annotations
 
 import os
 import sys
-from dataclasses import dataclass, fields
+from dataclasses import dataclass
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+from typing import Any, Callable, Dict, List, Optional, Sequence, Type
 
 from loguru import logger
 from PyQt6.QtCore import QThread, pyqtSignal
@@ -16,12 +16,17 @@ from PyQt6.QtWidgets import (
     QHeaderView,
     QMessageBox,
 )
-from sqlalchemy import func, select
+from sqlalchemy import select
+from sqlalchemy.engine import Row
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from BusinessCode.QueryRunner import QueryRunner
+from BusinessCode.QuerySpec import QuerySpec
+from BusinessCode.TargetService import target_display_columns, target_query_spec
+from DBCode.RowMapper import entity_columns, mapper_for
 from BusinessCode.semantic_search import SemanticIndex, build_semantic_index_from_db
 from target_model.db import session_scope as target_session
 from target_model.entities import AirportRunway, AircraftShelter, UndergroundCommandPost
@@ -143,13 +148,25 @@ class _BaseTargetSearchDialog(QDialog):
         self.ui = self.ui_class()  # type: ignore[call-arg]
         self.ui.setupUi(self)
 
-        self.results: List[Any] = []
+        # 当前结果：投影后的 Row（属性访问与实体一致），导出时再按主键加载完整实体
+        self.results: List[Row] = []
         self.sem_idx: Optional[SemanticIndex] = None
         self._sem_worker: Optional[TargetSemanticIndexWorker] = None
 
+        # 组合检索在后台线程执行，结果分块填充表格
+        self._runner = QueryRunner(self)
+        self._runner.chunk.connect(self._on_search_chunk)
+        self._runner.done.connect(self._on_search_done)
+        self._runner.failed.connect(self._on_search_failed)
+        self._runner.cancelled.connect(lambda: self._set_status("检索条件已修改，已取消上一次检索"))
+        self.finished.connect(lambda _result: self._runner.shutdown())
+
         self._init_navigation()
         self._connect_common_slots()
         self._setup_field_dependencies()
+        self._runner.cancel_on_edit(
+            *(getattr(self.ui, name, None) for name in (*self.line_edit_names, *self.check_box_names))
+        )
         self._start_build_semantic_index()
 
     # ------------------------------------------------------------------ navigation
@@ -268,15 +285,23 @@ class _BaseTargetSearchDialog(QDialog):
         if not self._has_conditions(condition):
             QMessageBox.information(self, "提示", "请先勾选并填写至少一个检索条件")
             return
-        try:
-            data = self._query_by_conditions(condition)
-        except Exception as exc:
-            logger.exception(exc)
-            QMessageBox.warning(self, "提示", f"查询失败: {exc}")
-            return
-        self.results = data
-        self._populate_table(data)
-        self._set_status(f"共找到 {len(data)} 条记录")
+        spec = self._query_spec()
+        self.results = []
+        self._reset_table()
+        self._set_status("正在检索 ...")
+        self._runner.submit(lambda: spec.stream(condition))
+
+    def _on_search_chunk(self, rows: List[Row]) -> None:
+        self.results.extend(rows)
+        self._append_rows(rows)
+        self._set_status(f"正在检索，已找到 {len(self.results)} 条记录 ...")
+
+    def _on_search_done(self, total: int, elapsed_ms: float) -> None:
+        self._set_status(f"共找到 {total} 条记录")
+
+    def _on_search_failed(self, msg: str) -> None:
+        self._set_status("")
+        QMessageBox.warning(self, "提示", msg)
 
     def nlp_search(self) -> None:
         if self.sem_idx is None:
@@ -292,11 +317,8 @@ class _BaseTargetSearchDialog(QDialog):
         if not cand_ids:
             self._set_status("索引中没有数据")
             return
-        stmt = select(self.orm_cls).where(getattr(self.orm_cls, self.id_attr).in_(cand_ids))
-        with target_session() as session:
-            rows = session.execute(stmt).scalars().all()
-        entities = [self._to_entity(row) for row in rows]
-        by_id = {getattr(e, self.id_attr): e for e in entities}
+        rows = self._run_display_query([getattr(self.orm_cls, self.id_attr).in_(cand_ids)])
+        by_id = {getattr(r, self.id_attr): r for r in rows}
         ordered = [by_id[id_] for id_ in cand_ids if id_ in by_id]
         self.results = ordered
         self._populate_table(ordered)
@@ -350,10 +372,11 @@ class _BaseTargetSearchDialog(QDialog):
             path = f"{path}{suffix}"
 
         try:
+            entities = self._load_entities([getattr(r, self.id_attr) for r in self.results])
             if suffix == ".json" or "json" in (chosen_filter or "").lower():
-                data = JSONExporter().export(self.results)
+                data = JSONExporter().export(entities)
             else:
-                data = CSVExporter().export(self.results)
+                data = CSVExporter().export(entities)
             Path(path).write_bytes(data)
             QMessageBox.information(self, "提示", f"导出成功：{path}")
         except Exception as exc:
@@ -362,17 +385,16 @@ class _BaseTargetSearchDialog(QDialog):
 
     # ------------------------------------------------------------------ helpers
     def _populate_table(self, data: List[Any]) -> None:
+        self._reset_table()
+        self._append_rows(data)
+
+    def _reset_table(self) -> None:
         tv = getattr(self.ui, "tv_result", None)
         if tv is None:
             return
         headers = [col.header for col in self.table_columns]
         model = QStandardItemModel(0, len(headers), tv)
         model.setHorizontalHeaderLabels(headers)
-        for row_idx, item in enumerate(data):
-            model.insertRow(row_idx)
-            for col_idx, col in enumerate(self.table_columns):
-                value = col.extractor(item)
-                model.setItem(row_idx, col_idx, QStandardItem(_to_display(value)))
 
         tv.setModel(model)
         header = tv.horizontalHeader()
@@ -387,39 +409,53 @@ class _BaseTargetSearchDialog(QDialog):
         tv.setSelectionBehavior(tv.SelectionBehavior.SelectRows)
         tv.setEditTriggers(tv.EditTrigger.NoEditTriggers)
 
+    def _append_rows(self, data: List[Any]) -> None:
+        tv = getattr(self.ui, "tv_result", None)
+        if tv is None:
+            return
+        model = tv.model()
+        for item in data:
+            model.appendRow([QStandardItem(_to_display(col.extractor(item))) for col in self.table_columns])
+
     def _set_status(self, text: str) -> None:
         label = getattr(self.ui, "lb_noti", None)
         if label:
             label.setText(text)
 
     def _to_entity(self, orm_obj: Any) -> Any:
-        field_names = [f.name for f in fields(self.entity_cls)]
-        payload = {name: getattr(orm_obj, name, None) for name in field_names}
-        return self.entity_cls(**payload)
+        return mapper_for(self.orm_cls, self.entity_cls)(orm_obj)
 
-    # ---- hooks for subclasses ---------------------------------------------------
-    def _collect_conditions(self) -> Dict[str, Any]:
-        raise NotImplementedError
+    # ---- SQL 侧检索 ---------------------------------------------------------------
+    def _display_columns(self) -> List[Any]:
+        """只投影结果表格需要的列，避免加载整行（含图片等大字段）再转实体"""
+        return target_display_columns(self.category)
 
-    def _query_by_conditions(self, condition: Dict[str, Any]) -> List[Any]:
-        raise NotImplementedError
+    def _query_spec(self) -> QuerySpec:
+        """检索条件声明在 TargetService 中（基准脚本共用），每种目标一个 QuerySpec"""
+        return target_query_spec(self.category)
 
-    # Utilities for subclasses
-    @staticmethod
-    def _apply_range_filter(filters: List[Any], column, start: Optional[Decimal], end: Optional[Decimal]) -> None:
-        if start is not None and end is not None:
-            filters.append(column.between(start, end))
-        elif start is not None:
-            filters.append(column >= start)
-        elif end is not None:
-            filters.append(column <= end)
+    def _run_display_query(self, filters: Sequence[Any]) -> List[Row]:
+        stmt = select(*self._display_columns())
+        if filters:
+            stmt = stmt.where(*filters)
+        with target_session() as session:
+            return list(session.execute(stmt).all())
+
+    def _load_entities(self, ids: Sequence[Any]) -> List[Any]:
+        """按主键加载完整实体（保持 ids 的顺序），用于导出"""
+        if not ids:
+            return []
+        # Core 查询实体所需的列，结果行直接映射为实体，不构造 ORM 对象
+        stmt = select(*entity_columns(self.orm_cls, self.entity_cls)).where(
+            getattr(self.orm_cls, self.id_attr).in_(ids))
+        to_entity = mapper_for(self.orm_cls, self.entity_cls)
+        with target_session() as session:
+            by_id = {getattr(row, self.id_attr): to_entity(row) for row in session.execute(stmt)}
+        return [by_id[id_] for id_ in ids if id_ in by_id]
 
-    @staticmethod
-    def _keyword_match(entity: Any, keyword: str, attrs: Iterable[str]) -> bool:
-        text = " ".join(
-            _to_display(getattr(entity, attr, "")) for attr in attrs if getattr(entity, attr, None) is not None
-        ).lower()
-        return keyword.lower() in text
+    # ---- hooks for subclasses ---------------------------------------------------
+    def _collect_conditions(self) -> Dict[str, Any]:
+        raise NotImplementedError
 
     def _widget_text(self, *names: str) -> str:
         for name in names:
@@ -448,19 +484,6 @@ class _BaseTargetSearchDialog(QDialog):
 # =============================================================================
 
 
-def _runway_total_thickness(runway: AirportRunway) -> Optional[float]:
-    parts = [
-        runway.pccsc_thick,
-        runway.ctbc_thick,
-        runway.gcss_thick,
-        runway.cs_thick,
-    ]
-    values = [float(p) for p in parts if p is not None]
-    if not values:
-        return None
-    return sum(values)
-
-
 RUNWAY_COLUMNS: Sequence[ColumnDef] = (
     ColumnDef("目标名称", lambda r: r.runway_name),
     ColumnDef("目标编号", lambda r: r.runway_code),
@@ -468,7 +491,7 @@ RUNWAY_COLUMNS: Sequence[ColumnDef] = (
     ColumnDef("机场/基地", lambda r: r.base or ""),
     ColumnDef("跑道长度(m)", lambda r: r.r_length),
     ColumnDef("跑道宽度(m)", lambda r: r.r_width),
-    ColumnDef("结构总厚度(cm)", _runway_total_thickness),
+    ColumnDef("结构总厚度(cm)", lambda r: r.total_thickness),
     ColumnDef("面层材料", lambda r: r.pccsc_cement or ""),
     ColumnDef("水泥稳定基层", lambda r: r.ctbc_cement or ""),
     ColumnDef("级配砂砾垫层", lambda r: _to_display(r.gcss_strength)),
@@ -583,51 +606,6 @@ class RunwayTargetSearchDialog(_BaseTargetSearchDialog):
         }
         return deps
 
-    def _query_by_conditions(self, cond: Dict[str, Any]) -> List[AirportRunway]:
-        filters: List[Any] = []
-        if cond.get("name_enabled") and cond.get("name"):
-            filters.append(self.orm_cls.runway_name.like(f"%{cond['name']}%"))
-        if cond.get("code_enabled") and cond.get("code"):
-            filters.append(self.orm_cls.runway_code.like(f"%{cond['code']}%"))
-        if cond.get("base_enabled") and cond.get("base"):
-            filters.append(self.orm_cls.base.like(f"%{cond['base']}%"))
-        if cond.get("country_enabled") and cond.get("country"):
-            filters.append(self.orm_cls.country.like(f"%{cond['country']}%"))
-        if cond.get("length_enabled"):
-            self._apply_range_filter(filters, self.orm_cls.r_length, cond.get("length_min"), cond.get("length_max"))
-        if cond.get("width_enabled"):
-            self._apply_range_filter(filters, self.orm_cls.r_width, cond.get("width_min"), cond.get("width_max"))
-        if cond.get("thickness_enabled"):
-            total = (
-                func.coalesce(self.orm_cls.pccsc_thick, 0)
-                + func.coalesce(self.orm_cls.ctbc_thick, 0)
-                + func.coalesce(self.orm_cls.gcss_thick, 0)
-                + func.coalesce(self.orm_cls.cs_thick, 0)
-            )
-            self._apply_range_filter(filters, total, cond.get("thickness_min"), cond.get("thickness_max"))
-
-        stmt = select(self.orm_cls)
-        if filters:
-            stmt = stmt.where(*filters)
-        with target_session() as session:
-            rows = session.execute(stmt).scalars().all()
-        entities = [self._to_entity(row) for row in rows]
-
-        def apply_keyword(flag_key: str, keyword_key: str, attrs: Sequence[str]) -> None:
-            keyword = cond.get(keyword_key, "")
-            if cond.get(flag_key) and keyword:
-                entities[:] = [e for e in entities if self._keyword_match(e, keyword, attrs)]
-
-        apply_keyword(
-            "pccsc_enabled",
-            "pccsc_keyword",
-            ("pccsc_cement", "pccsc_strength", "pccsc_flexural", "pccsc_freeze", "pccsc_block_size1", "pccsc_block_size2"),
-        )
-        apply_keyword("ctbc_enabled", "ctbc_keyword", ("ctbc_cement", "ctbc_strength", "ctbc_flexural", "ctbc_compaction"))
-        apply_keyword("gcss_enabled", "gcss_keyword", ("gcss_strength", "gcss_compaction"))
-        apply_keyword("cs_enabled", "cs_keyword", ("cs_strength", "cs_compaction"))
-        return entities
-
 
 # =============================================================================
 # Shelter search
@@ -717,30 +695,6 @@ class ShelterTargetSearchDialog(_BaseTargetSearchDialog):
         }
         return deps
 
-    def _query_by_conditions(self, cond: Dict[str, Any]) -> List[AircraftShelter]:
-        filters: List[Any] = []
-        if cond.get("name_enabled") and cond.get("name"):
-            filters.append(self.orm_cls.shelter_name.like(f"%{cond['name']}%"))
-        if cond.get("code_enabled") and cond.get("code"):
-            filters.append(self.orm_cls.shelter_code.like(f"%{cond['code']}%"))
-        if cond.get("base_enabled") and cond.get("base"):
-            filters.append(self.orm_cls.base.like(f"%{cond['base']}%"))
-        if cond.get("country_enabled") and cond.get("country"):
-            filters.append(self.orm_cls.country.like(f"%{cond['country']}%"))
-        if cond.get("height_enabled") and cond.get("height_min") is not None:
-            filters.append(self.orm_cls.shelter_height >= cond["height_min"])
-        if cond.get("width_enabled") and cond.get("width_min") is not None:
-            filters.append(self.orm_cls.shelter_width >= cond["width_min"])
-        if cond.get("length_enabled") and cond.get("length_min") is not None:
-            filters.append(self.orm_cls.shelter_length >= cond["length_min"])
-
-        stmt = select(self.orm_cls)
-        if filters:
-            stmt = stmt.where(*filters)
-        with target_session() as session:
-            rows = session.execute(stmt).scalars().all()
-        return [self._to_entity(row) for row in rows]
-
 
 # =============================================================================
 # UCC search
@@ -830,34 +784,6 @@ class UCCTargetSearchDialog(_BaseTargetSearchDialog):
         }
         return deps
 
-    def _query_by_conditions(self, cond: Dict[str, Any]) -> List[UndergroundCommandPost]:
-        filters: List[Any] = []
-        if cond.get("name_enabled") and cond.get("name"):
-            filters.append(self.orm_cls.ucc_name.like(f"%{cond['name']}%"))
-        if cond.get("code_enabled") and cond.get("code"):
-            filters.append(self.orm_cls.ucc_code.like(f"%{cond['code']}%"))
-        if cond.get("base_enabled") and cond.get("base"):
-            filters.append(self.orm_cls.base.like(f"%{cond['base']}%"))
-        if cond.get("country_enabled") and cond.get("country"):
-            filters.append(self.orm_cls.country.like(f"%{cond['country']}%"))
-
-        stmt = select(self.orm_cls)
-        if filters:
-            stmt = stmt.where(*filters)
-        with target_session() as session:
-            rows = session.execute(stmt).scalars().all()
-        entities = [self._to_entity(row) for row in rows]
-
-        def apply(keyword_flag: str, keyword_key: str, attr: str) -> None:
-            text = cond.get(keyword_key, "")
-            if cond.get(keyword_flag) and text:
-                entities[:] = [e for e in entities if text.lower() in (_to_display(getattr(e, attr, "")).lower())]
-
-        apply("rock_enabled", "rock_keyword", "rock_layer_materials")
-        apply("protective_enabled", "protective_keyword", "protective_layer_material")
-        apply("lining_enabled", "lining_keyword", "lining_layer_material")
-        return entities
-
 
 TARGET_DIALOGS: Dict[str, Type[_BaseTargetSearchDialog]] = {
     "runway": RunwayTargetSearchDialog,
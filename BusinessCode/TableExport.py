@@ -0,0 +1,505 @@
+"""
+数据表导出（不依赖 Qt）
+
+弹药、跑道、掩蔽库、地下指挥所等数据模型导出为 Excel / Word / CSV / JSON：
+- 各表的字段顺序与中文表头（TableSpec），导出对话框、批量导入（表头识别）与命令行工具 cli.py 共用
+- write_table() 按格式写出文件；Excel 为首行中文加粗、细边框、自动列宽并冻结首行，
+  Word 为每条记录一行“编号．名称”标题加逐字段列表
+
+    spec = TABLE_SPECS["runway"]
+    write_table(spec, items, "Runways.xlsx", "xlsx")
+"""
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass, fields, is_dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+ProgressFn = Optional[Callable[[str], None]]
+
+FORMATS = ("xlsx", "docx", "csv", "json")
+# 对话框里的格式名
+FORMAT_ALIASES = {"excel": "xlsx", "word": "docx"}
+
+# —— 各表字段顺序与中文表头（一一对应）——
+AMMUNITION_FIELD_ORDER: Sequence[str] = (
+    "am_id",
+    "am_name",
+    "chinese_name",
+    "short_name",
+    "country",
+    "used_by",
+    "am_type",
+    "model_name",
+    "submodel_name",
+    "manufacturer",
+    "attended_time",
+    "weight_kg",
+    "length_m",
+    "diameter_m",
+    "texture",
+    "wingspan_close_mm",
+    "wingspan_open_mm",
+    "structure",
+    "max_speed_ma",
+    "radar_cross_section",
+    "power_plant",
+    "launch_mass_kg",
+    "warhead_type",
+    "warhead_name",
+    "destroying_elements",
+    "fuze",
+    "explosion_equivalent_TNT_T",
+    "precision_m",
+    "destroying_mechanism",
+    "target",
+    "carrier",
+    "guidance_mode",
+    "explosive_payload_kg",
+    "penetrating_power",
+    "drop_height_range_m",
+    "drop_speed_kmh",
+    "drop_mode",
+    "coverage_area",
+    "range_km",
+
+    # EXB
+    "is_explosive_bomb",
+    "exb_component",
+    "exb_explosion",
+    "exb_weight",
+    "exb_more_parameters",
+
+    # EB
+    "is_energy_bomb",
+    "eb_density",
+    "eb_velocity",
+    "eb_pressure",
+    "eb_cover_material",
+    "eb_cone_angle",
+    "eb_more_parameters",
+
+    # FB
+    "is_fragment_bomb",
+    "fb_bomb_explosion",
+    "fb_fragment_shape",
+    "fb_surface_area",
+    "fb_fragment_weight",
+    "fb_diameter",
+    "fb_length",
+    "fb_shell_weight",
+    "fb_more_parameters",
+
+    # AB
+    "is_armor_bomb",
+    "ab_bullet_weight",
+    "ab_diameter",
+    "ab_head_length",
+    "ab_more_parameters",
+
+    # CB/CBS
+    "is_cluster_bomb",
+    "cbm_bullet_weight",
+    "cbm_bullet_section",
+    "cbm_projectile",
+    "cbs_bullet_count",
+    "cbs_bullet_model",
+    "cbs_bullet_weight",
+    "cb_diameter",
+    "cbs_bullet_length",
+    "cb_more_parameters",
+
+    "created_at",
+    "updated_at",
+)
+
+AMMUNITION_HEADERS: Sequence[str] = (
+    "自增主键", "官方名称", "中文名称", "简称", "国家", "使用单位", "弹药类型",
+    "弹药型号", "型号子类", "制造商", "服役时间", "弹体全重", "弹体长度", "弹体直径",
+    "弹体材质", "翼展(闭合)", "翼展(张开)", "结构", "最大时速", "雷达截面", "动力装置",
+    "发射质量", "战斗部类型", "战斗部", "毁伤元", "引信", "爆炸当量(TNT)", "精度(圆概率误差CEP)",
+    "破坏机制", "打击目标", "载机(投放平台)", "制导方式", "装药量", "穿透能力", "投弹高度范围",
+    "投弹速度", "投弹方式", "布撒范围", "射程",
+
+    # EXB
+    "是否爆破战斗部", "炸药成分", "热爆(爆热)", "装药质量", "爆破其他参数",
+
+    # EB
+    "是否聚能战斗部", "炸药密度", "爆速", "爆轰压", "覆盖材料", "锥角", "聚能其他参数",
+
+    # FB
+    "是否破片战斗部", "热爆", "破片形状", "破片表面积", "破片质量",
+    "装药直径", "装药长度", "壳体质量", "破片其他参数",
+
+    # AB
+    "是否穿甲战斗部", "弹丸质量", "弹丸直径", "弹丸头部长度", "穿甲其他参数",
+
+    # CB/CBS
+    "是否子母弹", "母弹质量", "母弹最大横截面", "母弹阻力系数",
+    "子弹数量", "子弹型号", "子弹质量", "最大直径", "子弹参考长度", "子母弹其他参数",
+
+    "创建时间(UTC)", "更新时间(UTC)"
+)
+
+RUNWAY_FIELD_ORDER: Sequence[str] = (
+    "id",
+    "runway_code",
+    "runway_name",
+    "country",
+    "base",
+    "runway_picture",
+    "r_length",
+    "r_width",
+    "pccsc_thick",
+    "pccsc_strength",
+    "pccsc_flexural",
+    "pccsc_freeze",
+    "pccsc_cement",
+    "pccsc_block_size1",
+    "pccsc_block_size2",
+    "ctbc_thick",
+    "ctbc_strength",
+    "ctbc_flexural",
+    "ctbc_cement",
+    "ctbc_compaction",
+    "gcss_thick",
+    "gcss_strength",
+    "gcss_compaction",
+    "cs_thick",
+    "cs_strength",
+    "cs_compaction",
+    "runway_status",
+    "created_time",
+    "updated_time",
+)
+
+RUNWAY_HEADERS_ZH: Sequence[str] = (
+    "编号",
+    "跑道代码",
+    "机场名称",
+    "国家/地区",
+    "基地/部队",
+    "机场照片",
+    "跑道长度(m)",
+    "跑道宽度(m)",
+    "混凝土面层厚度(cm)",
+    "混凝土面层抗压强度(MPa)",
+    "混凝土面层抗折强度(MPa)",
+    "抗冻融循环次数",
+    "水泥类型",
+    "道面分块尺寸1(m)",
+    "道面分块尺寸2(m)",
+    "水泥稳定碎石基层厚度(cm)",
+    "水泥稳定碎石基层抗压强度(MPa)",
+    "水泥稳定碎石基层抗折强度(MPa)",
+    "水泥掺量",
+    "夯实密实度",
+    "级配砂砾石垫层厚度(cm)",
+    "级配砂砾石垫层强度承载比(%)",
+    "级配砂砾石垫层压实模量(MPa)",
+    "土基压实层厚度(cm)",
+    "土基压实层强度承载比(%)",
+    "土基压实层压实模量(MPa)",
+    "跑道状态",
+    "创建时间(UTC)",
+    "更新时间(UTC)",
+)
+
+SHELTER_FIELD_ORDER: Sequence[str] = (
+    "id",
+    "shelter_code",
+    "shelter_name",
+    "country",
+    "base",
+    "shelter_picture",
+    "shelter_length",
+    "shelter_width",
+    "shelter_height",
+    "cave_width",
+    "cave_height",
+    "structural_form",
+    "door_material",
+    "door_thick",
+    "mask_layer_material",
+    "mask_layer_thick",
+    "soil_layer_material",
+    "soil_layer_thick",
+    "disper_layer_material",
+    "disper_layer_thick",
+    "disper_layer_reinforcement",
+    "structure_layer_material",
+    "structure_layer_thick",
+    "structure_layer_reinforcement",
+    "explosion_resistance",
+    "anti_kinetic",
+    "resistance_depth",
+    "nuclear_blast",
+    "radiation_shielding",
+    "fire_resistance",
+    "shelter_status",
+    "created_time",
+    "updated_time",
+)
+
+SHELTER_HEADERS: Sequence[str] = (
+    "编号",
+    "掩蔽库编号",
+    "掩蔽库名称",
+    "国家/地区",
+    "基地/部队",
+    "掩蔽库照片",
+    "库容净长(m)",
+    "库容净宽(m)",
+    "库容净高(m)",
+    "洞门宽度(m)",
+    "洞门高度(m)",
+    "结构形式",
+    "门体材料",
+    "门体厚度(cm)",
+    "伪装层材料",
+    "伪装层厚度(cm)",
+    "遮弹层材料",
+    "遮弹层厚度(cm)",
+    "分散层材料",
+    "分散层厚度(cm)",
+    "分散层钢筋配置",
+    "结构层材料",
+    "结构层厚度(cm)",
+    "结构层钢筋配置",
+    "抗爆能力(kPa)",
+    "抗动能穿透(kJ)",
+    "抗穿透深度(cm)",
+    "抗核冲波超压(kPa)",
+    "抗辐射屏蔽(cm)",
+    "耐火极限(h)",
+    "掩蔽库状态",
+    "创建时间(UTC)",
+    "更新时间(UTC)",
+)
+
+UG_FIELD_ORDER: Sequence[str] = (
+    "id",
+    "ucc_code",
+    "ucc_name",
+    "country",
+    "base",
+    "location",
+    "shelter_picture",
+    "rock_layer_materials",
+    "rock_layer_thick",
+    "rock_layer_strength",
+    "protective_layer_material",
+    "protective_layer_thick",
+    "protective_layer_strength",
+    "lining_layer_material",
+    "lining_layer_thick",
+    "lining_layer_strength",
+    "ucc_wall_materials",
+    "ucc_wall_thick",
+    "ucc_wall_strength",
+    "ucc_length",
+    "ucc_width",
+    "ucc_height",
+    "ucc_status",
+    "created_time",
+    "updated_time",
+)
+
+UG_HEADERS: Sequence[str] = (
+    "ID",
+    "指挥所代码",
+    "指挥所名称",
+    "国家/地区",
+    "基地/部队",
+    "所在位置",
+    "照片路径",
+    "土壤岩层材料",
+    "土壤岩层厚度(cm)",
+    "土壤岩层抗压强度(MPa)",
+    "防护层材料",
+    "防护层厚度(cm)",
+    "防护层抗压强度(MPa)",
+    "衣采层材料",
+    "衣采层厚度(cm)",
+    "衣采层抗压强度(MPa)",
+    "UCC墙体材料",
+    "UCC墙体厚度(cm)",
+    "UCC墙体抗压强度(MPa)",
+    "空间长度(m)",
+    "空间宽度(m)",
+    "空间高度(m)",
+    "指挥所状态",
+    "创建时间(UTC)",
+    "更新时间(UTC)",
+)
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """一类记录的导出格式：fields 与 headers 一一对应；Word 标题行取 title_fields 的值"""
+    name: str
+    title: str
+    sheet: str
+    file_prefix: str
+    fields: Sequence[str]
+    headers: Sequence[str]
+    title_fields: Sequence[str] = ("id",)
+
+
+TABLE_SPECS: Dict[str, TableSpec] = {
+    "ammunition": TableSpec("ammunition", "Ammunition 导出", "Ammunition", "Ammunitions",
+                            AMMUNITION_FIELD_ORDER, AMMUNITION_HEADERS, ("am_id", "am_name")),
+    "runway": TableSpec("runway", "机场跑道数据模型导出", "Runways", "Runways",
+                        RUNWAY_FIELD_ORDER, RUNWAY_HEADERS_ZH, ("id", "runway_name")),
+    "shelter": TableSpec("shelter", "掩蔽库数据模型导出", "Shelters", "Shelters",
+                         SHELTER_FIELD_ORDER, SHELTER_HEADERS, ("id", "shelter_code", "shelter_name")),
+    "ucc": TableSpec("ucc", "地下指挥所数据", "UndergroundPosts", "UndergroundPosts",
+                     UG_FIELD_ORDER, UG_HEADERS, ("id", "ucc_code", "ucc_name")),
+}
+
+
+def spec_for_entity(name: str, entity_cls: type, title: str = "", file_prefix: str = "") -> TableSpec:
+    """没有中文表头的数据类（场景、参数、结果、报告）：字段名即表头，按声明顺序导出"""
+    names = tuple(f.name for f in fields(entity_cls)) if is_dataclass(entity_cls) else ()
+    prefix = file_prefix or entity_cls.__name__
+    return TableSpec(name, title or prefix, prefix[:31], prefix, names, names, names[:1])
+
+
+def cell_text(value: Any) -> str:
+    """单元格文字：Decimal 原样（避免二进制浮点误差），时间到秒，二进制为 base64"""
+    if value is None:
+        return ""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode("ascii")
+    if isinstance(value, bool):
+        return "是" if value else "否"
+    return str(value)
+
+
+def table_rows(spec: TableSpec, items: Iterable[Any]) -> List[Dict[str, str]]:
+    """记录 -> {字段名: 文字}，只取 spec.fields"""
+    return [{f: cell_text(getattr(obj, f, None)) for f in spec.fields} for obj in items]
+
+
+def normalize_format(fmt: str) -> str:
+    fmt = fmt.lower().strip()
+    return FORMAT_ALIASES.get(fmt, fmt)
+
+
+def write_excel(spec: TableSpec, rows: List[Dict[str, str]], filename: str) -> None:
+    """pandas + openpyxl 写入：首行中文加粗、底色；所有单元格细边框；自动列宽（上限 60）；冻结首行"""
+    import pandas as pd  # type: ignore
+    from openpyxl.styles import Alignment, Border, Font, PatternFill, Side  # type: ignore
+    from openpyxl.utils import get_column_letter  # type: ignore
+
+    headers = list(spec.headers)
+    ordered = [{h: r.get(f, "") for f, h in zip(spec.fields, headers)} for r in rows]
+    df = pd.DataFrame(ordered, columns=headers)
+
+    with pd.ExcelWriter(filename, engine="openpyxl") as writer:
+        df.to_excel(writer, index=False, sheet_name=spec.sheet)
+        ws = writer.sheets[spec.sheet]
+
+        header_font = Font(bold=True)
+        header_fill = PatternFill("solid", fgColor="DDDDDD")
+        thin = Side(border_style="thin", color="888888")
+        border = Border(top=thin, bottom=thin, left=thin, right=thin)
+        center = Alignment(vertical="center")
+
+        widths = [len(h) + 5 for h in headers]
+        for row in ws.iter_rows(min_row=1, max_row=ws.max_row, max_col=len(headers)):
+            for c, cell in enumerate(row):
+                cell.border = border
+                cell.alignment = center
+                if cell.row == 1:
+                    cell.font = header_font
+                    cell.fill = header_fill
+                    continue
+                length = len(str(cell.value)) if cell.value is not None else 0
+                if length + 2 > widths[c]:
+                    widths[c] = min(length + 2, 60)
+
+        for c, width in enumerate(widths, start=1):
+            ws.column_dimensions[get_column_letter(c)].width = width
+        ws.freeze_panes = "A2"
+
+
+def write_word(spec: TableSpec, rows: List[Dict[str, str]], filename: str) -> None:
+    """每条记录：标题“编号．名称”，其余字段逐条“表头：值”（List Bullet）；中文宋体，西文 Times New Roman"""
+    from docx import Document  # type: ignore
+    from docx.enum.text import WD_PARAGRAPH_ALIGNMENT  # type: ignore
+    from docx.oxml.ns import qn  # type: ignore
+    from docx.shared import Pt  # type: ignore
+
+    doc = Document()
+    style = doc.styles["Normal"]
+    style.font.name = "Times New Roman"
+    style.font.size = Pt(11)
+    style._element.rPr.rFonts.set(qn("w:eastAsia"), "宋体")
+
+    title = doc.add_heading(spec.title, level=1)
+    title.runs[0].font.name = "Times New Roman"
+    title.runs[0]._element.rPr.rFonts.set(qn("w:eastAsia"), "宋体")
+
+    bullet = doc.styles["List Bullet"]
+    skip = set(spec.title_fields)
+    for r in rows:
+        key = r.get(spec.title_fields[0], "") if spec.title_fields else ""
+        name = " · ".join(v for v in (r.get(f, "") for f in spec.title_fields[1:]) if v)
+        title_p = doc.add_paragraph(f"{key}．{name}" if name else str(key))
+        title_p.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
+        for run in title_p.runs:
+            run.font.name = "Times New Roman"
+            run._element.rPr.rFonts.set(qn("w:eastAsia"), "宋体")
+            run.font.size = Pt(12)
+
+        for header, field in zip(spec.headers, spec.fields):
+            if field in skip:
+                continue
+            p = doc.add_paragraph(style=bullet)
+            run = p.add_run(f"{header}：{r.get(field, '')}")
+            run.font.name = "Times New Roman"
+            run._element.rPr.rFonts.set(qn("w:eastAsia"), "宋体")
+            run.font.size = Pt(11)
+
+    doc.save(filename)
+
+
+def write_table(spec: TableSpec, items: Sequence[Any], filename: str, fmt: str,
+                progress: ProgressFn = None) -> int:
+    """
+    按格式写出 items，返回记录数。csv / json 为全部字段（damage_models.exporters，与各导出对话框一致），
+    xlsx / docx 为 spec 中的字段与中文表头。缺少 pandas / openpyxl / python-docx 时抛 ImportError。
+    """
+    fmt = normalize_format(fmt)
+    if fmt not in FORMATS:
+        raise ValueError(f"不支持的导出格式: {fmt}")
+    if fmt in ("csv", "json"):
+        from damage_models.exporters import CSVExporter, JSONExporter
+
+        exporter = CSVExporter() if fmt == "csv" else JSONExporter()
+        if progress:
+            progress(f"正在写入 {fmt.upper()} ...")
+        with open(filename, "wb") as fp:
+            for _ in exporter.export_stream([items], fp):
+                pass
+        return len(items)
+
+    if progress:
+        progress("正在准备数据 ...")
+    rows = table_rows(spec, items)
+    if fmt == "xlsx":
+        if progress:
+            progress("正在写入 Excel ...")
+        write_excel(spec, rows, filename)
+    else:
+        if progress:
+            progress("正在写入 Word ...")
+        write_word(spec, rows, filename)
+    return len(rows)
@@ -12,10 +12,21 @@ from PyQt6.QtWidgets import (
     QLineEdit, QLabel, QMessageBox, QHeaderView, QComboBox
 )
 from PyQt6.QtGui import QStandardItemModel, QStandardItem
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import QTimer
+from BusinessCode.QueryRunner import QueryRunner
 from DBCode.DBHelper import DBHelper
+from DBCode.SelectorIndex import SELECTOR_INDEX
 from loguru import logger
 
+# 目标类型 -> (表名, 表头)；表格列与 SELECTOR_INDEX 中对应表的列一致
+_TARGET_TABLES = {
+    1: ("Runway_Info", ["跑道ID", "跑道代码", "跑道名称", "国家", "基地", "长度(m)", "宽度(m)"]),
+    2: ("Shelter_Info", ["掩蔽库ID", "掩蔽库代码", "掩蔽库名称", "国家", "基地", "宽(m)", "高(m)", "长(m)"]),
+    3: ("UCC_Info", ["指挥所ID", "指挥所代码", "指挥所名称", "国家", "基地", "位置"]),
+}
+# 停止输入多久后检索（ms）
+_SEARCH_DELAY_MS = 150
+
 
 class TargetSelectorDialog(QDialog):
     """目标选择对话框"""
@@ -33,6 +44,14 @@ class TargetSelectorDialog(QDialog):
         self.setWindowTitle(f"选择{type_names.get(target_type, '目标')}")
         self.resize(1000, 600)
 
+        # 边输入边检索：内存索引就绪时直接在界面线程检索，否则在后台查库
+        SELECTOR_INDEX.preload(self._table_name())
+        self._runner = QueryRunner(self)
+        self._runner.chunk.connect(self._show_rows)
+        self._runner.done.connect(self._on_fallback_done)
+        self._runner.failed.connect(lambda msg: QMessageBox.warning(self, "错误", f"加载目标数据失败：{msg}"))
+        self.finished.connect(lambda _result: self._runner.shutdown())
+
         self._init_ui()
         self._load_data()
 
@@ -50,6 +69,22 @@ class TargetSelectorDialog(QDialog):
         self.cmb_target_type.currentIndexChanged.connect(self._on_type_changed)
         search_layout.addWidget(self.cmb_target_type)
 
+        search_layout.addWidget(QLabel("搜索:"))
+        self.ed_search = QLineEdit()
+        self.ed_search.setPlaceholderText("输入目标名称或代码...")
+        self.ed_search.setClearButtonEnabled(True)
+        search_layout.addWidget(self.ed_search)
+        search_layout.addStretch()
+        layout.addLayout(search_layout)
+
+        # 输入停顿后再检索，连续输入只检索最后一次
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(_SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self._on_search)
+        self.ed_search.textChanged.connect(lambda _text: self._search_timer.start())
+        self.ed_search.returnPressed.connect(self._on_search)
+
         # 表格区域
         self.table_view = QTableView()
         self.table_view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
@@ -75,87 +110,51 @@ class TargetSelectorDialog(QDialog):
     def _on_type_changed(self, index):
         """目标类型改变"""
         self.target_type = index + 1
-        self._load_data()
+        SELECTOR_INDEX.preload(self._table_name())
+        self._load_data(self.ed_search.text().strip())
+
+    def _table_name(self) -> str:
+        return _TARGET_TABLES.get(self.target_type, _TARGET_TABLES[3])[0]
 
     def _load_data(self, keyword: str = ""):
-        """加载目标数据"""
-        db = DBHelper()
+        """加载目标数据（关键字为空时显示最新的记录）"""
+        table_name = self._table_name()
         try:
-            # 根据目标类型选择不同的表
-            if self.target_type == 1:  # 跑道
-                table_name = "Runway_Info"
-                id_field = "RunwayID"
-                code_field = "RunwayCode"
-                name_field = "RunwayName"
-                status_field = "RunwayStatus"
-                extra_fields = "Country, Base, RLength, RWidth"
-                headers = ["跑道ID", "跑道代码", "跑道名称", "国家", "基地", "长度(m)", "宽度(m)"]
-
-            elif self.target_type == 2:  # 掩体
-                table_name = "Shelter_Info"
-                id_field = "ShelterID"
-                code_field = "ShelterCode"
-                name_field = "ShelterName"
-                status_field = "ShelterStatus"
-                extra_fields = "Country, Base, ShelterWidth, ShelterHeight, ShelterLength"
-                headers = ["掩蔽库ID", "掩蔽库代码", "掩蔽库名称", "国家", "基地", "宽(m)", "高(m)", "长(m)"]
-
-            else:  # 地下指挥所
-                table_name = "UCC_Info"
-                id_field = "UCCID"
-                code_field = "UCCCode"
-                name_field = "UCCName"
-                status_field = "UCCStatus"
-                extra_fields = "Country, Base, Location"
-                headers = ["指挥所ID", "指挥所代码", "指挥所名称", "国家", "基地", "位置"]
-
-            # 构建SQL查询
-            if keyword:
-                sql = f"""
-                SELECT {id_field}, {code_field}, {name_field}, {extra_fields}
-                FROM {table_name}
-                AND ({code_field} LIKE %s OR {name_field} LIKE %s)
-                ORDER BY {id_field} DESC
-                """
-                pattern = f'%{keyword}%'
-                result = db.execute_query(sql, (pattern, pattern))
-            else:
-                sql = f"""
-                SELECT {id_field}, {code_field}, {name_field}, {extra_fields}
-                FROM {table_name}
-                ORDER BY {id_field} DESC
-                LIMIT 100
-                """
-                result = db.execute_query(sql)
+            rows = SELECTOR_INDEX.search(table_name, keyword)
+        except Exception as e:
+            logger.exception(e)
+            rows = None
+        if rows is not None:
+            self._runner.cancel()  # 丢弃仍在执行的查库结果
+            self._show_rows(rows)
+            return
+        # 索引尚未载入（后台载入中）：本次查库
+        self._runner.submit(lambda: [SELECTOR_INDEX.fallback_search(table_name, keyword)])
 
+    def _show_rows(self, rows):
+        """rows 为按 SELECTOR_INDEX 中当前目标表的列排列的元组"""
+        headers = _TARGET_TABLES.get(self.target_type, _TARGET_TABLES[3])[1]
 
-            # 设置表格模型
-            model = QStandardItemModel(0, len(headers))
-            model.setHorizontalHeaderLabels(headers)
+        # 设置表格模型
+        model = QStandardItemModel(0, len(headers))
+        model.setHorizontalHeaderLabels(headers)
+        for row_data in rows:
+            model.appendRow([QStandardItem("" if v is None else str(v)) for v in row_data])
 
-            if result:
-                for row_data in result:
-                    row = []
-                    for key in row_data.keys():
-                        value = row_data[key]
-                        row.append(QStandardItem(str(value) if value is not None else ''))
-                    model.appendRow(row)
-
-            self.table_view.setModel(model)
+        self.table_view.setModel(model)
 
-            # 调整列宽
-            header = self.table_view.horizontalHeader()
-            for i in range(len(headers)):
-                header.setSectionResizeMode(i, QHeaderView.ResizeMode.ResizeToContents)
+        # 调整列宽
+        header = self.table_view.horizontalHeader()
+        for i in range(len(headers)):
+            header.setSectionResizeMode(i, QHeaderView.ResizeMode.ResizeToContents)
 
-        except Exception as e:
-            logger.exception(e)
-            QMessageBox.warning(self, "错误", f"加载目标数据失败：{e}")
-        finally:
-            db.close()
+    def _on_fallback_done(self, total: int, _elapsed_ms: float):
+        if total == 0:  # 空结果不会发出 chunk，这里清空表格
+            self._show_rows([])
 
     def _on_search(self):
-        """搜索按钮点击"""
+        """输入停顿 / 回车时检索"""
+        self._search_timer.stop()
         keyword = self.ed_search.text().strip()
         self._load_data(keyword)
 
@@ -177,28 +176,17 @@ class TargetSelectorDialog(QDialog):
 
         from target_model.sql_repository import SQLRepository as TargetModelSQLRepository
         from target_model.db import session_scope as TargetModelSessionScope
-        with TargetModelSessionScope() as session:
-            target_repo = TargetModelSQLRepository(session)
         from target_model.entities import AirportRunway, AircraftShelter, UndergroundCommandPost
 
-        # 从数据库查询完整的目标信息
-        db = DBHelper()
+        # 根据目标类型查询不同的表
+        entity_cls = {1: AirportRunway, 2: AircraftShelter}.get(self.target_type, UndergroundCommandPost)
+
+        # 从数据库查询完整的目标信息（按主键读取，未变化的记录由实体缓存返回）
         try:
-            # 根据目标类型查询不同的表
-            if self.target_type == 1:  # 机场跑道
-                result = target_repo.get(target_id, AirportRunway)
-                if result:
-                    self.selected_target = result
-
-            elif self.target_type == 2:  # 单机掩蔽库
-                result = target_repo.get(target_id, AircraftShelter)
-                if result:
-                    self.selected_target = result
-
-            else:  # 地下指挥所
-                result = target_repo.get(target_id, UndergroundCommandPost)
-                if result:
-                    self.selected_target = result
+            with TargetModelSessionScope() as session:
+                result = TargetModelSQLRepository(session).get(target_id, entity_cls)
+            if result:
+                self.selected_target = result
 
             if self.selected_target:
                 self.accept()
@@ -208,40 +196,12 @@ class TargetSelectorDialog(QDialog):
         except Exception as e:
             logger.exception(e)
             QMessageBox.warning(self, "错误", f"查询目标信息失败：{e}")
-        finally:
-            db.close()
 
     def get_selected_target(self):
         """获取选中的目标信息"""
         return self.selected_target
 
 
-if __name__ == "__main__":
-    from PyQt6.QtWidgets import QApplication
-    app = QApplication(sys.argv)
-    dialog = TargetSelectorDialog(target_type=1)
-    if dialog.exec() == QDialog.DialogCode.Accepted:
-        target = dialog.get_selected_target()
-        print("选中的目标:", target)
-"""
-弹药选择对话框
-用于在毁伤场景中选择弹药
-"""
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
-from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QTableView, QPushButton,
-    QLineEdit, QLabel, QMessageBox, QHeaderView
-)
-from PyQt6.QtGui import QStandardItemModel, QStandardItem
-from PyQt6.QtCore import Qt
-from DBCode.DBHelper import DBHelper
-from loguru import logger
-
-
 class AmmunitionSelectorDialog(QDialog):
     """弹药选择对话框"""
 
@@ -391,8 +351,7 @@ class AmmunitionSelectorDialog(QDialog):
 if __name__ == "__main__":
     from PyQt6.QtWidgets import QApplication
     app = QApplication(sys.argv)
-    dialog = AmmunitionSelectorDialog()
+    dialog = TargetSelectorDialog(target_type=1)
     if dialog.exec() == QDialog.DialogCode.Accepted:
-        ammo = dialog.get_selected_ammunition()
-        print("选中的弹药:", ammo)
-
+        target = dialog.get_selected_target()
+        print("选中的目标:", target)
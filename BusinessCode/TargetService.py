@@ -0,0 +1,195 @@
+"""
+打击目标数据服务（不依赖 Qt）
+
+机场跑道、单机掩蔽库、地下指挥所的列表、组合检索、导出与语义索引构建。目标种类以 TARGET_KINDS 的键表示：
+runway / shelter / ucc。界面（Target_*_Export、Search_Targets）在后台线程中调用，cli.py 在子进程中调用。
+"""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func
+
+from target_model import AircraftShelter, AirportRunway, SQLRepository, UndergroundCommandPost
+from target_model.db import session_scope
+from target_model.orm import AircraftShelterORM, AirportRunwayORM, UndergroundCommandPostORM
+from BusinessCode.QuerySpec import Filter, QuerySpec
+from BusinessCode.TableExport import TABLE_SPECS, ProgressFn, write_table
+
+# 种类 -> (实体类, ORM 类名, 语义索引文件)
+TARGET_KINDS: Dict[str, Tuple[type, str, str]] = {
+    "runway": (AirportRunway, "AirportRunwayORM", "./models/runway_index"),
+    "shelter": (AircraftShelter, "AircraftShelterORM", "./models/shelter_index"),
+    "ucc": (UndergroundCommandPost, "UndergroundCommandPostORM", "./models/ucc_index"),
+}
+# 场景、评估结果、报告中的 TargetType -> 种类
+TARGET_TYPES: Dict[int, str] = {1: "runway", 2: "shelter", 3: "ucc"}
+PREFER_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
+
+
+def _kind(kind: str) -> Tuple[type, str, str]:
+    try:
+        return TARGET_KINDS[kind]
+    except KeyError:
+        raise ValueError(f"未知的目标种类: {kind}") from None
+
+
+def list_targets(kind: str, scope: Callable = session_scope) -> List[Any]:
+    """某一种目标的全部记录；scope 为会话工厂（默认 target_model.db.session_scope）"""
+    entity_cls = _kind(kind)[0]
+    with scope() as s:
+        return SQLRepository(s).list_all(entity_cls)
+
+
+def get_target(kind: str, item_id: int) -> Optional[Any]:
+    """按主键读取（未变化的记录由实体缓存返回）"""
+    entity_cls = _kind(kind)[0]
+    with session_scope() as s:
+        return SQLRepository(s).get(item_id, entity_cls)
+
+
+def export_targets(kind: str, items: Sequence[Any], filename: str, fmt: str, progress: ProgressFn = None) -> int:
+    """导出为 xlsx / docx / csv / json（见 TableExport.write_table），返回记录数"""
+    _kind(kind)
+    return write_table(TABLE_SPECS[kind], items, filename, fmt, progress=progress)
+
+
+def rebuild_semantic_index(kind: str, path: Optional[str] = None, prefer_model: Optional[str] = PREFER_MODEL):
+    """从数据库重建某一种目标的语义索引并保存（默认路径与检索窗口一致）；没有数据时返回 None"""
+    from BusinessCode.semantic_search import build_semantic_index_from_db
+    from target_model import orm
+
+    _, orm_name, default_path = _kind(kind)
+    path = path or default_path
+    with session_scope() as session:
+        idx = build_semantic_index_from_db(session, getattr(orm, orm_name), id_attr="id", prefer_model=prefer_model)
+    if idx is not None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        idx.save_index(path)
+    return idx
+
+
+# ---------- 组合检索（检索窗口 Search_Targets 与基准脚本共用） ----------
+
+_TARGET_ORM: Dict[str, type] = {
+    "runway": AirportRunwayORM,
+    "shelter": AircraftShelterORM,
+    "ucc": UndergroundCommandPostORM,
+}
+
+# 结果表格用到的 ORM 属性；查询只投影这些列（加主键和计算列），不加载图片等大字段
+TARGET_DISPLAY_ATTRS: Dict[str, Tuple[str, ...]] = {
+    "runway": ("runway_name", "runway_code", "country", "base", "r_length", "r_width",
+               "pccsc_cement", "ctbc_cement", "gcss_strength"),
+    "shelter": ("shelter_name", "shelter_code", "country", "base",
+                "shelter_height", "shelter_width", "shelter_length", "structural_form"),
+    "ucc": ("ucc_name", "ucc_code", "country", "base", "location",
+            "rock_layer_materials", "protective_layer_material", "lining_layer_material"),
+}
+
+
+def runway_total_thickness(orm_cls: type = AirportRunwayORM) -> Any:
+    """结构总厚度（SQL 表达式），既用于范围条件也作为结果列返回"""
+    return (
+        func.coalesce(orm_cls.pccsc_thick, 0)
+        + func.coalesce(orm_cls.ctbc_thick, 0)
+        + func.coalesce(orm_cls.gcss_thick, 0)
+        + func.coalesce(orm_cls.cs_thick, 0)
+    )
+
+
+def _computed_columns(kind: str) -> Dict[str, Any]:
+    """需要在 SQL 中计算并随结果返回的列（标签 -> 表达式）"""
+    if kind == "runway":
+        return {"total_thickness": runway_total_thickness()}
+    return {}
+
+
+def target_display_columns(kind: str) -> List[Any]:
+    _kind(kind)
+    orm = _TARGET_ORM[kind]
+    columns = [orm.id]
+    columns += [getattr(orm, attr) for attr in TARGET_DISPLAY_ATTRS[kind]]
+    columns += [expr.label(label) for label, expr in _computed_columns(kind).items()]
+    return columns
+
+
+def _common_filters(orm: type, name_attr: str, code_attr: str) -> List[Filter]:
+    return [
+        Filter("name", getattr(orm, name_attr), enabled="name_enabled"),
+        Filter("code", getattr(orm, code_attr), enabled="code_enabled"),
+        Filter("base", orm.base, enabled="base_enabled"),
+        Filter("country", orm.country, enabled="country_enabled"),
+    ]
+
+
+def _keyword(orm: type, name: str, attrs: Sequence[str]) -> Filter:
+    """
+    多属性关键词条件：各属性值（跳过 NULL）以空格拼接后做不区分大小写的包含匹配，
+    条件键为 <name>_keyword / <name>_enabled。
+    """
+    columns = tuple(getattr(orm, attr) for attr in attrs)
+    return Filter(name, columns, op="keyword", key=f"{name}_keyword", enabled=f"{name}_enabled")
+
+
+def _target_filters(kind: str) -> List[Filter]:
+    """组合检索条件声明，键与各检索窗口 _collect_conditions 返回的字典对应"""
+    orm = _TARGET_ORM[kind]
+    if kind == "runway":
+        return [
+            *_common_filters(orm, "runway_name", "runway_code"),
+            Filter("length", orm.r_length, op="range", key="length_min", upper="length_max",
+                   enabled="length_enabled"),
+            Filter("width", orm.r_width, op="range", key="width_min", upper="width_max",
+                   enabled="width_enabled"),
+            Filter("thickness", runway_total_thickness(orm), op="range", key="thickness_min",
+                   upper="thickness_max", enabled="thickness_enabled"),
+            _keyword(
+                orm, "pccsc",
+                ("pccsc_cement", "pccsc_strength", "pccsc_flexural", "pccsc_freeze", "pccsc_block_size1",
+                 "pccsc_block_size2"),
+            ),
+            _keyword(orm, "ctbc", ("ctbc_cement", "ctbc_strength", "ctbc_flexural", "ctbc_compaction")),
+            _keyword(orm, "gcss", ("gcss_strength", "gcss_compaction")),
+            _keyword(orm, "cs", ("cs_strength", "cs_compaction")),
+        ]
+    if kind == "shelter":
+        return [
+            *_common_filters(orm, "shelter_name", "shelter_code"),
+            Filter("height", orm.shelter_height, op="ge", key="height_min", enabled="height_enabled"),
+            Filter("width", orm.shelter_width, op="ge", key="width_min", enabled="width_enabled"),
+            Filter("length", orm.shelter_length, op="ge", key="length_min", enabled="length_enabled"),
+        ]
+    return [
+        *_common_filters(orm, "ucc_name", "ucc_code"),
+        _keyword(orm, "rock", ("rock_layer_materials",)),
+        _keyword(orm, "protective", ("protective_layer_material",)),
+        _keyword(orm, "lining", ("lining_layer_material",)),
+    ]
+
+
+_QUERY_SPECS: Dict[str, QuerySpec] = {}
+_query_specs_lock = threading.Lock()
+
+
+def target_query_spec(kind: str) -> QuerySpec:
+    """每种目标一个 QuerySpec（语句形状缓存随之在窗口实例之间复用）"""
+    _kind(kind)
+    with _query_specs_lock:
+        spec = _QUERY_SPECS.get(kind)
+        if spec is None:
+            spec = QuerySpec(
+                f"target.{kind}",
+                columns=target_display_columns(kind),
+                filters=_target_filters(kind),
+                session_factory=session_scope,
+            )
+            _QUERY_SPECS[kind] = spec
+        return spec
+
+
+def query_targets(kind: str, cond: Dict[str, Any]) -> List[Any]:
+    """按条件字典组合检索，返回投影后的结果行（属性名同实体，另含计算列）"""
+    return target_query_spec(kind).execute(cond).rows
@@ -15,6 +15,7 @@ from PyQt6.QtCore import QEvent, Qt
 from PyQt6.QtGui import QPixmap
 from PyQt6.QtWidgets import (
     QApplication,
+    QCompleter,
     QFileDialog,
     QMessageBox,
     QMainWindow,
@@ -30,6 +31,7 @@ from PyQt6.QtWidgets import (
 )
 from BusinessCode.ImgHelper import ImgHelper
 from BusinessCode.structure_preview import LayerVisualConfig, LayeredStructureRenderer
+from DBCode.LookupCache import LOOKUPS
 from UIs.Frm_Target_Runway_Add import Ui_Frm_Target_Runway_Add
 from target_model.db import session_scope
 from target_model.entities import AirportRunway
@@ -101,7 +103,11 @@ class Target_Runway_AddWindow(QMainWindow):
         if hasattr(self.ui, "cmb_country") and hasattr(self.ui.cmb_country, "clear"):
             self.ui.cmb_country.clear()
         if hasattr(self.ui, "cmb_country"):
-            self.ui.cmb_country.addItems(["中国", "美国", "俄罗斯", "法国", "英国", "德国", "其他"])
+            self.ui.cmb_country.addItems(LOOKUPS.values("target_country"))
+
+        # 基地/部队：按已有取值补全（取值字典见 DBCode.LookupCache）
+        if self._base_input is not None:
+            self._base_input.setCompleter(QCompleter(LOOKUPS.values("target_base"), self))
 
         # 信号连接
         self.btn_choose_image.clicked.connect(self.on_choose_image)
@@ -4,7 +4,7 @@ import base64
 import os
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, List, Optional
 
 from PyQt6.QtCore import QThread, pyqtSignal
 from PyQt6.QtWidgets import (
@@ -20,70 +20,9 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
 )
 
-RUNWAY_FIELD_ORDER: Sequence[str] = (
-    "id",
-    "runway_code",
-    "runway_name",
-    "country",
-    "base",
-    "runway_picture",
-    "r_length",
-    "r_width",
-    "pccsc_thick",
-    "pccsc_strength",
-    "pccsc_flexural",
-    "pccsc_freeze",
-    "pccsc_cement",
-    "pccsc_block_size1",
-    "pccsc_block_size2",
-    "ctbc_thick",
-    "ctbc_strength",
-    "ctbc_flexural",
-    "ctbc_cement",
-    "ctbc_compaction",
-    "gcss_thick",
-    "gcss_strength",
-    "gcss_compaction",
-    "cs_thick",
-    "cs_strength",
-    "cs_compaction",
-    "runway_status",
-    "created_time",
-    "updated_time",
-)
-
-RUNWAY_HEADERS_ZH: Sequence[str] = (
-    "编号",
-    "跑道代码",
-    "机场名称",
-    "国家/地区",
-    "基地/部队",
-    "机场照片",
-    "跑道长度(m)",
-    "跑道宽度(m)",
-    "混凝土面层厚度(cm)",
-    "混凝土面层抗压强度(MPa)",
-    "混凝土面层抗折强度(MPa)",
-    "抗冻融循环次数",
-    "水泥类型",
-    "道面分块尺寸1(m)",
-    "道面分块尺寸2(m)",
-    "水泥稳定碎石基层厚度(cm)",
-    "水泥稳定碎石基层抗压强度(MPa)",
-    "水泥稳定碎石基层抗折强度(MPa)",
-    "水泥掺量",
-    "夯实密实度",
-    "级配砂砾石垫层厚度(cm)",
-    "级配砂砾石垫层强度承载比(%)",
-    "级配砂砾石垫层压实模量(MPa)",
-    "土基压实层厚度(cm)",
-    "土基压实层强度承载比(%)",
-    "土基压实层压实模量(MPa)",
-    "跑道状态",
-    "创建时间(UTC)",
-    "更新时间(UTC)",
-)
-
+from BusinessCode.TableExport import TABLE_SPECS, RUNWAY_FIELD_ORDER, write_excel, write_word
+from BusinessCode.TargetService import list_targets
+from DBCode.Metrics import METRICS
 
 
 class Target_Runway_ExportWindow(QDialog):
@@ -167,7 +106,6 @@ class Target_Runway_ExportWindow(QDialog):
         QMessageBox.information(self, "导出完成", f"已导出到：\n{filename}")
 
 
-
 class ExportWorker(QThread):
     progress = pyqtSignal(int)
     message = pyqtSignal(str)
@@ -181,18 +119,15 @@ class ExportWorker(QThread):
         self.fmt = fmt.lower().strip()
 
     def run(self) -> None:
-        try:
-            from target_model.sql_repository import SQLRepository
-            from target_model.entities import AirportRunway
-        except Exception as exc:  # pragma: no cover - import guard
-            self.error.emit(f"导出依赖加载失败：{exc}")
-            return
+        # 耗时与导出记录数计入 export.* 指标（见 DBCode.Metrics）
+        with METRICS.timer(f"export.runway.{self.fmt}") as t:
+            t.rows = self._export()
 
+    def _export(self):
+        """执行导出，成功时返回导出的记录数"""
         try:
             self.message.emit("正在读取跑道数据 ...")
-            with self.session_scope() as session:
-                repo = SQLRepository(session)
-                runways = repo.list_all(AirportRunway)
+            runways = list_targets("runway", self.session_scope)
         except Exception as exc:
             self.error.emit(f"读取跑道数据失败：{exc}")
             return
@@ -233,75 +168,17 @@ class ExportWorker(QThread):
         self.progress.emit(100)
         self.message.emit("导出完成")
         self.done.emit(outfile)
+        return len(rows)
 
+    # 写文件见 TableExport
     def _write_excel(self, filename: str, rows: List[Dict[str, str]]) -> None:
         self.message.emit("正在写入 Excel ...")
-        import pandas as pd  # type: ignore
-        from openpyxl.styles import Alignment, Border, Font, PatternFill, Side  # type: ignore
-        from openpyxl.utils import get_column_letter  # type: ignore
-
-        ordered = [
-            {header: row.get(field, "") for field, header in zip(RUNWAY_FIELD_ORDER, RUNWAY_HEADERS_ZH)}
-            for row in rows
-        ]
-
-        df = pd.DataFrame(ordered, columns=RUNWAY_HEADERS_ZH)
-        with pd.ExcelWriter(filename, engine="openpyxl") as writer:
-            df.to_excel(writer, index=False, sheet_name="Runways")
-            ws = writer.sheets["Runways"]
-
-            header_font = Font(bold=True)
-            header_fill = PatternFill("solid", fgColor="DDDDDD")
-            thin = Side(border_style="thin", color="999999")
-            border = Border(top=thin, bottom=thin, left=thin, right=thin)
-            center = Alignment(vertical="center")
-
-            for row in ws.iter_rows(min_row=1, max_row=ws.max_row, max_col=ws.max_column):
-                for cell in row:
-                    cell.border = border
-                    if cell.row == 1:
-                        cell.font = header_font
-                        cell.fill = header_fill
-                        cell.alignment = center
-
-            for col_idx in range(1, ws.max_column + 1):
-                column = get_column_letter(col_idx)
-                max_length = max((len(str(ws.cell(row=row, column=col_idx).value or "")) for row in range(1, ws.max_row + 1)), default=0)
-                ws.column_dimensions[column].width = min(max(max_length + 2, 12), 60)
-
-            ws.freeze_panes = "A2"
+        write_excel(TABLE_SPECS["runway"], rows, filename)
 
     def _write_word(self, filename: str, rows: List[Dict[str, str]]) -> None:
         self.message.emit("正在写入 Word ...")
-        from docx import Document  # type: ignore
-        from docx.oxml.ns import qn  # type: ignore
-        from docx.shared import Pt  # type: ignore
-        from docx.enum.text import WD_PARAGRAPH_ALIGNMENT  # type: ignore
-
-        doc = Document()
-        doc.add_heading("机场跑道数据模型导出", level=1)
-
-        for row in rows or [{}]:
-            title = row.get("runway_name", "") or "未命名跑道"
-            run_id = row.get("id", "")
-            title_para = doc.add_paragraph(f"{run_id}．{title}")
-            title_para.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
-            for run in title_para.runs:
-                run.font.name = "Times New Roman"
-                run._element.rPr.rFonts.set(qn("w:eastAsia"), "宋体")
-                run.font.size = Pt(12)
-
-            for header, field in zip(RUNWAY_HEADERS_ZH, RUNWAY_FIELD_ORDER):
-                if field in ("id", "runway_name"):
-                    continue
-                value = row.get(field, "")
-                para = doc.add_paragraph(style="List Bullet")
-                bullet = para.add_run(f"{header}：{value}")
-                bullet.font.name = "Times New Roman"
-                bullet._element.rPr.rFonts.set(qn("w:eastAsia"), "宋体")
-                bullet.font.size = Pt(11)
-
-        doc.save(filename)
+        write_word(TABLE_SPECS["runway"], rows, filename)
+
 
 def _to_str(value: Any) -> str:
     if value is None:
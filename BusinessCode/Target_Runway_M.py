@@ -13,6 +13,7 @@ from PyQt6.QtWidgets import QApplication, QHeaderView, QHBoxLayout, QMessageBox,
 from UIs.Frm_Target_Runway_M import Ui_Frm_Target_Runway_M
 from BusinessCode.Target_Runway_Add import Target_Runway_AddWindow
 from BusinessCode.Target_Runway_Export import Target_Runway_ExportWindow
+from BusinessCode.BulkImport import ImportKind, show_import_dialog
 from target_model.db import Base, engine, session_scope
 from target_model.entities import AirportRunway
 from target_model.sql_repository import SQLRepository
@@ -70,6 +71,13 @@ class Target_Runway_MWindow(QDialog):
 
         self.ui.btn_add.clicked.connect(self.open_add_window)
         self.ui.btn_export.clicked.connect(self.open_export_dialog)
+        # 批量导入（CSV / XLSX / JSON），放在导出按钮之后
+        self.btn_import = QPushButton("批量导入机场跑道数据模型", self)
+        self.btn_import.setMinimumSize(80, 40)
+        self.ui.horizontalLayout.insertWidget(2, self.btn_import)
+        self.ui.horizontalLayout.setStretch(2, 0)
+        self.ui.horizontalLayout.setStretch(3, 1)
+        self.btn_import.clicked.connect(self.open_import_dialog)
         self.refresh_table()  # load existing runway records when the window opens
 
     # 窗体居中显示
@@ -98,6 +106,9 @@ class Target_Runway_MWindow(QDialog):
         dialog = Target_Runway_ExportWindow(self, session_scope)
         dialog.exec()
 
+    def open_import_dialog(self) -> None:
+        show_import_dialog(self, ImportKind.RUNWAY, on_imported=self.refresh_table)
+
     def refresh_table(self) -> None:
         self.setup_table()
 
@@ -136,7 +147,7 @@ class Target_Runway_MWindow(QDialog):
         try:
             with session_scope() as session:
                 repo = SQLRepository(session)
-                runways = repo.list_all(AirportRunway)
+                runways = repo.list_records(AirportRunway)
         except Exception as exc:  # pragma: no cover - defensive logging
             print(f"[Runway_List] 数据库读取失败：{exc}")
             runways = []
@@ -4,7 +4,7 @@ import base64
 import os
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, List, Optional
 
 from PyQt6.QtCore import QThread, pyqtSignal
 from PyQt6.QtWidgets import (
@@ -20,82 +20,9 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
 )
 
-
-
-
-
-SHELTER_FIELD_ORDER: Sequence[str] = (
-    "id",
-    "shelter_code",
-    "shelter_name",
-    "country",
-    "base",
-    "shelter_picture",
-    "shelter_length",
-    "shelter_width",
-    "shelter_height",
-    "cave_width",
-    "cave_height",
-    "structural_form",
-    "door_material",
-    "door_thick",
-    "mask_layer_material",
-    "mask_layer_thick",
-    "soil_layer_material",
-    "soil_layer_thick",
-    "disper_layer_material",
-    "disper_layer_thick",
-    "disper_layer_reinforcement",
-    "structure_layer_material",
-    "structure_layer_thick",
-    "structure_layer_reinforcement",
-    "explosion_resistance",
-    "anti_kinetic",
-    "resistance_depth",
-    "nuclear_blast",
-    "radiation_shielding",
-    "fire_resistance",
-    "shelter_status",
-    "created_time",
-    "updated_time",
-)
-
-
-
-SHELTER_HEADERS: Sequence[str] = (
-    "??",
-    "?????",
-    "?????",
-    "??/??",
-    "??/??",
-    "?????",
-    "????(m)",
-    "????(m)",
-    "????(m)",
-    "????(m)",
-    "????(m)",
-    "????",
-    "????",
-    "????(cm)",
-    "?????",
-    "?????(cm)",
-    "?????",
-    "?????(cm)",
-    "?????",
-    "?????(cm)",
-    "???????",
-    "?????",
-    "?????(cm)",
-    "???????",
-    "????(kPa)",
-    "?????(kJ)",
-    "?????(cm)",
-    "??????(kPa)",
-    "?????(cm)",
-    "????(h)",
-    "????(UTC)",
-    "????(UTC)",
-)
+from BusinessCode.TableExport import TABLE_SPECS, SHELTER_FIELD_ORDER, write_excel, write_word
+from BusinessCode.TargetService import list_targets
+from DBCode.Metrics import METRICS
 
 
 class Target_Shelter_ExportWindow(QDialog):
@@ -178,8 +105,6 @@ class Target_Shelter_ExportWindow(QDialog):
         QMessageBox.information(self, "导出完成", f"已导出到：\n{filename}")
 
 
-
-
 class ExportWorker(QThread):
     progress = pyqtSignal(int)
     message = pyqtSignal(str)
@@ -193,18 +118,15 @@ class ExportWorker(QThread):
         self.fmt = fmt.lower().strip()
 
     def run(self) -> None:  # pragma: no cover - involves GUI thread
-        try:
-            from target_model.sql_repository import SQLRepository
-            from target_model.entities import AircraftShelter
-        except Exception as exc:
-            self.error.emit(f"导出依赖加载失败：{exc}")
-            return
+        # 耗时与导出记录数计入 export.* 指标（见 DBCode.Metrics）
+        with METRICS.timer(f"export.shelter.{self.fmt}") as t:
+            t.rows = self._export()
 
+    def _export(self):
+        """执行导出，成功时返回导出的记录数"""
         try:
             self.message.emit("正在读取掩蔽库数据 ...")
-            with self.session_scope() as session:
-                repo = SQLRepository(session)
-                shelters = repo.list_all(AircraftShelter)
+            shelters = list_targets("shelter", self.session_scope)
         except Exception as exc:
             self.error.emit(f"读取掩蔽库数据失败：{exc}")
             return
@@ -245,85 +167,16 @@ class ExportWorker(QThread):
         self.progress.emit(100)
         self.message.emit("导出完成")
         self.done.emit(output)
+        return len(rows)
 
+    # 写文件见 TableExport
     def _write_excel(self, filename: str, rows: List[Dict[str, str]]) -> None:
         self.message.emit("正在写入 Excel ...")
-        import pandas as pd  # type: ignore
-        from openpyxl.styles import Alignment, Border, Font, PatternFill, Side  # type: ignore
-        from openpyxl.utils import get_column_letter  # type: ignore
-
-        ordered = [
-            {header: row.get(field, "") for field, header in zip(SHELTER_FIELD_ORDER, SHELTER_HEADERS)}
-            for row in rows
-        ]
-        df = pd.DataFrame(ordered, columns=SHELTER_HEADERS)
-
-        with pd.ExcelWriter(filename, engine="openpyxl") as writer:
-            df.to_excel(writer, index=False, sheet_name="Shelters")
-            ws = writer.sheets["Shelters"]
-
-            header_font = Font(bold=True)
-            header_fill = PatternFill("solid", fgColor="DDDDDD")
-            thin = Side(border_style="thin", color="999999")
-            border = Border(top=thin, bottom=thin, left=thin, right=thin)
-            center = Alignment(vertical="center")
-
-            for row in ws.iter_rows(min_row=1, max_row=ws.max_row, max_col=ws.max_column):
-                for cell in row:
-                    cell.border = border
-                    if cell.row == 1:
-                        cell.font = header_font
-                        cell.fill = header_fill
-                        cell.alignment = center
-
-            for col_idx in range(1, ws.max_column + 1):
-                column = get_column_letter(col_idx)
-                max_length = max(
-                    (len(str(ws.cell(row=row, column=col_idx).value or "")) for row in range(1, ws.max_row + 1)),
-                    default=0,
-                )
-                ws.column_dimensions[column].width = min(max(max_length + 2, 12), 60)
-
-            ws.freeze_panes = "A2"
+        write_excel(TABLE_SPECS["shelter"], rows, filename)
 
     def _write_word(self, filename: str, rows: List[Dict[str, str]]) -> None:
         self.message.emit("正在写入 Word ...")
-        from docx import Document  # type: ignore
-        from docx.enum.text import WD_PARAGRAPH_ALIGNMENT  # type: ignore
-        from docx.oxml.ns import qn  # type: ignore
-        from docx.shared import Pt  # type: ignore
-
-        document = Document()
-        document.add_heading("Aircraft Shelters", level=1)
-
-
-        for row in rows or [{}]:
-            name = row.get("shelter_name", "")
-            code = row.get("shelter_code", "")
-            shelter_id = row.get("id", "")
-            if name and code:
-                display_title = f"{code} ? {name}"
-            else:
-                display_title = name or code or "Unnamed Shelter"
-            heading_parts = [part for part in (str(shelter_id).strip(), display_title) if part]
-            title_paragraph = document.add_paragraph(" ? ".join(heading_parts))
-            title_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
-            for run in title_paragraph.runs:
-                run.font.name = "Times New Roman"
-                run._element.rPr.rFonts.set(qn("w:eastAsia"), "??")
-                run.font.size = Pt(12)
-
-            for header, field in zip(SHELTER_HEADERS, SHELTER_FIELD_ORDER):
-                if field in ("id", "shelter_code", "shelter_name"):
-                    continue
-                value = row.get(field, "")
-                paragraph = document.add_paragraph(style="List Bullet")
-                run = paragraph.add_run(f"{header}: {value}")
-                run.font.name = "Times New Roman"
-                run._element.rPr.rFonts.set(qn("w:eastAsia"), "??")
-                run.font.size = Pt(11)
-
-        document.save(filename)
+        write_word(TABLE_SPECS["shelter"], rows, filename)
 
 
 def _to_str(value: Any) -> str:
@@ -15,6 +15,7 @@ from PyQt6.QtWidgets import QApplication, QHeaderView, QHBoxLayout, QMessageBox,
 from UIs.Frm_Target_Shelter_M import Ui_Frm_Target_Shelter_M
 from BusinessCode.Target_Shelter_Add import Target_Shelter_AddWindow
 from BusinessCode.Target_Shelter_Export import Target_Shelter_ExportWindow
+from BusinessCode.BulkImport import ImportKind, show_import_dialog
 from target_model.db import session_scope
 from target_model.entities import AircraftShelter
 from target_model.sql_repository import SQLRepository
@@ -45,6 +46,13 @@ class Target_Shelter_MWindow(QDialog):
 
         self.ui.btn_add.clicked.connect(self.open_add_window)
         self.ui.btn_export.clicked.connect(self.open_export_dialog)
+        # 批量导入（CSV / XLSX / JSON），放在导出按钮之后
+        self.btn_import = QPushButton("批量导入单机掩蔽库数据模型", self)
+        self.btn_import.setMinimumSize(80, 40)
+        self.ui.horizontalLayout.insertWidget(2, self.btn_import)
+        self.ui.horizontalLayout.setStretch(2, 0)
+        self.ui.horizontalLayout.setStretch(3, 1)
+        self.btn_import.clicked.connect(self.open_import_dialog)
         self.refresh_table()  # load existing shelter records when the window opens
 
     # 窗体居中显示
@@ -73,6 +81,9 @@ class Target_Shelter_MWindow(QDialog):
         dialog = Target_Shelter_ExportWindow(self, session_scope)
         dialog.exec()
 
+    def open_import_dialog(self) -> None:
+        show_import_dialog(self, ImportKind.SHELTER, on_imported=self.refresh_table)
+
     def refresh_table(self) -> None:
         self.setup_table()
 
@@ -118,7 +129,7 @@ class Target_Shelter_MWindow(QDialog):
         try:
             with session_scope() as session:
                 repo = SQLRepository(session)
-                shelters = repo.list_all(AircraftShelter)
+                shelters = repo.list_records(AircraftShelter)
         except Exception as exc:  # pragma: no cover
             print(f"[Shelter_List] database fetch failed: {exc}")
             shelters = []
@@ -16,6 +16,7 @@ from PyQt6.QtGui import QPixmap
 from PyQt6.QtWidgets import (
     QMainWindow,
     QApplication,
+    QCompleter,
     QFileDialog,
     QMessageBox,
     QLineEdit,
@@ -31,6 +32,7 @@ from PyQt6.QtWidgets import (
 
 from BusinessCode.ImgHelper import ImgHelper
 from BusinessCode.structure_preview import LayerVisualConfig, UndergroundStructureRenderer
+from DBCode.LookupCache import LOOKUPS
 from UIs.Frm_Target_UCC_Add import Ui_Frm_Target_UCC_Add
 from target_model.db import session_scope
 from target_model.entities import UndergroundCommandPost
@@ -67,7 +69,10 @@ class Target_UCC_AddWindow(QMainWindow):
         if hasattr(self.ui, "cmb_country") and hasattr(self.ui.cmb_country, "clear"):
             self.ui.cmb_country.clear()
         if hasattr(self.ui, "cmb_country"):
-            self.ui.cmb_country.addItems(["中国", "美国", "俄罗斯", "法国", "英国", "德国", "其他"])
+            self.ui.cmb_country.addItems(LOOKUPS.values("target_country"))
+
+        # 基地/部队：按已有取值补全（取值字典见 DBCode.LookupCache）
+        self.ui.ed_unit.setCompleter(QCompleter(LOOKUPS.values("target_base"), self))
 
         # 连接信号
         self.ui.btn_choose_image.clicked.connect(self.on_choose_image)
@@ -4,7 +4,7 @@ import base64
 import os
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, List, Optional
 
 from PyQt6.QtCore import QThread, pyqtSignal
 from PyQt6.QtWidgets import (
@@ -20,65 +20,9 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
 )
 
-
-UG_FIELD_ORDER: Sequence[str] = (
-    "id",
-    "ucc_code",
-    "ucc_name",
-    "country",
-    "base",
-    "location",
-    "shelter_picture",
-    "rock_layer_materials",
-    "rock_layer_thick",
-    "rock_layer_strength",
-    "protective_layer_material",
-    "protective_layer_thick",
-    "protective_layer_strength",
-    "lining_layer_material",
-    "lining_layer_thick",
-    "lining_layer_strength",
-    "ucc_wall_materials",
-    "ucc_wall_thick",
-    "ucc_wall_strength",
-    "ucc_length",
-    "ucc_width",
-    "ucc_height",
-    "ucc_status",
-    "created_time",
-    "updated_time",
-)
-
-
-UG_HEADERS: Sequence[str] = (
-    "ID",
-    "\u6307\u6325\u6240\u4ee3\u7801",
-    "\u6307\u6325\u6240\u540d\u79f0",
-    "\u56fd\u5bb6/\u5730\u533a",
-    "\u57fa\u5730/\u90e8\u961f",
-    "\u6240\u5728\u4f4d\u7f6e",
-    "\u7167\u7247\u8def\u5f84",
-    "\u571f\u58e4\u5ca9\u5c42\u6750\u6599",
-    "\u571f\u58e4\u5ca9\u5c42\u539a\u5ea6(cm)",
-    "\u571f\u58e4\u5ca9\u5c42\u6297\u538b\u5f3a\u5ea6(MPa)",
-    "\u9632\u62a4\u5c42\u6750\u6599",
-    "\u9632\u62a4\u5c42\u539a\u5ea6(cm)",
-    "\u9632\u62a4\u5c42\u6297\u538b\u5f3a\u5ea6(MPa)",
-    "\u8863\u91c7\u5c42\u6750\u6599",
-    "\u8863\u91c7\u5c42\u539a\u5ea6(cm)",
-    "\u8863\u91c7\u5c42\u6297\u538b\u5f3a\u5ea6(MPa)",
-    "UCC\u5899\u4f53\u6750\u6599",
-    "UCC\u5899\u4f53\u539a\u5ea6(cm)",
-    "UCC\u5899\u4f53\u6297\u538b\u5f3a\u5ea6(MPa)",
-    "\u7a7a\u95f4\u957f\u5ea6(m)",
-    "\u7a7a\u95f4\u5bbd\u5ea6(m)",
-    "\u7a7a\u95f4\u9ad8\u5ea6(m)",
-    "\u6307\u6325\u6240\u72b6\u6001",
-    "\u521b\u5efa\u65f6\u95f4(UTC)",
-    "\u66f4\u65b0\u65f6\u95f4(UTC)",
-)
-
-
+from BusinessCode.TableExport import TABLE_SPECS, UG_FIELD_ORDER, write_excel, write_word
+from BusinessCode.TargetService import list_targets
+from DBCode.Metrics import METRICS
 
 
 def _to_str(value: Any) -> str:
@@ -101,7 +45,6 @@ def _to_str(value: Any) -> str:
     return str(value)
 
 
-
 def post_to_dict(obj: Any) -> Dict[str, str]:
     return {field: _to_str(getattr(obj, field, None)) for field in UG_FIELD_ORDER}
 
@@ -119,18 +62,15 @@ class ExportWorker(QThread):
         self.fmt = fmt.lower().strip()
 
     def run(self) -> None:  # pragma: no cover - GUI thread
-        try:
-            from target_model.sql_repository import SQLRepository
-            from target_model.entities import UndergroundCommandPost
-        except Exception as exc:
-            self.error.emit(f"导出依赖加载失败：{exc}")
-            return
+        # 耗时与导出记录数计入 export.* 指标（见 DBCode.Metrics）
+        with METRICS.timer(f"export.ucc.{self.fmt}") as t:
+            t.rows = self._export()
 
+    def _export(self):
+        """执行导出，成功时返回导出的记录数"""
         try:
             self.message.emit("正在读取地下指挥所数据 ...")
-            with self.session_scope() as session:
-                repo = SQLRepository(session)
-                posts = repo.list_all(UndergroundCommandPost)
+            posts = list_targets("ucc", self.session_scope)
         except Exception as exc:
             self.error.emit(f"读取数据失败：{exc}")
             return
@@ -171,85 +111,16 @@ class ExportWorker(QThread):
         self.progress.emit(100)
         self.message.emit("导出完成")
         self.done.emit(output)
+        return len(rows)
 
+    # 写文件见 TableExport
     def _write_excel(self, filename: str, rows: List[Dict[str, str]]) -> None:
         self.message.emit("正在写入 Excel ...")
-        import pandas as pd  # type: ignore
-        from openpyxl.styles import Alignment, Border, Font, PatternFill, Side  # type: ignore
-        from openpyxl.utils import get_column_letter  # type: ignore
-
-        ordered = [
-            {header: row.get(field, "") for field, header in zip(UG_FIELD_ORDER, UG_HEADERS)}
-            for row in rows
-        ]
-        df = pd.DataFrame(ordered, columns=UG_HEADERS)
-
-        with pd.ExcelWriter(filename, engine="openpyxl") as writer:
-            df.to_excel(writer, index=False, sheet_name="UndergroundPosts")
-            ws = writer.sheets["UndergroundPosts"]
-
-            header_font = Font(bold=True)
-            header_fill = PatternFill("solid", fgColor="DDDDDD")
-            thin = Side(border_style="thin", color="999999")
-            border = Border(top=thin, bottom=thin, left=thin, right=thin)
-            center = Alignment(vertical="center")
-
-            for row in ws.iter_rows(min_row=1, max_row=ws.max_row, max_col=ws.max_column):
-                for cell in row:
-                    cell.border = border
-                    if cell.row == 1:
-                        cell.font = header_font
-                        cell.fill = header_fill
-                        cell.alignment = center
-
-            for col_idx in range(1, ws.max_column + 1):
-                column = get_column_letter(col_idx)
-                max_length = max(
-                    (len(str(ws.cell(row=row, column=col_idx).value or "")) for row in range(1, ws.max_row + 1)),
-                    default=0,
-                )
-                ws.column_dimensions[column].width = min(max(max_length + 2, 12), 60)
-
-            ws.freeze_panes = "A2"
+        write_excel(TABLE_SPECS["ucc"], rows, filename)
 
     def _write_word(self, filename: str, rows: List[Dict[str, str]]) -> None:
         self.message.emit("正在写入 Word ...")
-        from docx import Document  # type: ignore
-        from docx.enum.text import WD_PARAGRAPH_ALIGNMENT  # type: ignore
-        from docx.oxml.ns import qn  # type: ignore
-        from docx.shared import Pt  # type: ignore
-
-        doc = Document()
-        doc.add_heading("地下指挥所数据", level=1)
-
-
-        for row in rows or [{}]:
-            code = row.get("ucc_code", "")
-            name = row.get("ucc_name", "")
-            post_id = row.get("id", "")
-            if code and name:
-                display = f"{code} · {name}"
-            else:
-                display = code or name or "未命名指挥所"
-            heading_parts = [part for part in (str(post_id).strip(), display) if part]
-            title_para = doc.add_paragraph(" · ".join(heading_parts))
-            title_para.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
-            for run in title_para.runs:
-                run.font.name = "Times New Roman"
-                run._element.rPr.rFonts.set(qn("w:eastAsia"), "宋体")
-                run.font.size = Pt(12)
-
-            for header, field in zip(UG_HEADERS, UG_FIELD_ORDER):
-                if field in ("id", "ucc_code", "ucc_name"):
-                    continue
-                value = row.get(field, "")
-                paragraph = doc.add_paragraph(style="List Bullet")
-                run = paragraph.add_run(f"{header}: {value}")
-                run.font.name = "Times New Roman"
-                run._element.rPr.rFonts.set(qn("w:eastAsia"), "宋体")
-                run.font.size = Pt(11)
-
-        doc.save(filename)
+        write_word(TABLE_SPECS["ucc"], rows, filename)
 
 
 class Target_UCC_ExportWindow(QDialog):
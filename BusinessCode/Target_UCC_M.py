@@ -14,6 +14,7 @@ from PyQt6.QtWidgets import QApplication, QHeaderView, QHBoxLayout, QMessageBox,
 from UIs.Frm_Target_UCC_M import Ui_Frm_Target_UCC_M
 from BusinessCode.Target_UCC_Add import Target_UCC_AddWindow
 from BusinessCode.Target_UCC_Export import Target_UCC_ExportWindow
+from BusinessCode.BulkImport import ImportKind, show_import_dialog
 from target_model.db import session_scope
 from target_model.entities import UndergroundCommandPost
 from target_model.sql_repository import SQLRepository
@@ -33,6 +34,13 @@ class Target_UCC_MWindow(QDialog):
 
         self.ui.btn_add.clicked.connect(self.open_add_window)
         self.ui.btn_export.clicked.connect(self.open_export_dialog)
+        # 批量导入（CSV / XLSX / JSON），放在导出按钮之后
+        self.btn_import = QPushButton("批量导入地下指挥所数据模型", self)
+        self.btn_import.setMinimumSize(80, 40)
+        self.ui.horizontalLayout.insertWidget(2, self.btn_import)
+        self.ui.horizontalLayout.setStretch(2, 0)
+        self.ui.horizontalLayout.setStretch(3, 1)
+        self.btn_import.clicked.connect(self.open_import_dialog)
         self.refresh_table()  # load existing underground command post records at startup
 
     # 窗体居中显示
@@ -73,6 +81,9 @@ class Target_UCC_MWindow(QDialog):
         dialog = Target_UCC_ExportWindow(self, session_scope)
         dialog.exec()
 
+    def open_import_dialog(self) -> None:
+        show_import_dialog(self, ImportKind.UCC, on_imported=self.refresh_table)
+
     def refresh_table(self) -> None:
         self.setup_table()
 
@@ -111,7 +122,7 @@ class Target_UCC_MWindow(QDialog):
         try:
             with session_scope() as session:
                 repo = SQLRepository(session)
-                posts = repo.list_all(UndergroundCommandPost)
+                posts = repo.list_records(UndergroundCommandPost)
         except Exception as exc:  # pragma: no cover - defensive
             print(f"[Underground_List] database fetch failed: {exc}")
             posts = []
@@ -5,7 +5,7 @@ from PyQt6.QtCore import QModelIndex
 from PyQt6.QtWidgets import QApplication, QMainWindow, QAbstractItemView, QTableWidgetItem, QMessageBox, QHeaderView
 from UIs.Frm_UserManagement import Ui_Frm_UserManagement  # 导入自动生成的界面类
 from DBCode.DBHelper import DBHelper
-import bcrypt
+from BusinessCode.PasswordPolicy import hash_password
 
 # 1. 获取项目根目录的绝对路径，通过"./"回到项目根目录
 project_root = Path(__file__).parent.parent  # __file__是当前文件路径，parent是父目录
@@ -149,7 +149,7 @@ class UserManagement(QMainWindow):
         user_status = self.ui.txt_UStatus.currentIndex()
         remark = self.ui.txt_URemark.text().strip()
 
-        hashed_password = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+        hashed_password = hash_password(password)
 
         if self.current_user_id:
             query = """
@@ -3,23 +3,23 @@ from pathlib import Path
 
 from loguru import logger
 
-from BusinessCode.Config import load_config
+from BusinessCode.BackupScheduler import BackupScheduler, RestoreJobWorker, get_backup_scheduler
+from BusinessCode.BackupService import (backup_backend, backup_now, dump_tables, insert_backup_record,
+                                        list_backup_records, TARGET_TABLES,
+                                        BACKUP_TYPE_AUTO, BACKUP_TYPE_MANUAL)
+from BusinessCode.Config import load_config, save_config
 from UIs.Frm_DataRestore import Ui_Frm_DataRestore  # 导入自动生成的界面类
 from PyQt6.QtWidgets import (QApplication, QDialog, QMessageBox, QMainWindow, QGroupBox, QRadioButton,
                              QLabel, QLineEdit, QPushButton, QVBoxLayout, QHBoxLayout,
-                             QWidget, QTableWidget, QTableWidgetItem, QFileDialog, QButtonGroup)
+                             QWidget, QTableWidget, QTableWidgetItem, QFileDialog, QButtonGroup, QComboBox)
 import sys
 import shutil
 import os
-import os
-import subprocess
-import datetime
-from typing import Tuple, List, Dict
+from typing import Tuple, List, Dict, Optional
 # 导入现有数据库连接工具（假设DBHelper提供数据库配置获取功能）
 from DBCode.DBHelper import DBHelper  # 假设该类包含数据库连接配置
 from PyQt6.QtCore import QTimer, Qt
 from PyQt6.QtSql import QSqlDatabase, QSqlTableModel
-import uuid
 from PyQt6.QtGui import QStandardItemModel, QStandardItem
 
 # 1. 获取项目根目录的绝对路径（根据实际结构调整）
@@ -32,7 +32,7 @@ sys.path.append(str(project_root))
 
 
 class DataRestore(QDialog):
-    def __init__(self, username):
+    def __init__(self, username, scheduler: Optional[BackupScheduler] = None):
         super().__init__()
         self.ui = Ui_Frm_DataRestore()
         self.ui.setupUi(self)
@@ -40,60 +40,64 @@ class DataRestore(QDialog):
         #        self.backup_config["manual_backup_path"]="D:\\"
         self.backup_records: List[Dict[str, str]] = []  # 备份记录
         self.db_helper = DBHelper()  # 实例化现有数据库连接工具
+        self.restore_worker: Optional[RestoreJobWorker] = None
         self.cfg = load_config()
 
         self.group1 = QButtonGroup(self)  # 父对象设为窗口，自动管理生命周期
         self.group1.addButton(self.ui.rb_AutoBackup, id=1)  # id可选，用于标识选中的按钮
         self.group1.addButton(self.ui.rb_ManualBackup, id=2)
-        self.ui.rb_AutoBackup.setChecked(True)  # 设置自动备份默认选中
-        self.ui.rb_AutoBackup.setChecked(True)
         self.ui.txt_ResotrePath.setReadOnly(True)
         self.ui.txt_BackupPath.setReadOnly(True)
 
         # self._load_backup_records()  # 加载历史记录
         self.ui.btn_SelectPath.clicked.connect(self.select_backup_path)
-        # 定时备份计时器
-        # self.auto_timer = QTimer(self)
-        # self.auto_timer.timeout.connect(self._auto_backup_task)
-        # 2. 初始化倒计时定时器（每秒触发一次）
-        self.ui.rb_AutoBackup.setChecked(True)
-        self.ui.rb_weekly.setChecked(True)
+
+        # 自动备份由随主程序启动的 BackupScheduler 执行，本窗口只负责配置和显示倒计时
+        self.scheduler = scheduler or get_backup_scheduler()
+        self.cycle_buttons = {
+            self.ui.rb_weekly: "每周",
+            self.ui.rb_monthly: "每月",
+            self.ui.rb_quarterly: "每季度",
+            self.ui.rb_yearly: "每年",
+        }
+        self.cycle_group = QButtonGroup(self)
+        for rb in self.cycle_buttons:
+            self.cycle_group.addButton(rb)
+        self._load_schedule_settings()
+
+        # 备份方式：mysqldump 或内置逻辑备份（不依赖外部程序）
+        self.lbl_Backend = QLabel("备份方式:", self.ui.groupBox)
+        self.lbl_Backend.setGeometry(410, 145, 60, 20)
+        self.cb_BackupBackend = QComboBox(self.ui.groupBox)
+        self.cb_BackupBackend.setGeometry(470, 140, 130, 31)
+        self.cb_BackupBackend.addItem("mysqldump", "mysqldump")
+        self.cb_BackupBackend.addItem("内置逻辑备份", "native")
+        self.cb_BackupBackend.setCurrentIndex(max(0, self.cb_BackupBackend.findData(backup_backend(self.cfg))))
+        self.cb_BackupBackend.currentIndexChanged.connect(self._on_backend_changed)
+
+        # 倒计时刷新定时器（每秒触发一次，仅刷新显示）
         self.auto_timer = QTimer(self)
         self.auto_timer.timeout.connect(self.update_remaining_time)  # 绑定刷新函数
-        self.next_backup_time = None  # 存储下一次备份的时间
-        self.auto_cycle_sec = 0  # 存储自动备份周期的总秒数（如每周=604800秒）
 
         # ---------- 关联信号与槽 ----------
-        self.ui.rb_AutoBackup.toggled.connect(self._setup_auto_backup)
-        self.ui.rb_weekly.toggled.connect(self._setup_auto_backup)
-        self.ui.rb_monthly.toggled.connect(self._setup_auto_backup)
-        self.ui.rb_quarterly.toggled.connect(self._setup_auto_backup)
-        self.ui.rb_yearly.toggled.connect(self._setup_auto_backup)
+        # 切换单选框时旧按钮 toggled(False)、新按钮 toggled(True) 各触发一次，只处理选中的那一次
+        self.group1.idToggled.connect(lambda _id, checked: checked and self._setup_auto_backup())
+        self.cycle_group.idToggled.connect(lambda _id, checked: checked and self._setup_auto_backup())
         self.ui.btn_Backup.clicked.connect(self._do_manual_backup)
         self.ui.tv_BackupList.clicked.connect(self._on_backup_selected)
         self.ui.btn_Restore.clicked.connect(self._do_restore)
+        if self.scheduler is not None:
+            self.scheduler.jobFinished.connect(self._on_backup_job_finished)
+            self.scheduler.jobFailed.connect(self._on_backup_job_failed)
 
         # 初始化TableView模型
         self.load_backup_data()
 
-        # 检查自动备份是否默认勾选，若勾选则启动倒计时
-        if self.ui.rb_AutoBackup.isChecked():
-            self._setup_auto_backup()  # 主动触发启动逻辑
+        self.auto_timer.start(1000)
+        self.update_remaining_time()
 
         # 需要备份和恢复的表
-        self.TARGET_TABLES = [
-            "Ammunition_Info",
-            "Runway_Info",
-            "Shelter_Info",
-            "UCC_Info",
-            "DamageScene_Info",
-            "DamageParameter_Info",
-            "Assessment_Result",
-            "Assessment_Report"
-            # "DataBackup_Records",
-            # "DataRestore_Records",
-            # "User_Info"
-        ]
+        self.TARGET_TABLES = TARGET_TABLES
 
     def load_backup_data(self) -> None:
         # 1. 给QTableWidget设置列数（和表头数量一致）
@@ -106,7 +110,7 @@ class DataRestore(QDialog):
         ])
         # 4. 清空原有数据（避免重复加载）
         self.ui.tv_BackupList.setRowCount(0)
-        datalist = self.db_helper.fetch_all("SELECT * FROM DataBackup_Records ORDER BY BackupTime DESC")
+        datalist = list_backup_records(self.db_helper)
         for row, data in enumerate(datalist):
             self.ui.tv_BackupList.insertRow(row)
             self.ui.tv_BackupList.setItem(row, 0, QTableWidgetItem(str(data.get("BackupID", ""))))
@@ -149,109 +153,89 @@ class DataRestore(QDialog):
         if selected_path:  # 用户选择了路径
             self.ui.txt_BackupPath.setText(selected_path)
 
-    # 设置自动定期备份
-    def _setup_auto_backup(self):
-        """设置自动备份定时任务"""
-        is_rb_AutoBackup_checked = self.ui.rb_AutoBackup.isChecked()
-        if not is_rb_AutoBackup_checked:
-            # 关闭自动备份时，停止倒计时并清空显示
-            self.auto_timer.stop()
-            self.ui.lbl_remaintime.clear()
-            self.next_backup_time = None
-            return
+    def _load_schedule_settings(self):
+        """按持久化的调度配置初始化单选框"""
+        cfg = load_config()
+        if cfg.get("auto_backup_enabled") == "1":
+            self.ui.rb_AutoBackup.setChecked(True)
+        else:
+            self.ui.rb_ManualBackup.setChecked(True)
+        cycle_name = cfg.get("auto_backup_cycle", "每周")
+        for rb, name in self.cycle_buttons.items():
+            if name == cycle_name:
+                rb.setChecked(True)
+                break
+        else:
+            self.ui.rb_weekly.setChecked(True)
+        self.ui.txt_BackupPath.setText(cfg.get("manual_backup_path", ""))
 
-        # 获取选中的周期
-        cycle_map = {
-            # self.ui.rb_weekly: ("每周", 60 * 60 * 24 * 7),
-            self.ui.rb_weekly: ("每周", 30),
-            self.ui.rb_monthly: ("每月", 60 * 60 * 24 * 30),
-            self.ui.rb_quarterly: ("每季度", 60 * 60 * 24 * 90),
-            self.ui.rb_yearly: ("每年", 60 * 60 * 24 * 365)
-        }
+    def _on_backend_changed(self, _index):
+        """备份方式写入配置，自动备份与手动备份共用"""
+        backend = self.cb_BackupBackend.currentData()
+        save_config({"backup_backend": backend})
+        self.cfg["backup_backend"] = backend
 
-        # 获取用户选择的周期
+    # 设置自动定期备份
+    def _setup_auto_backup(self):
+        """将自动备份开关与周期写入调度配置"""
         selected_cycle = None
-        for rb, (name, sec) in cycle_map.items():
+        for rb, name in self.cycle_buttons.items():
             if rb.isChecked():
-                selected_cycle = (name, sec)
+                selected_cycle = name
                 break
 
-        if not selected_cycle:
+        is_rb_AutoBackup_checked = self.ui.rb_AutoBackup.isChecked()
+        if is_rb_AutoBackup_checked and not selected_cycle:
             QMessageBox.warning(self, "提示", "请选择自动备份周期")
             self.ui.rb_AutoBackup.setChecked(False)
             return
 
-        # 记录周期名称和总秒数
-        self.auto_cycle_name, self.auto_cycle_sec = selected_cycle
-
-        # 计算下一次备份时间：当前时间 + 周期秒数
-        self.next_backup_time = datetime.datetime.now() + datetime.timedelta(seconds=self.auto_cycle_sec)
-
-        # 启动自动备份定时器和倒计时定时器
-        # self.auto_timer.setInterval(self.auto_cycle_sec * 1000)
-        # self.auto_timer.start()
-        self.auto_timer.start(1000)  # 每秒刷新一次
-
-    # 自动定期备份
-    def _auto_backup_task(self):
-        """自动备份任务（定时器触发）"""
-        backup_path = self.ui.txt_BackupPath.text().strip()
-        backup_file = f"auto_{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}.sql"
-        version = f"V{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:6]}"
-
-        try:
-            # 执行备份
-            self.backup_db(backup_path, backup_file)
-            # 插入记录（BackupType=1=自动）
-            self.insert_backup_record(
-                backup_type=1,
-                cycle=self.auto_cycle_name,
-                path=backup_path,
-                file=backup_file,
-                version=version,
-                status="成功",
-                operator=self.username
-            )
-            # 刷新TableView
-            self.load_backup_data()
-            self.ui.lbl_Note.setText("自动备份完成")
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"自动备份失败: {str(e)}")
+        if self.scheduler is not None:
+            self.scheduler.configure(is_rb_AutoBackup_checked, selected_cycle)
+        else:
+            save_config({"auto_backup_enabled": "1" if is_rb_AutoBackup_checked else "0",
+                         "auto_backup_cycle": selected_cycle or "每周"})
+        self.update_remaining_time()
 
     def _do_manual_backup(self):
         """执行手动备份"""
         if not self.ui.rb_ManualBackup.isChecked():
             QMessageBox.warning(self, "提示", "请选择“手动立即备份”")
             return
-        self.ui.lbl_Note.setText("正在执行数据恢复操作...")
         backup_path = self.ui.txt_BackupPath.text().strip()
         if not backup_path:
             QMessageBox.warning(self, "提示", "请输入备份路径")
             return
 
-        # 生成文件名与版本号
-        backup_file = f"manual_{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}.sql"
-        version = f"V{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        if self.scheduler is not None:
+            # 交给后台线程执行，完成后由 _on_backup_job_finished 刷新列表
+            if not self.scheduler.run_manual(backup_path, self.username):
+                QMessageBox.information(self, "提示", "已有备份任务正在执行，请稍后再试")
+                return
+            self.ui.btn_Backup.setEnabled(False)
+            self.ui.lbl_Note.setText("正在执行数据备份...")
+            return
 
         try:
-            # 执行备份
-            self.backup_db(backup_path, backup_file)
-            # 插入记录（BackupType=2=手动）
-            self.insert_backup_record(
-                backup_type=2,
-                cycle="",
-                path=backup_path,
-                file=backup_file,
-                version=version,
-                status="成功",
-                operator=self.username
-            )
+            # 执行备份并写入备份记录（见 BackupService.backup_now）
+            backup_now(BACKUP_TYPE_MANUAL, backup_path, self.username, progress=self.ui.lbl_Note.setText)
             # 刷新TableView
             self.load_backup_data()
             self.ui.lbl_Note.setText("手动备份完成")
         except Exception as e:
             QMessageBox.critical(self, "错误", f"手动备份失败: {str(e)}")
 
+    def _on_backup_job_finished(self, backup_type: int, path: str):
+        self.ui.btn_Backup.setEnabled(True)
+        self.load_backup_data()
+        self.ui.lbl_Note.setText("自动备份完成" if backup_type == BACKUP_TYPE_AUTO else "手动备份完成")
+
+    def _on_backup_job_failed(self, backup_type: int, msg: str):
+        self.ui.btn_Backup.setEnabled(True)
+        self.ui.lbl_Note.setText(msg)
+        if backup_type == BACKUP_TYPE_MANUAL:
+            QMessageBox.critical(self, "错误", f"手动备份失败: {msg}")
+
     def _on_backup_selected(self, index):
         """选中备份记录时，填充恢复路径"""
         if not index.isValid():
@@ -279,83 +263,47 @@ class DataRestore(QDialog):
                                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No) != QMessageBox.StandardButton.Yes:
             return
 
-        try:
-            # 执行恢复
-            self.restore_db(backup_path, backup_file)
-            # 插入恢复记录（状态1=成功）
-            self.insert_restore_record(
-                backup_id=backup_id,
-                path=backup_path,
-                file=backup_file,
-                version=version,
-                status=1,
-                operator=self.username
-            )
-            self.ui.lbl_Note.setText("恢复成功")
-        except Exception as e:
-            # 插入恢复失败记录（状态0=失败）
-            self.insert_restore_record(
-                backup_id=backup_id,
-                path=backup_path,
-                file=backup_file,
-                version=version,
-                status=0,
-                operator=self.username,
-                remark=str(e)
-            )
-            QMessageBox.critical(self, "错误", f"恢复失败: {str(e)}")
+        # 恢复与恢复记录在后台线程执行（取值字典等缓存由 restore_now 置为失效），完成前禁用备份 / 恢复按钮
+        self.restore_worker = RestoreJobWorker(backup_id, backup_path, backup_file, version, self.username,
+                                               self.TARGET_TABLES, parent=self)
+        self.restore_worker.message.connect(self.ui.lbl_Note.setText)
+        self.restore_worker.done.connect(self._on_restore_done)
+        self.restore_worker.error.connect(self._on_restore_failed)
+        self.restore_worker.finished.connect(self._on_restore_finished)
+        self.ui.btn_Restore.setEnabled(False)
+        self.ui.btn_Backup.setEnabled(False)
+        self.restore_worker.start()
+
+    def _on_restore_done(self, _path: str):
+        self.ui.lbl_Note.setText("恢复成功")
+
+    def _on_restore_failed(self, msg: str):
+        self.ui.lbl_Note.setText(msg)
+        QMessageBox.critical(self, "错误", msg)
+
+    def _on_restore_finished(self):
+        self.restore_worker.deleteLater()
+        self.restore_worker = None
+        self.ui.btn_Restore.setEnabled(True)
+        self.ui.btn_Backup.setEnabled(True)
 
     def closeEvent(self, event):
         """窗口关闭时释放资源"""
+        if self.restore_worker is not None:
+            QMessageBox.information(self, "提示", "数据恢复正在执行，请等待完成后再关闭")
+            event.ignore()
+            return
         self.db_helper.close()
         self.auto_timer.stop()
+        if self.scheduler is not None:
+            self.scheduler.jobFinished.disconnect(self._on_backup_job_finished)
+            self.scheduler.jobFailed.disconnect(self._on_backup_job_failed)
         event.accept()
 
     def backup_db(self, backup_path: str, backup_file: str) -> str:
-        """
-        使用 mysqldump 备份指定的若干业务表到 SQL 文件。
-        - 避免 shell 拼接；使用 args 列表更安全
-        - 通过 env 传递密码，避免明文出现在命令行
-        - 指定 utf8mb4
-        """
+        """使用 mysqldump 备份业务表到 SQL 文件（见 BackupService.dump_tables）"""
         try:
-            os.makedirs(backup_path, exist_ok=True)
-            full_path = os.path.join(backup_path, backup_file)
-
-            mysqldump = self.cfg["mysqldump_path"]
-            host = self.cfg["DB_HOST"]
-            port = str(self.cfg.get("DB_PORT", 3306))
-            user = self.cfg["DB_USER"]
-            pwd = self.cfg["DB_PASS"]
-            db = self.cfg["DB_NAME"]
-
-            # 仅导出需要的表
-            tables = self.TARGET_TABLES
-
-            args = [
-                mysqldump,
-                f"--host={host}",
-                f"--port={port}",
-                f"--user={user}",
-                "--default-character-set=utf8mb4",
-                "--skip-add-drop-table",
-                db,
-                *tables
-            ]
-
-            # 避免密码出现在命令行：MYSQL_PWD 仅对子进程可见
-            env = os.environ.copy()
-            if pwd:
-                env["MYSQL_PWD"] = pwd
-
-            # 直接把 stdout 写到文件，避免 shell 重定向
-            with open(full_path, "wb") as out:
-                proc = subprocess.run(args, stdout=out, stderr=subprocess.PIPE, env=env, check=True)
-                if proc.stderr:
-                    # mysqldump 会打印 warning 到 stderr；这里留作日志
-                    logger.warning(proc.stderr.decode(errors="ignore"))
-            return full_path
-
+            return dump_tables(self.cfg, backup_path, backup_file, self.TARGET_TABLES)
         except Exception as e:
             logger.exception(e)
             raise Exception(f"备份失败: {e}")
@@ -363,119 +311,16 @@ class DataRestore(QDialog):
     def insert_backup_record(self, backup_type, cycle, path, file, version, status, operator, remark=""):
         """插入备份记录到DataBackup_Records"""
         try:
-            sqlstr = """
-                     INSERT INTO DataBackup_Records
-                     (BackupType, BackupCycle, BackupPath, BackupFile, VersionNo, BackupStatus, BackupTime, Operator,
-                      Remark)
-                     VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s) \
-                     """
-            params = (backup_type, cycle, path, file, version, status,
-                      datetime.datetime.now(), operator, remark)
-            self.db_helper.execute_query(sqlstr, params)
+            insert_backup_record(self.db_helper, backup_type, cycle, path, file, version, status, operator, remark)
         except Exception as e:
             logger.exception(e)
             raise Exception(f"备份记录插入失败: {str(e)}")
 
-    def restore_db(self, backup_path: str, backup_file: str) -> str:
-        """
-        使用 mysql 导入 SQL 文件：
-        - 不用 shell 重定向；以 stdin 传入
-        - 自动去除 UTF-8 BOM，避免 Unknown command
-        - 通过 env 传递密码，避免明文出现在命令行
-        - 指定 utf8mb4
-        """
-        try:
-            full_path = os.path.join(backup_path, backup_file)
-            if not os.path.exists(full_path):
-                raise FileNotFoundError(f"备份文件不存在：{full_path}")
-
-            mysql = self.cfg["mysql_path"]
-            host = self.cfg["DB_HOST"]
-            port = str(self.cfg.get("DB_PORT", 3306))
-            user = self.cfg["DB_USER"]
-            pwd = self.cfg["DB_PASS"]
-            db = self.cfg["DB_NAME"]
-
-            # 先清理业务表（和你原逻辑一致）
-            for table in self.TARGET_TABLES:
-                try:
-                    self.ui.lbl_Note.setText(f"正在删除原始数据表: {table} ...")
-                    self.db_helper.execute_query(f"DROP TABLE IF EXISTS `{table}`;")
-                except Exception as e:
-                    logger.warning(f"删除表 {table} 失败：{e}")
-
-            args = [
-                mysql,
-                f"--host={host}",
-                f"--port={port}",
-                f"--user={user}",
-                "--default-character-set=utf8mb4",
-                db
-            ]
-
-            env = os.environ.copy()
-            if pwd:
-                env["MYSQL_PWD"] = pwd  # 仅对子进程生效
-
-            # 读取 SQL，若有 UTF-8 BOM 则跳过
-            with open(full_path, "rb") as f:
-                data = f.read()
-            if data.startswith(b"\xEF\xBB\xBF"):  # UTF-8 BOM
-                data = data[3:]
-
-            # 把 SQL 通过 stdin 输入给 mysql
-            proc = subprocess.run(args, input=data, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env, check=True)
-            if proc.stdout:
-                logger.info(proc.stdout.decode(errors="ignore"))
-            if proc.stderr:
-                # mysql 可能会有 warning
-                logger.warning(proc.stderr.decode(errors="ignore"))
-
-            return full_path
-
-        except subprocess.CalledProcessError as e:
-            # 统一抛出更清晰的错误
-            out = (e.stdout or b"").decode(errors="ignore")
-            err = (e.stderr or b"").decode(errors="ignore")
-            logger.error(f"mysql 导入失败，stdout:\n{out}\nstderr:\n{err}")
-            raise Exception(f"恢复失败（mysql 非零退出）: {err or out or e}")
-
-        except Exception as e:
-            logger.exception(e)
-            raise Exception(f"恢复失败: {e}")
-
-    def insert_restore_record(self, backup_id, path, file, version, status, operator, remark=""):
-        """插入恢复记录到DataRestore_Records"""
-        try:
-            sqlstr = """
-                     INSERT INTO DataRestore_Records
-                     (BackupID, RestorePath, RestoreFile, VersionNo, RestoreStatus, RestoreTime, Operator, Remark)
-                     VALUES (%s, %s, %s, %s, %s, %s, %s, %s) \
-                     """
-            params = (backup_id, path, file, version, status, datetime.datetime.now(), operator, remark)
-            self.db_helper.execute_query(sqlstr, params)
-        except Exception as e:
-            logger.exception(e)
-            raise Exception(f"恢复记录插入失败: {str(e)}")
-
     def update_remaining_time(self):
-        if self.next_backup_time is None or self.auto_cycle_sec == 0:
+        remaining_sec = self.scheduler.remaining_seconds() if self.scheduler is not None else None
+        if remaining_sec is None:
             self.ui.lbl_remaintime.setText("0")
             return
-
-        # 计算当前时间与下一次备份的时间差
-        now = datetime.datetime.now()
-        time_delta = self.next_backup_time - now
-        remaining_sec = int(time_delta.total_seconds())  # 转换为总秒数
-
-        # 若剩余时间≤0，说明到了备份时间
-        if remaining_sec <= 0:
-            # 触发自动备份任务
-            self._auto_backup_task()
-            # 重新计算下一次备份时间
-            self.next_backup_time = datetime.datetime.now() + datetime.timedelta(seconds=self.auto_cycle_sec)
-            remaining_sec = self.auto_cycle_sec  # 重置为周期总秒数
-
         # 更新到界面显示
         self.ui.lbl_remaintime.setText(str(remaining_sec))
 
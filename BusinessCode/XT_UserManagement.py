@@ -11,8 +11,8 @@ from PyQt6.QtCore import pyqtSignal
 from PyQt6.QtWidgets import QApplication, QDialog, QAbstractItemView, QTableWidgetItem, QMessageBox, QHeaderView
 from UIs.Frm_UserManagement import Ui_Frm_UserManagement  # 导入自动生成的界面类
 from DBCode.DBHelper import DBHelper
-import bcrypt
-import datetime
+from DBCode.UserRepository import UserRepository
+from BusinessCode.PasswordPolicy import hash_password
 
 
 class UserManagement(QDialog):
@@ -29,6 +29,7 @@ class UserManagement(QDialog):
         self.ui.setupUi(self)
 
         self.db = DBHelper()
+        self.users = UserRepository(self.db)
         self.ischeckusername = False  # track username availability check
         self.current_user_id = None
         self.init_ui()
@@ -73,7 +74,7 @@ class UserManagement(QDialog):
     def load_user_data(self) -> None:
 
         self.ui.tv_UserInfo.setRowCount(0)
-        users = self.db.fetch_all("SELECT * FROM User_Info")
+        users = self.users.list_all()
         for row, user in enumerate(users):
             self.ui.tv_UserInfo.insertRow(row)
             self.ui.tv_UserInfo.setItem(row, 0, QTableWidgetItem(str(user.get("UID", ""))))  # 用户名
@@ -99,16 +100,8 @@ class UserManagement(QDialog):
             return
 
         try:
-            result = None
             # 查询条件：用户名相同，且排除当前修改的用户（如果是修改操作）
-            if self.current_user_id:
-                sql = "SELECT UID FROM User_Info WHERE username = %s AND UID != %s"
-                result = self.db.fetch_all(sql, (username, self.current_user_id))
-            else:
-                sql = "SELECT UID FROM User_Info WHERE username = %s"
-                result = self.db.fetch_all(sql, (username,))
-
-            if result:
+            if self.users.name_exists(username, exclude_uid=self.current_user_id):
                 self.ui.lab_Note.setText("该用户名已存在，请更换！")
                 self.ui.lab_Note.setStyleSheet("color: red;")
             else:
@@ -173,38 +166,26 @@ class UserManagement(QDialog):
         user_status = 1 if self.ui.txt_UStatus.currentIndex() == 0 else 0  # 用户状态(1表示启用, 0表示禁用)
         remark = self.ui.txt_URemark.text().strip()
 
+        values = {
+            "TrueName": true_name, "Department": department, "UPosition": position, "UserName": username,
+            "URole": user_role, "Telephone": telephone, "Address": address, "UStatus": user_status,
+            "URemark": remark,
+        }
         try:
             if self.current_user_id:
-                query = """
-                        UPDATE User_Info
-                        SET TrueName   = %s,
-                            Department = %s,
-                            UPosition  = %s,
-                            UserName   = %s,
-                            URole      = %s,
-                            Telephone  = %s,
-                            Address    = %s,
-                            UStatus    = %s,
-                            URemark    = %s,
-                            UpdatedTime=%s
-                        WHERE UID = %s \
-                        """
-                params = (true_name, department, position, username, user_role, telephone, address, user_status, remark,
-                          datetime.datetime.now(), self.current_user_id)
-                logger.debug(f"params: {params}")
-                self.db.execute_query(query, params)
+                logger.debug(f"values: {values}")
+                # 单条语句，失败时 DBHelper 已回滚并返回 None
+                if self.users.update(self.current_user_id, values) is None:
+                    raise Exception("数据库写入失败")
                 QMessageBox.information(self, "操作成功", "用户信息修改成功！")
                 self.clear_input()
             else:
-                hashed_password = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
-                query = """
-                        INSERT INTO User_Info (TrueName, Department, UPosition, UserName,
-                                               UPassword, URole, Telephone, Address, UStatus, URemark, CreatedTime)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) \
-                        """
-                params = (true_name, department, position, username, hashed_password, user_role, telephone, address,
-                          user_status, remark, datetime.datetime.now())
-                self.db.execute_query(query, params)
+                hashed_password = hash_password(password)
+                with self.db.transaction():
+                    # 检测与插入放在同一事务内，避免检测之后被其他会话抢先注册同名用户
+                    if self.users.name_exists(username, lock=True):
+                        raise Exception(f"用户名 {username} 已存在")
+                    self.users.add(values, hashed_password)
                 QMessageBox.information(self, "操作成功", "用户信息添加成功！")
                 self.clear_input()
         except Exception as exc:
@@ -219,10 +200,9 @@ class UserManagement(QDialog):
             return
         logger.info(uid_item.text())
         uid = int(uid_item.text())
-        user_records = self.db.fetch_all("SELECT * FROM User_Info WHERE UID = %s", (uid,))
-        if not user_records:
+        user = self.users.get_by_id(uid)
+        if not user:
             return
-        user = user_records[0]
         self.current_user_id = uid
         self.ui.txt_UserName.setText(user.get("UserName", ""))
         self.ui.txt_TrueName.setText(user.get("TrueName", ""))
@@ -263,7 +243,12 @@ class UserManagement(QDialog):
             if uid_item is None:
                 return
             uid = int(uid_item.text())
-            self.db.execute_query("DELETE FROM User_Info WHERE UID = %s", (uid,))
+            try:
+                if self.users.delete(uid) is None:
+                    raise Exception("数据库写入失败")
+            except Exception as exc:
+                QMessageBox.critical(self, "出错提示", f"用户删除失败: {exc}")
+                return
             self.load_user_data()
             QMessageBox.information(self, "操作成功", "用户删除成功！")
             self.clear_input()
@@ -285,8 +270,13 @@ class UserManagement(QDialog):
                 return
             uid = int(uid_item.text())
             password = "123456"
-            hashed_password = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
-            self.db.execute_query("Update User_Info set UPassword=%s WHERE UID = %s", (hashed_password, uid))
+            hashed_password = hash_password(password)
+            try:
+                if self.users.set_password(uid, hashed_password) is None:
+                    raise Exception("数据库写入失败")
+            except Exception as exc:
+                QMessageBox.critical(self, "出错提示", f"密码重置失败: {exc}")
+                return
             QMessageBox.information(self, "操作成功", "该用户的密码已经重置为 123456")
             self.clear_input()
 
@@ -10,6 +10,9 @@ import json
 from sqlalchemy import select, LargeBinary, Column
 from loguru import logger
 
+from BusinessCode.LogSetup import brief
+from DBCode.Metrics import METRICS
+
 # ------- 可选：小型预训练模型（句向量），缺失则退化为 TF-IDF -------
 _EMB_MODEL = None
 _VECT_BACKEND = "sbert"  # "sbert" | "tfidf"
@@ -139,8 +142,6 @@ def _row_to_blob(row, field_names: list[str] | None = None) -> str:
     if not field_names:
         field_names = _collect_field_names(row)
 
-    logger.debug(f"field_names={field_names}")
-
     # 逐字段取值（0/False 也要保留）
     for name in field_names:
         try:
@@ -184,6 +185,7 @@ class SemanticIndex:
     tfidf_mat: Any | None = None
 
     @staticmethod
+    @METRICS.timed("index.am.build", rows=lambda items, *a, **k: len(items))
     def build(items: List[Tuple[int, str]], prefer_model: Optional[str] = None) -> "SemanticIndex":
         logger.debug("开始构建SemanticIndex")
         _try_load_embedder(prefer_model)
@@ -196,7 +198,7 @@ class SemanticIndex:
         # logger.debug(f"safe_blobs={safe_blobs}")
 
         if _VECT_BACKEND == "sbert":
-            logger.debug(f"_VECT_BACKEND为sbert")
+            logger.debug("_VECT_BACKEND为sbert")
             import numpy as np
             mat = _EMB_MODEL.encode(safe_blobs, normalize_embeddings=True).astype("float32")  # type: ignore
             dim = mat.shape[1]
@@ -300,13 +302,14 @@ class SemanticIndex:
             raise RuntimeError("保存 TF-IDF 索引需要 joblib，请先安装：pip install joblib") from e
         joblib.dump({"vec": self.tfidf, "mat": self.tfidf_mat, "ids": self.ids}, base + ".tfidf.joblib")
 
+    @METRICS.timed("index.am.search")
     def search(self, query: str, topk: int = 100) -> List[int]:
         q = query.strip()
-        logger.debug(f"query: {q}")
+        logger.debug("query: {}", q)
         if not q:
             return self.ids[:topk]
 
-        logger.debug(f"self.backend={self.backend}")
+        logger.debug("self.backend={}", self.backend)
         if self.backend == "sbert":
             import numpy as np
             qv = _EMB_MODEL.encode([q], normalize_embeddings=True).astype("float32")  # type: ignore
@@ -356,7 +359,7 @@ def smart_query(session, idx: SemanticIndex, query: str,
     - to_condition:   把自然语言 query → 你已有的 condition_data
     """
     cand_ids = idx.search(query, topk=topk)
-    logger.debug(f"cand_ids: {cand_ids}")
+    logger.opt(lazy=True).debug("cand_ids: {}", lambda: brief(cand_ids))
 
     # 若不做结构化过滤，直接返回 ID 子集对应的记录
     from sqlalchemy import select
@@ -10,6 +10,9 @@ import json
 
 from loguru import logger
 
+from BusinessCode.LogSetup import brief
+from DBCode.Metrics import METRICS
+
 # ------- 可选：小型预训练模型（句向量），缺失则退化为 TF-IDF -------
 _EMB_MODEL = None
 _VECT_BACKEND = "sbert"  # "sbert" | "tfidf"
@@ -159,6 +162,7 @@ class SemanticIndex:
     tfidf_mat: Any | None = None
 
     @staticmethod
+    @METRICS.timed("index.target.build", rows=lambda items, *a, **k: len(items))
     def build(items: List[Tuple[int, str]], prefer_model: Optional[str] = None) -> "SemanticIndex":
         logger.debug("开始构建SemanticIndex")
         _try_load_embedder(prefer_model)
@@ -168,10 +172,10 @@ class SemanticIndex:
         # —— 语料清洗：避免全空行导致空词表 ——
         # 若某条为空，填入一个极简占位符，防止 fit 时全空
         safe_blobs = [x if x != "" else "NA" for x in blobs]
-        logger.debug(f"safe_blobs={safe_blobs}")
+        logger.opt(lazy=True).debug("语料 {}", lambda: brief(safe_blobs))
 
         if _VECT_BACKEND == "sbert":
-            logger.debug(f"_VECT_BACKEND为sbert")
+            logger.debug("_VECT_BACKEND为sbert")
             import numpy as np
             mat = _EMB_MODEL.encode(safe_blobs, normalize_embeddings=True).astype("float32")  # type: ignore
             dim = mat.shape[1]
@@ -276,6 +280,7 @@ class SemanticIndex:
         joblib.dump({"vec": self.tfidf, "mat": self.tfidf_mat, "ids": self.ids}, base + ".tfidf.joblib")
 
 
+    @METRICS.timed("index.target.search")
     def search(self, query: str, topk: int = 100) -> List[int]:
         q = query.strip()
         if not q:
@@ -307,8 +312,8 @@ def build_semantic_index_from_db(session, orm_cls, id_attr: str = "am_id",
     for r in rows:
         rid = getattr(r, id_attr)
         blob = _row_to_blob(r)  # 全字段
-        logger.debug(f"_row_to_blob={blob}")
         items.append((rid, blob))
+    logger.debug("索引语料 {} 条", len(items))
     return SemanticIndex.build(items, prefer_model=prefer_model)
 
 
@@ -329,7 +334,7 @@ def smart_query(session, idx: SemanticIndex, query: str,
     - to_condition:   把自然语言 query → 你已有的 condition_data
     """
     cand_ids = idx.search(query, topk=topk)
-    logger.debug(f"cand_ids: {cand_ids}")
+    logger.opt(lazy=True).debug("cand_ids: {}", lambda: brief(cand_ids))
 
     # 若不做结构化过滤，直接返回 ID 子集对应的记录
     from sqlalchemy import select
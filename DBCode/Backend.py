@@ -0,0 +1,190 @@
+"""
+数据库后端（不依赖 Qt）
+
+配置项 db_backend 选择后端：
+- mysql（默认）：MySQL 服务器，SQLAlchemy 用 pymysql，DBHelper 用 mysql-connector；
+- sqlite：嵌入式单文件数据库（配置项 sqlite_path），WAL 模式，适合单机离线部署、测试与本地基准，无需数据库服务。
+环境变量 DATABASE_URL 优先于配置（以 sqlite: 开头时按 sqlite 后端处理）。
+配置在每个进程内只读取一次（见 _process_config）。
+
+各模型包的 engine 由 create_app_engine() 创建；DBHelper 通过 connect_sqlite() 连接同一个文件，
+仓储中按 MySQL 写法的 SQL（%s 占位符、LAST_INSERT_ID()、FOR UPDATE）由 translate() 改写。
+"""
+from __future__ import annotations
+
+import datetime
+import decimal
+import functools
+import os
+import re
+import sqlite3
+from typing import Dict, Optional
+
+from BusinessCode.ConfigStore import load_config
+
+BACKENDS = ("mysql", "sqlite")
+
+# 每个 SQLite 连接建立时执行：WAL 允许读写并发；NORMAL 在 WAL 下仍保证崩溃一致性；写锁等待而不是立即报错
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=30000",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def _env_url() -> str:
+    return (os.getenv("DATABASE_URL") or "").strip()
+
+
+@functools.lru_cache(maxsize=1)
+def _process_config() -> Dict[str, str]:
+    """
+    本进程使用的配置快照：只在第一次需要时读取一次配置文件，之后每个 DBHelper、engine 都不再读写磁盘。
+    修改 db_backend / 连接参数后需重启程序（各模型包的 engine 也是在导入时建立的）。
+    """
+    return load_config()
+
+
+def _resolve_backend(cfg: Dict[str, str]) -> str:
+    url = _env_url()
+    if url:
+        return "sqlite" if url.startswith("sqlite") else "mysql"
+    name = (cfg.get("db_backend") or "mysql").strip().lower()
+    return name if name in BACKENDS else "mysql"
+
+
+def _resolve_sqlite_path(cfg: Dict[str, str]) -> str:
+    url = _env_url()
+    if url.startswith("sqlite"):
+        path = url.split(":///", 1)[-1]
+    else:
+        path = os.path.expanduser(cfg.get("sqlite_path") or "")
+    path = os.path.abspath(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+@functools.lru_cache(maxsize=1)
+def _process_backend() -> str:
+    return _resolve_backend(_process_config())
+
+
+@functools.lru_cache(maxsize=1)
+def _process_sqlite_path() -> str:
+    return _resolve_sqlite_path(_process_config())
+
+
+def backend(cfg: Optional[Dict[str, str]] = None) -> str:
+    """后端：mysql / sqlite；不传 cfg 时为本进程的后端（首次调用时确定）"""
+    return _process_backend() if cfg is None else _resolve_backend(cfg)
+
+
+def sqlite_path(cfg: Optional[Dict[str, str]] = None) -> str:
+    """SQLite 数据库文件的绝对路径（所在目录不存在时创建）；不传 cfg 时为本进程使用的文件"""
+    return _process_sqlite_path() if cfg is None else _resolve_sqlite_path(cfg)
+
+
+def database_url(cfg: Optional[Dict[str, str]] = None):
+    """SQLAlchemy 连接 URL（字符串或 URL 对象）"""
+    raw = _env_url()
+    if raw:
+        return raw  # assume already URL-encoded
+
+    from sqlalchemy.engine import URL
+
+    cfg = cfg or _process_config()
+    if backend(cfg) == "sqlite":
+        return URL.create("sqlite", database=sqlite_path(cfg))
+    return URL.create(
+        drivername="mysql+pymysql",
+        username=cfg.get("DB_USER", "root"),
+        password=cfg.get("DB_PASS", "123456"),
+        host=cfg.get("DB_HOST", "127.0.0.1"),
+        port=int(cfg.get("DB_PORT", "3306")),
+        database=cfg.get("DB_NAME", "damassessment_db"),
+        query={"charset": "utf8mb4"},
+    )
+
+
+def _apply_pragmas(dbapi_conn) -> None:
+    cursor = dbapi_conn.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def create_app_engine(url, name: str):
+    """创建模型包使用的 engine，并挂接耗时统计（sql.<name>）"""
+    from sqlalchemy import create_engine, event
+    from DBCode.Metrics import instrument_engine
+
+    if str(url).startswith("sqlite"):
+        # 后台线程（检索、导出）与界面线程共用连接池
+        engine = create_engine(url, echo=False, future=True,
+                               connect_args={"check_same_thread": False, "timeout": 30})
+        event.listen(engine, "connect", lambda dbapi_conn, _record: _apply_pragmas(dbapi_conn))
+    else:
+        engine = create_engine(url, pool_pre_ping=True, echo=False, future=True)
+    instrument_engine(engine, name)
+    return engine
+
+
+# ---------- DBHelper 的 SQLite 连接 ----------
+
+def _dict_row(cursor, row):
+    # 与 mysql-connector 的 dictionary=True 游标一致：列名 -> 值
+    return {col[0]: value for col, value in zip(cursor.description, row)}
+
+
+def _parse_datetime(value: bytes):
+    text = value.decode()
+    try:
+        return datetime.datetime.fromisoformat(text)
+    except ValueError:
+        return text
+
+
+# 与 SQLAlchemy 的 SQLite DATETIME 存储格式一致，两条访问路径读写同一列
+sqlite3.register_adapter(datetime.datetime, lambda v: v.isoformat(" ", timespec="microseconds"))
+sqlite3.register_adapter(datetime.date, lambda v: v.isoformat())
+sqlite3.register_adapter(decimal.Decimal, str)
+sqlite3.register_converter("DATETIME", _parse_datetime)
+sqlite3.register_converter("TIMESTAMP", _parse_datetime)
+
+
+def connect_sqlite(path: Optional[str] = None) -> sqlite3.Connection:
+    """DBHelper 使用的连接：行为字典，DATETIME 列转为 datetime"""
+    conn = sqlite3.connect(path or sqlite_path(), timeout=30, detect_types=sqlite3.PARSE_DECLTYPES,
+                           check_same_thread=False)
+    conn.row_factory = _dict_row
+    _apply_pragmas(conn)
+    return conn
+
+
+# ---------- SQL 方言改写 ----------
+
+# 引号内的字面量原样保留，只改写语句本身
+_RE_SQL_TOKEN = re.compile(r"('(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\")|(%s)|(LAST_INSERT_ID\(\))|(\s+FOR\s+UPDATE\b)",
+                           re.IGNORECASE)
+
+
+def _sqlite_token(m: re.Match) -> str:
+    if m.group(1):
+        return m.group(1)
+    if m.group(2):
+        return "?"
+    if m.group(3):
+        return "last_insert_rowid()"
+    return ""  # SQLite 的写事务本身是串行的，无需行锁
+
+
+@functools.lru_cache(maxsize=1024)
+def translate(sql: str, dialect: str) -> str:
+    """把 MySQL 写法的 SQL 改写为目标方言（mysql 原样返回）"""
+    if dialect != "sqlite":
+        return sql
+    return _RE_SQL_TOKEN.sub(_sqlite_token, sql)
@@ -1,56 +1,258 @@
-import mysql.connector
+import time
+from contextlib import contextmanager
+
 from loguru import logger
-from mysql.connector import Error
 
-from BusinessCode.Config import load_config
-from DBCode.ConfigHelper import ConfigHelper
+from DBCode import Backend
+from DBCode.Metrics import METRICS
 
 class DBHelper:
+    """
+    原生 SQL 访问（仓储层使用）。后端见 DBCode.Backend：mysql 用 mysql-connector，
+    sqlite 连接与模型包相同的数据库文件；语句按 MySQL 写法编写，执行前由 Backend.translate 改写。
+    """
+
     def __init__(self):
         self.conn = None
-        self. confighelper = ConfigHelper()
-        self.db_config = self.confighelper.get_db_config()
+        # 事务嵌套深度（>1 表示处于保存点内）及延迟执行的写操作队列
+        self._tx_depth = 0
+        self._pending = []
+        self.dialect = Backend.backend()
         try:
-            self.conn = mysql.connector.connect(
-                host=self.db_config["host"],
-                user=self.db_config["user"],
-                password=self.db_config["password"],
-                database=self.db_config["db_name"],
-            )
-            if self.conn.is_connected():
+            if self.dialect == "sqlite":
+                self.conn = Backend.connect_sqlite()
+            else:
+                import mysql.connector
+                from DBCode.ConfigHelper import ConfigHelper
+
+                self. confighelper = ConfigHelper()
+                self.db_config = self.confighelper.get_db_config()
+                self.conn = mysql.connector.connect(
+                    host=self.db_config["host"],
+                    user=self.db_config["user"],
+                    password=self.db_config["password"],
+                    database=self.db_config["db_name"],
+                )
+            if self.is_connected():
                 print("数据库连接成功")
-        except Error as e:
+        except Exception as e:
             print(f"数据库连接失败: {e}")
 
+    def is_connected(self):
+        if self.conn is None:
+            return False
+        return True if self.dialect == "sqlite" else self.conn.is_connected()
+
+    def _cursor(self, **kwargs):
+        # sqlite 连接的行工厂已返回字典，游标参数只对 mysql-connector 有意义
+        if self.dialect == "sqlite":
+            return self.conn.cursor()
+        return self.conn.cursor(**kwargs)
+
+    def _sql(self, query):
+        return Backend.translate(query, self.dialect)
+
+    @property
+    def in_transaction(self):
+        return self._tx_depth > 0
+
     def execute_query(self, query, params=None):
-        cursor = self.conn.cursor(dictionary=True)
+        # 先把排队中的写操作落库，保证语句顺序及事务内“读己所写”
+        self._flush_pending()
+        cursor = self._cursor(dictionary=True)
+        t0 = time.perf_counter()
         try:
-            cursor.execute(query, params or ())
+            cursor.execute(self._sql(query), params or ())
 
             # 如果是 SELECT 查询，立即读取所有结果
             if query.strip().lower().startswith('select'):
                 result = cursor.fetchall()
                 cursor.close()
+                self._observe(t0, len(result), query, params)
                 return result  # 返回结果数据，而不是 cursor
             else:
-                # 对于 INSERT、UPDATE、DELETE 等操作
-                self.conn.commit()
+                # 对于 INSERT、UPDATE、DELETE 等操作；事务内由 commit() 统一提交
+                if not self.in_transaction:
+                    self.conn.commit()
                 affected_rows = cursor.rowcount
                 cursor.close()
+                self._observe(t0, affected_rows, query, params)
                 return affected_rows
 
         except Exception as e:
             print(f"执行SQL失败: {e}")
+            if self.in_transaction:
+                # 事务内的失败交给 transaction() 回滚整个工作单元
+                cursor.close()
+                raise
+            self.conn.rollback()
+            return None
+
+    def iter_query(self, query, params=None, chunk_size=1000):
+        """
+        逐块读取 SELECT 结果（每块至多 chunk_size 行的 dict 列表），用于导出等大结果集。
+        使用非缓冲游标：结果边从服务器读取边返回，客户端内存只保留当前块。
+        迭代期间该连接不能执行其他语句；中途停止迭代（close）后应关闭连接，不再复用。
+        """
+        self._flush_pending()
+        cursor = self._cursor(dictionary=True, buffered=False)
+        t0 = time.perf_counter()
+        total = 0
+        try:
+            cursor.execute(self._sql(query), params or ())
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                total += len(rows)
+                yield rows
+            self._observe(t0, total, query, params)
+        finally:
+            try:
+                cursor.close()
+            except Exception as e:
+                # 中途停止时游标上仍有未读结果，由随后的 close() 断开连接丢弃
+                logger.debug(f"关闭非缓冲游标: {e}")
+
+    def execute_many(self, query, seq_params):
+        """
+        批量执行同一条语句（executemany）。INSERT ... VALUES 会被合并为多值插入。
+        返回影响行数；事务外失败时回滚并返回 None，事务内失败时抛出异常。
+        """
+        seq_params = list(seq_params)
+        if not seq_params:
+            return 0
+        self._flush_pending()
+        try:
+            rowcount = self._executemany(query, seq_params)
+            if not self.in_transaction:
+                self.conn.commit()
+            return rowcount
+        except Exception as e:
+            print(f"批量执行SQL失败: {e}")
+            if self.in_transaction:
+                raise
             self.conn.rollback()
             return None
 
+    def _executemany(self, query, seq_params):
+        cursor = self._cursor()
+        t0 = time.perf_counter()
+        try:
+            cursor.executemany(self._sql(query), seq_params)
+            self._observe(t0, cursor.rowcount, query, None)
+            return cursor.rowcount
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _observe(t0, rows, query, params):
+        # 耗时与行数计入 sql.dbhelper（见 DBCode.Metrics）
+        METRICS.observe("sql.dbhelper", (time.perf_counter() - t0) * 1000,
+                        rows if rows is not None and rows >= 0 else None, query, params)
+
+    # ---------- 工作单元 ----------
+
+    def queue(self, query, params=None):
+        """
+        延迟执行的写操作：事务内先排队，在下一次查询、保存点或提交前统一落库，
+        相邻的同一条 SQL 合并为一次 executemany（同一往返内批量发送）。
+        事务外等同于 execute_query，立即执行并提交。
+        """
+        if not self.in_transaction:
+            return self.execute_query(query, params)
+        self._pending.append((query, tuple(params or ())))
+        return None
+
+    def _flush_pending(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        i = 0
+        while i < len(pending):
+            query = pending[i][0]
+            j = i
+            while j < len(pending) and pending[j][0] == query:
+                j += 1
+            # 事务内执行，失败直接抛出，由外层回滚
+            self._executemany(query, [p for _, p in pending[i:j]])
+            i = j
+
+    def begin(self):
+        """
+        显式开始事务。已在事务中时建立保存点（SAVEPOINT），用于嵌套的工作单元。
+        须与 commit() / rollback() 成对调用；通常直接使用 transaction()。
+        """
+        if self._tx_depth == 0:
+            # 事务外的 SELECT 可能留下隐式事务（autocommit=False），先结束它再显式开始
+            if self.conn.in_transaction:
+                self.conn.commit()
+            if self.dialect == "sqlite":
+                self.conn.execute("BEGIN")
+            else:
+                self.conn.start_transaction()
+        else:
+            self._flush_pending()
+            self._raw_execute(f"SAVEPOINT sp_{self._tx_depth}")
+        self._tx_depth += 1
+
+    def commit(self):
+        """提交当前层：最外层提交整个事务，内层仅释放保存点（延迟到最外层一起提交）"""
+        if self._tx_depth == 0:
+            self.conn.commit()
+            return
+        self._flush_pending()
+        if self._tx_depth == 1:
+            self.conn.commit()
+        else:
+            self._raw_execute(f"RELEASE SAVEPOINT sp_{self._tx_depth - 1}")
+        self._tx_depth -= 1
+
+    def rollback(self):
+        """回滚当前层：最外层回滚整个事务，内层回滚到对应保存点，外层事务继续有效"""
+        # 排队中的语句都属于当前层（进入保存点前已落库），直接丢弃
+        self._pending = []
+        if self._tx_depth <= 1:
+            self._tx_depth = 0
+            self.conn.rollback()
+            return
+        self._tx_depth -= 1
+        self._raw_execute(f"ROLLBACK TO SAVEPOINT sp_{self._tx_depth}")
+
+    def _raw_execute(self, sql):
+        cursor = self._cursor()
+        try:
+            cursor.execute(sql)
+        finally:
+            cursor.close()
+
+    @contextmanager
+    def transaction(self):
+        """
+        工作单元：块内的写操作不再逐条提交，正常结束时一次提交，出现异常则整体回滚。
+        嵌套使用时内层对应一个保存点，内层异常只撤销内层的写操作。
+            with db.transaction():
+                repo.add(...)
+                param_repo.add_many(...)
+                for r in records:
+                    db.queue("DELETE FROM t WHERE id=%s", (r["id"],))
+        """
+        self.begin()
+        try:
+            yield self
+            self.commit()
+        except Exception:
+            self.rollback()
+            raise
+
     def fetch_all(self, query, params=None):
         # 现在 execute_query 直接返回结果
         result = self.execute_query(query, params)
         return result if result is not None else []
 
     def close(self):
-        if self.conn and self.conn.is_connected():
+        if self.is_connected():
             self.conn.close()
+            self.conn = None
             print("数据库连接已关闭")
 
@@ -0,0 +1,129 @@
+"""
+按主键读取实体的进程级缓存（LRU，容量有限）
+
+选择对话框、编辑窗口、报告导出会反复按主键读取同一批记录（弹药、目标、毁伤场景/参数/结果/报告），
+完整读取一行往往包含图片等大字段。各仓储的按主键读取改为“读穿”：
+1. 先只查该行的更新时间（按主键的单列查询，开销很小）
+2. 缓存中同一 (类型, 主键) 且更新时间相同则直接返回副本
+3. 否则读取完整行、映射为实体并放入缓存
+
+命中条件包含更新时间，其他进程/客户端修改过的记录会自然失效；本进程内的 add / update / delete
+还会在写入时主动 invalidate（更新时间的精度为秒，同一秒内的连续修改靠这一步保证）。
+
+缓存中保存的是独立副本，返回给调用方的也是副本：调用方修改实体或绑定 update() 不影响缓存内容。
+统计：ENTITY_CACHE.stats()
+"""
+from __future__ import annotations
+
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+DEFAULT_MAX_SIZE = 2048
+
+_MISSING = object()
+
+
+class EntityCache:
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.max_size = max_size
+        # (类型, 主键) -> (更新时间, 实体)；同一记录只保留最新版本
+        self._data: "OrderedDict[Tuple[Hashable, Any], Tuple[Any, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, kind: Hashable, key: Any, version: Any) -> Optional[Any]:
+        """版本（更新时间）一致时返回缓存实体的副本，否则返回 None 并计为未命中"""
+        with self._lock:
+            item = self._data.get((kind, key), _MISSING)
+            if item is _MISSING or item[0] != version:
+                self.misses += 1
+                return None
+            self._data.move_to_end((kind, key))
+            self.hits += 1
+            entity = item[1]
+        return copy.copy(entity)
+
+    def put(self, kind: Hashable, key: Any, version: Any, entity: Any) -> None:
+        if entity is None or self.max_size <= 0:
+            return
+        entity = copy.copy(entity)
+        with self._lock:
+            self._data[(kind, key)] = (version, entity)
+            self._data.move_to_end((kind, key))
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, kind: Hashable, key: Any, version: Any,
+                    loader: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """读穿：未命中时调用 loader() 读取并缓存"""
+        entity = self.get(kind, key, version)
+        if entity is not None:
+            return entity
+        entity = loader()
+        self.put(kind, key, version, entity)
+        return entity
+
+    def invalidate(self, kind: Hashable, key: Any = _MISSING) -> None:
+        """使某条记录失效；不传 key 时使该类型的全部记录失效（批量写入后使用）"""
+        with self._lock:
+            if key is not _MISSING:
+                if self._data.pop((kind, key), None) is not None:
+                    self.invalidations += 1
+                return
+            stale = [k for k in self._data if k[0] == kind]
+            for k in stale:
+                del self._data[k]
+            self.invalidations += len(stale)
+
+    def invalidate_many(self, kind: Hashable, keys) -> None:
+        for key in keys:
+            self.invalidate(kind, key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+# 进程内共享的实例
+ENTITY_CACHE = EntityCache()
+
+
+def cached_get(db, kind: Hashable, table: str, pk: str, value: Any,
+               to_entity: Callable[[Dict[str, Any]], Any],
+               version_column: str = "UpdatedTime") -> Optional[Any]:
+    """
+    DBHelper 的按主键读穿：先只查 version_column，未变化时从 ENTITY_CACHE 返回，
+    否则 SELECT * 并用 to_entity 映射字典行后缓存。记录不存在返回 None。
+    """
+    sql = f"SELECT {version_column} FROM {table} WHERE {pk}=%s"
+    rows = db.execute_query(sql, (value,))
+    if not rows:
+        return None
+    entity = ENTITY_CACHE.get(kind, value, rows[0][version_column])
+    if entity is not None:
+        return entity
+    rows = db.execute_query(f"SELECT * FROM {table} WHERE {pk}=%s", (value,))
+    if not rows:
+        return None
+    entity = to_entity(rows[0])
+    ENTITY_CACHE.put(kind, value, rows[0].get(version_column), entity)
+    return entity
@@ -0,0 +1,147 @@
+"""
+下拉框 / 检索条件用的取值字典（国家、弹药类型、基地、结构形式、毁伤等级等）
+
+原先各窗口每次打开都各自 SELECT DISTINCT（或写死列表）。这里统一维护：
+- 首次取值时用一条 UNION ALL 查询把全部字典一次载入，之后在进程内共享，打开窗口不再查库
+- 仓储新增 / 修改记录时调用 notify()，把新出现的取值增量加入对应字典（不重新查询）
+- 数据恢复等整体替换数据的操作后调用 invalidate()，下次取值时重新载入
+删除记录不会移除取值（字典只用于给出候选项，多出的候选项不影响检索结果）。
+
+    from DBCode.LookupCache import LOOKUPS
+    combo.addItems(LOOKUPS.values("am_country"))
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+TARGET_TABLES = ("Runway_Info", "Shelter_Info", "UCC_Info")
+DAMAGE_DEGREES = ("未达到轻度毁伤", "轻度毁伤", "中度毁伤", "重度毁伤", "完全摧毁")
+
+
+@dataclass(frozen=True)
+class LookupSpec:
+    """
+    name      字典名称
+    sources   (表名, 列名, 实体属性名)：从哪些列收集取值；实体属性名用于 notify()
+    defaults  固定的候选项，排在数据库中出现的其他取值之前
+    """
+    name: str
+    sources: Tuple[Tuple[str, str, str], ...]
+    defaults: Tuple[str, ...] = ()
+
+
+LOOKUP_SPECS: Tuple[LookupSpec, ...] = (
+    LookupSpec("am_country", (("Ammunition_Info", "Country", "country"),),
+               ("中国", "美国", "俄罗斯", "法国", "英国", "德国", "印度", "中国台湾", "其他")),
+    LookupSpec("am_base", (("Ammunition_Info", "Base", "used_by"),),
+               ("空军", "陆军", "海军", "联合")),
+    LookupSpec("am_type", (("Ammunition_Info", "AMType", "am_type"),),
+               ("钻地弹", "空地导弹", "子母弹", "巡航导弹", "布撒器", "其他")),
+    LookupSpec("target_country", tuple((t, "Country", "country") for t in TARGET_TABLES),
+               ("中国", "美国", "俄罗斯", "法国", "英国", "德国", "其他")),
+    LookupSpec("target_base", tuple((t, "Base", "base") for t in TARGET_TABLES)),
+    LookupSpec("structural_form", (("Shelter_Info", "StructuralForm", "structural_form"),)),
+    LookupSpec("damage_degree", (("Assessment_Result", "DamageDegree", "DamageDegree"),
+                                 ("Assessment_Report", "DamageDegree", "DamageDegree")),
+               DAMAGE_DEGREES),
+)
+
+
+def _clean(value: Any) -> Optional[str]:
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    return value or None
+
+
+class LookupCache:
+    def __init__(self, specs: Sequence[LookupSpec] = LOOKUP_SPECS) -> None:
+        self._specs: Dict[str, LookupSpec] = {s.name: s for s in specs}
+        # 表名 -> [(字典名, 实体属性名)]
+        self._by_table: Dict[str, List[Tuple[str, str]]] = {}
+        for spec in specs:
+            for table, _column, attr in spec.sources:
+                self._by_table.setdefault(table, []).append((spec.name, attr))
+        # 字典名 -> 数据库中出现过的取值（dict 作有序集合）；None 表示尚未载入
+        self._values: Optional[Dict[str, Dict[str, None]]] = None
+        self._lock = threading.RLock()
+        self.loads = 0
+
+    def values(self, name: str, with_defaults: bool = True) -> List[str]:
+        """
+        字典的候选项：固定候选项在前，其后为数据库中出现过的其他取值（按载入/加入顺序）。
+        with_defaults=False 时只返回数据库中出现过的取值（检索条件用）。
+        """
+        spec = self._specs[name]
+        with self._lock:
+            self._ensure_loaded()
+            seen = list((self._values or {}).get(name, {}))
+        if not with_defaults:
+            return seen
+        defaults = list(spec.defaults)
+        return defaults + [v for v in seen if v not in spec.defaults]
+
+    def notify(self, table: str, entity: Any) -> None:
+        """记录新增 / 修改后调用：entity 可为实体对象或字典行"""
+        targets = self._by_table.get(table)
+        if not targets:
+            return
+        with self._lock:
+            if self._values is None:
+                return  # 尚未载入，载入时自然包含
+            for name, attr in targets:
+                raw = entity.get(attr) if isinstance(entity, dict) else getattr(entity, attr, None)
+                value = _clean(raw)
+                if value is not None:
+                    self._values[name].setdefault(value, None)
+
+    def notify_many(self, table: str, entities) -> None:
+        for entity in entities:
+            self.notify(table, entity)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._values = None
+
+    def _ensure_loaded(self) -> None:
+        if self._values is not None:
+            return
+        parts: List[str] = []
+        params: List[str] = []
+        for spec in self._specs.values():
+            for table, column, _attr in spec.sources:
+                parts.append(
+                    f"SELECT DISTINCT %s AS k, {column} AS v FROM {table} "
+                    f"WHERE {column} IS NOT NULL AND {column} <> ''"
+                )
+                params.append(spec.name)
+        values: Dict[str, Dict[str, None]] = {name: {} for name in self._specs}
+        from DBCode.DBHelper import DBHelper
+        rows = None
+        try:
+            db = DBHelper()
+            try:
+                rows = db.execute_query(" UNION ALL ".join(parts), params)
+            finally:
+                db.close()
+        except Exception as e:
+            logger.warning(f"取值字典查询失败: {e}")
+        if rows is None:
+            # 查询失败时只返回固定候选项，下次取值再重试
+            logger.warning("取值字典载入失败，暂用固定候选项")
+            return
+        for row in sorted(rows, key=lambda r: str(r["v"])):
+            value = _clean(row["v"])
+            if value is not None:
+                values[row["k"]].setdefault(value, None)
+        self._values = values
+        self.loads += 1
+        logger.debug(f"取值字典已载入: { {k: len(v) for k, v in values.items()} }")
+
+
+# 进程内共享的实例
+LOOKUPS = LookupCache()
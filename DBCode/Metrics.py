@@ -0,0 +1,229 @@
+"""
+热点路径的耗时统计（滚动直方图）
+
+记录的指标（名称前缀）：
+- sql.<引擎>      SQLAlchemy 语句耗时及返回行数（instrument_engine 挂在各模型包的 engine 上）
+- sql.dbhelper    DBHelper.execute_query / executemany 的耗时及行数
+- index.*         语义索引构建 / 检索耗时（行数为参与构建的记录数）
+- export.*        导出耗时，行数为导出记录数，汇总中给出吞吐（行/秒）
+- ui.stall        界面线程卡顿时长（见 BusinessCode.PerformanceDialog.UiStallMonitor）
+
+每个指标只保留最近 window 个样本（deque），分位数与分桶在样本窗口上计算；累计次数另计。
+订阅者（subscribe）可拿到每个样本，例如慢查询记录。
+
+    from DBCode.Metrics import METRICS
+    with METRICS.timer("export.pdf") as t:
+        ...
+        t.rows = len(items)
+
+查看：主窗口“系统综合管理 → 性能监控”，或 METRICS.snapshot() / METRICS.export_json(path)
+"""
+from __future__ import annotations
+
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from loguru import logger
+
+DEFAULT_WINDOW = 2048
+# 分桶上界（ms），最后一桶为 “>5000”
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class Sample(NamedTuple):
+    name: str
+    ms: float
+    rows: Optional[int]
+    ts: float  # time.time()
+    detail: Optional[str] = None  # 例如 SQL 语句
+    params: Any = None  # 例如 SQL 参数（仅传给订阅者，不保存在直方图中）
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    k = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+class RollingHistogram:
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        # (耗时 ms, 行数)
+        self._samples: deque = deque(maxlen=window)
+        self.lifetime_count = 0
+        self.lifetime_ms = 0.0
+
+    def add(self, ms: float, rows: Optional[int] = None) -> None:
+        self._samples.append((ms, rows))
+        self.lifetime_count += 1
+        self.lifetime_ms += ms
+
+    def summary(self) -> Dict[str, Any]:
+        samples = list(self._samples)
+        times = sorted(ms for ms, _ in samples)
+        with_rows = [(ms, r) for ms, r in samples if r is not None]
+        rows_total = sum(r for _, r in with_rows)
+        rows_ms = sum(ms for ms, _ in with_rows)
+        buckets: Dict[str, int] = {}
+        i = 0
+        for edge in BUCKETS_MS:
+            n = 0
+            while i < len(times) and times[i] <= edge:
+                n += 1
+                i += 1
+            buckets[f"<={edge}"] = n
+        buckets[f">{BUCKETS_MS[-1]}"] = len(times) - i
+        return {
+            "count": len(times),
+            "lifetime_count": self.lifetime_count,
+            "lifetime_ms": self.lifetime_ms,
+            "mean_ms": sum(times) / len(times) if times else 0.0,
+            "p50_ms": _percentile(times, 0.50),
+            "p90_ms": _percentile(times, 0.90),
+            "p99_ms": _percentile(times, 0.99),
+            "max_ms": times[-1] if times else 0.0,
+            "rows": rows_total if with_rows else None,
+            "rows_per_sec": rows_total / (rows_ms / 1000) if with_rows and rows_ms > 0 else None,
+            "buckets": buckets,
+        }
+
+
+class _Timing:
+    __slots__ = ("rows", "detail")
+
+    def __init__(self, detail: Optional[str]) -> None:
+        self.rows: Optional[int] = None
+        self.detail = detail
+
+
+class Metrics:
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        self.window = window
+        self._hist: Dict[str, RollingHistogram] = {}
+        self._listeners: List[Callable[[Sample], None]] = []
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def observe(self, name: str, ms: float, rows: Optional[int] = None,
+                detail: Optional[str] = None, params: Any = None) -> None:
+        with self._lock:
+            hist = self._hist.get(name)
+            if hist is None:
+                hist = self._hist[name] = RollingHistogram(self.window)
+            hist.add(ms, rows)
+            listeners = list(self._listeners)
+        if listeners:
+            sample = Sample(name, ms, rows, time.time(), detail, params)
+            for fn in listeners:
+                try:
+                    fn(sample)
+                except Exception as e:
+                    logger.warning(f"性能指标订阅者出错: {e}")
+
+    @contextmanager
+    def timer(self, name: str, detail: Optional[str] = None) -> Iterator[_Timing]:
+        """计时块；块内可设置 t.rows。块内抛出异常时同样记录（耗时包含失败路径）"""
+        t = _Timing(detail)
+        t0 = time.perf_counter()
+        try:
+            yield t
+        finally:
+            self.observe(name, (time.perf_counter() - t0) * 1000, t.rows, t.detail)
+
+    def timed(self, name: str, rows: Optional[Callable[..., Optional[int]]] = None):
+        """
+        函数计时装饰器。rows(*args, **kwargs) 返回本次调用处理的行数（可选）。
+            @METRICS.timed("index.build", rows=lambda items, *a, **k: len(items))
+        """
+        def deco(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.timer(name) as t:
+                    if rows is not None:
+                        try:
+                            t.rows = rows(*args, **kwargs)
+                        except Exception:
+                            t.rows = None
+                    return fn(*args, **kwargs)
+            return wrapper
+        return deco
+
+    def subscribe(self, fn: Callable[[Sample], None]) -> None:
+        with self._lock:
+            if fn not in self._listeners:
+                self._listeners.append(fn)
+
+    def unsubscribe(self, fn: Callable[[Sample], None]) -> None:
+        with self._lock:
+            if fn in self._listeners:
+                self._listeners.remove(fn)
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return sorted(self._hist)
+
+    def summary(self, name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            hist = self._hist.get(name)
+            return hist.summary() if hist is not None else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            items = list(self._hist.items())
+        return {
+            "started": self.started,
+            "time": time.time(),
+            "window": self.window,
+            "metrics": {name: hist.summary() for name, hist in sorted(items)},
+        }
+
+    def export_json(self, path: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        data = self.snapshot()
+        if extra:
+            data.update(extra)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hist.clear()
+            self.started = time.time()
+
+
+# 进程内共享的实例
+METRICS = Metrics()
+
+
+def instrument_engine(engine, name: str) -> None:
+    """在 SQLAlchemy engine 上挂接计时事件，记录为 sql.<name>"""
+    from sqlalchemy import event
+
+    metric = f"sql.{name}"
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_metrics_t0", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get("_metrics_t0")
+        if not stack:
+            return
+        ms = (time.perf_counter() - stack.pop()) * 1000
+        rowcount = getattr(cursor, "rowcount", -1)
+        METRICS.observe(metric, ms, rowcount if rowcount is not None and rowcount >= 0 else None,
+                        statement, parameters)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        # 语句失败时不会触发 after_cursor_execute，弹出对应的起始时间
+        conn = exception_context.connection
+        if conn is not None:
+            stack = conn.info.get("_metrics_t0")
+            if stack:
+                stack.pop()
@@ -0,0 +1,272 @@
+"""
+行 -> 实体 的映射函数（按需生成并缓存）
+
+各仓储原先逐行用 dataclasses.fields + getattr 反射，或手写几十个字段的构造调用。
+这里按 (来源, 实体类, 选项) 生成一次专用函数，例如：
+
+    def map_AirportRunway(r):
+        return _cls(id=r.id, runway_name=r.runway_name, ...)
+
+之后每行只是一次普通函数调用。来源可以是：
+- source="attr"：ORM 对象或 Core 查询结果 Row（按属性名取值）
+- source="item"：DBHelper 返回的字典行（按键取值，缺键时取实体字段默认值）
+
+配合 entity_columns() 只 SELECT 实体需要的列，可直接把 Core 结果行映射为实体，
+不必先加载完整 ORM 对象。
+
+只读的列表 / 检索结果用 record_class() 生成的记录类型（namedtuple：tuple 存储，
+无实例 __dict__，不绑定 update 闭包），编辑时再按主键取完整实体。
+内存对比：python -m DBCode.RowMapper --sizes 10000 100000 1000000
+"""
+from __future__ import annotations
+
+import dataclasses
+import threading
+from collections import namedtuple
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+_MAPPERS: Dict[Tuple, Callable[[Any], Any]] = {}
+_RECORDS: Dict[Tuple, type] = {}
+_lock = threading.Lock()
+
+
+def _orm_keys(orm_cls: Any) -> Optional[frozenset]:
+    """ORM 类的列属性名集合；非 ORM 来源返回 None（不做可用性检查）"""
+    mapper = getattr(orm_cls, "__mapper__", None)
+    if mapper is None:
+        return None
+    return frozenset(attr.key for attr in mapper.column_attrs)
+
+
+def _field_default(f: dataclasses.Field) -> Any:
+    if f.default is not dataclasses.MISSING:
+        return f.default
+    return None
+
+
+def compile_mapper(
+        entity_cls: type,
+        *,
+        source: str = "attr",
+        rename: Optional[Mapping[str, str]] = None,
+        convert: Optional[Mapping[str, Callable[[Any], Any]]] = None,
+        exclude: Iterable[str] = (),
+        available: Optional[Iterable[str]] = None,
+) -> Callable[[Any], Any]:
+    """
+    生成映射函数（不缓存，一般通过 mapper_for 获取）。
+    rename:    实体字段 -> 来源属性名/键名（不同名时）
+    convert:   实体字段 -> 取值后的转换函数
+    exclude:   不读取、直接置 None 的字段（如列表中不需要的图片）
+    available: 来源实际具有的属性名；不在其中的字段置 None（与 getattr(row, name, None) 一致）
+    """
+    if source not in ("attr", "item"):
+        raise ValueError(f"未知的来源类型: {source}")
+    rename = dict(rename or {})
+    convert = dict(convert or {})
+    exclude = set(exclude)
+    available = set(available) if available is not None else None
+
+    env: Dict[str, Any] = {"_cls": entity_cls}
+    args: List[str] = []
+    for f in dataclasses.fields(entity_cls):
+        if not f.init:
+            continue
+        key = rename.get(f.name, f.name)
+        if f.name in exclude or (available is not None and key not in available):
+            args.append(f"{f.name}=None")
+            continue
+        if source == "attr":
+            expr = f"r.{key}"
+        else:
+            default_name = f"_d_{f.name}"
+            env[default_name] = _field_default(f)
+            expr = f"r.get({key!r}, {default_name})"
+        if f.name in convert:
+            conv_name = f"_c_{f.name}"
+            env[conv_name] = convert[f.name]
+            expr = f"{conv_name}({expr})"
+        args.append(f"{f.name}={expr}")
+
+    fn_name = f"map_{entity_cls.__name__}"
+    body = ",\n        ".join(args)
+    code = f"def {fn_name}(r):\n    return _cls(\n        {body}\n    )\n"
+    exec(compile(code, f"<row-mapper {entity_cls.__name__}>", "exec"), env)
+    fn = env[fn_name]
+    fn.__doc__ = code
+    return fn
+
+
+def mapper_for(
+        orm_cls: Any,
+        entity_cls: type,
+        *,
+        source: str = "attr",
+        rename: Optional[Mapping[str, str]] = None,
+        convert: Optional[Mapping[str, Callable[[Any], Any]]] = None,
+        exclude: Iterable[str] = (),
+) -> Callable[[Any], Any]:
+    """
+    取 (orm_cls, entity_cls, 选项) 对应的映射函数，首次使用时生成，之后复用。
+    orm_cls 为 ORM 类时按其列属性检查可用字段；字典来源可传表名等任意可哈希标识。
+    """
+    exclude = tuple(sorted(exclude))
+    key = (
+        orm_cls, entity_cls, source,
+        tuple(sorted((rename or {}).items())),
+        tuple(sorted((convert or {}).items(), key=lambda kv: kv[0])),
+        exclude,
+    )
+    fn = _MAPPERS.get(key)
+    if fn is not None:
+        return fn
+    with _lock:
+        fn = _MAPPERS.get(key)
+        if fn is None:
+            fn = compile_mapper(
+                entity_cls,
+                source=source,
+                rename=rename,
+                convert=convert,
+                exclude=exclude,
+                available=_orm_keys(orm_cls) if source == "attr" else None,
+            )
+            _MAPPERS[key] = fn
+    return fn
+
+
+def entity_columns(
+        orm_cls: Any,
+        entity_cls: type,
+        *,
+        rename: Optional[Mapping[str, str]] = None,
+        exclude: Iterable[str] = (),
+) -> List[Any]:
+    """
+    实体需要的 ORM 列属性，用于 select(*cols)：结果 Row 的键即 ORM 属性名，
+    可直接交给同样参数的 mapper_for(...) 映射。
+    """
+    rename = rename or {}
+    exclude = set(exclude)
+    keys = _orm_keys(orm_cls) or frozenset()
+    cols = []
+    for f in dataclasses.fields(entity_cls):
+        key = rename.get(f.name, f.name)
+        if f.init and f.name not in exclude and key in keys:
+            cols.append(getattr(orm_cls, key))
+    return cols
+
+
+# ---------- 只读记录 ----------
+
+def record_class(entity_cls: type, field_names: Optional[Sequence[str]] = None) -> type:
+    """
+    实体的只读轻量表示：namedtuple，字段为实体字段（或其子集，顺序按 field_names）。
+    同一 (实体类, 字段) 只生成一次。
+    """
+    if field_names is None:
+        field_names = [f.name for f in dataclasses.fields(entity_cls) if f.init]
+    key = (entity_cls, tuple(field_names))
+    cls = _RECORDS.get(key)
+    if cls is None:
+        with _lock:
+            cls = _RECORDS.get(key)
+            if cls is None:
+                cls = namedtuple(f"{entity_cls.__name__}Record", key[1], module=entity_cls.__module__)
+                _RECORDS[key] = cls
+    return cls
+
+
+def record_query(
+        orm_cls: Any,
+        entity_cls: type,
+        field_names: Optional[Sequence[str]] = None,
+        *,
+        rename: Optional[Mapping[str, str]] = None,
+        exclude: Iterable[str] = (),
+) -> Tuple[List[Any], type]:
+    """
+    返回 (列, 记录类型)：select(*列) 的结果行与记录字段按位置一一对应，
+    用 记录类型._make(row) 直接构造。ORM 中不存在的字段和 exclude 中的字段不包含在内。
+    """
+    rename = rename or {}
+    exclude = set(exclude)
+    keys = _orm_keys(orm_cls) or frozenset()
+    if field_names is None:
+        field_names = [f.name for f in dataclasses.fields(entity_cls) if f.init]
+    names = [n for n in field_names if n not in exclude and rename.get(n, n) in keys]
+    cols = [getattr(orm_cls, rename.get(n, n)) for n in names]
+    return cols, record_class(entity_cls, names)
+
+
+# ---------- 内存对比 ----------
+
+def benchmark_memory(sizes: Sequence[int] = (10_000, 100_000, 1_000_000)) -> Dict[str, Any]:
+    """
+    比较弹药实体（dataclass + 仓储绑定的 update 闭包）与只读记录在不同行数下的内存占用。
+    数据为合成数据，不访问数据库；tracemalloc 统计各表示方式新分配的字节数。
+    """
+    import gc
+    import time
+    import tracemalloc
+    from datetime import datetime
+    from decimal import Decimal
+
+    from am_models.entities import Ammunition
+
+    names = [f.name for f in dataclasses.fields(Ammunition) if f.init]
+    make_record = record_class(Ammunition, names)._make
+    now = datetime.now()
+
+    def sample(i: int) -> Dict[str, Any]:
+        # 字段值在各表示之间共享，只统计容器本身的开销
+        values = {n: None for n in names}
+        values.update(am_id=i, am_name=f"AM-{i}", am_type="钻地弹", am_image_blob=None,
+                      weight_kg=Decimal("1000.5"), launch_mass_kg=Decimal("1200"),
+                      warhead_type="侵彻", warhead_name="WH", created_at=now, updated_at=now)
+        return values
+
+    def as_entity(values):
+        e = Ammunition(**values)
+
+        def _inst_update():  # 与 add_update_method 绑定的闭包结构相同
+            return e
+
+        setattr(e, "update", _inst_update)
+        return e
+
+    def as_record(values):
+        # 与 list_records 相同：按位置由结果行构造
+        return make_record(values.values())
+
+    report: Dict[str, Any] = {"fields": len(names), "results": []}
+    for n in sizes:
+        rows = [sample(i) for i in range(n)]
+        entry: Dict[str, Any] = {"rows": n}
+        for label, build in (("entity", as_entity), ("record", as_record)):
+            gc.collect()
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            objs = [build(v) for v in rows]
+            elapsed = time.perf_counter() - t0
+            current, _peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            entry[label] = {"bytes": current, "bytes_per_row": current / n, "build_sec": elapsed}
+            del objs
+        entry["ratio"] = entry["entity"]["bytes"] / max(entry["record"]["bytes"], 1)
+        report["results"].append(entry)
+        del rows
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import os
+    import sys
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser = argparse.ArgumentParser(description="实体与只读记录的内存占用对比")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+    print(json.dumps(benchmark_memory(args.sizes), ensure_ascii=False, indent=2))
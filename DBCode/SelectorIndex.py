@@ -0,0 +1,362 @@
+"""
+选择对话框（弹药 / 跑道 / 掩蔽库 / 地下指挥所）的内存检索索引
+
+选择对话框边输入边检索，每次按键不再查库：
+- 每张表首次检索时在后台线程把 (主键, 名称, 代码/型号, 表格显示列) 一次载入内存；
+  载入完成前由 fallback_search() 查库（LIKE + LIMIT）兜底
+- 检索在内存中完成：被检索的列小写后拼成一段文本，用 str.find 扫描（C 实现），
+  偏移量二分映射回记录；字段前缀匹配排在前面，其后为子串匹配。10 万条记录单次检索在毫秒级
+- 仓储新增 / 修改 / 删除记录时调用 touch(table, key)，下次检索前按主键重新读取这几行；
+  不知道具体主键的批量写入调用 touch(table)，整表在后台重新载入
+- 数据恢复等整体替换数据后调用 invalidate()
+
+    from DBCode.SelectorIndex import SELECTOR_INDEX
+    rows = SELECTOR_INDEX.search("Ammunition_Info", "agm")
+    if rows is None:  # 尚未载入
+        rows = SELECTOR_INDEX.fallback_search("Ammunition_Info", "agm")
+
+性能测试：python -m DBCode.SelectorIndex --sizes 10000 100000
+"""
+from __future__ import annotations
+
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from loguru import logger
+
+from DBCode.Metrics import METRICS
+from DBCode.SlowQueryLog import query_label
+
+DEFAULT_LIMIT = 100
+
+_ALL = object()
+
+# 记录内字段以 \x00 开头，记录之间以 \n 分隔；字段值中的这两个字符替换为空格
+_FIELD_SEP = "\x00"
+_RECORD_SEP = "\n"
+_CLEAN = str.maketrans({_FIELD_SEP: " ", _RECORD_SEP: " ", "\r": " "})
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """
+    table     表名（同时作为 touch() 的标识）
+    pk        主键列
+    columns   载入并返回的列（表格显示列），第一列为主键
+    search    参与检索的列（须包含在 columns 中）
+    """
+    table: str
+    pk: str
+    columns: Tuple[str, ...]
+    search: Tuple[str, ...]
+
+
+INDEX_SPECS: Tuple[IndexSpec, ...] = (
+    IndexSpec("Ammunition_Info", "AMID",
+              ("AMID", "AMName", "AMNameCN", "AMType", "AMModel", "Country",
+               "WarheadType", "WarheadName", "ChargeAmount"),
+              ("AMName", "AMNameCN", "AMModel")),
+    IndexSpec("Runway_Info", "RunwayID",
+              ("RunwayID", "RunwayCode", "RunwayName", "Country", "Base", "RLength", "RWidth"),
+              ("RunwayCode", "RunwayName")),
+    IndexSpec("Shelter_Info", "ShelterID",
+              ("ShelterID", "ShelterCode", "ShelterName", "Country", "Base",
+               "ShelterWidth", "ShelterHeight", "ShelterLength"),
+              ("ShelterCode", "ShelterName")),
+    IndexSpec("UCC_Info", "UCCID",
+              ("UCCID", "UCCCode", "UCCName", "Country", "Base", "Location"),
+              ("UCCCode", "UCCName")),
+)
+
+
+def _norm(value: Any) -> str:
+    if value is None:
+        return ""
+    return str(value).translate(_CLEAN).lower()
+
+
+def _like_escape(value: str) -> str:
+    # 显式 ESCAPE '/'：MySQL 与 SQLite 的默认转义不同（SQLite 没有默认转义字符）
+    return value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
+
+class _TableIndex:
+    """一张表的索引数据；rows 按主键倒序（新记录在前，与原先 ORDER BY ... DESC 一致）"""
+
+    def __init__(self, spec: IndexSpec, rows: Sequence[Tuple[Any, ...]]) -> None:
+        self.spec = spec
+        self._search_pos = [spec.columns.index(c) for c in spec.search]
+        self.rows: Dict[Any, Tuple[Any, ...]] = {}
+        self._texts: Dict[Any, str] = {}
+        for r in rows:
+            self._set(r)
+        self._build()
+
+    def _set(self, row: Sequence[Any]) -> None:
+        row = tuple(row)
+        self.rows[row[0]] = row
+        self._texts[row[0]] = "".join(_FIELD_SEP + _norm(row[i]) for i in self._search_pos) + _RECORD_SEP
+
+    def _build(self) -> None:
+        # 每条记录的检索文本已缓存，这里只重新排序和拼接（timsort 对基本有序的主键接近线性）
+        keys = sorted(self.rows, reverse=True)
+        texts = [self._texts[k] for k in keys]
+        starts: List[int] = []
+        pos = 0
+        for t in texts:
+            starts.append(pos)
+            pos += len(t)
+        self.ordered = [self.rows[k] for k in keys]
+        self.starts = starts
+        self.text = "".join(texts)
+
+    def apply(self, changed: Dict[Any, Optional[Tuple[Any, ...]]]) -> None:
+        """按主键替换 / 删除记录（None 表示删除）后重建检索文本"""
+        for key, row in changed.items():
+            if row is None:
+                self.rows.pop(key, None)
+                self._texts.pop(key, None)
+            else:
+                self._set(row)
+        self._build()
+
+    def _scan(self, needle: str, seen: Set[int], out: List[Tuple[Any, ...]], limit: int) -> None:
+        text, starts, ordered = self.text, self.starts, self.ordered
+        pos = text.find(needle)
+        while pos != -1 and len(out) < limit:
+            idx = bisect_right(starts, pos) - 1
+            if idx not in seen:
+                seen.add(idx)
+                out.append(ordered[idx])
+            # 跳到下一条记录，同一记录只命中一次
+            nxt = starts[idx + 1] if idx + 1 < len(starts) else len(text)
+            pos = text.find(needle, nxt)
+
+    def search(self, keyword: str, limit: int) -> List[Tuple[Any, ...]]:
+        needle = _norm(keyword).strip()
+        if not needle:
+            return self.ordered[:limit]
+        out: List[Tuple[Any, ...]] = []
+        seen: Set[int] = set()
+        self._scan(_FIELD_SEP + needle, seen, out, limit)  # 字段前缀匹配
+        self._scan(needle, seen, out, limit)  # 子串匹配
+        return out
+
+
+class SelectorIndex:
+    def __init__(self, specs: Sequence[IndexSpec] = INDEX_SPECS) -> None:
+        self._specs: Dict[str, IndexSpec] = {s.table: s for s in specs}
+        self._tables: Dict[str, _TableIndex] = {}
+        # 表名 -> 待重新读取的主键；_ALL 表示整表重新载入
+        self._pending: Dict[str, Any] = {}
+        self._loading: Set[str] = set()
+        self._generation = 0
+        self._lock = threading.RLock()
+        self.loads = 0
+
+    def spec(self, table: str) -> IndexSpec:
+        return self._specs[table]
+
+    def loaded(self, table: str) -> bool:
+        with self._lock:
+            return table in self._tables and self._pending.get(table) is not _ALL
+
+    def search(self, table: str, keyword: str, limit: int = DEFAULT_LIMIT) -> Optional[List[Tuple[Any, ...]]]:
+        """
+        内存检索，返回按 spec.columns 排列的行元组。
+        索引尚未载入（或整表待重载）时返回 None，并在后台开始载入；调用方改用 fallback_search()。
+        """
+        with self._lock:
+            index = self._tables.get(table)
+            pending = self._pending.get(table)
+            if index is None or pending is _ALL:
+                self._start_load(table)
+                return None
+        if pending:
+            self._refresh(table, pending)
+        with self._lock, METRICS.timer("index.selector.search") as t:
+            rows = self._tables[table].search(keyword, limit)
+            t.rows = len(rows)
+        return rows
+
+    def preload(self, table: str) -> None:
+        """在后台线程载入索引（打开对话框时调用，首次按键时通常已可用）"""
+        with self._lock:
+            if table not in self._tables or self._pending.get(table) is _ALL:
+                self._start_load(table)
+
+    def fallback_search(self, table: str, keyword: str, limit: int = DEFAULT_LIMIT) -> List[Tuple[Any, ...]]:
+        """索引未就绪时直接查库（可在后台线程调用）"""
+        spec = self._specs[table]
+        sql = f"SELECT {', '.join(spec.columns)} FROM {table}"
+        params: List[Any] = []
+        keyword = (keyword or "").strip()
+        if keyword:
+            pattern = f"%{_like_escape(keyword)}%"
+            sql += " WHERE " + " OR ".join(f"{c} LIKE %s ESCAPE '/'" for c in spec.search)
+            params.extend(pattern for _ in spec.search)
+        sql += f" ORDER BY {spec.pk} DESC LIMIT %s"
+        params.append(int(limit))
+        rows = self._query(sql, params)
+        if rows is None:
+            raise RuntimeError(f"查询 {table} 失败")
+        return [tuple(r[c] for c in spec.columns) for r in rows]
+
+    def touch(self, table: str, key: Any = _ALL) -> None:
+        """记录新增 / 修改 / 删除后调用；不传 key 时整表重新载入（批量写入后使用）"""
+        with self._lock:
+            if table not in self._specs:
+                return
+            if table in self._loading:
+                # 正在载入，载入的查询可能已错过这次修改：载入完成后再整表重载一次
+                self._pending[table] = _ALL
+                return
+            if table not in self._tables:
+                return  # 尚未载入，载入时自然包含
+            if key is _ALL:
+                self._pending[table] = _ALL
+                return
+            pending = self._pending.setdefault(table, set())
+            if pending is not _ALL:
+                pending.add(key)
+
+    def touch_many(self, table: str, keys) -> None:
+        for key in keys:
+            self.touch(table, key)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._tables.clear()
+            self._pending.clear()
+            self._generation += 1
+
+    # ---------- 内部 ----------
+
+    def _start_load(self, table: str) -> None:
+        # 调用方持有 _lock
+        if table in self._loading:
+            return
+        self._loading.add(table)
+        self._pending.pop(table, None)
+        generation = self._generation
+        threading.Thread(target=self._load, args=(table, generation),
+                         name=f"selector-index-{table}", daemon=True).start()
+
+    def _load(self, table: str, generation: int) -> None:
+        spec = self._specs[table]
+        try:
+            rows = self._query(f"SELECT {', '.join(spec.columns)} FROM {table}", ())
+            if rows is None:
+                logger.warning(f"检索索引 {table} 载入失败，继续查库")
+                return
+            with METRICS.timer("index.selector.build") as t:
+                index = _TableIndex(spec, [tuple(r[c] for c in spec.columns) for r in rows])
+                t.rows = len(rows)
+            with self._lock:
+                if generation != self._generation:
+                    return  # 载入期间被 invalidate()，丢弃
+                self._tables[table] = index
+                self.loads += 1
+            logger.debug(f"检索索引 {table} 已载入: {len(index.rows)} 条")
+        except Exception as e:
+            logger.warning(f"检索索引 {table} 载入失败: {e}")
+        finally:
+            with self._lock:
+                self._loading.discard(table)
+
+    def _refresh(self, table: str, keys: Set[Any]) -> None:
+        spec = self._specs[table]
+        with self._lock:
+            keys = set(keys)
+            self._pending.pop(table, None)
+        marks = ", ".join(["%s"] * len(keys))
+        sql = f"SELECT {', '.join(spec.columns)} FROM {table} WHERE {spec.pk} IN ({marks})"
+        rows = self._query(sql, list(keys))
+        if rows is None:
+            # 读取失败时保留待刷新的主键，下次再试
+            with self._lock:
+                pending = self._pending.setdefault(table, set())
+                if pending is not _ALL:
+                    pending.update(keys)
+            return
+        changed: Dict[Any, Optional[Tuple[Any, ...]]] = {k: None for k in keys}
+        for r in rows:
+            changed[r[spec.pk]] = tuple(r[c] for c in spec.columns)
+        with self._lock:
+            index = self._tables.get(table)
+            if index is not None:
+                index.apply(changed)
+
+    @staticmethod
+    def _query(sql: str, params) -> Optional[List[Dict[str, Any]]]:
+        from DBCode.DBHelper import DBHelper
+        db = DBHelper()
+        try:
+            with query_label("selector_index"):
+                return db.execute_query(sql, params)
+        finally:
+            db.close()
+
+
+# 进程内共享的实例
+SELECTOR_INDEX = SelectorIndex()
+
+
+# ---------- 性能测试 ----------
+
+def benchmark(sizes: Sequence[int] = (10_000, 100_000), limit: int = DEFAULT_LIMIT) -> Dict[str, Any]:
+    """
+    合成弹药数据（不访问数据库），模拟逐字输入，统计每次按键的内存检索耗时。
+    """
+    import random
+    import time
+
+    spec = INDEX_SPECS[0]
+    rng = random.Random(2025)
+    prefixes = ["AGM", "GBU", "JDAM", "BLU", "KH", "风暴", "鹰击", "长剑"]
+    keystrokes = ["a", "ag", "agm", "agm-1", "agm-15", "agm-158",
+                  "鹰", "鹰击", "鹰击-1", "zzz-none"]
+    report: Dict[str, Any] = {"limit": limit, "results": []}
+    for n in sizes:
+        rows = []
+        for i in range(n):
+            p = rng.choice(prefixes)
+            model = f"{p}-{rng.randint(1, 999)}"
+            rows.append((i, f"{p} Missile {i}", f"{p}导弹{i}", "空地导弹", model, "美国",
+                         "侵彻", "WH", 100.0))
+        t0 = time.perf_counter()
+        index = _TableIndex(spec, rows)
+        build_ms = (time.perf_counter() - t0) * 1000
+        timings = []
+        for kw in keystrokes:
+            t0 = time.perf_counter()
+            hits = index.search(kw, limit)
+            timings.append({"keyword": kw, "ms": (time.perf_counter() - t0) * 1000, "hits": len(hits)})
+        # 单条修改后的重建耗时（touch 后下一次检索前发生）
+        t0 = time.perf_counter()
+        index.apply({0: rows[0]})
+        rebuild_ms = (time.perf_counter() - t0) * 1000
+        report["results"].append({
+            "rows": n,
+            "build_ms": build_ms,
+            "rebuild_ms": rebuild_ms,
+            "max_keystroke_ms": max(t["ms"] for t in timings),
+            "keystrokes": timings,
+        })
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import os
+    import sys
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser = argparse.ArgumentParser(description="选择对话框内存检索的按键延迟测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+    args = parser.parse_args()
+    print(json.dumps(benchmark(args.sizes, args.limit), ensure_ascii=False, indent=2))
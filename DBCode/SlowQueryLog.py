@@ -0,0 +1,348 @@
+"""
+慢查询记录
+
+订阅 DBCode.Metrics 中的 SQL 样本（sql.am / sql.target / sql.damage / sql.dbhelper），
+耗时达到阈值的语句写入 ~/.hs_2025/logs/slow_query.log（与 CrashGuard 的 crash.log 同目录，按大小轮转），
+每行一条 JSON：时间、来源、检索名称、耗时、行数、SQL 文本、参数形状（只记类型不记取值）、
+语句指纹（字面量和参数替换为 ?，用于归并同类语句），以及 SELECT 的 EXPLAIN FORMAT=JSON
+（sqlite 后端为 EXPLAIN QUERY PLAN 的各步说明）。
+
+- 阈值与是否 EXPLAIN 取自配置 slow_query_ms / slow_query_explain（见 BusinessCode.Config）
+- EXPLAIN 在后台线程用独立连接执行，不占用原查询的连接；同一指纹 10 分钟内只 EXPLAIN 一次
+- 检索代码可用 query_label("名称") 标注随后执行的语句，日志中据此区分来源（QuerySpec 已标注）
+
+汇总（按总耗时排序的语句指纹）：
+    python -m DBCode.SlowQueryLog --top 20
+    python -m DBCode.SlowQueryLog --top 5 --plans
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, Iterator, List, Optional
+
+from loguru import logger
+
+from BusinessCode.CrashGuard import LOG_DIR
+from DBCode.Metrics import METRICS, Sample
+
+LOG_FILE = os.path.join(LOG_DIR, "slow_query.log")
+MAX_LOG_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 5
+DEFAULT_THRESHOLD_MS = 500.0
+MAX_SQL_CHARS = 8000
+EXPLAIN_TTL_SEC = 600
+
+_local = threading.local()
+
+
+@contextmanager
+def query_label(name: str) -> Iterator[None]:
+    """标注当前线程随后执行的语句来自哪个检索（写入慢查询记录的 label 字段）"""
+    prev = getattr(_local, "label", None)
+    _local.label = name
+    try:
+        yield
+    finally:
+        _local.label = prev
+
+
+def current_label() -> Optional[str]:
+    return getattr(_local, "label", None)
+
+
+# ---------- 语句指纹 / 参数形状 ----------
+
+_RE_COMMENT = re.compile(r"/\*.*?\*/|--[^\n]*", re.S)
+_RE_STRING = re.compile(r"'(?:[^'\\]|\\.)*'")
+_RE_PARAM = re.compile(r"%\(\w+\)s|%s|\?")
+_RE_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_RE_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_RE_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """去掉注释，字面量与参数替换为 ?，IN 列表折叠为 (?+)，压缩空白"""
+    text = _RE_COMMENT.sub(" ", sql)
+    text = _RE_STRING.sub("?", text)
+    text = _RE_PARAM.sub("?", text)
+    text = _RE_NUMBER.sub("?", text)
+    text = _RE_IN_LIST.sub("(?+)", text)
+    return _RE_SPACE.sub(" ", text).strip()
+
+
+def _type_name(value: Any) -> str:
+    if isinstance(value, (list, tuple, set)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def params_shape(params: Any) -> Any:
+    """参数的形状：字典 -> {键: 类型}，序列 -> [类型]；不记录取值"""
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {str(k): _type_name(v) for k, v in params.items()}
+    if isinstance(params, (list, tuple)):
+        if params and all(isinstance(p, (list, tuple, dict)) for p in params):
+            # executemany：只记批量大小和第一组的形状
+            return {"batch": len(params), "first": params_shape(params[0])}
+        return [_type_name(p) for p in params]
+    return _type_name(params)
+
+
+def _is_select(sql: str) -> bool:
+    head = _RE_COMMENT.sub(" ", sql).lstrip().lower()
+    return head.startswith("select") or head.startswith("with")
+
+
+# ---------- 记录器 ----------
+
+class SlowQueryRecorder:
+    def __init__(self, threshold_ms: float = DEFAULT_THRESHOLD_MS, explain: bool = True,
+                 log_file: str = LOG_FILE) -> None:
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.log_file = log_file
+        self._file_logger = self._make_file_logger(log_file)
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=64)
+        self._explained: Dict[str, float] = {}  # 指纹 -> 上次 EXPLAIN 时间
+        self._thread: Optional[threading.Thread] = None
+        self.recorded = 0
+        self.dropped = 0
+
+    @staticmethod
+    def _make_file_logger(log_file: str) -> logging.Logger:
+        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        file_logger = logging.getLogger(f"slowquery:{log_file}")
+        file_logger.setLevel(logging.INFO)
+        file_logger.propagate = False
+        if not file_logger.handlers:
+            fh = RotatingFileHandler(log_file, maxBytes=MAX_LOG_BYTES, backupCount=BACKUP_COUNT,
+                                     encoding="utf-8")
+            fh.setFormatter(logging.Formatter("%(message)s"))
+            file_logger.addHandler(fh)
+        return file_logger
+
+    def start(self) -> "SlowQueryRecorder":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name="slow-query-log", daemon=True)
+            self._thread.start()
+        METRICS.subscribe(self.on_sample)
+        return self
+
+    def stop(self) -> None:
+        METRICS.unsubscribe(self.on_sample)
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def on_sample(self, sample: Sample) -> None:
+        if not sample.name.startswith("sql.") or sample.ms < self.threshold_ms or not sample.detail:
+            return
+        sql = sample.detail
+        if sql.lstrip().lower().startswith("explain"):
+            return  # 本记录器自己执行的 EXPLAIN
+        record = {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sample.ts)),
+            "source": sample.name,
+            "label": current_label(),
+            "thread": threading.current_thread().name,
+            "ms": round(sample.ms, 2),
+            "rows": sample.rows,
+            "fingerprint": fingerprint(sql),
+            "sql": sql[:MAX_SQL_CHARS],
+            "params": params_shape(sample.params),
+        }
+        job = {"record": record, "sql": sql, "params": sample.params}
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            # 后台来不及处理时不阻塞查询线程：不做 EXPLAIN，直接写入
+            self.dropped += 1
+            self._write(record)
+
+    # ---------- 后台线程 ----------
+
+    def _worker(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            record = job["record"]
+            try:
+                if self.explain and self._should_explain(record["fingerprint"], job["sql"], job["params"]):
+                    record["explain"] = self._run_explain(job["sql"], job["params"])
+            except Exception as e:
+                record["explain_error"] = str(e)
+            self._write(record)
+
+    def _should_explain(self, fp: str, sql: str, params: Any) -> bool:
+        if not _is_select(sql):
+            return False
+        if isinstance(params, (list, tuple)) and params and isinstance(params[0], (list, tuple, dict)):
+            return False  # executemany
+        now = time.time()
+        last = self._explained.get(fp)
+        if last is not None and now - last < EXPLAIN_TTL_SEC:
+            return False
+        self._explained[fp] = now
+        return True
+
+    @staticmethod
+    def _run_explain(sql: str, params: Any) -> Any:
+        from DBCode.DBHelper import DBHelper
+        db = DBHelper()
+        try:
+            cursor = db.conn.cursor()
+            try:
+                if db.dialect == "sqlite":
+                    # SQLite 只有文本形式的查询计划：每步一行
+                    cursor.execute("EXPLAIN QUERY PLAN " + db._sql(sql), params or ())
+                    return [r["detail"] for r in cursor.fetchall()]
+                cursor.execute("EXPLAIN FORMAT=JSON " + sql, params or ())
+                row = cursor.fetchone()
+            finally:
+                cursor.close()
+        finally:
+            db.close()
+        if not row:
+            return None
+        try:
+            return json.loads(row[0])
+        except (TypeError, ValueError):
+            return row[0]
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        try:
+            self._file_logger.info(json.dumps(record, ensure_ascii=False, default=str))
+            self.recorded += 1
+        except Exception as e:
+            logger.warning(f"写入慢查询日志失败: {e}")
+
+
+_RECORDER: Optional[SlowQueryRecorder] = None
+
+
+def install_slow_query_log(threshold_ms: Optional[float] = None,
+                           explain: Optional[bool] = None) -> SlowQueryRecorder:
+    """程序入口调用；参数缺省时取配置 slow_query_ms / slow_query_explain"""
+    global _RECORDER
+    if threshold_ms is None or explain is None:
+        from BusinessCode.ConfigStore import load_config
+        cfg = load_config()
+        if threshold_ms is None:
+            try:
+                threshold_ms = float(cfg.get("slow_query_ms") or DEFAULT_THRESHOLD_MS)
+            except ValueError:
+                threshold_ms = DEFAULT_THRESHOLD_MS
+        if explain is None:
+            explain = (cfg.get("slow_query_explain") or "1").strip() not in ("0", "false", "no", "")
+    if _RECORDER is not None:
+        _RECORDER.threshold_ms = threshold_ms
+        _RECORDER.explain = explain
+        return _RECORDER
+    _RECORDER = SlowQueryRecorder(threshold_ms, explain).start()
+    logger.info(f"慢查询记录已启用：阈值 {threshold_ms:.0f} ms，日志 {LOG_FILE}")
+    return _RECORDER
+
+
+# ---------- 汇总 ----------
+
+def _log_files(log_file: str) -> List[str]:
+    files = [log_file] + [f"{log_file}.{i}" for i in range(1, BACKUP_COUNT + 1)]
+    return [f for f in files if os.path.exists(f)]
+
+
+def summarize(log_file: str = LOG_FILE, top: int = 20) -> List[Dict[str, Any]]:
+    """按指纹归并日志中的记录，按总耗时降序返回前 top 项"""
+    groups: Dict[str, Dict[str, Any]] = {}
+    for path in _log_files(log_file):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                fp = rec.get("fingerprint") or fingerprint(rec.get("sql", ""))
+                g = groups.setdefault(fp, {
+                    "fingerprint": fp, "count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                    "rows_total": 0, "labels": set(), "sources": set(),
+                    "last_seen": "", "worst_sql": "", "plan": None,
+                })
+                ms = float(rec.get("ms") or 0)
+                g["count"] += 1
+                g["total_ms"] += ms
+                g["rows_total"] += int(rec.get("rows") or 0)
+                if rec.get("label"):
+                    g["labels"].add(rec["label"])
+                g["sources"].add(rec.get("source", ""))
+                g["last_seen"] = max(g["last_seen"], rec.get("time", ""))
+                if ms >= g["max_ms"]:
+                    g["max_ms"] = ms
+                    g["worst_sql"] = rec.get("sql", "")
+                if rec.get("explain") is not None:
+                    g["plan"] = rec["explain"]
+    out = sorted(groups.values(), key=lambda g: g["total_ms"], reverse=True)[:top]
+    for g in out:
+        g["avg_ms"] = g["total_ms"] / g["count"] if g["count"] else 0.0
+        g["labels"] = sorted(g["labels"])
+        g["sources"] = sorted(g["sources"])
+    return out
+
+
+def _plan_tables(plan: Any) -> List[str]:
+    """从 EXPLAIN JSON 中提取 表(访问方式, 使用的索引, 估计行数) 概要"""
+    found: List[str] = []
+
+    def walk(node: Any) -> None:
+        if isinstance(node, dict):
+            if "table_name" in node:
+                found.append(f"{node['table_name']}({node.get('access_type', '?')}, "
+                             f"key={node.get('key', '-')}, rows={node.get('rows_examined_per_scan', '?')})")
+            for v in node.values():
+                walk(v)
+        elif isinstance(node, list):
+            for v in node:
+                walk(v)
+
+    walk(plan)
+    return found
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="慢查询日志汇总（按总耗时排序）")
+    parser.add_argument("--log", default=LOG_FILE, help="日志文件（自动包含轮转的 .1 .. .N）")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--plans", action="store_true", help="输出每项最近一次的 EXPLAIN JSON")
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出汇总")
+    args = parser.parse_args()
+
+    rows = summarize(args.log, args.top)
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2, default=str))
+    elif not rows:
+        print(f"没有慢查询记录：{args.log}")
+    else:
+        for i, g in enumerate(rows, start=1):
+            print(f"#{i}  总计 {g['total_ms']:.0f} ms  次数 {g['count']}  平均 {g['avg_ms']:.0f} ms  "
+                  f"最大 {g['max_ms']:.0f} ms  行数 {g['rows_total']}  最近 {g['last_seen']}")
+            if g["labels"]:
+                print(f"    检索: {', '.join(g['labels'])}")
+            print(f"    来源: {', '.join(g['sources'])}")
+            print(f"    指纹: {g['fingerprint'][:300]}")
+            if g["plan"] is not None:
+                print(f"    计划: {'; '.join(_plan_tables(g['plan'])) or '-'}")
+                if args.plans:
+                    print(json.dumps(g["plan"], ensure_ascii=False, indent=2))
+            print()
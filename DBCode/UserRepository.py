@@ -0,0 +1,70 @@
+"""
+用户信息（User_Info）仓储 - 使用 DBHelper
+
+登录、修改密码、用户管理、主窗口等处的用户 SQL 集中在这里；记录为字典（列名 -> 值）。
+语句按 MySQL 写法编写，sqlite 后端由 DBHelper 改写（见 DBCode.Backend）。
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from DBCode.DBHelper import DBHelper
+
+# 用户管理窗口可编辑的列（密码单独修改）
+EDITABLE_COLUMNS = ("TrueName", "Department", "UPosition", "UserName", "URole",
+                    "Telephone", "Address", "UStatus", "URemark")
+
+
+class UserRepository:
+    """用户信息仓储类 - 使用 DBHelper"""
+
+    def __init__(self, db_helper: DBHelper):
+        self.db = db_helper
+
+    def list_all(self) -> List[Dict[str, Any]]:
+        return self.db.fetch_all("SELECT * FROM User_Info")
+
+    def get_by_id(self, uid: int) -> Optional[Dict[str, Any]]:
+        rows = self.db.fetch_all("SELECT * FROM User_Info WHERE UID = %s", (uid,))
+        return rows[0] if rows else None
+
+    def get_by_name(self, username: str) -> Optional[Dict[str, Any]]:
+        rows = self.db.fetch_all("SELECT * FROM User_Info WHERE UserName = %s", (username,))
+        return rows[0] if rows else None
+
+    def name_exists(self, username: str, exclude_uid: Optional[int] = None, lock: bool = False) -> bool:
+        """
+        用户名是否已被使用（exclude_uid 为正在修改的用户）。
+        lock=True 时在事务内锁定匹配行（MySQL 的 FOR UPDATE），检测与随后的插入之间不会被抢先注册。
+        """
+        sql = "SELECT UID FROM User_Info WHERE UserName = %s"
+        params: tuple = (username,)
+        if exclude_uid:
+            sql += " AND UID != %s"
+            params += (exclude_uid,)
+        if lock:
+            sql += " FOR UPDATE"
+        return bool(self.db.fetch_all(sql, params))
+
+    def add(self, values: Dict[str, Any], hashed_password: str) -> int:
+        """新增用户，values 取 EDITABLE_COLUMNS 中的列；返回影响行数"""
+        columns = [c for c in EDITABLE_COLUMNS if c in values] + ["UPassword", "CreatedTime"]
+        params = tuple(values[c] for c in columns[:-2]) + (hashed_password, datetime.now())
+        sql = "INSERT INTO User_Info ({}) VALUES ({})".format(", ".join(columns), ", ".join(["%s"] * len(columns)))
+        return self.db.execute_query(sql, params)
+
+    def update(self, uid: int, values: Dict[str, Any]) -> int:
+        """修改用户信息（不含密码）；返回影响行数"""
+        columns = [c for c in EDITABLE_COLUMNS if c in values]
+        sql = "UPDATE User_Info SET {}, UpdatedTime = %s WHERE UID = %s".format(
+            ", ".join(f"{c} = %s" for c in columns))
+        return self.db.execute_query(sql, tuple(values[c] for c in columns) + (datetime.now(), uid))
+
+    def delete(self, uid: int) -> int:
+        return self.db.execute_query("DELETE FROM User_Info WHERE UID = %s", (uid,))
+
+    def set_password(self, uid: int, hashed_password: str) -> int:
+        return self.db.execute_query("UPDATE User_Info SET UPassword = %s WHERE UID = %s", (hashed_password, uid))
+
+    def set_password_by_name(self, username: str, hashed_password: str) -> int:
+        return self.db.execute_query("UPDATE User_Info SET UPassword = %s WHERE UserName = %s",
+                                     (hashed_password, username))
@@ -5,7 +5,7 @@ from pathlib import Path
 from typing import Final
 
 import bcrypt
-from sqlalchemy import text
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, Text, text
 
 
 def _project_root() -> Path:
@@ -40,24 +40,68 @@ def _create_damage_tables() -> None:
     Base.metadata.create_all(bind=engine, checkfirst=True)
 
 
-def _ensure_user_table() -> None:
+# 没有 ORM 映射的系统表：用 Table 声明，由 SQLAlchemy 按后端生成建表语句
+# （MySQL 为 InnoDB / utf8mb4，SQLite 忽略 mysql_* 选项）
+_SYSTEM_METADATA = MetaData()
+_MYSQL_OPTS: Final[dict] = {"mysql_engine": "InnoDB", "mysql_charset": "utf8mb4"}
+
+Table(
+    "User_Info", _SYSTEM_METADATA,
+    Column("UID", Integer, primary_key=True, autoincrement=True),
+    Column("UserName", String(100), nullable=False),
+    Column("UPassword", String(100), nullable=False),
+    Column("URole", String(30), nullable=False),
+    Column("TrueName", String(100)),
+    Column("Department", String(100)),
+    Column("UPosition", String(100)),
+    Column("Telephone", String(100)),
+    Column("Address", String(200)),
+    Column("UStatus", Integer),
+    Column("URemark", Text),
+    Column("CreatedTime", DateTime),
+    Column("UpdatedTime", DateTime),
+    **_MYSQL_OPTS,
+)
+
+Table(
+    "DataBackup_Records", _SYSTEM_METADATA,
+    Column("BackupID", Integer, primary_key=True, autoincrement=True, comment="备份记录ID"),
+    Column("BackupType", Integer, comment="备份类型"),
+    Column("BackupCycle", String(60), comment="备份周期"),
+    Column("CycleDetail", String(60), comment="周期详情"),
+    Column("BackupPath", String(60), comment="备份文件存储路径"),
+    Column("BackupFile", String(60), comment="备份文件名"),
+    Column("VersionNo", String(60), comment="备份版本编号"),
+    Column("BackupStatus", String(60), comment="备份状态"),
+    Column("BackupTime", DateTime, comment="备份执行时间"),
+    Column("Operator", String(60), comment="操作人"),
+    Column("Remark", Text, comment="备注信息"),
+    **_MYSQL_OPTS,
+)
+
+Table(
+    "DataRestore_Records", _SYSTEM_METADATA,
+    Column("RestoreID", Integer, primary_key=True, autoincrement=True, comment="恢复记录ID"),
+    Column("BackupID", Integer, comment="备份记录ID"),
+    Column("RestorePath", String(60), comment="恢复文件存储路径"),
+    Column("RestoreFile", String(60), comment="恢复文件名"),
+    Column("VersionNo", String(60), comment="恢复版本编号"),
+    Column("RestoreStatus", Integer, comment="恢复状态"),
+    Column("RestoreTime", DateTime, comment="恢复执行时间"),
+    Column("Operator", String(60), comment="操作人"),
+    Column("Remark", Text, comment="备注信息"),
+    **_MYSQL_OPTS,
+)
+
+
+def _create_system_tables() -> None:
     from am_models.db import engine
 
-    ddl: Final[str] = """
-    CREATE TABLE IF NOT EXISTS User_Info (
-        UID INT PRIMARY KEY AUTO_INCREMENT,
-        UserName VARCHAR(100) NOT NULL,
-        UPassword VARCHAR(100) NOT NULL,
-        URole VARCHAR(30) NOT NULL,
-        TrueName VARCHAR(100),
-        Department VARCHAR(100),
-        UPosition VARCHAR(100),
-        Telephone VARCHAR(100),
-        Address VARCHAR(200),
-        UStatus INT,
-        URemark TEXT
-    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
-    """
+    _SYSTEM_METADATA.create_all(bind=engine, checkfirst=True)
+
+
+def _ensure_user_table() -> None:
+    from am_models.db import engine
 
     default_user_sql: Final[str] = """
     INSERT INTO User_Info (
@@ -84,7 +128,6 @@ def _ensure_user_table() -> None:
     }
 
     with engine.begin() as connection:
-        connection.exec_driver_sql(ddl)
         existing = connection.execute(
             text("SELECT UID FROM User_Info WHERE UserName = :username"),
             {"username": default_user_params["username"]},
@@ -97,6 +140,7 @@ def initialize_database() -> None:
     _prepare_sys_path()
     _create_ammunition_tables()
     _create_target_tables()
+    _create_system_tables()
     _ensure_user_table()
     _create_damage_tables()
 
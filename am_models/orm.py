@@ -27,7 +27,7 @@ class AmmunitionORM(Base):
     )  # 官方名称
 
     am_image_blob: Mapped[bytes | None] = deferred(
-        mapped_column("AMImage", MEDIUMBLOB, nullable=True)
+        mapped_column("AMImage", LargeBinary().with_variant(MEDIUMBLOB(), "mysql"), nullable=True)
     )
 
     chinese_name: Mapped[str] = mapped_column(
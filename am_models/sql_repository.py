@@ -1,16 +1,28 @@
 from __future__ import annotations
 
 import logging
-from typing import List, Optional, Callable, Dict, Sequence, Any
+from typing import List, Optional, Callable, Dict, Sequence, Any, Tuple
 from datetime import datetime
 
 from loguru import logger
-from sqlalchemy import select, desc, asc
+from sqlalchemy import select, desc, asc, insert, update, tuple_, inspect
 from sqlalchemy.orm import Session
 
+from DBCode.EntityCache import ENTITY_CACHE
+from DBCode.LookupCache import LOOKUPS
+from DBCode.SelectorIndex import SELECTOR_INDEX
+from DBCode.RowMapper import entity_columns, mapper_for, record_query
+
 from .entities import Ammunition
 from .orm import AmmunitionORM
 
+# 实体字段与 ORM 属性不同名的部分（其余字段同名）
+ENTITY_TO_ORM = {
+    "explosion_equivalent_TNT_T": "explosion_equivalent_tnt_t",
+    "created_at": "created_time",
+    "updated_at": "updated_time",
+}
+
 
 class SQLRepository:
     """Ammunition 的 MySQL 仓储：支持 list_all / get / add / update / delete。"""
@@ -21,17 +33,38 @@ class SQLRepository:
     # ---------- Query ----------
 
     def list_all(self) -> List[Ammunition]:
-        rows = self.session.scalars(select(AmmunitionORM)).all()
-        ents = [self.to_entity(r) for r in rows]
+        # 直接查询实体需要的列（含图片），一次取回并映射，避免逐行加载延迟的图片列
+        rows = self.session.execute(select(*self.entity_columns(include_blob=True))).all()
+        to_entity = self.row_mapper(include_blob=True)
+        ents = [to_entity(r) for r in rows]
         for e in ents:
             self.add_update_method(e)
         return ents
 
+    def list_records(self, field_names: Optional[Sequence[str]] = None) -> List[Any]:
+        """
+        只读列表：返回 namedtuple 记录（字段名同实体，默认不含图片），不绑定 update()。
+        用于表格 / 检索结果展示；需要编辑时再用 get(am_id) 取完整实体。
+        """
+        cols, record_cls = record_query(AmmunitionORM, Ammunition, field_names,
+                                        rename=ENTITY_TO_ORM, exclude=("am_image_blob",))
+        make = record_cls._make
+        return [make(r) for r in self.session.execute(select(*cols))]
+
     def get(self, item_id: int) -> Optional[Ammunition]:
-        row = self.session.get(AmmunitionORM, item_id)
-        if not row:
+        # 先只查更新时间，未变化时从实体缓存返回，不再读取整行（含图片）
+        version = self.session.execute(
+            select(AmmunitionORM.updated_time).where(AmmunitionORM.am_id == item_id)
+        ).first()
+        if version is None:
             return None
-        ent = self.to_entity(row)
+        ent = ENTITY_CACHE.get(Ammunition, item_id, version[0])
+        if ent is None:
+            row = self.session.get(AmmunitionORM, item_id)
+            if not row:
+                return None
+            ent = self.to_entity(row)
+            ENTITY_CACHE.put(Ammunition, item_id, row.updated_time, ent)
         self.add_update_method(ent)
         return ent
 
@@ -118,6 +151,9 @@ class SQLRepository:
         self.session.flush()  # 获取自增主键
         # 回写主键
         item.am_id = row.am_id
+        ENTITY_CACHE.invalidate(Ammunition, item.am_id)
+        LOOKUPS.notify(AmmunitionORM.__tablename__, item)
+        SELECTOR_INDEX.touch(AmmunitionORM.__tablename__, item.am_id)
 
         # 绑定原地更新方法
         self.add_update_method(item)
@@ -162,6 +198,9 @@ class SQLRepository:
         # 回写所有字段
         self._assign_row_from_entity(row, e, for_create=False)
         self.session.flush()
+        ENTITY_CACHE.invalidate(Ammunition, e.am_id)
+        LOOKUPS.notify(AmmunitionORM.__tablename__, e)
+        SELECTOR_INDEX.touch(AmmunitionORM.__tablename__, e.am_id)
         return e
 
     def delete(self, item_id: int) -> bool:
@@ -169,114 +208,100 @@ class SQLRepository:
         if not row:
             return False
         self.session.delete(row)
+        ENTITY_CACHE.invalidate(Ammunition, item_id)
+        SELECTOR_INDEX.touch(AmmunitionORM.__tablename__, item_id)
         return True
 
+    def upsert_many(self, items: Sequence[Ammunition], batch_size: int = 1000) -> Tuple[int, int]:
+        """
+        批量导入：按 (弹药型号, 官方名称) 判断记录是否已存在，存在则更新，否则新增。
+        - 每批先一次查询已有主键，再分别用 insert / update 的 executemany 写入
+        - 同一批次内重复的键以最后一条为准
+        - 实体未带图片时不覆盖库中已有图片
+        返回 (新增数, 更新数)；提交由调用方负责。
+        """
+        unique: Dict[Tuple[Any, Any], Ammunition] = {}
+        for e in items:
+            unique[(e.model_name, e.am_name)] = e
+        ents = list(unique.values())
+
+        inserted = updated = 0
+        now = datetime.utcnow()
+        for start in range(0, len(ents), batch_size):
+            batch = ents[start:start + batch_size]
+            keys = [(e.model_name, e.am_name) for e in batch]
+            existing = {
+                (m, n): am_id
+                for am_id, m, n in self.session.execute(
+                    select(AmmunitionORM.am_id, AmmunitionORM.model_name, AmmunitionORM.am_name)
+                    .where(tuple_(AmmunitionORM.model_name, AmmunitionORM.am_name).in_(keys))
+                ).all()
+            }
+
+            new_rows: List[Dict[str, Any]] = []
+            upd_rows: List[Dict[str, Any]] = []
+            for e, key in zip(batch, keys):
+                values = self._values_from_entity(e)
+                am_id = existing.get(key)
+                if am_id is None:
+                    values["created_time"] = e.created_at or now
+                    values["updated_time"] = now
+                    new_rows.append(values)
+                else:
+                    if values.get("am_image_blob") is None:
+                        values.pop("am_image_blob", None)
+                    values["am_id"] = am_id
+                    values["updated_time"] = now
+                    upd_rows.append(values)
+
+            if new_rows:
+                self.session.execute(insert(AmmunitionORM), new_rows)
+            if upd_rows:
+                self.session.execute(update(AmmunitionORM), upd_rows)
+            inserted += len(new_rows)
+            updated += len(upd_rows)
+            ENTITY_CACHE.invalidate_many(Ammunition, (v["am_id"] for v in upd_rows))
+        LOOKUPS.notify_many(AmmunitionORM.__tablename__, ents)
+        # 新增记录的主键未知，整表重新载入
+        SELECTOR_INDEX.touch(AmmunitionORM.__tablename__)
+        return inserted, updated
+
     # ---------- Helpers ----------
 
     @staticmethod
     def to_entity(r: AmmunitionORM, include_blob: bool = True) -> Ammunition:
-        """ORM -> 实体（字段全集映射）"""
+        """ORM 对象或 Core 结果行 -> 实体（字段全集映射）"""
         if r is None:
             return None  # type: ignore[return-value]
+        return SQLRepository.row_mapper(include_blob)(r)
+
+    @staticmethod
+    def row_mapper(include_blob: bool = True) -> Callable[[Any], Ammunition]:
+        """生成并缓存的映射函数；include_blob=False 时不读取图片列"""
+        return mapper_for(
+            AmmunitionORM, Ammunition,
+            rename=ENTITY_TO_ORM,
+            exclude=() if include_blob else ("am_image_blob",),
+        )
 
-        return Ammunition(
-            # 主键
-            am_id=r.am_id,
-
-            # 必填
-            am_name=r.am_name,
-            am_image_blob=(r.am_image_blob if include_blob else None),
-            am_type=r.am_type,
-            model_name=r.model_name,
-            weight_kg=r.weight_kg,
-            launch_mass_kg=r.launch_mass_kg,
-            warhead_type=r.warhead_type,
-            warhead_name=r.warhead_name,
-
-            # 可选
-            country=r.country,
-            used_by=r.used_by,
-            chinese_name=r.chinese_name,
-            short_name=r.short_name,
-            submodel_name=r.submodel_name,
-            manufacturer=r.manufacturer,
-            attended_time=r.attended_time,
-
-            length_m=r.length_m,
-            diameter_m=r.diameter_m,
-            texture=r.texture,
-            wingspan_close_mm=r.wingspan_close_mm,
-            wingspan_open_mm=r.wingspan_open_mm,
-            structure=r.structure,
-
-            max_speed_ma=r.max_speed_ma,
-            radar_cross_section=r.radar_cross_section,
-            power_plant=r.power_plant,
-
-            destroying_elements=r.destroying_elements,
-            fuze=r.fuze,
-            explosion_equivalent_TNT_T=r.explosion_equivalent_tnt_t,
-            precision_m=r.precision_m,
-            destroying_mechanism=r.destroying_mechanism,
-
-            target=r.target,
-            carrier=r.carrier,
-            guidance_mode=r.guidance_mode,
-            explosive_payload_kg=r.explosive_payload_kg,
-            penetrating_power=r.penetrating_power,
-            drop_height_range_m=r.drop_height_range_m,
-            drop_speed_kmh=r.drop_speed_kmh,
-            drop_mode=r.drop_mode,
-            coverage_area=r.coverage_area,
-            range_km=r.range_km,
-
-            is_explosive_bomb=r.is_explosive_bomb,
-            exb_component=r.exb_component,
-            exb_explosion=r.exb_explosion,
-            exb_weight=r.exb_weight,
-            exb_more_parameters=r.exb_more_parameters,
-
-            is_energy_bomb=r.is_energy_bomb,
-            eb_density=r.eb_density,
-            eb_velocity=r.eb_velocity,
-            eb_pressure=r.eb_pressure,
-            eb_cover_material=r.eb_cover_material,
-            eb_cone_angle=r.eb_cone_angle,
-            eb_more_parameters=r.eb_more_parameters,
-
-            is_fragment_bomb=r.is_fragment_bomb,
-            fb_bomb_explosion=r.fb_bomb_explosion,
-            fb_fragment_shape=r.fb_fragment_shape,
-            fb_surface_area=r.fb_surface_area,
-            fb_fragment_weight=r.fb_fragment_weight,
-            fb_diameter=r.fb_diameter,
-            fb_length=r.fb_length,
-            fb_shell_weight=r.fb_shell_weight,
-            fb_more_parameters=r.fb_more_parameters,
-
-            is_armor_bomb=r.is_armor_bomb,
-            ab_bullet_weight=r.ab_bullet_weight,
-            ab_diameter=r.ab_diameter,
-            ab_head_length=r.ab_head_length,
-            ab_more_parameters=r.ab_more_parameters,
-
-            is_cluster_bomb=r.is_cluster_bomb,
-            cbm_bullet_weight=r.cbm_bullet_weight,
-            cbm_bullet_section=r.cbm_bullet_section,
-            cbm_projectile=r.cbm_projectile,
-            cbs_bullet_count=r.cbs_bullet_count,
-            cbs_bullet_model=r.cbs_bullet_model,
-            cbs_bullet_weight=r.cbs_bullet_weight,
-            cb_diameter=r.cb_diameter,
-            cbs_bullet_length=r.cbs_bullet_length,
-            cb_more_parameters=r.cb_more_parameters,
-
-            am_status=r.am_status,
-
-            created_at=r.created_time,
-            updated_at=r.updated_time,
+    @staticmethod
+    def entity_columns(include_blob: bool = False) -> List[Any]:
+        """与 row_mapper 对应的列，select(*cols) 的结果行可直接映射为实体"""
+        return entity_columns(
+            AmmunitionORM, Ammunition,
+            rename=ENTITY_TO_ORM,
+            exclude=() if include_blob else ("am_image_blob",),
         )
 
+    @classmethod
+    def _values_from_entity(cls, e: Ammunition) -> Dict[str, Any]:
+        """实体 -> {ORM 属性名: 值}，用于批量 insert/update（不含主键与审计字段）"""
+        row = AmmunitionORM()
+        cls._assign_row_from_entity(row, e, for_create=True)
+        skip = ("am_id", "created_time", "updated_time")
+        return {attr.key: getattr(row, attr.key)
+                for attr in inspect(AmmunitionORM).column_attrs if attr.key not in skip}
+
     @staticmethod
     def _assign_row_from_entity(row: AmmunitionORM, e: Ammunition, *, for_create: bool) -> None:
         """
@@ -376,10 +401,11 @@ class SQLRepository:
 
         row.am_status = 1
 
-        # 审计字段：创建时尽量保留实体默认；更新时不改 created_at，仅改 updated_at
+        # 审计字段：创建时尽量保留实体默认；更新时不改 created_time，仅改 updated_time
+        # （实体缓存以 updated_time 判断记录是否变化，见 DBCode.EntityCache）
         if for_create:
-            row.created_at = e.created_at
-            row.updated_at = e.updated_at
+            row.created_time = e.created_at
+            row.updated_time = e.updated_at
         else:
-            # created_at 不动
-            row.updated_at = e.updated_at or datetime.utcnow()
+            # created_time 不动
+            row.updated_time = e.updated_at or datetime.utcnow()
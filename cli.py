@@ -0,0 +1,290 @@
+"""
+命令行批处理入口（不启动界面，不导入 PyQt6），用于服务器上的定时任务：
+
+    python cli.py export ammunition runway --format xlsx --out exports
+    python cli.py export all --format csv --jobs 4
+    python cli.py reports --all --format pdf --out reports --jobs 4
+    python cli.py reports --ids 3 5 8 --format word
+    python cli.py index ammunition runway shelter ucc --jobs 2
+    python cli.py backup [--path ./manual_backups] [--operator cli]
+    python cli.py restore ./manual_backups/manual_xxx.hsbk --yes
+
+调用的是界面使用的同一套服务（AmmunitionService、TargetService、DamageService、AssessmentService、
+BackupService 与 TableExport）。
+多项导出、批量报告与多个索引的构建分到 --jobs 个子进程并行（各进程各自连接数据库）；
+子进程只向 stderr 输出 WARNING 以上日志，完整日志由主进程写入 logs/app.log。
+全部成功时退出码为 0，任一项失败为 1。
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+project_root = Path(__file__).resolve().parent
+
+# 可导出的数据：名称 -> 显示名
+ENTITIES: Dict[str, str] = {
+    "ammunition": "弹药",
+    "runway": "机场跑道",
+    "shelter": "单机掩蔽库",
+    "ucc": "地下指挥所",
+    "scene": "毁伤场景",
+    "parameter": "毁伤参数",
+    "result": "毁伤评估结果",
+    "report": "毁伤评估报告",
+}
+
+# 可重建的语义索引（索引路径与各检索窗口一致，见 AmmunitionService / TargetService）
+INDEXES = ("ammunition", "runway", "shelter", "ucc")
+
+
+# ---------- 子进程 ----------
+
+def _init_worker(workdir: str) -> None:
+    """子进程初始化：与主进程相同的工作目录与导入路径；日志只留 stderr 的警告"""
+    os.chdir(workdir)
+    if workdir not in sys.path:
+        sys.path.insert(0, workdir)
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING", enqueue=False)
+
+
+def _run_jobs(fn: Callable, args_list: Sequence[tuple], jobs: int) -> List:
+    """jobs <= 1 或只有一项时在本进程顺序执行；否则分到进程池，结果按提交顺序返回"""
+    if jobs <= 1 or len(args_list) <= 1:
+        return [fn(*args) for args in args_list]
+    workers = min(jobs, len(args_list))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(os.getcwd(),)) as pool:
+        futures = [pool.submit(fn, *args) for args in args_list]
+        return [f.result() for f in futures]
+
+
+# ---------- 数据导出 ----------
+
+def _load_items(entity: str) -> list:
+    if entity == "ammunition":
+        from BusinessCode.AmmunitionService import list_ammunition
+        return list_ammunition()
+    if entity in ("runway", "shelter", "ucc"):
+        from BusinessCode.TargetService import list_targets
+        return list_targets(entity)
+    if entity in ("scene", "parameter"):
+        from BusinessCode.DamageService import list_parameters, list_scenes
+        return list_scenes() if entity == "scene" else list_parameters()
+    from BusinessCode.AssessmentService import list_reports, list_results
+    return list_results() if entity == "result" else list_reports()
+
+
+def _table_spec(entity: str):
+    from BusinessCode.TableExport import TABLE_SPECS, spec_for_entity
+
+    if entity in TABLE_SPECS:
+        return TABLE_SPECS[entity]
+    from damage_models import AssessmentReport, AssessmentResult, DamageParameter, DamageScene
+
+    cls = {"scene": DamageScene, "parameter": DamageParameter,
+           "result": AssessmentResult, "report": AssessmentReport}[entity]
+    return spec_for_entity(entity, cls, title=f"{ENTITIES[entity]}导出")
+
+
+def export_entity(entity: str, fmt: str, out_dir: str, stamp: str) -> Tuple[str, bool, str, int]:
+    """导出一类记录，返回 (实体, 成功, 文件路径或错误信息, 记录数)"""
+    from BusinessCode.TableExport import normalize_format, write_table
+    from DBCode.Metrics import METRICS
+
+    fmt = normalize_format(fmt)
+    try:
+        with METRICS.timer(f"export.{entity}.{fmt}") as t:
+            items = _load_items(entity)
+            spec = _table_spec(entity)
+            filename = os.path.join(out_dir, f"{spec.file_prefix}_{stamp}.{fmt}")
+            t.rows = write_table(spec, items, filename, fmt)
+        return entity, True, filename, t.rows
+    except Exception as e:
+        logger.exception(f"导出 {entity} 失败: {e}")
+        return entity, False, str(e), 0
+
+
+def cmd_export(args) -> int:
+    entities = list(ENTITIES) if "all" in args.entities else list(dict.fromkeys(args.entities))
+    os.makedirs(args.out, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    results = _run_jobs(export_entity, [(e, args.format, args.out, stamp) for e in entities], args.jobs)
+    failed = 0
+    for entity, ok, detail, rows in results:
+        if ok:
+            print(f"[完成] {ENTITIES[entity]}：{rows} 条 -> {detail}")
+        else:
+            failed += 1
+            print(f"[失败] {ENTITIES[entity]}：{detail}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+# ---------- 批量报告 ----------
+
+def _all_report_ids() -> List[int]:
+    return [r.ReportID for r in _load_items("report") if r.ReportID is not None]
+
+
+def _chunks(items: Sequence[int], n: int) -> List[List[int]]:
+    """均分为 n 组（交错分配，各组负载相近）"""
+    n = max(1, min(n, len(items)))
+    return [list(items[i::n]) for i in range(n)]
+
+
+def cmd_reports(args) -> int:
+    ids = _all_report_ids() if args.all else list(dict.fromkeys(args.ids or []))
+    if not ids:
+        print("没有需要导出的报告", file=sys.stderr)
+        return 1
+    os.makedirs(args.out, exist_ok=True)
+    t0 = time.perf_counter()
+    from BusinessCode.AssessmentService import export_reports
+
+    groups = _chunks(ids, args.jobs)
+    results = [r for group in _run_jobs(export_reports, [(g, args.format, args.out) for g in groups], args.jobs)
+               for r in group]
+    failed = [(rid, detail) for rid, ok, detail in results if not ok]
+    for rid, detail in failed:
+        print(f"[失败] 报告 {rid}：{detail}", file=sys.stderr)
+    print(f"已导出 {len(results) - len(failed)}/{len(results)} 份报告到 {args.out}，"
+          f"耗时 {time.perf_counter() - t0:.1f} s")
+    return 1 if failed else 0
+
+
+# ---------- 语义索引 ----------
+
+def build_index(name: str) -> Tuple[str, bool, str]:
+    """重建一个语义索引并保存（覆盖已有索引文件），返回 (名称, 成功, 说明)"""
+    try:
+        if name == "ammunition":
+            from BusinessCode.AmmunitionService import rebuild_semantic_index
+            idx = rebuild_semantic_index()
+        else:
+            from BusinessCode.TargetService import rebuild_semantic_index
+            idx = rebuild_semantic_index(name)
+        return name, True, "已保存" if idx is not None else "无数据，未构建索引"
+    except Exception as e:
+        logger.exception(f"构建语义索引 {name} 失败: {e}")
+        return name, False, str(e)
+
+
+def cmd_index(args) -> int:
+    names = list(dict.fromkeys(args.names or INDEXES))
+    unknown = [n for n in names if n not in INDEXES]
+    if unknown:
+        print(f"未知的索引：{', '.join(unknown)}（可选 {' / '.join(INDEXES)}）", file=sys.stderr)
+        return 2
+    failed = 0
+    for name, ok, detail in _run_jobs(build_index, [(n,) for n in names], args.jobs):
+        if ok:
+            print(f"[完成] {ENTITIES[name]}索引：{detail}")
+        else:
+            failed += 1
+            print(f"[失败] {ENTITIES[name]}索引：{detail}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+# ---------- 备份 / 恢复 ----------
+
+def cmd_backup(args) -> int:
+    from BusinessCode.BackupService import BACKUP_TYPE_MANUAL, backup_now
+    from BusinessCode.ConfigStore import load_config
+
+    path = args.path or load_config().get("manual_backup_path") or "./manual_backups"
+    os.makedirs(path, exist_ok=True)
+    try:
+        full_path = backup_now(BACKUP_TYPE_MANUAL, path, args.operator, progress=print)
+    except Exception as e:
+        logger.exception(f"备份失败: {e}")
+        print(f"[失败] 备份：{e}", file=sys.stderr)
+        return 1
+    print(f"[完成] 备份文件：{full_path}")
+    return 0
+
+
+def cmd_restore(args) -> int:
+    from BusinessCode.BackupService import restore_now
+
+    if not args.yes:
+        answer = input(f"恢复将覆盖当前业务表数据，确认从 {args.file} 恢复？[y/N] ")
+        if answer.strip().lower() not in ("y", "yes"):
+            print("已取消")
+            return 1
+    try:
+        restore_now(args.file, progress=print)
+    except Exception as e:
+        logger.exception(f"恢复失败: {e}")
+        print(f"[失败] 恢复：{e}", file=sys.stderr)
+        return 1
+    print(f"[完成] 已从 {args.file} 恢复")
+    return 0
+
+
+# ---------- 入口 ----------
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="数据导出、报告批量导出、语义索引构建与备份恢复（无界面）")
+    parser.add_argument("--workdir", default=str(project_root),
+                        help="工作目录（config.ini、models、logs 的相对路径基准，默认程序目录）")
+    sub = parser.add_subparsers(dest="command", required=True)
+    jobs_default = max(1, min(4, os.cpu_count() or 1))
+
+    p = sub.add_parser("export", help="导出数据表")
+    p.add_argument("entities", nargs="+", choices=list(ENTITIES) + ["all"])
+    p.add_argument("--format", default="xlsx", choices=["xlsx", "docx", "csv", "json"])
+    p.add_argument("--out", default="exports")
+    p.add_argument("--jobs", type=int, default=jobs_default, help="并行进程数")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("reports", help="批量导出评估报告")
+    group = p.add_mutually_exclusive_group(required=True)
+    group.add_argument("--ids", type=int, nargs="+", help="报告ID")
+    group.add_argument("--all", action="store_true", help="全部报告")
+    p.add_argument("--format", default="pdf", choices=["pdf", "word"])
+    p.add_argument("--out", default="reports")
+    p.add_argument("--jobs", type=int, default=jobs_default, help="并行进程数")
+    p.set_defaults(func=cmd_reports)
+
+    p = sub.add_parser("index", help="重建语义索引")
+    p.add_argument("names", nargs="*", metavar="NAME", help=f"{' / '.join(INDEXES)}，默认全部")
+    p.add_argument("--jobs", type=int, default=1, help="并行进程数（每个进程各自载入语义模型，注意内存）")
+    p.set_defaults(func=cmd_index)
+
+    p = sub.add_parser("backup", help="手动备份")
+    p.add_argument("--path", default=None, help="备份目录（默认配置 manual_backup_path）")
+    p.add_argument("--operator", default="cli", help="写入备份记录的操作人")
+    p.set_defaults(func=cmd_backup)
+
+    p = sub.add_parser("restore", help="从备份文件恢复")
+    p.add_argument("file")
+    p.add_argument("--yes", action="store_true", help="不询问确认")
+    p.set_defaults(func=cmd_restore)
+    return parser
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    os.chdir(args.workdir)
+    if args.workdir not in sys.path:
+        sys.path.insert(0, args.workdir)
+
+    from BusinessCode.LogSetup import configure_logging
+    configure_logging()
+    try:
+        return args.func(args)
+    finally:
+        logger.complete()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Iterable, Protocol, Any, List, Dict
+from typing import Iterable, Protocol, Any, List, Dict, BinaryIO
 import csv, json, dataclasses, io
 
 
@@ -7,20 +7,20 @@ class Exporter(Protocol):
     def export(self, items: Iterable[Any]) -> bytes: ...
 
 
+def _to_dict(obj: Any) -> Dict[str, Any]:
+    if dataclasses.is_dataclass(obj):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, "__dict__"):
+        return dict(obj.__dict__)
+    raise TypeError("Unsupported item type for CSV export")
+
+
 class CSVExporter:
     def __init__(self, field_order: List[str] | None = None) -> None:
         self.field_order = field_order
 
     def export(self, items: Iterable[Any]) -> bytes:
-        rows: List[Dict[str, Any]] = []
-        for obj in items:
-            if dataclasses.is_dataclass(obj):
-                row = dataclasses.asdict(obj)
-            elif hasattr(obj, "__dict__"):
-                row = dict(obj.__dict__)
-            else:
-                raise TypeError("Unsupported item type for CSV export")
-            rows.append(row)
+        rows: List[Dict[str, Any]] = [_to_dict(obj) for obj in items]
         if not rows:
             return b""
         fieldnames = self.field_order or list(rows[0].keys())
@@ -31,6 +31,33 @@ class CSVExporter:
             writer.writerow({k: r.get(k) for k in fieldnames})
         return buf.getvalue().encode("utf-8-sig")  # 使用 BOM 以便 Excel 正确识别
 
+    def export_stream(self, chunks: Iterable[Iterable[Any]], fp: BinaryIO) -> Iterable[int]:
+        """
+        按块写入 fp（二进制文件），每写完一块 yield 累计行数；内容与 export() 一致。
+        调用方停止迭代即停止写入。
+        """
+        fieldnames = self.field_order
+        buf = io.StringIO()
+        writer = None
+        total = 0
+        for chunk in chunks:
+            for obj in chunk:
+                row = _to_dict(obj)
+                if writer is None:
+                    fieldnames = fieldnames or list(row.keys())
+                    writer = csv.DictWriter(buf, fieldnames=fieldnames)
+                    writer.writeheader()
+                writer.writerow({k: row.get(k) for k in fieldnames})
+                total += 1
+            if writer is not None:
+                data = buf.getvalue().encode("utf-8")
+                if fp.tell() == 0:
+                    data = b"\xef\xbb\xbf" + data  # BOM
+                fp.write(data)
+                buf.seek(0)
+                buf.truncate()
+            yield total
+
 
 class JSONExporter:
     def export(self, items: Iterable[Any]) -> bytes:
@@ -43,3 +70,24 @@ class JSONExporter:
 
         payload = [to_obj(x) for x in items]
         return json.dumps(payload, ensure_ascii=False, indent=2, default=str).encode("utf-8")
+
+    def export_stream(self, chunks: Iterable[Iterable[Any]], fp: BinaryIO) -> Iterable[int]:
+        """按块写入 fp，每写完一块 yield 累计行数；输出与 export() 相同（缩进 2 的数组）"""
+        def to_obj(o: Any):
+            if dataclasses.is_dataclass(o):
+                return dataclasses.asdict(o)
+            if hasattr(o, "__dict__"):
+                return dict(o.__dict__)
+            return o
+
+        total = 0
+        for chunk in chunks:
+            parts = []
+            for obj in chunk:
+                text = json.dumps(to_obj(obj), ensure_ascii=False, indent=2, default=str)
+                parts.append(("[\n" if total == 0 else ",\n") + "  " + text.replace("\n", "\n  "))
+                total += 1
+            if parts:
+                fp.write("".join(parts).encode("utf-8"))
+            yield total
+        fp.write(b"\n]" if total else b"[]")
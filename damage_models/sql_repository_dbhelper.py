@@ -1,8 +1,12 @@
 """
 毁伤数据SQL仓储类
 使用 DBHelper 进行数据库操作（模仿 am_models 的方式）
+
+批量接口 add_many / update_many / delete_many 配合 DBHelper.transaction() 使用，
+多条记录在同一事务内以 executemany 批量写入。
+get_by_id 经实体缓存读取（DBCode.EntityCache），写操作使对应记录失效。
 """
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Sequence
 from datetime import datetime
 import sys
 import os
@@ -12,6 +16,22 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from .entities import DamageScene, DamageParameter, AssessmentResult, AssessmentReport
 from DBCode.DBHelper import DBHelper
+from DBCode.EntityCache import ENTITY_CACHE, cached_get
+from DBCode.LookupCache import LOOKUPS
+from DBCode.RowMapper import mapper_for
+
+
+def _placeholders(values: Sequence) -> str:
+    return ", ".join(["%s"] * len(values))
+
+
+def _float_or_none(value):
+    # DECIMAL 列转 float；与原逐行转换一致，0 / 空值都视为未填
+    return float(value) if value else None
+
+
+def _float_fields(*names: str) -> dict:
+    return {name: _float_or_none for name in names}
 
 
 class DamageSceneRepository:
@@ -20,24 +40,42 @@ class DamageSceneRepository:
     def __init__(self, db_helper: DBHelper):
         self.db = db_helper
 
-    def add(self, scene: DamageScene) -> int:
-        """添加毁伤场景"""
-        now = datetime.now()
-
-        sql = """
+    _INSERT_SQL = """
         INSERT INTO DamageScene_Info 
         (DSCode, DSName, DSOffensive, DSDefensive, DSBattle, AMID, AMCode, 
          TargetType, TargetID, TargetCode, DSStatus, CreatedTime, UpdatedTime)
         VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
 
-        params = (
+    _UPDATE_SQL = """
+        UPDATE DamageScene_Info 
+        SET DSCode=%s, DSName=%s, DSOffensive=%s, DSDefensive=%s, DSBattle=%s,
+            AMID=%s, AMCode=%s, TargetType=%s, TargetID=%s, TargetCode=%s,
+            DSStatus=%s, UpdatedTime=%s
+        WHERE DSID=%s
+        """
+
+    @staticmethod
+    def _insert_params(scene: DamageScene, now: datetime) -> tuple:
+        return (
             scene.DSCode, scene.DSName, scene.DSOffensive, scene.DSDefensive,
             scene.DSBattle, scene.AMID, scene.AMCode, scene.TargetType,
             scene.TargetID, scene.TargetCode, scene.DSStatus, now, now
         )
 
-        sql_res = self.db.execute_query(sql, params)
+    @staticmethod
+    def _update_params(scene: DamageScene, now: datetime) -> tuple:
+        return (
+            scene.DSCode, scene.DSName, scene.DSOffensive, scene.DSDefensive,
+            scene.DSBattle, scene.AMID, scene.AMCode, scene.TargetType,
+            scene.TargetID, scene.TargetCode, scene.DSStatus, now, scene.DSID
+        )
+
+    def add(self, scene: DamageScene) -> int:
+        """添加毁伤场景"""
+        now = datetime.now()
+
+        sql_res = self.db.execute_query(self._INSERT_SQL, self._insert_params(scene, now))
         if not sql_res:
             return 0
 
@@ -45,42 +83,54 @@ class DamageSceneRepository:
         result = self.db.execute_query("SELECT DSID FROM DamageScene_Info WHERE DSCODE=%s", (scene.DSCode,))
         return result[0] if result else 0
 
+    def is_duplicate(self, scene: DamageScene) -> bool:
+        """编号或名称是否已被其它场景使用（含软删除的，唯一索引同样覆盖它们）"""
+        sql = "SELECT DSID FROM DamageScene_Info WHERE (DSCode=%s OR DSName=%s)"
+        params: tuple = (scene.DSCode, scene.DSName)
+        if scene.DSID is not None:
+            sql += " AND DSID<>%s"
+            params += (scene.DSID,)
+        return bool(self.db.fetch_all(sql + " LIMIT 1", params))
+
+    def add_many(self, scenes: Iterable[DamageScene]) -> int:
+        """批量添加毁伤场景，返回插入行数"""
+        now = datetime.now()
+        return self.db.execute_many(self._INSERT_SQL, [self._insert_params(s, now) for s in scenes]) or 0
+
     def update(self, scene: DamageScene) -> bool:
         """更新毁伤场景"""
         now = datetime.now()
-
-        sql = """
-        UPDATE DamageScene_Info 
-        SET DSCode=%s, DSName=%s, DSOffensive=%s, DSDefensive=%s, DSBattle=%s,
-            AMID=%s, AMCode=%s, TargetType=%s, TargetID=%s, TargetCode=%s,
-            DSStatus=%s, UpdatedTime=%s
-        WHERE DSID=%s
-        """
-
-        params = (
-            scene.DSCode, scene.DSName, scene.DSOffensive, scene.DSDefensive,
-            scene.DSBattle, scene.AMID, scene.AMCode, scene.TargetType,
-            scene.TargetID, scene.TargetCode, scene.DSStatus, now, scene.DSID
-        )
-
-        affected = self.db.execute_query(sql, params)
+        affected = self.db.execute_query(self._UPDATE_SQL, self._update_params(scene, now))
+        ENTITY_CACHE.invalidate(DamageScene, scene.DSID)
         return affected > 0 if affected else False
 
+    def update_many(self, scenes: Iterable[DamageScene]) -> int:
+        """批量更新毁伤场景，返回影响行数"""
+        scenes = list(scenes)
+        ENTITY_CACHE.invalidate_many(DamageScene, (s.DSID for s in scenes))
+        now = datetime.now()
+        return self.db.execute_many(self._UPDATE_SQL, [self._update_params(s, now) for s in scenes]) or 0
+
     def delete(self, dsid: int) -> bool:
         """删除毁伤场景(软删除，将DSStatus设置为0)"""
         now = datetime.now()
         sql = "UPDATE DamageScene_Info SET DSStatus=0, UpdatedTime=%s WHERE DSID=%s"
         affected = self.db.execute_query(sql, (now, dsid))
+        ENTITY_CACHE.invalidate(DamageScene, dsid)
         return affected > 0 if affected else False
 
+    def delete_many(self, dsids: Iterable[int]) -> int:
+        """批量删除毁伤场景(软删除)，返回影响行数"""
+        ids = list(dsids)
+        if not ids:
+            return 0
+        ENTITY_CACHE.invalidate_many(DamageScene, ids)
+        sql = f"UPDATE DamageScene_Info SET DSStatus=0, UpdatedTime=%s WHERE DSID IN ({_placeholders(ids)})"
+        return self.db.execute_query(sql, (datetime.now(), *ids)) or 0
+
     def get_by_id(self, dsid: int) -> Optional[DamageScene]:
         """根据ID获取毁伤场景"""
-        sql = "SELECT * FROM DamageScene_Info WHERE DSID=%s"
-        result = self.db.execute_query(sql, (dsid,))
-
-        if result and len(result) > 0:
-            return self._row_to_entity(result[0])
-        return None
+        return cached_get(self.db, DamageScene, "DamageScene_Info", "DSID", dsid, self._row_to_entity)
 
     def get_all(self) -> List[DamageScene]:
         """获取所有毁伤场景(仅未删除的)"""
@@ -101,25 +151,8 @@ class DamageSceneRepository:
 
         return [self._row_to_entity(row) for row in result] if result else []
 
-    @staticmethod
-    def _row_to_entity(row: dict) -> DamageScene:
-        """数据库行转实体"""
-        return DamageScene(
-            DSID=row.get('DSID'),
-            DSCode=row.get('DSCode', ''),
-            DSName=row.get('DSName', ''),
-            DSOffensive=row.get('DSOffensive'),
-            DSDefensive=row.get('DSDefensive'),
-            DSBattle=row.get('DSBattle'),
-            AMID=row.get('AMID', 0),
-            AMCode=row.get('AMCode', ''),
-            TargetType=row.get('TargetType', 0),
-            TargetID=row.get('TargetID', 0),
-            TargetCode=row.get('TargetCode', ''),
-            DSStatus=row.get('DSStatus'),
-            CreatedTime=row.get('CreatedTime'),
-            UpdatedTime=row.get('UpdatedTime')
-        )
+    # 数据库行转实体：按字段生成一次的映射函数（见 DBCode.RowMapper）
+    _row_to_entity = staticmethod(mapper_for("DamageScene_Info", DamageScene, source="item"))
 
 
 class DamageParameterRepository:
@@ -128,11 +161,7 @@ class DamageParameterRepository:
     def __init__(self, db_helper: DBHelper):
         self.db = db_helper
 
-    def add(self, param: DamageParameter) -> int:
-        """添加毁伤参数"""
-        now = datetime.now()
-
-        sql = """
+    _INSERT_SQL = """
         INSERT INTO DamageParameter_Info 
         (DSID, DSCode, Carrier, GuidanceMode, WarheadType, ChargeAmount,
          DropHeight, DropSpeed, DropMode, FlightRange, ElectroInterference,
@@ -140,25 +169,7 @@ class DamageParameterRepository:
         VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
 
-        params = (
-            param.DSID, param.DSCode, param.Carrier, param.GuidanceMode,
-            param.WarheadType, param.ChargeAmount, param.DropHeight,
-            param.DropSpeed, param.DropMode, param.FlightRange,
-            param.ElectroInterference, param.WeatherConditions,
-            param.WindSpeed, param.DPStatus, now, now
-        )
-
-        self.db.execute_query(sql, params)
-
-        # 获取插入的ID
-        result = self.db.execute_query("SELECT LAST_INSERT_ID() as id")
-        return result[0]['id'] if result else 0
-
-    def update(self, param: DamageParameter) -> bool:
-        """更新毁伤参数"""
-        now = datetime.now()
-
-        sql = """
+    _UPDATE_SQL = """
         UPDATE DamageParameter_Info 
         SET DSID=%s, DSCode=%s, Carrier=%s, GuidanceMode=%s, WarheadType=%s,
             ChargeAmount=%s, DropHeight=%s, DropSpeed=%s, DropMode=%s,
@@ -167,7 +178,19 @@ class DamageParameterRepository:
         WHERE DPID=%s
         """
 
-        params = (
+    @staticmethod
+    def _insert_params(param: DamageParameter, now: datetime) -> tuple:
+        return (
+            param.DSID, param.DSCode, param.Carrier, param.GuidanceMode,
+            param.WarheadType, param.ChargeAmount, param.DropHeight,
+            param.DropSpeed, param.DropMode, param.FlightRange,
+            param.ElectroInterference, param.WeatherConditions,
+            param.WindSpeed, param.DPStatus, now, now
+        )
+
+    @staticmethod
+    def _update_params(param: DamageParameter, now: datetime) -> tuple:
+        return (
             param.DSID, param.DSCode, param.Carrier, param.GuidanceMode,
             param.WarheadType, param.ChargeAmount, param.DropHeight,
             param.DropSpeed, param.DropMode, param.FlightRange,
@@ -175,24 +198,55 @@ class DamageParameterRepository:
             param.WindSpeed, param.DPStatus, now, param.DPID
         )
 
-        affected = self.db.execute_query(sql, params)
+    def add(self, param: DamageParameter) -> int:
+        """添加毁伤参数"""
+        now = datetime.now()
+
+        self.db.execute_query(self._INSERT_SQL, self._insert_params(param, now))
+
+        # 获取插入的ID
+        result = self.db.execute_query("SELECT LAST_INSERT_ID() as id")
+        return result[0]['id'] if result else 0
+
+    def add_many(self, params: Iterable[DamageParameter]) -> int:
+        """批量添加毁伤参数（多值 INSERT），返回插入行数"""
+        now = datetime.now()
+        return self.db.execute_many(self._INSERT_SQL, [self._insert_params(p, now) for p in params]) or 0
+
+    def update(self, param: DamageParameter) -> bool:
+        """更新毁伤参数"""
+        now = datetime.now()
+        affected = self.db.execute_query(self._UPDATE_SQL, self._update_params(param, now))
+        ENTITY_CACHE.invalidate(DamageParameter, param.DPID)
         return affected > 0 if affected else False
 
+    def update_many(self, params: Iterable[DamageParameter]) -> int:
+        """批量更新毁伤参数，返回影响行数"""
+        params = list(params)
+        ENTITY_CACHE.invalidate_many(DamageParameter, (p.DPID for p in params))
+        now = datetime.now()
+        return self.db.execute_many(self._UPDATE_SQL, [self._update_params(p, now) for p in params]) or 0
+
     def delete(self, dpid: int) -> bool:
         """删除毁伤参数(软删除，将DPStatus设置为0)"""
         now = datetime.now()
         sql = "UPDATE DamageParameter_Info SET DPStatus=0, UpdatedTime=%s WHERE DPID=%s"
         affected = self.db.execute_query(sql, (now, dpid))
+        ENTITY_CACHE.invalidate(DamageParameter, dpid)
         return affected > 0 if affected else False
 
+    def delete_many(self, dpids: Iterable[int]) -> int:
+        """批量删除毁伤参数(软删除)，返回影响行数"""
+        ids = list(dpids)
+        if not ids:
+            return 0
+        ENTITY_CACHE.invalidate_many(DamageParameter, ids)
+        sql = f"UPDATE DamageParameter_Info SET DPStatus=0, UpdatedTime=%s WHERE DPID IN ({_placeholders(ids)})"
+        return self.db.execute_query(sql, (datetime.now(), *ids)) or 0
+
     def get_by_id(self, dpid: int) -> Optional[DamageParameter]:
         """根据ID获取毁伤参数"""
-        sql = "SELECT * FROM DamageParameter_Info WHERE DPID=%s"
-        result = self.db.execute_query(sql, (dpid,))
-
-        if result and len(result) > 0:
-            return self._row_to_entity(result[0])
-        return None
+        return cached_get(self.db, DamageParameter, "DamageParameter_Info", "DPID", dpid, self._row_to_entity)
 
     def get_by_scene_id(self, dsid: int) -> List[DamageParameter]:
         """根据场景ID获取毁伤参数列表(仅未删除的)"""
@@ -208,28 +262,11 @@ class DamageParameterRepository:
 
         return [self._row_to_entity(row) for row in result] if result else []
 
-    @staticmethod
-    def _row_to_entity(row: dict) -> DamageParameter:
-        """数据库行转实体"""
-        return DamageParameter(
-            DPID=row.get('DPID'),
-            DSID=row.get('DSID', 0),
-            DSCode=row.get('DSCode', ''),
-            Carrier=row.get('Carrier'),
-            GuidanceMode=row.get('GuidanceMode'),
-            WarheadType=row.get('WarheadType', ''),
-            ChargeAmount=float(row['ChargeAmount']) if row.get('ChargeAmount') else None,
-            DropHeight=float(row['DropHeight']) if row.get('DropHeight') else None,
-            DropSpeed=float(row['DropSpeed']) if row.get('DropSpeed') else None,
-            DropMode=row.get('DropMode'),
-            FlightRange=float(row['FlightRange']) if row.get('FlightRange') else None,
-            ElectroInterference=row.get('ElectroInterference'),
-            WeatherConditions=row.get('WeatherConditions'),
-            WindSpeed=float(row['WindSpeed']) if row.get('WindSpeed') else None,
-            DPStatus=row.get('DPStatus'),
-            CreatedTime=row.get('CreatedTime'),
-            UpdatedTime=row.get('UpdatedTime')
-        )
+    # 数据库行转实体：按字段生成一次的映射函数（见 DBCode.RowMapper）
+    _row_to_entity = staticmethod(mapper_for(
+        "DamageParameter_Info", DamageParameter, source="item",
+        convert=_float_fields("ChargeAmount", "DropHeight", "DropSpeed", "FlightRange", "WindSpeed"),
+    ))
 
 
 class AssessmentResultRepository:
@@ -238,35 +275,14 @@ class AssessmentResultRepository:
     def __init__(self, db_helper: DBHelper):
         self.db = db_helper
 
-    def add(self, result: AssessmentResult) -> int:
-        """添加毁伤结果"""
-        now = datetime.now()
-
-        sql = """
+    _INSERT_SQL = """
         INSERT INTO Assessment_Result 
         (DSID, DPID, AMID, TargetType, TargetID, DADepth, DADiameter, DAVolume,
          DAArea, DALength, DAWidth, Discturction, DamageDegree, CreatedTime, UpdatedTime)
         VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
 
-        params = (
-            result.DSID, result.DPID, result.AMID, result.TargetType, result.TargetID,
-            result.DADepth, result.DADiameter, result.DAVolume, result.DAArea,
-            result.DALength, result.DAWidth, result.Discturction, result.DamageDegree,
-            now, now
-        )
-
-        self.db.execute_query(sql, params)
-
-        # 获取插入的ID
-        db_result = self.db.execute_query("SELECT LAST_INSERT_ID() as id")
-        return db_result[0]['id'] if db_result else 0
-
-    def update(self, result: AssessmentResult) -> bool:
-        """更新毁伤结果"""
-        now = datetime.now()
-
-        sql = """
+    _UPDATE_SQL = """
         UPDATE Assessment_Result 
         SET DSID=%s, DPID=%s, AMID=%s, TargetType=%s, TargetID=%s,
             DADepth=%s, DADiameter=%s, DAVolume=%s, DAArea=%s,
@@ -275,30 +291,77 @@ class AssessmentResultRepository:
         WHERE DAID=%s
         """
 
-        params = (
+    @staticmethod
+    def _insert_params(result: AssessmentResult, now: datetime) -> tuple:
+        return (
+            result.DSID, result.DPID, result.AMID, result.TargetType, result.TargetID,
+            result.DADepth, result.DADiameter, result.DAVolume, result.DAArea,
+            result.DALength, result.DAWidth, result.Discturction, result.DamageDegree,
+            now, now
+        )
+
+    @staticmethod
+    def _update_params(result: AssessmentResult, now: datetime) -> tuple:
+        return (
             result.DSID, result.DPID, result.AMID, result.TargetType, result.TargetID,
             result.DADepth, result.DADiameter, result.DAVolume, result.DAArea,
             result.DALength, result.DAWidth, result.Discturction, result.DamageDegree,
             now, result.DAID
         )
 
-        affected = self.db.execute_query(sql, params)
+    def add(self, result: AssessmentResult) -> int:
+        """添加毁伤结果"""
+        now = datetime.now()
+
+        self.db.execute_query(self._INSERT_SQL, self._insert_params(result, now))
+        LOOKUPS.notify("Assessment_Result", result)
+
+        # 获取插入的ID
+        db_result = self.db.execute_query("SELECT LAST_INSERT_ID() as id")
+        return db_result[0]['id'] if db_result else 0
+
+    def add_many(self, results: Iterable[AssessmentResult]) -> int:
+        """批量添加毁伤结果，返回插入行数"""
+        results = list(results)
+        LOOKUPS.notify_many("Assessment_Result", results)
+        now = datetime.now()
+        return self.db.execute_many(self._INSERT_SQL, [self._insert_params(r, now) for r in results]) or 0
+
+    def update(self, result: AssessmentResult) -> bool:
+        """更新毁伤结果"""
+        now = datetime.now()
+        affected = self.db.execute_query(self._UPDATE_SQL, self._update_params(result, now))
+        LOOKUPS.notify("Assessment_Result", result)
+        ENTITY_CACHE.invalidate(AssessmentResult, result.DAID)
         return affected > 0 if affected else False
 
+    def update_many(self, results: Iterable[AssessmentResult]) -> int:
+        """批量更新毁伤结果，返回影响行数"""
+        results = list(results)
+        LOOKUPS.notify_many("Assessment_Result", results)
+        ENTITY_CACHE.invalidate_many(AssessmentResult, (r.DAID for r in results))
+        now = datetime.now()
+        return self.db.execute_many(self._UPDATE_SQL, [self._update_params(r, now) for r in results]) or 0
+
     def delete(self, daid: int) -> bool:
         """删除毁伤结果"""
         sql = "DELETE FROM Assessment_Result WHERE DAID=%s"
         affected = self.db.execute_query(sql, (daid,))
+        ENTITY_CACHE.invalidate(AssessmentResult, daid)
         return affected > 0 if affected else False
 
+    def delete_many(self, daids: Iterable[int]) -> int:
+        """批量删除毁伤结果，返回影响行数"""
+        ids = list(daids)
+        if not ids:
+            return 0
+        ENTITY_CACHE.invalidate_many(AssessmentResult, ids)
+        sql = f"DELETE FROM Assessment_Result WHERE DAID IN ({_placeholders(ids)})"
+        return self.db.execute_query(sql, tuple(ids)) or 0
+
     def get_by_id(self, daid: int) -> Optional[AssessmentResult]:
         """根据ID获取毁伤结果"""
-        sql = "SELECT * FROM Assessment_Result WHERE DAID=%s"
-        db_result = self.db.execute_query(sql, (daid,))
-
-        if db_result and len(db_result) > 0:
-            return self._row_to_entity(db_result[0])
-        return None
+        return cached_get(self.db, AssessmentResult, "Assessment_Result", "DAID", daid, self._row_to_entity)
 
     def get_by_scene_id(self, dsid: int) -> List[AssessmentResult]:
         """根据场景ID获取毁伤结果列表"""
@@ -314,6 +377,17 @@ class AssessmentResultRepository:
 
         return [self._row_to_entity(row) for row in db_result] if db_result else []
 
+    def count_all(self) -> int:
+        """记录总数（导出时用于计算进度）"""
+        db_result = self.db.execute_query("SELECT COUNT(*) AS n FROM Assessment_Result")
+        return int(db_result[0]["n"]) if db_result else 0
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[List[AssessmentResult]]:
+        """与 get_all 顺序相同，按块流式返回实体，不把整表读入内存（见 DBHelper.iter_query）"""
+        sql = "SELECT * FROM Assessment_Result ORDER BY DAID DESC"
+        for rows in self.db.iter_query(sql, chunk_size=chunk_size):
+            yield [self._row_to_entity(row) for row in rows]
+
     def search(self, keyword: str) -> List[AssessmentResult]:
         """搜索毁伤结果"""
         sql = """
@@ -326,27 +400,11 @@ class AssessmentResultRepository:
 
         return [self._row_to_entity(row) for row in db_result] if db_result else []
 
-    @staticmethod
-    def _row_to_entity(row: dict) -> AssessmentResult:
-        """数据库行转实体"""
-        return AssessmentResult(
-            DAID=row.get('DAID'),
-            DSID=row.get('DSID', 0),
-            DPID=row.get('DPID', 0),
-            AMID=row.get('AMID', 0),
-            TargetType=row.get('TargetType', 0),
-            TargetID=row.get('TargetID', 0),
-            DADepth=float(row['DADepth']) if row.get('DADepth') else None,
-            DADiameter=float(row['DADiameter']) if row.get('DADiameter') else None,
-            DAVolume=float(row['DAVolume']) if row.get('DAVolume') else None,
-            DAArea=float(row['DAArea']) if row.get('DAArea') else None,
-            DALength=float(row['DALength']) if row.get('DALength') else None,
-            DAWidth=float(row['DAWidth']) if row.get('DAWidth') else None,
-            Discturction=float(row['Discturction']) if row.get('Discturction') else None,
-            DamageDegree=row.get('DamageDegree'),
-            CreatedTime=row.get('CreatedTime'),
-            UpdatedTime=row.get('UpdatedTime')
-        )
+    # 数据库行转实体：按字段生成一次的映射函数（见 DBCode.RowMapper）
+    _row_to_entity = staticmethod(mapper_for(
+        "Assessment_Result", AssessmentResult, source="item",
+        convert=_float_fields("DADepth", "DADiameter", "DAVolume", "DAArea", "DALength", "DAWidth", "Discturction"),
+    ))
 
 
 class AssessmentReportRepository:
@@ -355,66 +413,92 @@ class AssessmentReportRepository:
     def __init__(self, db_helper: DBHelper):
         self.db = db_helper
 
-    def add(self, report: AssessmentReport) -> int:
-        """添加毁伤评估报告"""
-        now = datetime.now()
-
-        sql = """
+    _INSERT_SQL = """
         INSERT INTO Assessment_Report 
         (ReportCode, ReportName, DAID, DSID, DPID, AMID, TargetType, TargetID,
          DamageDegree, Comment, Creator, Reviewer, CreatedTime, UpdatedTime)
         VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
 
-        params = (
+    _UPDATE_SQL = """
+        UPDATE Assessment_Report 
+        SET ReportCode=%s, ReportName=%s, DAID=%s, DSID=%s, DPID=%s, AMID=%s,
+            TargetType=%s, TargetID=%s, DamageDegree=%s, Comment=%s,
+            Creator=%s, Reviewer=%s, UpdatedTime=%s
+        WHERE ReportID=%s
+        """
+
+    @staticmethod
+    def _insert_params(report: AssessmentReport, now: datetime) -> tuple:
+        return (
             report.ReportCode, report.ReportName, report.DAID, report.DSID,
             report.DPID, report.AMID, report.TargetType, report.TargetID,
             report.DamageDegree, report.Comment, report.Creator, report.Reviewer,
             now, now
         )
 
-        self.db.execute_query(sql, params)
+    @staticmethod
+    def _update_params(report: AssessmentReport, now: datetime) -> tuple:
+        return (
+            report.ReportCode, report.ReportName, report.DAID, report.DSID,
+            report.DPID, report.AMID, report.TargetType, report.TargetID,
+            report.DamageDegree, report.Comment, report.Creator, report.Reviewer,
+            now, report.ReportID
+        )
+
+    def add(self, report: AssessmentReport) -> int:
+        """添加毁伤评估报告"""
+        now = datetime.now()
+
+        self.db.execute_query(self._INSERT_SQL, self._insert_params(report, now))
+        LOOKUPS.notify("Assessment_Report", report)
 
         # 获取插入的ID
         db_result = self.db.execute_query("SELECT LAST_INSERT_ID() as id")
         return db_result[0]['id'] if db_result else 0
 
+    def add_many(self, reports: Iterable[AssessmentReport]) -> int:
+        """批量添加毁伤评估报告，返回插入行数"""
+        reports = list(reports)
+        LOOKUPS.notify_many("Assessment_Report", reports)
+        now = datetime.now()
+        return self.db.execute_many(self._INSERT_SQL, [self._insert_params(r, now) for r in reports]) or 0
+
     def update(self, report: AssessmentReport) -> bool:
         """更新毁伤评估报告"""
         now = datetime.now()
-
-        sql = """
-        UPDATE Assessment_Report 
-        SET ReportCode=%s, ReportName=%s, DAID=%s, DSID=%s, DPID=%s, AMID=%s,
-            TargetType=%s, TargetID=%s, DamageDegree=%s, Comment=%s,
-            Creator=%s, Reviewer=%s, UpdatedTime=%s
-        WHERE ReportID=%s
-        """
-
-        params = (
-            report.ReportCode, report.ReportName, report.DAID, report.DSID,
-            report.DPID, report.AMID, report.TargetType, report.TargetID,
-            report.DamageDegree, report.Comment, report.Creator, report.Reviewer,
-            now, report.ReportID
-        )
-
-        affected = self.db.execute_query(sql, params)
+        affected = self.db.execute_query(self._UPDATE_SQL, self._update_params(report, now))
+        LOOKUPS.notify("Assessment_Report", report)
+        ENTITY_CACHE.invalidate(AssessmentReport, report.ReportID)
         return affected > 0 if affected else False
 
+    def update_many(self, reports: Iterable[AssessmentReport]) -> int:
+        """批量更新毁伤评估报告，返回影响行数"""
+        reports = list(reports)
+        LOOKUPS.notify_many("Assessment_Report", reports)
+        ENTITY_CACHE.invalidate_many(AssessmentReport, (r.ReportID for r in reports))
+        now = datetime.now()
+        return self.db.execute_many(self._UPDATE_SQL, [self._update_params(r, now) for r in reports]) or 0
+
     def delete(self, report_id: int) -> bool:
         """删除毁伤评估报告"""
         sql = "DELETE FROM Assessment_Report WHERE ReportID=%s"
         affected = self.db.execute_query(sql, (report_id,))
+        ENTITY_CACHE.invalidate(AssessmentReport, report_id)
         return affected > 0 if affected else False
 
+    def delete_many(self, report_ids: Iterable[int]) -> int:
+        """批量删除毁伤评估报告，返回影响行数"""
+        ids = list(report_ids)
+        if not ids:
+            return 0
+        ENTITY_CACHE.invalidate_many(AssessmentReport, ids)
+        sql = f"DELETE FROM Assessment_Report WHERE ReportID IN ({_placeholders(ids)})"
+        return self.db.execute_query(sql, tuple(ids)) or 0
+
     def get_by_id(self, report_id: int) -> Optional[AssessmentReport]:
         """根据ID获取毁伤评估报告"""
-        sql = "SELECT * FROM Assessment_Report WHERE ReportID=%s"
-        db_result = self.db.execute_query(sql, (report_id,))
-
-        if db_result and len(db_result) > 0:
-            return self._row_to_entity(db_result[0])
-        return None
+        return cached_get(self.db, AssessmentReport, "Assessment_Report", "ReportID", report_id, self._row_to_entity)
 
     def get_all(self) -> List[AssessmentReport]:
         """获取所有毁伤评估报告"""
@@ -423,6 +507,17 @@ class AssessmentReportRepository:
 
         return [self._row_to_entity(row) for row in db_result] if db_result else []
 
+    def count_all(self) -> int:
+        """记录总数（导出时用于计算进度）"""
+        db_result = self.db.execute_query("SELECT COUNT(*) AS n FROM Assessment_Report")
+        return int(db_result[0]["n"]) if db_result else 0
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[List[AssessmentReport]]:
+        """与 get_all 顺序相同，按块流式返回实体，不把整表读入内存（见 DBHelper.iter_query）"""
+        sql = "SELECT * FROM Assessment_Report ORDER BY ReportID DESC"
+        for rows in self.db.iter_query(sql, chunk_size=chunk_size):
+            yield [self._row_to_entity(row) for row in rows]
+
     def search(self, keyword: str) -> List[AssessmentReport]:
         """搜索毁伤评估报告"""
         sql = """
@@ -435,23 +530,5 @@ class AssessmentReportRepository:
 
         return [self._row_to_entity(row) for row in db_result] if db_result else []
 
-    @staticmethod
-    def _row_to_entity(row: dict) -> AssessmentReport:
-        """数据库行转实体"""
-        return AssessmentReport(
-            ReportID=row.get('ReportID'),
-            ReportCode=row.get('ReportCode', ''),
-            ReportName=row.get('ReportName', ''),
-            DAID=row.get('DAID', 0),
-            DSID=row.get('DSID'),
-            DPID=row.get('DPID'),
-            AMID=row.get('AMID'),
-            TargetType=row.get('TargetType', 0),
-            TargetID=row.get('TargetID'),
-            DamageDegree=row.get('DamageDegree'),
-            Comment=row.get('Comment'),
-            Creator=row.get('Creator'),
-            Reviewer=row.get('Reviewer'),
-            CreatedTime=row.get('CreatedTime'),
-            UpdatedTime=row.get('UpdatedTime')
-        )
+    # 数据库行转实体：按字段生成一次的映射函数（见 DBCode.RowMapper）
+    _row_to_entity = staticmethod(mapper_for("Assessment_Report", AssessmentReport, source="item"))
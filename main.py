@@ -4,19 +4,25 @@ from loguru import logger
 from PyQt6.QtWidgets import QApplication, QMessageBox
 
 from BusinessCode.Config import ConfigEditorDialog, is_first_run, mark_first_run_done
+from DBCode.Backend import backend
 from DBCode.init_database import initialize_database
 from BusinessCode.Login import LoginWindow, load_skin
+from BusinessCode.LogSetup import configure_logging
+from DBCode.SlowQueryLog import install_slow_query_log
 
 if __name__ == "__main__":
-    # 初始化日志
-    logger.add("logs/app.log", level="DEBUG")
+    # 初始化日志（后台线程写入 logs/app.log，级别见配置 log_level / log_levels）
+    configure_logging()
+    # 慢查询记录（阈值见配置 slow_query_ms）
+    install_slow_query_log()
 
     app = QApplication(sys.argv)
     load_skin(app)
 
     # 首次强制检查 / 编辑
     try:
-        if is_first_run():
+        # 首次运行时配置 MySQL 连接；sqlite 后端无需配置
+        if is_first_run() and backend() == "mysql":
             logger.info("首次打开软件，打开数据库信息配置界面")
             dlg = ConfigEditorDialog()
             dlg.configSaved.connect(mark_first_run_done)
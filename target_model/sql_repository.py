@@ -4,9 +4,16 @@ from dataclasses import fields
 from datetime import datetime
 from typing import Callable, Iterable, List, Optional, Tuple, Type, Union, cast
 
-from sqlalchemy import select
+from sqlalchemy import select, func, inspect
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
+from DBCode.EntityCache import ENTITY_CACHE
+from DBCode.LookupCache import LOOKUPS
+from DBCode.SelectorIndex import SELECTOR_INDEX
+from DBCode.RowMapper import entity_columns, mapper_for, record_query
+
 from .entities import AirportRunway, AircraftShelter, UndergroundCommandPost
 from .orm import AirportRunwayORM, AircraftShelterORM, UndergroundCommandPostORM
 
@@ -21,10 +28,12 @@ class _EntityMeta:
         orm_cls: type,
         primary_key: str = "id",
         audit_fields: Tuple[str, ...] | None = None,
+        code_field: str | None = None,
     ) -> None:
         self.entity_cls = entity_cls
         self.orm_cls = orm_cls
         self.primary_key = primary_key
+        self.code_field = code_field
         self.audit_fields: Tuple[str, ...] = audit_fields or ("created_at", "updated_at")
         self.created_field: str | None = self.audit_fields[0] if self.audit_fields else None
         if self.audit_fields and len(self.audit_fields) > 1:
@@ -40,8 +49,12 @@ class _EntityMeta:
         )
 
     def to_entity(self, row: object) -> Entity:
-        data = {name: getattr(row, name, None) for name in self.field_names}
-        return cast(Entity, self.entity_cls(**data))
+        return cast(Entity, self.row_mapper(row))
+
+    @property
+    def row_mapper(self):
+        """ORM 对象 / Core 结果行 -> 实体 的生成函数（首次使用时生成并缓存）"""
+        return mapper_for(self.orm_cls, self.entity_cls)
 
     def assign_row_from_entity(self, row: object, entity: Entity, *, for_create: bool) -> None:
         for name in self.mutable_non_audit_fields:
@@ -53,6 +66,13 @@ class _EntityMeta:
             setattr(row, self.updated_field, getattr(entity, self.updated_field, datetime.utcnow()))
 
 
+def _is_binary(column) -> bool:
+    try:
+        return column.type.python_type is bytes
+    except NotImplementedError:
+        return False
+
+
 class SQLRepository:
     """
     SQLAlchemy 驱动的通用仓储，支持机场跑道、飞机隐蔽库与地下指挥所三张表的统一 CRUD。
@@ -61,9 +81,12 @@ class SQLRepository:
 
 
     _METAS: Tuple[_EntityMeta, ...] = (
-        _EntityMeta(AirportRunway, AirportRunwayORM, audit_fields=("created_time", "updated_time")),
-        _EntityMeta(AircraftShelter, AircraftShelterORM, audit_fields=("created_time", "updated_time")),
-        _EntityMeta(UndergroundCommandPost, UndergroundCommandPostORM, audit_fields=("created_time", "updated_time")),
+        _EntityMeta(AirportRunway, AirportRunwayORM, audit_fields=("created_time", "updated_time"),
+                    code_field="runway_code"),
+        _EntityMeta(AircraftShelter, AircraftShelterORM, audit_fields=("created_time", "updated_time"),
+                    code_field="shelter_code"),
+        _EntityMeta(UndergroundCommandPost, UndergroundCommandPostORM, audit_fields=("created_time", "updated_time"),
+                    code_field="ucc_code"),
     )
     _META_BY_ENTITY: dict[type, _EntityMeta] = {meta.entity_cls: meta for meta in _METAS}
 
@@ -75,22 +98,55 @@ class SQLRepository:
     def list_all(self, entity_cls: EntityType | None = None) -> List[Entity]:
         results: List[Entity] = []
         for meta in self._iter_metas(entity_cls):
-            rows = self.session.scalars(select(meta.orm_cls)).all()
-            entities = [meta.to_entity(r) for r in rows]
+            # Core 查询实体所需的列并直接映射，不经过 ORM 对象
+            rows = self.session.execute(select(*entity_columns(meta.orm_cls, meta.entity_cls))).all()
+            to_entity = meta.row_mapper
+            entities = [to_entity(r) for r in rows]
             for ent in entities:
                 self.add_update_method(ent, meta)
             results.extend(entities)
         return results
 
+    def list_records(self, entity_cls: EntityType, field_names: Iterable[str] | None = None) -> List[tuple]:
+        """
+        只读列表：返回 namedtuple 记录（字段名同实体，默认不含图片等二进制列），不绑定 update()。
+        用于表格展示；需要编辑时再用 get(id) 取完整实体。
+        """
+        meta = self._meta_from_cls(entity_cls)
+        binary = [attr.key for attr in inspect(meta.orm_cls).column_attrs if _is_binary(attr.columns[0])]
+        cols, record_cls = record_query(meta.orm_cls, meta.entity_cls,
+                                        list(field_names) if field_names is not None else None, exclude=binary)
+        make = record_cls._make
+        return [make(r) for r in self.session.execute(select(*cols))]
+
     def get(self, item_id: int, entity_cls: EntityType | None = None) -> Optional[Entity]:
         for meta in self._iter_metas(entity_cls):
-            row = self.session.get(meta.orm_cls, item_id)
-            if row is not None:
-                entity = meta.to_entity(row)
+            entity = self._cached_get(meta, item_id)
+            if entity is not None:
                 self.add_update_method(entity, meta)
                 return entity
         return None
 
+    def _cached_get(self, meta: _EntityMeta, item_id: int) -> Optional[Entity]:
+        """按主键读取，更新时间未变化时从实体缓存返回（见 DBCode.EntityCache）"""
+        pk = getattr(meta.orm_cls, meta.primary_key)
+        if not meta.updated_field:
+            row = self.session.get(meta.orm_cls, item_id)
+            return meta.to_entity(row) if row is not None else None
+        version = self.session.execute(
+            select(getattr(meta.orm_cls, meta.updated_field)).where(pk == item_id)
+        ).first()
+        if version is None:
+            return None
+        entity = ENTITY_CACHE.get(meta.entity_cls, item_id, version[0])
+        if entity is None:
+            row = self.session.get(meta.orm_cls, item_id)
+            if row is None:
+                return None
+            entity = meta.to_entity(row)
+            ENTITY_CACHE.put(meta.entity_cls, item_id, getattr(row, meta.updated_field), entity)
+        return entity
+
     # ---------- Mutations ----------
 
     def add(self, item: Entity) -> Entity:
@@ -107,6 +163,9 @@ class SQLRepository:
         self.session.flush()
 
         setattr(item, meta.primary_key, getattr(row, meta.primary_key))
+        ENTITY_CACHE.invalidate(meta.entity_cls, getattr(item, meta.primary_key))
+        LOOKUPS.notify(meta.orm_cls.__tablename__, item)
+        SELECTOR_INDEX.touch(meta.orm_cls.__tablename__, getattr(item, meta.primary_key))
         self.add_update_method(item, meta)
         return item
 
@@ -133,6 +192,9 @@ class SQLRepository:
             setattr(entity, meta.updated_field, datetime.utcnow())
         meta.assign_row_from_entity(row, entity, for_create=False)
         self.session.flush()
+        ENTITY_CACHE.invalidate(meta.entity_cls, pk_value)
+        LOOKUPS.notify(meta.orm_cls.__tablename__, entity)
+        SELECTOR_INDEX.touch(meta.orm_cls.__tablename__, pk_value)
         self.add_update_method(entity, meta)
         return entity
 
@@ -141,9 +203,94 @@ class SQLRepository:
             row = self.session.get(meta.orm_cls, item_id)
             if row is not None:
                 self.session.delete(row)
+                ENTITY_CACHE.invalidate(meta.entity_cls, item_id)
+                SELECTOR_INDEX.touch(meta.orm_cls.__tablename__, item_id)
                 return True
         return False
 
+    def unique_conflicts(self, items: List[Entity]) -> List[Tuple[int, str]]:
+        """
+        upsert_many 按编码覆盖，编码以外的唯一列（如名称）若已被另一编码的记录占用，
+        MySQL 的 ON DUPLICATE KEY 会改写那条记录，sqlite 则直接报错。
+        返回这类冲突：[(items 中的下标, 说明)]，调用方应在写入前剔除。
+        """
+        conflicts: List[Tuple[int, str]] = []
+        for meta in self._METAS:
+            indexed = [(i, e) for i, e in enumerate(items) if type(e) is meta.entity_cls]
+            if not indexed or not meta.code_field:
+                continue
+            key_of = {attr.columns[0].name: attr.key for attr in inspect(meta.orm_cls).column_attrs}
+            code_attr = getattr(meta.orm_cls, meta.code_field)
+            for col in meta.orm_cls.__table__.columns:
+                name = key_of[col.name]
+                if not col.unique or name == meta.code_field:
+                    continue
+                values = list({getattr(e, name) for _, e in indexed if getattr(e, name) is not None})
+                owner: dict = {}
+                for start in range(0, len(values), 1000):
+                    stmt = select(getattr(meta.orm_cls, name), code_attr).where(
+                        getattr(meta.orm_cls, name).in_(values[start:start + 1000]))
+                    owner.update(self.session.execute(stmt).tuples())
+                for i, e in indexed:
+                    code = owner.get(getattr(e, name))
+                    if code is not None and code != getattr(e, meta.code_field):
+                        conflicts.append((i, f"{col.name} {getattr(e, name)} 已被编码 {code} 使用"))
+        return conflicts
+
+    def upsert_many(self, items: Iterable[Entity], batch_size: int = 1000) -> int:
+        """
+        批量导入：INSERT ... ON DUPLICATE KEY UPDATE（sqlite 为 ON CONFLICT DO UPDATE），按编码（*_code 唯一索引）新增或覆盖。
+        - 每批一条多值 INSERT，避免逐行往返
+        - 编码、创建时间不被覆盖；导入数据未带图片时保留库中已有图片
+        返回写入的记录数；提交由调用方负责。
+        """
+        groups: dict[type, List[Entity]] = {}
+        for item in items:
+            groups.setdefault(type(item), []).append(item)
+
+        written = 0
+        now = datetime.utcnow()
+        sqlite = self.session.get_bind().dialect.name == "sqlite"
+        for entity_type, ents in groups.items():
+            meta = self._meta_from_cls(entity_type)
+            table = meta.orm_cls.__table__
+            column_of = {attr.key: attr.columns[0].name for attr in inspect(meta.orm_cls).column_attrs}
+
+            rows = []
+            for e in ents:
+                if meta.created_field and getattr(e, meta.created_field, None) is None:
+                    setattr(e, meta.created_field, now)
+                if meta.updated_field:
+                    setattr(e, meta.updated_field, now)
+                rows.append({column_of[name]: getattr(e, name) for name in meta.mutable_fields})
+
+            keep = {column_of[n] for n in (meta.code_field, meta.created_field) if n}
+            update_cols = [column_of[n] for n in meta.mutable_fields if column_of[n] not in keep]
+            for start in range(0, len(rows), batch_size):
+                if sqlite:
+                    stmt = sqlite_insert(table).values(rows[start:start + batch_size])
+                    incoming = stmt.excluded
+                else:
+                    stmt = mysql_insert(table).values(rows[start:start + batch_size])
+                    incoming = stmt.inserted
+                set_ = {}
+                for col in update_cols:
+                    if _is_binary(table.c[col]):
+                        set_[col] = func.coalesce(incoming[col], table.c[col])
+                    else:
+                        set_[col] = incoming[col]
+                if sqlite:
+                    stmt = stmt.on_conflict_do_update(index_elements=[column_of[meta.code_field]], set_=set_)
+                else:
+                    stmt = stmt.on_duplicate_key_update(set_)
+                self.session.execute(stmt)
+            # 按编码覆盖，不知道具体命中了哪些主键，整类失效
+            ENTITY_CACHE.invalidate(meta.entity_cls)
+            LOOKUPS.notify_many(meta.orm_cls.__tablename__, ents)
+            SELECTOR_INDEX.touch(meta.orm_cls.__tablename__)
+            written += len(rows)
+        return written
+
     # ---------- Helpers ----------
 
     def add_update_method(self, entity: Entity, meta: _EntityMeta | None = None) -> None: